@@ -0,0 +1,92 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+Benchmark of annualization factor inference, alone and within volatility over each column of a panel sharing one
+index, against the previous implementation, which computed the distance of each pair of dates in turn.
+
+Run from the repository root with: python -m benchmarks.bench_annualization_factor
+"""
+import datetime as dt
+import time
+import warnings
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import gs_quant.timeseries.econometrics as econometrics
+from gs_quant.errors import MqValueError
+from gs_quant.timeseries import volatility
+
+
+def legacy_get_annualization_factor(x):
+    prev_idx = x.index[0]
+    distances = []
+
+    for idx in x.index[1:]:
+        d = (idx - prev_idx).days
+        if d == 0:
+            raise MqValueError('multiple data points on same date')
+        distances.append(d)
+        prev_idx = idx
+
+    return econometrics._annualization_factor_for_distance(np.average(distances))
+
+
+def timed(fn, *args, number: int = 1):
+    start = time.perf_counter()
+    for _ in range(number):
+        result = fn(*args)
+    return result, (time.perf_counter() - start) / number
+
+
+def report(name: str, size: int, before: float, after: float):
+    print('{:<32} points={:>7} before={:>9.3f}ms after={:>8.3f}ms speedup={:>8.1f}x'.format(
+        name, size, before * 1000, after * 1000, before / after))
+
+
+def run_inference(name: str, index):
+    # A new series (and index) each time, so that the inferred factor is not re-used
+    series = [pd.Series(1.0, index=index.copy()) for _ in range(20)]
+    expected, before = timed(lambda: [legacy_get_annualization_factor(s) for s in series])
+    actual, after = timed(lambda: [econometrics._get_annualization_factor(s) for s in series])
+    assert actual == expected
+    report(name, len(index), before / len(series), after / len(series))
+
+    _, cached = timed(econometrics._get_annualization_factor, series[0], number=1000)
+    report(name + ' (cached)', len(index), before / len(series), cached)
+
+
+def run_panel(name: str, panel: pd.DataFrame):
+    columns = [panel.iloc[:, i] for i in range(panel.shape[1])]
+    with mock.patch.object(econometrics, '_get_annualization_factor', legacy_get_annualization_factor):
+        expected, before = timed(lambda: [volatility(c, 22) for c in columns])
+    actual, after = timed(lambda: [volatility(c, 22) for c in columns])
+    for a, e in zip(actual, expected):
+        pd.testing.assert_series_equal(a, e)
+    report(name, panel.size, before, after)
+
+
+if __name__ == '__main__':
+    warnings.simplefilter('ignore')
+    rng = np.random.RandomState(42)
+
+    dates = pd.bdate_range('2010-01-04', periods=2610)
+    run_inference('daily (dates)', pd.Index([d.date() for d in dates]))
+    run_inference('daily (timestamps)', dates)
+    run_inference('weekly (datetimes)', pd.Index([dt.datetime(2000, 1, 7, 16) + dt.timedelta(weeks=i)
+                                                  for i in range(1000)]))
+
+    prices = 100 + np.cumsum(rng.normal(size=(len(dates), 500)), axis=0)
+    run_panel('volatility of 500 columns', pd.DataFrame(prices, index=pd.Index([d.date() for d in dates])))
@@ -0,0 +1,149 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+Benchmark of attribute access, hashing and equality on large sets of instruments: the per-class alias table and
+property getters against the previous implementation, which translated names with inflection on every access.
+
+Run from the repository root with: python -m benchmarks.bench_attribute_access
+"""
+from contextlib import contextmanager, nullcontext
+import timeit
+
+import inflection
+
+from gs_quant.base import Base
+from gs_quant.instrument import IRSwap
+from gs_quant.priceable import PriceableImpl
+from gs_quant.session import GsSession
+
+
+def legacy_getattr(self, item):
+    snake_case_item = inflection.underscore(item)
+    if snake_case_item in object.__getattribute__(self, 'properties')():
+        return object.__getattribute__(self, snake_case_item)
+    else:
+        return object.__getattribute__(self, item)
+
+
+def legacy_setattr(self, key, value):
+    properties = object.__getattribute__(self, 'properties')()
+    snake_case_key = inflection.underscore(key)
+    key_is_property = key in properties
+    snake_case_key_is_property = snake_case_key in properties
+
+    if snake_case_key_is_property and not key_is_property:
+        return object.__setattr__(self, snake_case_key, value)
+    else:
+        return object.__setattr__(self, key, value)
+
+
+def legacy_hash(self) -> int:
+    if not self._hash_is_calced:
+        calced_hash = hash(self.name)
+        for prop in self.properties():
+            calced_hash ^= hash(object.__getattribute__(self, prop))
+
+        self._Base__calced_hash = calced_hash
+
+    return self._Base__calced_hash
+
+
+def legacy_eq(self, other) -> bool:
+    return \
+        type(self) == type(other) and self.name == other.name and \
+        (self._Base__calced_hash is None or other._Base__calced_hash is None or
+         self._Base__calced_hash == other._Base__calced_hash) \
+        and all(object.__getattribute__(self, p) == object.__getattribute__(other, p) for p in self.properties())
+
+
+def legacy_getattribute(self, name):
+    resolved = False
+
+    try:
+        resolved = object.__getattribute__(self, '_resolution_info') is not None
+    except AttributeError:
+        pass
+
+    if GsSession.current_is_set and not resolved:
+        attr = getattr(object.__getattribute__(self, '__class__'), name, None)
+        if attr and isinstance(attr, property) and object.__getattribute__(self, name) is None:
+            self.resolve()
+
+    return object.__getattribute__(self, name)
+
+
+@contextmanager
+def legacy():
+    """Swap in the previous implementations"""
+    current = {(c, n): c.__dict__[n] for c, n in ((Base, '__getattr__'), (Base, '__setattr__'), (Base, '__hash__'),
+                                                  (Base, '__eq__'), (PriceableImpl, '__getattribute__'))}
+    Base.__getattr__ = legacy_getattr
+    Base.__setattr__ = legacy_setattr
+    Base.__hash__ = legacy_hash
+    Base.__eq__ = legacy_eq
+    PriceableImpl.__getattribute__ = legacy_getattribute
+    try:
+        yield
+    finally:
+        for (cls, name), fn in current.items():
+            setattr(cls, name, fn)
+
+
+def swaps(size: int) -> list:
+    return [IRSwap('Pay', '{}y'.format(1 + i % 30), 'USD', fixedRate=0.0001 * i, notionalAmount=1e6)
+            for i in range(size)]
+
+
+def read(instruments: list):
+    for swap in instruments:
+        _ = swap.fixed_rate, swap.fixedRate, swap.termination_date, swap.notional_currency, swap.fee
+
+
+def write(instruments: list):
+    for swap in instruments:
+        swap.fixedRate = 0.01
+        swap.notional_amount = 1e7
+
+
+def hash_all(instruments: list):
+    for swap in instruments:
+        swap.fee = None  # Invalidate the cached hash
+        hash(swap)
+
+
+def eq_all(instruments: list, others: list):
+    for swap, other in zip(instruments, others):
+        _ = swap == other
+
+
+def run(size: int, number: int = 1):
+    timings = []
+    for context in (legacy, nullcontext):
+        with context():
+            instruments = swaps(size)
+            others = swaps(size)
+            results = []
+            for fn, args in (((lambda: swaps(size)), ()), (read, (instruments,)), (write, (instruments,)),
+                             (hash_all, (instruments,)), (eq_all, (instruments, others))):
+                results.append(timeit.timeit(lambda: fn(*args), number=number) / number)
+            timings.append(results)
+
+    for name, before, after in zip(('construct', 'get', 'set', '__hash__', '__eq__'), *timings):
+        print('{:<10} instruments={:>7} legacy={:>9.1f}ms aliased={:>8.1f}ms speedup={:>6.1f}x'.format(
+            name, size, before * 1000, after * 1000, before / after))
+
+
+if __name__ == '__main__':
+    run(10000)
+    run(50000)
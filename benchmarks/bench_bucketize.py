@@ -0,0 +1,119 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+Benchmark of bucketing intraday power prices into daily and monthly averages, for one node and for a panel of nodes,
+against the previous implementation, which filtered columns of dates, days and hours of each node's prices in turn.
+
+Run from the repository root with: python -m benchmarks.bench_bucketize
+"""
+import datetime as dt
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from gs_quant.timeseries.buckets import NercCalendar, get_bucket_calendar
+
+
+def legacy_bucketize(df: pd.DataFrame, bucket: str, granularity: str, start_date: dt.date, end_date: dt.date,
+                     timezone: str, peak_start: int, peak_end: int, weekends: list) -> pd.Series:
+    df = df.tz_convert(timezone)
+
+    df['month'] = df.index.to_period('M')
+    df['date'] = df.index.date
+    df['day'] = df.index.dayofweek
+    df['hour'] = df.index.hour
+    holidays = NercCalendar().holidays(start=start_date, end=end_date).date
+
+    freq = int(min(np.diff(df.index.asi8) // 10 ** 9))
+    ref_hour_range = pd.date_range(str(start_date), str(end_date + dt.timedelta(days=1)),
+                                   freq=str(freq) + "S", tz=timezone, closed='left')
+    missing_hours = ref_hour_range[~ref_hour_range.isin(df.index)]
+    missing_dates = np.unique(missing_hours.date)
+    missing_months = np.unique(np.array(missing_dates, dtype='M8[D]').astype('M8[M]'))
+
+    df = df.loc[(~df['date'].isin(missing_dates))]
+    if granularity == 'M':
+        # As corrected: months (periods) were compared with datetime64 values, so never dropped
+        df = df.loc[(~df['month'].isin(pd.PeriodIndex(missing_months, freq='M')))]
+
+    if bucket == '7x24':
+        pass
+    elif bucket == 'offpeak':
+        df = df.loc[df['date'].isin(holidays) |
+                    df['day'].isin(weekends) |
+                    (~df['date'].isin(holidays) & ~df['day'].isin(weekends) &
+                        ((df['hour'] < peak_start) | (df['hour'] > peak_end - 1)))]
+    elif bucket == 'peak':
+        df = df.loc[(~df['date'].isin(holidays)) & (~df['day'].isin(weekends)) & (df['hour'] > peak_start - 1) &
+                    (df['hour'] < peak_end)]
+    elif bucket == '7x8':
+        df = df.loc[(df['hour'] < peak_start) | (df['hour'] > peak_end - 1)]
+    elif bucket == '2x16h':
+        df = df.loc[((df['date'].isin(holidays)) | df['day'].isin(weekends)) & ((df['hour'] > peak_start - 1) &
+                                                                                (df['hour'] < peak_end))]
+
+    df = df['price'].resample(granularity).mean()
+    df.index = df.index.date
+    return df.loc[start_date: end_date]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def prices(start_date: dt.date, end_date: dt.date, nodes: int, timezone: str, rng: np.random.RandomState) \
+        -> pd.DataFrame:
+    start = pd.Timestamp(start_date).tz_localize(timezone)
+    end = pd.Timestamp(end_date + dt.timedelta(days=1)).tz_localize(timezone)
+    index = pd.date_range(start, end, freq='5min', closed='left').tz_convert('UTC')
+    df = pd.DataFrame(30 + rng.normal(size=(len(index), nodes)).cumsum(axis=0) / 10, index=index)
+
+    # Gaps of a few intervals in some nodes
+    for _ in range(nodes):
+        i = rng.randint(len(index) - 10)
+        df.iloc[i:i + rng.randint(1, 10), rng.randint(nodes)] = np.nan
+    return df
+
+
+def run(iso: str, start_date: dt.date, end_date: dt.date, nodes: int, rng: np.random.RandomState):
+    calendar = get_bucket_calendar(iso)
+    peak_start, peak_end = calendar.peak_hours
+    panel = prices(start_date, end_date, nodes, calendar.timezone, rng)
+
+    for bucket in ('7x24', 'peak', 'offpeak', '7x8', '2x16h'):
+        for granularity in ('D', 'M'):
+            def legacy():
+                return [legacy_bucketize(panel[[c]].dropna().rename(columns={c: 'price'}), bucket, granularity,
+                                         start_date, end_date, calendar.timezone, peak_start, peak_end,
+                                         list(calendar.weekends)) for c in panel.columns]
+
+            expected, before = timed(legacy)
+            actual, after = timed(calendar.bucketize, panel, bucket, granularity, start_date, end_date)
+            for column, series in zip(panel.columns, expected):
+                pd.testing.assert_series_equal(actual[column].dropna(), series.dropna(), check_names=False)
+
+            print('{:<6} nodes={:>4} points={:>7} {:<8} {} before={:>9.1f}ms after={:>7.1f}ms speedup={:>6.1f}x'
+                  .format(iso, nodes, len(panel), bucket, granularity, before * 1000, after * 1000, before / after))
+
+
+if __name__ == '__main__':
+    warnings.simplefilter('ignore')
+    rng = np.random.RandomState(42)
+
+    run('PJM', dt.date(2017, 1, 1), dt.date(2019, 12, 31), 1, rng)
+    run('CAISO', dt.date(2019, 1, 1), dt.date(2019, 12, 31), 100, rng)
@@ -0,0 +1,94 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+Benchmark of date_range, which was a generator calling business_day_offset for each date, and of the array variants of
+the business day helpers against calling them for each date.
+
+Run from the repository root with: python -m benchmarks.bench_date_range
+"""
+import datetime as dt
+import time
+
+import numpy as np
+
+from gs_quant.datetime.date import business_day_count, business_day_count_array, business_day_offset, \
+    business_day_offset_array, date_range, is_business_day, is_business_day_array
+
+
+def legacy_date_range(begin, end, calendars=(), week_mask=None):
+    if isinstance(begin, dt.date):
+        if isinstance(end, dt.date):
+            def f():
+                prev = begin
+                if prev > end:
+                    raise ValueError('begin must be <= end')
+
+                while prev <= end:
+                    yield prev
+                    prev = business_day_offset(prev, 1, calendars=calendars, week_mask=week_mask)
+
+            return (d for d in f())
+        return (business_day_offset(begin, i, calendars=calendars, week_mask=week_mask) for i in range(end))
+    return (business_day_offset(end, -i, roll='preceding', calendars=calendars, week_mask=week_mask)
+            for i in range(begin))
+
+
+def timed(fn, *args, number: int = 3):
+    start = time.perf_counter()
+    for _ in range(number):
+        result = fn(*args)
+    return result, (time.perf_counter() - start) / number
+
+
+def report(name: str, size: int, before: float, after: float):
+    print('{:<44} dates={:>6} before={:>9.2f}ms after={:>7.3f}ms speedup={:>7.1f}x'.format(
+        name, size, before * 1000, after * 1000, before / after))
+
+
+def run_date_range(name: str, begin, end):
+    expected, before = timed(lambda: tuple(legacy_date_range(begin, end)))
+    actual, after = timed(lambda: date_range(begin, end))
+    assert tuple(actual) == expected
+    report(name, len(expected), before, after)
+
+    _, materialised = timed(lambda: tuple(date_range(begin, end)))
+    report(name + ' (as tuple)', len(expected), before, materialised)
+
+
+def run_helpers(dates: np.ndarray):
+    objects = dates.astype(dt.date)
+
+    expected, before = timed(lambda: [is_business_day(d) for d in objects])
+    actual, after = timed(is_business_day_array, dates)
+    assert actual.tolist() == expected
+    report('is_business_day', len(dates), before, after)
+
+    expected, before = timed(lambda: [business_day_offset(d, 5, roll='forward') for d in objects])
+    actual, after = timed(business_day_offset_array, dates, 5, 'forward')
+    assert actual.astype(dt.date).tolist() == expected
+    report('business_day_offset', len(dates), before, after)
+
+    expected, before = timed(lambda: [business_day_count(d, d + dt.timedelta(days=30)) for d in objects])
+    actual, after = timed(business_day_count_array, dates, dates + 30)
+    assert actual.tolist() == expected
+    report('business_day_count', len(dates), before, after)
+
+
+if __name__ == '__main__':
+    today = dt.date(2019, 12, 31)
+    run_date_range('date_range(date, date), 10 years', dt.date(2010, 1, 4), today)
+    run_date_range('date_range(date, int)', dt.date(2010, 1, 4), 2610)
+    run_date_range('date_range(int, date)', 2610, today)
+
+    run_helpers(np.arange('2010-01-01', '2020-01-01', dtype='datetime64[D]'))
@@ -0,0 +1,80 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+Benchmark of many concurrent users, each pricing a few trades in its own PricingContext, with each context sending its
+own requests against a shared RequestDispatcher. The risk service is simulated with a fixed latency per request and a
+cost per position and measure, and serves a limited number of requests at a time.
+
+Run from the repository root with: python -m benchmarks.bench_dispatcher
+"""
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from unittest import mock
+
+from gs_quant.api.gs.risk import GsRiskApi
+from gs_quant.instrument import IRSwap
+from gs_quant.markets import PricingContext, RequestDispatcher
+from gs_quant.risk import RiskRequest
+from gs_quant.session import Environment, GsSession, OAuth2Session
+
+REQUEST_LATENCY = 0.05
+CELL_LATENCY = 0.00002
+SERVICE_CAPACITY = threading.Semaphore(16)
+
+
+def simulated_exec(request: RiskRequest):
+    with SERVICE_CAPACITY:
+        time.sleep(REQUEST_LATENCY + CELL_LATENCY * len(request.positions) * len(request.measures))
+    return [[[{'value': 1.0}] for _ in request.positions] for _ in request.measures]
+
+
+def run(users: int, trades: int = 3):
+    session = GsSession.current
+    books = [[IRSwap('Pay', '{}y'.format(1 + (u + t) % 30), 'USD', fixed_rate=0.0001 * (u * trades + t))
+              for t in range(trades)] for u in range(users)]
+
+    def price(book):
+        with session, PricingContext():
+            futures = [i.dollar_price() for i in book]
+        return [f.result() for f in futures]
+
+    def timed(dispatcher):
+        PricingContext.set_dispatcher(dispatcher)
+        try:
+            with mock.patch.object(GsRiskApi, '_exec', side_effect=simulated_exec) as exec_mock, \
+                    ThreadPoolExecutor(max_workers=64) as executor:
+                start = time.perf_counter()
+                results = list(executor.map(price, books))
+                elapsed = time.perf_counter() - start
+        finally:
+            PricingContext.set_dispatcher(None)
+            if dispatcher:
+                dispatcher.shutdown()
+
+        assert all(r == [1.0] * trades for r in results)
+        return exec_mock.call_count, elapsed
+
+    before_requests, before = timed(None)
+    after_requests, after = timed(RequestDispatcher(max_latency=0.005, max_positions=500))
+    print('{:>5} users of {} trades: requests {:>5} -> {:>3}, before={:>8.1f}ms after={:>7.1f}ms speedup={:>5.1f}x'
+          .format(users, trades, before_requests, after_requests, before * 1000, after * 1000, before / after))
+
+
+if __name__ == '__main__':
+    OAuth2Session.init = mock.MagicMock(return_value=None)
+    GsSession.use(Environment.QA, 'client_id', 'secret')
+
+    for users in (50, 200, 1000):
+        run(users)
@@ -0,0 +1,158 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+Benchmark of decoding generated classes from API payloads: the per-class schema used by from_dict() against the
+previous implementation, which resolved property types, names and required args by reflection on every object.
+
+Run from the repository root with: python -m benchmarks.bench_from_dict
+"""
+import copy
+import datetime as dt
+import keyword
+import re
+import timeit
+from inspect import signature, Parameter
+
+import dateutil
+import inflection
+
+from gs_quant.base import Base, EnumBase, get_enum_value
+from gs_quant.target.assets import Asset
+from gs_quant.target.common import PositionSet
+
+
+def legacy_from_dict(cls, values: dict) -> Base:
+    """The previous implementation of Base._from_dict"""
+    args = [k for k, v in signature(cls.__init__).parameters.items() if k != 'kwargs'
+            and v.default == Parameter.empty][1:]
+    required = {}
+
+    for arg in args:
+        prop_name = arg[:-1] if arg.endswith('_') and not keyword.iskeyword(arg) else arg
+        prop_type = cls.prop_type(prop_name)
+        value = values.pop(arg, None)
+
+        if prop_type:
+            if issubclass(prop_type, Base):
+                if isinstance(value, dict):
+                    value = legacy_from_dict(prop_type, value)
+            elif issubclass(prop_type, EnumBase):
+                value = get_enum_value(prop_type, value)
+
+        required[arg] = value
+
+    instance = cls(**required)
+
+    for prop in instance.properties():
+        prop_value = values.get(prop, values.get(inflection.camelize(prop, uppercase_first_letter=False)))
+
+        if prop_value is not None:
+            prop_type = instance.prop_type(prop)
+
+            if prop_type is None:
+                setattr(instance, prop, prop_value)
+            elif issubclass(prop_type, dt.datetime):
+                if isinstance(prop_value, int):
+                    setattr(instance, prop, dt.datetime.fromtimestamp(prop_value / 1000).isoformat())
+                else:
+                    matcher = re.search(r'\.([0-9]*)Z$', prop_value)
+                    if matcher:
+                        sub_seconds = matcher.group(1)
+                        if len(sub_seconds) > 6:
+                            prop_value = re.sub(matcher.re, '.{}Z'.format(sub_seconds[:6]), prop_value)
+                    setattr(instance, prop, dateutil.parser.isoparse(prop_value))
+            elif issubclass(prop_type, dt.date):
+                setattr(instance, prop, dateutil.parser.isoparse(prop_value).date())
+            elif issubclass(prop_type, EnumBase):
+                setattr(instance, prop, get_enum_value(prop_type, prop_value))
+            elif issubclass(prop_type, Base):
+                if isinstance(prop_value, Base):
+                    setattr(instance, prop, prop_value)
+                else:
+                    setattr(instance, prop, legacy_from_dict(prop_type, prop_value))
+            elif issubclass(prop_type, (list, tuple)):
+                item_type = instance.prop_item_type(prop)
+                item_args = [i for i in getattr(item_type, '__args__', ()) if isinstance(i, type)]
+                if item_args:
+                    item_type = next((a for a in item_args if issubclass(a, (Base, EnumBase))), item_args[-1])
+
+                if issubclass(item_type, Base):
+                    item_values = tuple(v if isinstance(v, (Base, EnumBase)) else legacy_from_dict(item_type, v)
+                                        for v in prop_value)
+                elif issubclass(item_type, EnumBase):
+                    item_values = tuple(get_enum_value(item_type, v) for v in prop_value)
+                else:
+                    item_values = tuple(prop_value)
+                setattr(instance, prop, item_values)
+            else:
+                setattr(instance, prop, prop_value)
+
+    return instance
+
+
+def asset_payload(i: int) -> dict:
+    """An /assets/query result"""
+    return {
+        'id': 'MA{:017d}'.format(i),
+        'assetClass': 'Equity',
+        'type': 'Single Stock',
+        'name': 'Asset {}'.format(i),
+        'currency': 'USD',
+        'region': 'Americas',
+        'exchange': 'NYSE',
+        'listed': True,
+        'liveDate': '2010-01-04',
+        'createdById': 'user',
+        'createdTime': '2019-05-01T10:11:12.123456789Z',
+        'lastUpdatedTime': '2019-06-01T10:11:12.000Z',
+        'identifiers': [{'type': 'Ticker', 'value': 'T{}'.format(i)}, {'type': 'BBID', 'value': 'T{} UN'.format(i)},
+                        {'type': 'RIC', 'value': 'T{}.N'.format(i)}],
+        'entitlements': {'view': ['internal', 'external'], 'edit': ['guid:1'], 'admin': ['guid:1']},
+        'people': {'portfolioManagers': ['guid:2']},
+        'tags': ['a', 'b'],
+        'assetStats': [{'lastUpdatedTime': '2019-06-01T10:11:12Z', 'period': '1y', 'type': 'Rolling',
+                        'stats': {'mean': 0.1}}]
+    }
+
+
+def position_set_payload(i: int) -> dict:
+    """A target.common PositionSet, as returned for index and portfolio compositions"""
+    return {
+        'id': 'PS{}'.format(i),
+        'positionDate': '2019-01-02',
+        'lastUpdateTime': '2019-01-02T08:00:00.000Z',
+        'divisor': 1.0,
+        'positions': [{'assetId': 'MA{:017d}'.format(j), 'quantity': float(j)} for j in range(20)]
+    }
+
+
+def run(name: str, cls, payload_fn, size: int, number: int = 3):
+    results = [payload_fn(i) for i in range(size)]
+
+    # Both implementations must agree before we time them
+    decode = cls._decoder()
+    assert tuple(legacy_from_dict(cls, copy.deepcopy(r)) for r in results) == \
+        tuple(decode(copy.deepcopy(r)) for r in results), 'decoded objects differ'
+
+    copies = [copy.deepcopy(results) for _ in range(2 * number)]
+    legacy = timeit.timeit(lambda: tuple(legacy_from_dict(cls, r) for r in copies.pop()), number=number) / number
+    schema = timeit.timeit(lambda: tuple(decode(r) for r in copies.pop()), number=number) / number
+
+    print('{:<20} objects={:>7} legacy={:>9.1f}ms schema={:>8.1f}ms speedup={:>6.1f}x'.format(
+        name, size, legacy * 1000, schema * 1000, legacy / schema))
+
+
+if __name__ == '__main__':
+    run('Asset', Asset, asset_payload, 2000)
+    run('PositionSet', PositionSet, position_set_payload, 500)
@@ -0,0 +1,78 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+Benchmark of the first use of calendars of several exchanges in a new process, with a simulated query latency, against
+the previous implementation, which queried the holidays of each exchange separately.
+
+Run from the repository root with: python -m benchmarks.bench_holiday_store
+"""
+import tempfile
+import time
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from gs_quant.data import Dataset
+from gs_quant.datetime import GsCalendar, HolidayStore
+
+LATENCY = 0.1
+EXCHANGES = ('NYSE', 'LSE', 'TSE', 'HKEX', 'EUREX', 'ASX', 'TSX', 'SIX')
+DATES = pd.bdate_range('1952-01-01', '2052-12-31')
+
+
+def get_data(_self, exchange, start, end):
+    time.sleep(LATENCY)
+    exchanges = (exchange,) if isinstance(exchange, str) else exchange
+    rows = [(d, e) for e in exchanges for d in DATES[EXCHANGES.index(e)::250]]
+    return pd.DataFrame({'exchange': [e for _, e in rows]}, index=pd.DatetimeIndex([d for d, _ in rows]))
+
+
+def legacy_holidays(calendars) -> set:
+    holidays = set()
+    dataset = Dataset(Dataset.GS.HOLIDAY)
+    for holiday_id in calendars:
+        data = dataset.get_data(exchange=holiday_id, start=GsCalendar.DATE_LOW_LIMIT, end=GsCalendar.DATE_HIGH_LIMIT)
+        if not data.empty:
+            holidays.update(data.index.values.astype('datetime64[D]'))
+    return holidays
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def calendars(store: HolidayStore) -> list:
+    GsCalendar.set_holiday_store(store)
+    GsCalendar.prefetch(EXCHANGES)
+    return [GsCalendar.get(e).business_day_calendar() for e in EXCHANGES]
+
+
+if __name__ == '__main__':
+    with mock.patch.object(Dataset, 'get_data', autospec=True, side_effect=get_data), \
+            tempfile.TemporaryDirectory() as path:
+        expected, before = timed(lambda: [np.busdaycalendar(holidays=tuple(legacy_holidays((e,)))) for e in EXCHANGES])
+        actual, cold = timed(lambda: calendars(HolidayStore(path)))
+        for a, e in zip(actual, expected):
+            assert (a.holidays == e.holidays).all()
+
+        # A new process, whose store is read from the file written by the last
+        actual, warm = timed(lambda: calendars(HolidayStore(path)))
+        for a, e in zip(actual, expected):
+            assert (a.holidays == e.holidays).all()
+
+    print('{} exchanges, {:.0f}ms per query: before={:.1f}ms first process={:.1f}ms later processes={:.1f}ms'.format(
+        len(EXCHANGES), LATENCY * 1000, before * 1000, cold * 1000, warm * 1000))
@@ -0,0 +1,90 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+Benchmark of step interpolation (interpolate with Interpolate.STEP, and value) over daily and intraday series against
+the previous implementation, which filled missing values one at a time.
+
+Run from the repository root with: python -m benchmarks.bench_interpolate_step
+"""
+import datetime as dt
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from gs_quant.timeseries import Interpolate, interpolate, value
+
+
+def legacy_interpolate_step(x: pd.Series, dates: pd.Series = None) -> pd.Series:
+    first_date = pd.Timestamp(dates.index[0]) if isinstance(x.index[0], pd.Timestamp) else dates.index[0]
+    prev = x.index[0] if first_date < x.index[0] else x.index[x.index.get_indexer([first_date], method='pad')[0]]
+    current = x[prev]
+    curve = x.align(dates, 'right', )[0]
+
+    for knot in curve.items():
+        if np.isnan(knot[1]):
+            curve[knot[0]] = current
+        else:
+            current = knot[1]
+    return curve
+
+
+def legacy_interpolate(x: pd.Series, dates) -> pd.Series:
+    return legacy_interpolate_step(x, dates if isinstance(dates, pd.Series) else pd.Series(np.nan, dates))
+
+
+def series(index, rng: np.random.RandomState, nans: bool = True) -> pd.Series:
+    levels = 100 + np.cumsum(rng.normal(size=len(index)))
+    if nans:
+        levels[rng.choice(len(index), len(index) // 20, replace=False)] = np.nan
+    return pd.Series(levels, index=index)
+
+
+def timed(fn, *args, number: int = 1):
+    start = time.perf_counter()
+    for _ in range(number):
+        result = fn(*args)
+    return result, (time.perf_counter() - start) / number
+
+
+def run(name: str, x: pd.Series, dates, number: int = 1):
+    expected, before = timed(legacy_interpolate, x, dates, number=number)
+    actual, after = timed(interpolate, x, dates, Interpolate.STEP, number=number)
+    pd.testing.assert_series_equal(actual, expected)
+
+    print('{:<24} points={:>8} dates={:>8} before={:>9.2f}ms after={:>8.2f}ms speedup={:>7.1f}x'.format(
+        name, len(x), len(dates), before * 1000, after * 1000, before / after))
+
+
+if __name__ == '__main__':
+    warnings.simplefilter('ignore')
+    rng = np.random.RandomState(42)
+
+    daily = series(pd.bdate_range('2000-01-03', periods=5000), rng)
+    run('daily', daily, series(pd.date_range('1999-12-01', periods=7500), rng))
+
+    intraday = series(pd.date_range('2019-01-02 09:30', periods=200000, freq='s'), rng)
+    run('intraday', intraday, series(pd.date_range('2019-01-02 09:30', periods=100000, freq='2s'), rng))
+
+    # Requested dates which mostly do not coincide with the series' own
+    offset = intraday.index + pd.Timedelta(milliseconds=500)
+    run('intraday mismatched', intraday, list(offset[rng.choice(len(offset), 50000, replace=False)].sort_values()))
+    run('daily mismatched', daily, [d.date() for d in pd.date_range('1999-06-01', periods=2000, freq='W')])
+
+    day = series([dt.date(2019, 1, 1) + dt.timedelta(days=i) for i in range(5000)], rng, nans=False)
+    _, before = timed(lambda: legacy_interpolate(day, [dt.date(2025, 6, 1)]).get(0), number=100)
+    _, after = timed(lambda: value(day, dt.date(2025, 6, 1)), number=100)
+    print('{:<24} points={:>8} dates={:>8} before={:>9.2f}ms after={:>8.2f}ms speedup={:>7.1f}x'.format(
+        'value', len(day), 1, before * 1000, after * 1000, before / after))
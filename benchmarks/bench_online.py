@@ -0,0 +1,63 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+Benchmark of appending one observation to 10 years of daily history: recomputing the batch function over the whole
+history against updating its online counterpart.
+
+Run from the repository root with: python -m benchmarks.bench_online
+"""
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import gs_quant.timeseries as ts
+from gs_quant.timeseries import Window
+from gs_quant.timeseries.online import OnlineBeta, OnlineMaxDrawdown, OnlineMovingAverage, OnlineStd, \
+    OnlineVolatility
+
+
+def run(name: str, batch, online, *history: pd.Series, new: int = 200):
+    # The last observations arrive one at a time, after initialising from the rest of the history
+    initial = [h[:-new] for h in history]
+    online.extend(*initial)
+
+    start = time.perf_counter()
+    for i in range(len(history[0]) - new, len(history[0])):
+        expected = batch(*(h[:i + 1] for h in history)).iloc[-1]
+    before = (time.perf_counter() - start) / new
+
+    start = time.perf_counter()
+    for i in range(len(history[0]) - new, len(history[0])):
+        actual = online.update(history[0].index[i], *(h.iloc[i] for h in history))
+    after = (time.perf_counter() - start) / new
+
+    assert actual == expected or (np.isnan(actual) and np.isnan(expected))
+    print('{:<20} history={:>6} before={:>9.3f}ms after={:>8.4f}ms speedup={:>8.1f}x'.format(
+        name, len(history[0]), before * 1000, after * 1000, before / after))
+
+
+if __name__ == '__main__':
+    warnings.simplefilter('ignore')
+    rng = np.random.RandomState(42)
+    index = pd.bdate_range('2010-01-04', periods=2610)
+    x = pd.Series(100 + np.cumsum(rng.normal(size=len(index))), index=index)
+    b = pd.Series(100 + np.cumsum(rng.normal(size=len(index))), index=index)
+
+    run('volatility', lambda s: ts.volatility(s, 22), OnlineVolatility(22), x)
+    run('moving_average', lambda s: ts.moving_average(s, 22), OnlineMovingAverage(22), x)
+    run('std', lambda s: ts.std(s, 22), OnlineStd(22), x)
+    run('max_drawdown', lambda s: ts.max_drawdown(s, Window(252, 0)), OnlineMaxDrawdown(Window(252, 0)), x)
+    run('beta', lambda s, t: ts.beta(s, t, 22), OnlineBeta(22), x, b)
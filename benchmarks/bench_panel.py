@@ -0,0 +1,63 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+Benchmark of timeseries functions over a panel of 3,000 daily price series: one call per series against one call on
+the panel.
+
+Run from the repository root with: python -m benchmarks.bench_panel
+"""
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from gs_quant.timeseries import Window, beta, max_drawdown, moving_average, returns, volatility, zscores
+
+CASES = (
+    ('returns', returns, ()),
+    ('volatility', volatility, (Window(22, 0),)),
+    ('zscores', zscores, (Window(22, 0),)),
+    ('beta', beta, ('benchmark', Window(66, 0))),
+    ('max_drawdown', max_drawdown, (Window(252, 0),)),
+    ('moving_average', moving_average, (Window(22, 0),)),
+)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run(num_series: int, num_dates: int):
+    rng = np.random.RandomState(42)
+    dates = pd.bdate_range('2010-01-01', periods=num_dates)
+    panel = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(scale=0.01, size=(num_dates, num_series)), axis=0)),
+                         index=dates, columns=['E{}'.format(i) for i in range(num_series)])
+    benchmark = panel.mean(axis=1)
+
+    for name, fn, args in CASES:
+        args = tuple(benchmark if a == 'benchmark' else a for a in args)
+        expected, before = timed(lambda: pd.concat({c: fn(panel[c], *args) for c in panel.columns}, axis=1))
+        actual, after = timed(lambda: fn(panel, *args))
+        pd.testing.assert_frame_equal(actual, expected, check_names=False)
+
+        print('{:<16} series={:>6} dates={:>6} per series={:>9.2f}ms panel={:>8.2f}ms speedup={:>7.1f}x'.format(
+            name, num_series, num_dates, before * 1000, after * 1000, before / after))
+
+
+if __name__ == '__main__':
+    warnings.simplefilter('ignore')
+    run(3000, 2520)
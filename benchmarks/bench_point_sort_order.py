@@ -0,0 +1,57 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+Benchmark of point_sort_order over typical IR and FX curve points: uncached parsing against the memoised scalar
+function and the bulk point_sort_orders.
+
+Run from the repository root with: python -m benchmarks.bench_point_sort_order
+"""
+import datetime as dt
+import timeit
+
+import numpy as np
+
+import gs_quant.datetime.point as point
+from gs_quant.datetime import point_sort_order, point_sort_orders
+
+IR_POINTS = ('o/n', 't/n', '1w', '2w', '1m', '2m', '3m', '6m', '9m', '1y', '18m', '2y', '3y', '4y', '5y', '6y', '7y',
+             '8y', '9y', '10y', '12y', '15y', '20y', '25y', '30y', '40y', '50y', 'Dec20', 'Mar21', 'Jun21', 'Sep21',
+             'FRA3x6', '3x3', '10Y;3M', '5Y;1Y', 'QE1-2020', '01Jan20', 'JAN2021')
+FX_POINTS = ('Spot', '1w XC', '1m XC', '3m XC', '-1f XC', 'ON GC', 'TN GC', '1 Week GC', '1 week', 'H21', 'FFK9',
+             '9JAN2021', '1.1y')
+REF_DATE = dt.date(2019, 1, 1)
+
+# The parsing behind point_sort_order, without memoisation
+uncached_point_sort_order = getattr(point, '__point_sort_order').__wrapped__
+
+
+def run(name: str, size: int, number: int = 5):
+    rng = np.random.RandomState(42)
+    points = rng.choice(np.array(IR_POINTS + FX_POINTS, dtype=object), size)
+
+    expected = np.array([uncached_point_sort_order(p, REF_DATE) for p in points], dtype=float)
+    assert np.array_equal(point_sort_orders(points, REF_DATE), expected, equal_nan=True), 'bulk orders differ'
+
+    uncached = timeit.timeit(lambda: [uncached_point_sort_order(p, REF_DATE) for p in points], number=number) / number
+    cached = timeit.timeit(lambda: [point_sort_order(p, REF_DATE) for p in points], number=number) / number
+    bulk = timeit.timeit(lambda: point_sort_orders(points, REF_DATE), number=number) / number
+
+    print('{:<20} points={:>8} uncached={:>9.2f}ms cached={:>8.2f}ms bulk={:>8.2f}ms speedup={:>7.1f}x'.format(
+        name, size, uncached * 1000, cached * 1000, bulk * 1000, uncached / bulk))
+
+
+if __name__ == '__main__':
+    run('curve', len(IR_POINTS) + len(FX_POINTS))
+    run('risk result', 10000)
+    run('large risk result', 1000000, number=1)
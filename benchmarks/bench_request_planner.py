@@ -0,0 +1,72 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+Benchmark of pricing a mixed book, whose instruments ask for different sets of measures, with each distinct set of
+measures sent in its own requests (as by default) against the merged requests of RequestPlanner. The
+risk service is simulated with a fixed latency per request and a cost per position and measure.
+
+Run from the repository root with: python -m benchmarks.bench_request_planner
+"""
+import itertools
+import time
+from typing import Optional
+from unittest import mock
+
+from gs_quant.api.gs.risk import GsRiskApi
+from gs_quant.instrument import IRSwap
+from gs_quant.markets import PricingContext, RequestPlanner
+from gs_quant.risk import IRAnnualImpliedVol, IRDelta, IRDeltaParallel, IRFwdRate, IRSpotRate, \
+    IRVegaParallel, RiskRequest
+
+REQUEST_LATENCY = 0.05
+CELL_LATENCY = 0.0002
+MEASURES = (IRDeltaParallel, IRVegaParallel, IRSpotRate, IRFwdRate, IRAnnualImpliedVol, IRDelta)
+
+
+def simulated_exec(request: RiskRequest):
+    time.sleep(REQUEST_LATENCY + CELL_LATENCY * len(request.positions) * len(request.measures))
+    return [[[{'value': 1.0}] for _ in request.positions] for _ in request.measures]
+
+
+def price_book(instruments, planner: Optional[RequestPlanner]):
+    with mock.patch.object(GsRiskApi, '_exec', side_effect=simulated_exec) as exec_mock:
+        start = time.perf_counter()
+        with PricingContext(request_planner=planner):
+            futures = [i.dollar_price() for i in instruments]
+            # Each instrument also asks for one or two of the other measures
+            for idx, (instrument, combination) in enumerate(zip(instruments, itertools.cycle(
+                    itertools.combinations(MEASURES, 2)))):
+                futures.append(instrument.calc(combination[:1 + idx % 2]))
+
+        elapsed = time.perf_counter() - start
+        assert all(f.result() is not None for f in futures)
+        return exec_mock.call_count, elapsed
+
+
+def run(size: int):
+    instruments = [IRSwap('Pay', '{}y'.format(1 + i % 30), 'USD', fixed_rate=0.0001 * i) for i in range(size)]
+    before_requests, before = price_book(instruments, None)
+    after_requests, after = price_book(instruments, RequestPlanner(request_cost=REQUEST_LATENCY / CELL_LATENCY))
+    print('mixed book of {:>5} instruments: requests {:>3} -> {:>3}, before={:>8.1f}ms after={:>8.1f}ms '
+          'speedup={:>5.1f}x'.format(size, before_requests, after_requests, before * 1000, after * 1000,
+                                     before / after))
+
+
+if __name__ == '__main__':
+    from gs_quant.session import Environment, GsSession, OAuth2Session
+    OAuth2Session.init = mock.MagicMock(return_value=None)
+    GsSession.use(Environment.QA, 'client_id', 'secret')
+
+    for size in (30, 100, 300):
+        run(size)
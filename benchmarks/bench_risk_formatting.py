@@ -0,0 +1,112 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+Benchmark of risk result formatting: the columnar structured_formatter and sort_risk against the previous
+row-by-row implementation.
+
+Run from the repository root with: python -m benchmarks.bench_risk_formatting
+"""
+import copy
+import datetime as dt
+import timeit
+
+import dateutil
+import pandas as pd
+
+from gs_quant.datetime import point_sort_order
+from gs_quant.markets import HistoricalPricingContext, PricingContext
+from gs_quant.risk import sort_risk, structured_formatter
+
+POINTS = ('o/n', '1w', '2w', '1m', '2m', '3m', '6m', '9m', '1y', '18m', '2y', '3y', '4y', '5y', '6y', '7y', '8y',
+          '9y', '10y', '12y', '15y', '20y', '25y', '30y', '40y', '50y', 'Dec20', 'Mar21', 'Jun21', 'Sep21')
+ASSETS = ('USD', 'EUR', 'GBP', 'JPY', 'CHF')
+
+
+def row_formatter(result, historical: bool) -> pd.DataFrame:
+    """The previous implementation: flatten and mutate each row dict, then sort with a Python key"""
+    def flatten(item):
+        rows = []
+        for elem in item:
+            if isinstance(elem, (list, tuple)):
+                rows.extend(flatten(elem))
+            else:
+                excluded_fields = ['calculationTime', 'queueingTime']
+                if not historical:
+                    excluded_fields.append('date')
+                else:
+                    date = elem.get('date')
+                    if date is not None:
+                        elem['date'] = dateutil.parser.isoparse(date).date()
+
+                for field in excluded_fields:
+                    if field in elem:
+                        elem.pop(field)
+
+                rows.append(elem)
+
+        return rows
+
+    df = pd.DataFrame.from_records(flatten(result))
+    by = ('date', 'time', 'marketDataType', 'assetId', 'pointClass', 'point')
+    columns = tuple(df.columns)
+    indices = [columns.index(c) if c in columns else -1 for c in by]
+    fns = [point_sort_order if c == 'point' else None for c in columns]
+
+    def cmp(row) -> tuple:
+        return tuple(fns[i](row[i]) if fns[i] else row[i] for i in indices if i != -1)
+
+    data = sorted((tuple(r)[1:] for r in df.to_records()), key=cmp)
+    fields = [f for f in by if f in columns]
+    fields.extend(f for f in columns if f not in fields)
+
+    result = pd.DataFrame.from_records(data, columns=columns)[fields]
+    if 'date' in result:
+        result = result.set_index('date')
+
+    return result
+
+
+def ir_delta_result(num_dates: int) -> list:
+    start = dt.date(2019, 1, 1)
+    dates = [(start + dt.timedelta(days=i)).isoformat() for i in range(num_dates)]
+    return [[{'date': d, 'marketDataType': 'IR', 'assetId': a, 'pointClass': 'Swap', 'point': p, 'value': 0.01 * i,
+              'calculationTime': 10, 'queueingTime': 1}
+             for d in reversed(dates) for a in ASSETS for i, p in enumerate(reversed(POINTS))]]
+
+
+def run(name: str, context_fn, num_dates: int, historical: bool, number: int = 5):
+    result = ir_delta_result(num_dates)
+
+    with context_fn():
+        # Both implementations must agree before we time them
+        expected = row_formatter(copy.deepcopy(result), historical)
+        actual = structured_formatter(copy.deepcopy(result))
+        assert actual.equals(expected), 'columnar and row formatting differ'
+
+        copies = [copy.deepcopy(result) for _ in range(2 * number)]
+        row = timeit.timeit(lambda: row_formatter(copies.pop(), historical), number=number) / number
+        columnar = timeit.timeit(lambda: structured_formatter(copies.pop()), number=number) / number
+
+    df = pd.DataFrame(result[0]).drop(columns=['calculationTime', 'queueingTime', 'date']).sample(frac=1)
+    sort = timeit.timeit(lambda: sort_risk(df), number=number) / number
+
+    print('{:<40} rows={:>7} row={:>9.1f}ms columnar={:>8.1f}ms speedup={:>6.1f}x sort_risk={:>7.1f}ms'.format(
+        name, len(result[0]), row * 1000, columnar * 1000, row / columnar, sort * 1000))
+
+
+if __name__ == '__main__':
+    run('IRDelta', PricingContext, 1, False)
+    run('IRDelta, 20 dates', lambda: HistoricalPricingContext(dates=[dt.date(2019, 1, 1)]), 20, True)
+    run('IRDelta, 250 dates', lambda: HistoricalPricingContext(dates=[dt.date(2019, 1, 1)]), 250, True, number=2)
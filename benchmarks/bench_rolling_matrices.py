@@ -0,0 +1,66 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+Benchmark of rolling correlation and co-variance matrices of a panel against computing each pair of series with
+correlation and cov.
+
+Run from the repository root with: python -m benchmarks.bench_rolling_matrices
+"""
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from gs_quant.timeseries import Window, correlation, correlation_matrix, cov, covariance_matrix
+
+
+def pairwise(fn, panel: pd.DataFrame, w: Window) -> np.ndarray:
+    result = np.empty((len(panel), panel.shape[1], panel.shape[1]))
+    for i in range(panel.shape[1]):
+        for j in range(i, panel.shape[1]):
+            result[:, i, j] = result[:, j, i] = fn(panel.iloc[:, i], panel.iloc[:, j], w).values
+    return result
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run(name: str, pair_fn, matrix_fn, panel: pd.DataFrame, w: Window):
+    expected, before = timed(pairwise, pair_fn, panel, w)
+    actual, after = timed(matrix_fn, panel, w)
+    assert np.allclose(actual.values.reshape(expected.shape), expected, rtol=1e-6, atol=1e-10, equal_nan=True)
+
+    latest, latest_time = timed(matrix_fn, panel, w, latest=True)
+    assert np.allclose(latest.values, expected[-1], rtol=1e-6, atol=1e-10, equal_nan=True)
+
+    print('{:<14} dates={:>5} series={:>4} before={:>9.2f}s after={:>7.2f}s speedup={:>6.1f}x latest={:>7.1f}ms'
+          .format(name, len(panel), panel.shape[1], before, after, before / after, latest_time * 1000))
+
+
+if __name__ == '__main__':
+    warnings.simplefilter('ignore')
+    rng = np.random.RandomState(42)
+    index = pd.bdate_range('2010-01-04', periods=2610)
+
+    for columns in (20, 100):
+        prices = pd.DataFrame(100 + np.cumsum(rng.normal(size=(len(index), columns)), axis=0), index=index)
+        run('correlation', correlation, correlation_matrix, prices, Window(22, 0))
+
+        returns = prices.pct_change()
+        returns[returns.abs() > 0.05] = np.nan
+        run('cov', cov, covariance_matrix, returns, Window(66, 0))
@@ -0,0 +1,85 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+Benchmark of the rolling percentiles and mode of daily series against their previous implementations, which
+computed scipy's percentileofscore and mode once per window.
+
+Run from the repository root with: python -m benchmarks.bench_rolling_order_statistics
+"""
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import scipy.stats.mstats as stats
+from scipy.stats import percentileofscore
+
+from gs_quant.timeseries import Window, mode, percentiles
+from gs_quant.timeseries.helper import apply_ramp, normalize_window
+
+
+def legacy_percentiles(x: pd.Series, y: pd.Series = None, w=Window(None, 0)) -> pd.Series:
+    w = normalize_window(x, w)
+    if x.empty:
+        return x
+
+    if y is None:
+        y = x.copy()
+
+    res = pd.Series(dtype=float)
+    for idx, val in y.items():
+        sample = x[:idx][-w.w:]
+        res.loc[idx] = percentileofscore(sample, val, kind='mean')
+
+    return apply_ramp(res, w)
+
+
+def legacy_mode(x: pd.Series, w=Window(None, 0)) -> pd.Series:
+    w = normalize_window(x, w)
+    return apply_ramp(x.rolling(w.w, 0).apply(lambda y: stats.mode(y).mode, raw=True), w)
+
+
+def series(size: int, rng: np.random.RandomState) -> pd.Series:
+    # Prices rounded to cents, so that values repeat within windows
+    levels = np.round(100 + np.cumsum(rng.normal(size=size)), 2)
+    levels[rng.choice(size, size // 100, replace=False)] = np.nan
+    return pd.Series(levels, index=pd.bdate_range('2000-01-03', periods=size))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run(name: str, size: int, w: Window):
+    rng = np.random.RandomState(42)
+    x = series(size, rng)
+    y = series(size, rng)
+
+    for label, fn, legacy, args in (('percentiles', percentiles, legacy_percentiles, (x, y, w)),
+                                    ('mode', mode, legacy_mode, (x, w))):
+        expected, before = timed(legacy, *args)
+        actual, after = timed(fn, *args)
+        np.testing.assert_allclose(actual.values, expected.values, rtol=1e-12, err_msg='{} differs'.format(label))
+
+        print('{:<20} {:<12} points={:>6} window={:>4} before={:>9.2f}ms after={:>8.2f}ms speedup={:>7.1f}x'.format(
+            name, label, size, w.w, before * 1000, after * 1000, before / after))
+
+
+if __name__ == '__main__':
+    warnings.simplefilter('ignore')
+    run('1y daily', 260, Window(22, 22))
+    run('10y daily', 2600, Window(252, 0))
+    run('10y daily expanding', 2600, Window(2600, 0))
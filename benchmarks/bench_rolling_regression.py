@@ -0,0 +1,71 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+Benchmark of rolling multi-factor regression of a panel of returns, against fitting each window from scratch by least
+squares (for all series of the panel at once).
+
+Run from the repository root with: python -m benchmarks.bench_rolling_regression
+"""
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from gs_quant.timeseries import rolling_regression
+
+
+def refit(y: pd.DataFrame, x: pd.DataFrame, w: int) -> np.ndarray:
+    # Coefficients, t-statistics and R-squared of each full window, fitted from scratch with an intercept
+    results = np.full((len(y), y.shape[1], 2 * x.shape[1] + 3), np.nan)
+    for i in range(w - 1, len(y)):
+        x_ = np.column_stack((np.ones(w), x.values[i - w + 1:i + 1]))
+        y_ = y.values[i - w + 1:i + 1]
+        coefficients = np.linalg.lstsq(x_, y_, rcond=None)[0]
+        residual = ((y_ - x_ @ coefficients) ** 2).sum(axis=0)
+        errors = np.sqrt(np.outer(np.diag(np.linalg.inv(x_.T @ x_)), residual / (w - x_.shape[1])))
+        total = ((y_ - y_.mean(axis=0)) ** 2).sum(axis=0)
+        results[i] = np.column_stack((coefficients.T, (coefficients / errors).T, 1 - residual / total))
+    return results
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run(dates: int, factors: int, series: int, w: int, rng: np.random.RandomState):
+    index = pd.bdate_range('2010-01-04', periods=dates)
+    x = pd.DataFrame(rng.normal(scale=0.01, size=(dates, factors)), index=index)
+    loadings = rng.normal(size=(factors, series))
+    y = pd.DataFrame(x.values @ loadings + rng.normal(scale=0.01, size=(dates, series)), index=index)
+
+    expected, before = timed(refit, y, x, w)
+    actual, after = timed(rolling_regression, y, x, w)
+    actual = actual.values.reshape(len(actual) // series, series, -1)
+    assert np.allclose(actual, expected[w:], rtol=1e-6, atol=1e-8)
+
+    print('dates={:>5} factors={:>3} series={:>5} window={:>4} before={:>9.1f}ms after={:>8.1f}ms speedup={:>6.1f}x'
+          .format(dates, factors, series, w, before * 1000, after * 1000, before / after))
+
+
+if __name__ == '__main__':
+    warnings.simplefilter('ignore')
+    rng = np.random.RandomState(42)
+
+    run(2610, 5, 1, 252, rng)
+    run(2610, 20, 1, 252, rng)
+    run(2610, 5, 500, 252, rng)
+    run(2610, 20, 500, 252, rng)
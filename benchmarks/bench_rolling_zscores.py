@@ -0,0 +1,67 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+Benchmark of rolling z-scores against the previous implementation, which called scipy.stats.zscore once per window.
+The previous implementation is only timed on the smaller series.
+
+Run from the repository root with: python -m benchmarks.bench_rolling_zscores
+"""
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import scipy.stats.mstats as stats
+
+from gs_quant.timeseries import Window, zscores
+from gs_quant.timeseries.helper import apply_ramp
+
+
+def _zscore(x):
+    if x.size == 1:
+        return 0
+
+    return stats.zscore(x, ddof=1)[-1]
+
+
+def legacy_zscores(x: pd.Series, w: Window) -> pd.Series:
+    return apply_ramp(x.rolling(w.w, 0).apply(_zscore, raw=False), w)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run(name: str, size: int, w: Window, legacy: bool = True):
+    rng = np.random.RandomState(42)
+    x = pd.Series(1000 + np.cumsum(rng.normal(size=size)), index=pd.date_range('2000-01-01', periods=size, freq='min'))
+    x[rng.choice(size, size // 1000, replace=False)] = np.nan
+
+    actual, after = timed(zscores, x, w)
+    if legacy:
+        expected, before = timed(legacy_zscores, x, w)
+        np.testing.assert_allclose(actual.values, expected.values, rtol=1e-9, atol=1e-12, err_msg='z-scores differ')
+        print('{:<12} points={:>8} window={:>5} before={:>9.2f}ms after={:>8.2f}ms speedup={:>7.1f}x'.format(
+            name, size, w.w, before * 1000, after * 1000, before / after))
+    else:
+        print('{:<12} points={:>8} window={:>5} after={:>8.2f}ms'.format(name, size, w.w, after * 1000))
+
+
+if __name__ == '__main__':
+    warnings.simplefilter('ignore')
+    for window in (Window(5, 0), Window(22, 22), Window(252, 0)):
+        run('10k', 10000, window)
+        run('1m', 1000000, window, legacy=False)
@@ -0,0 +1,95 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+Benchmark of add_tenors against the expiration dates of term structure measures, which were computed by parsing each
+tenor into a pandas DateOffset and adding it and a CustomBusinessDay to each date, and of the pricing date range, which
+built a CustomBusinessDay on each call.
+
+Run from the repository root with: python -m benchmarks.bench_tenor
+"""
+import datetime as dt
+import re
+import time
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.offsets import CustomBusinessDay
+
+from gs_quant.datetime import GsCalendar, add_tenors, relative_days_add
+from gs_quant.timeseries.measures import _range_from_pricing_date
+
+
+def legacy_to_offset(tenor: str) -> pd.DateOffset:
+    matcher = re.fullmatch('(\\d+)([dwmy])', tenor)
+    if not matcher:
+        raise ValueError('invalid tenor ' + tenor)
+    name = {'d': 'days', 'w': 'weeks', 'm': 'months', 'y': 'years'}[matcher.group(2)]
+    return pd.DateOffset(**{name: int(matcher.group(1))})
+
+
+def legacy_get_custom_bd(exchange):
+    return CustomBusinessDay(calendar=GsCalendar.get(exchange).business_day_calendar())
+
+
+def legacy_expiration_dates(df: pd.DataFrame, exchange) -> pd.Series:
+    cbd = legacy_get_custom_bd(exchange)
+    return df.index + df['tenor'].map(legacy_to_offset) + cbd - cbd
+
+
+def legacy_range_from_pricing_date(exchange, pricing_date):
+    today = pd.Timestamp.today().normalize()
+    matcher = re.fullmatch('(\\d+)b', pricing_date)
+    if matcher:
+        start = end = today - legacy_get_custom_bd(exchange) * int(matcher.group(1))
+    else:
+        end = today - dt.timedelta(days=relative_days_add(pricing_date, True))
+        start = end - legacy_get_custom_bd(exchange)
+    return start, end
+
+
+def timed(fn, *args, number: int = 3):
+    start = time.perf_counter()
+    for _ in range(number):
+        result = fn(*args)
+    return result, (time.perf_counter() - start) / number
+
+
+def report(name: str, size: int, before: float, after: float):
+    print('{:<44} size={:>7} before={:>9.2f}ms after={:>7.3f}ms speedup={:>7.1f}x'.format(
+        name, size, before * 1000, after * 1000, before / after))
+
+
+def run_expiration_dates(dates: int, tenors=('1w', '2w', '1m', '2m', '3m', '6m', '9m', '1y', '18m', '2y', '5y')):
+    index = pd.DatetimeIndex(np.repeat(pd.bdate_range('2010-01-01', periods=dates).values, len(tenors)))
+    df = pd.DataFrame({'tenor': np.tile(tenors, dates)}, index=index)
+
+    expected, before = timed(legacy_expiration_dates, df, ())
+    actual, after = timed(lambda: add_tenors(df.index, df['tenor'], 'preceding', ()))
+    assert (expected.values.astype('datetime64[D]') == actual).all()
+    report('expiration dates, {} dates'.format(dates), len(df), before, after)
+
+
+def run_pricing_date_range(calls: int = 1000):
+    pricing_dates = ('1b', '5b', '1m', '3m', '1y')
+    expected, before = timed(lambda: [legacy_range_from_pricing_date((), p) for p in pricing_dates * (calls // 5)])
+    actual, after = timed(lambda: [_range_from_pricing_date((), p) for p in pricing_dates * (calls // 5)])
+    assert actual == expected
+    report('_range_from_pricing_date', calls, before, after)
+
+
+if __name__ == '__main__':
+    run_expiration_dates(1)
+    run_expiration_dates(250)
+    run_expiration_dates(2500)
+    run_pricing_date_range()
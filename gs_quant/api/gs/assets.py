@@ -89,6 +89,18 @@ class GsAssetApi:
         response = GsSession.current._post('/assets/query', payload=query, cls=GsAsset)
         return response['results']
 
+    @classmethod
+    async def get_many_assets_async(
+            cls,
+            fields: IdList = None,
+            as_of: dt.datetime = None,
+            limit: int = 100,
+            **kwargs
+    ) -> Tuple[GsAsset, ...]:
+        query = cls.__create_query(fields, as_of, limit, **kwargs)
+        response = await GsSession.current._post_async('/assets/query', payload=query, cls=GsAsset)
+        return response['results']
+
     @classmethod
     def get_many_assets_data(
             cls,
@@ -174,6 +186,37 @@ class GsAssetApi:
             limit: int = None,
             **kwargs
     ) -> dict:
+        input_type, output_type, query = cls.__map_identifiers_query(input_type, output_type, ids, as_of, limit,
+                                                                     **kwargs)
+        results = GsSession.current._post('/assets/data/query', payload=query)
+        return cls.__map_identifiers_results(input_type, output_type, query, results, multimap)
+
+    @classmethod
+    async def map_identifiers_async(
+            cls,
+            input_type: Union[GsIdType, str],
+            output_type: Union[GsIdType, str],
+            ids: IdList,
+            as_of: dt.datetime = None,
+            multimap: bool = False,
+            limit: int = None,
+            **kwargs
+    ) -> dict:
+        input_type, output_type, query = cls.__map_identifiers_query(input_type, output_type, ids, as_of, limit,
+                                                                     **kwargs)
+        results = await GsSession.current._post_async('/assets/data/query', payload=query)
+        return cls.__map_identifiers_results(input_type, output_type, query, results, multimap)
+
+    @classmethod
+    def __map_identifiers_query(
+            cls,
+            input_type: Union[GsIdType, str],
+            output_type: Union[GsIdType, str],
+            ids: IdList,
+            as_of: dt.datetime,
+            limit: int,
+            **kwargs
+    ) -> Tuple[str, str, EntityQuery]:
         if isinstance(input_type, GsIdType):
             input_type = input_type.name
         elif not isinstance(input_type, str):
@@ -188,8 +231,17 @@ class GsAssetApi:
         the_args[input_type] = ids
 
         limit = limit or 4 * len(ids)
-        query = cls.__create_query((input_type, output_type), as_of, limit, **the_args)
-        results = GsSession.current._post('/assets/data/query', payload=query)
+        return input_type, output_type, cls.__create_query((input_type, output_type), as_of, limit, **the_args)
+
+    @classmethod
+    def __map_identifiers_results(
+            cls,
+            input_type: str,
+            output_type: str,
+            query: EntityQuery,
+            results: Union[dict, list],
+            multimap: bool
+    ) -> dict:
         if len(results) >= query.limit:
             raise MqValueError('number of results may have exceeded capacity')
 
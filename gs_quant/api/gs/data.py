@@ -13,6 +13,8 @@ KIND, either express or implied.  See the License for the
 specific language governing permissions and limitations
 under the License.
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import datetime as dt
 from enum import Enum
 from itertools import chain
@@ -56,6 +58,7 @@ class QueryType(Enum):
 
 class GsDataApi(DataApi):
     __definitions = {}
+    __sharding = {}
     DEFAULT_SCROLL = '30s'
 
     # DataApi interface
@@ -65,58 +68,185 @@ class GsDataApi(DataApi):
             -> Union[MDAPIDataBatchResponse, DataQueryResponse, tuple]:
         if query.marketDataCoordinates:
             # Don't use MDAPIDataBatchResponse for now - it doesn't handle quoting style correctly
-            results: Union[MDAPIDataBatchResponse, dict] = GsSession.current._post(
-                '/data/coordinates/query', payload=query)
-            if isinstance(results, dict):
-                return results.get('responses', ())
-            else:
-                return results.responses if results.responses is not None else ()
-        if query.where:
-            where = query.where.as_dict()
-            xref_keys = set(where.keys()).intersection(XRef.properties())
-            if xref_keys:
-                # Check that assetId is a symbol dimension of this data set. If not, we need to do a separate query
-                # to resolve xref --> assetId
-                if len(xref_keys) > 1:
-                    raise MqValueError('Cannot not specify more than one type of asset identifier')
-
-                definition = cls.get_definition(dataset_id)
-
-                sd = definition.dimensions.symbolDimensions
-                if definition.parameters.symbolStrategy == 'MDAPI' or ('assetId' not in sd and 'gsid' not in sd):
-                    xref_type = min(xref_keys)
-                    if asset_id_type is None:
-                        asset_id_type = xref_type
-
-                    xref_values = where[asset_id_type]
-                    xref_values = (xref_values,) if isinstance(xref_values, str) else xref_values
-                    asset_id_map = GsAssetApi.map_identifiers(xref_type, GsIdType.id, xref_values)
-
-                    if len(asset_id_map) != len(xref_values):
-                        raise MqValueError('Not all {} were resolved to asset Ids'.format(asset_id_type))
-
-                    setattr(query.where, xref_type, None)
-                    query.where.assetId = [asset_id_map[x] for x in xref_values]
-
-        results: Union[DataQueryResponse, dict] = GsSession.current._post('/data/{}/query'.format(dataset_id),
-                                                                          payload=query)
+            results = GsSession.current._post('/data/coordinates/query', payload=query)
+            return cls.__coordinates_results(results)
+
+        definition = cls.get_definition(dataset_id) if cls.__xref_keys(query) else None
+        xref_type, xref_values, asset_id_type = cls.__xrefs_to_resolve(query, definition, asset_id_type)
+        if xref_type:
+            asset_id_map = GsAssetApi.map_identifiers(xref_type, GsIdType.id, xref_values)
+            cls.__set_asset_ids(query, xref_type, xref_values, asset_id_type, asset_id_map)
+
+        results = cls.__query_shards(query, dataset_id)
+
+        asset_ids = cls.__asset_ids_to_resolve(results, asset_id_type)
+        if asset_ids:
+            xref_map = GsAssetApi.map_identifiers(GsIdType.id, asset_id_type, asset_ids)
+            cls.__set_xrefs(results, asset_ids, asset_id_type, xref_map)
+
+        return results
+
+    @classmethod
+    async def query_data_async(cls, query: DataQuery, dataset_id: str = None,
+                               asset_id_type: Union[GsIdType, str] = None) \
+            -> Union[MDAPIDataBatchResponse, DataQueryResponse, tuple]:
+        if query.marketDataCoordinates:
+            results = await GsSession.current._post_async('/data/coordinates/query', payload=query)
+            return cls.__coordinates_results(results)
+
+        definition = await cls.get_definition_async(dataset_id) if cls.__xref_keys(query) else None
+        xref_type, xref_values, asset_id_type = cls.__xrefs_to_resolve(query, definition, asset_id_type)
+        if xref_type:
+            asset_id_map = await GsAssetApi.map_identifiers_async(xref_type, GsIdType.id, xref_values)
+            cls.__set_asset_ids(query, xref_type, xref_values, asset_id_type, asset_id_map)
+
+        results = await cls.__query_shards_async(query, dataset_id)
+
+        asset_ids = cls.__asset_ids_to_resolve(results, asset_id_type)
+        if asset_ids:
+            xref_map = await GsAssetApi.map_identifiers_async(GsIdType.id, asset_id_type, asset_ids)
+            cls.__set_xrefs(results, asset_ids, asset_id_type, xref_map)
+
+        return results
+
+    @classmethod
+    def __query_shards(cls, query: DataQuery, dataset_id: str) -> Union[list, tuple]:
+        path = '/data/{}/query'.format(dataset_id)
+        shards, max_concurrent = cls.__shards(query, dataset_id)
+        if len(shards) == 1:
+            return cls.__data_results(GsSession.current._post(path, payload=query))
+
+        session = GsSession.current
+
+        def run_shard(shard: DataQuery) -> Union[list, tuple]:
+            with session:
+                return cls.__data_results(session._post(path, payload=shard))
+
+        with ThreadPoolExecutor(min(max_concurrent, len(shards))) as pool:
+            return list(chain.from_iterable(pool.map(run_shard, shards)))
+
+    @classmethod
+    async def __query_shards_async(cls, query: DataQuery, dataset_id: str) -> Union[list, tuple]:
+        path = '/data/{}/query'.format(dataset_id)
+        shards, max_concurrent = cls.__shards(query, dataset_id)
+        if len(shards) == 1:
+            return cls.__data_results(await GsSession.current._post_async(path, payload=query))
+
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def run_shard(shard: DataQuery) -> Union[list, tuple]:
+            async with semaphore:
+                return cls.__data_results(await GsSession.current._post_async(path, payload=shard))
+
+        return list(chain.from_iterable(await asyncio.gather(*(run_shard(s) for s in shards))))
+
+    @classmethod
+    def __shards(cls, query: DataQuery, dataset_id: str) -> Tuple[List[DataQuery], int]:
+        sharding = cls.__sharding.get(dataset_id)
+        if sharding is None:
+            return [query], 1
+
+        date_shards, asset_ids_per_shard, max_concurrent = sharding
+
+        # Split the range into contiguous sub-ranges. Bounds are inclusive, to a resolution of a day for dates and a
+        # millisecond (as serialized in queries) for times
+        ranges = [{}]
+        if query.start_date is not None and query.end_date is not None:
+            start, end, resolution, start_field, end_field = \
+                query.start_date, query.end_date, dt.timedelta(days=1), 'start_date', 'end_date'
+        elif query.start_time is not None and query.end_time is not None:
+            start, end, resolution, start_field, end_field = \
+                query.start_time, query.end_time, dt.timedelta(milliseconds=1), 'start_time', 'end_time'
+        else:
+            start = end = None
+
+        if start is not None and end > start:
+            steps = (end - start) // resolution + 1
+            num_ranges = min(date_shards, steps)
+            bounds = [start + resolution * (steps * i // num_ranges) for i in range(num_ranges + 1)]
+            ranges = [{start_field: bounds[i], end_field: bounds[i + 1] - resolution} for i in range(num_ranges)]
+
+        # Split long lists of asset ids
+        asset_ids = [{}]
+        where_asset_ids = query.where.asset_id if query.where else None
+        if asset_ids_per_shard and isinstance(where_asset_ids, (list, tuple)) and \
+                len(where_asset_ids) > asset_ids_per_shard:
+            asset_ids = [{'where': query.where.clone(asset_id=tuple(where_asset_ids[i:i + asset_ids_per_shard]))}
+                         for i in range(0, len(where_asset_ids), asset_ids_per_shard)]
+
+        return [query.clone(**r, **a) for r in ranges for a in asset_ids], max_concurrent
+
+    @classmethod
+    def __coordinates_results(cls, results: Union[MDAPIDataBatchResponse, dict]) -> tuple:
+        if isinstance(results, dict):
+            return results.get('responses', ())
+        else:
+            return results.responses if results.responses is not None else ()
+
+    @classmethod
+    def __data_results(cls, results: Union[DataQueryResponse, dict]) -> Union[list, tuple]:
         if isinstance(results, dict):
-            results = results.get('data', ())
+            return results.get('data', ())
         else:
-            results = results.data if results.data is not None else ()
+            return results.data if results.data is not None else ()
 
-        if asset_id_type not in {GsIdType.id, None}:
-            asset_ids = tuple(set(filter(None, (r.get('assetId') for r in results))))
-            if asset_ids:
-                xref_map = GsAssetApi.map_identifiers(GsIdType.id, asset_id_type, asset_ids)
+    @classmethod
+    def __xref_keys(cls, query: DataQuery) -> set:
+        if not query.where:
+            return set()
 
-                if len(xref_map) != len(asset_ids):
-                    raise MqValueError('Not all asset Ids were resolved to {}'.format(asset_id_type))
+        xref_keys = set(query.where.as_dict().keys()).intersection(XRef.properties())
+        if len(xref_keys) > 1:
+            raise MqValueError('Cannot not specify more than one type of asset identifier')
 
-                for result in results:
-                    result[asset_id_type] = xref_map[result['assetId']]
+        return xref_keys
 
-        return results
+    @classmethod
+    def __xrefs_to_resolve(cls, query: DataQuery, definition: Optional[DataSetEntity],
+                           asset_id_type: Optional[Union[GsIdType, str]]) \
+            -> Tuple[Optional[str], tuple, Optional[Union[GsIdType, str]]]:
+        # Check that assetId is a symbol dimension of this data set. If not, we need to do a separate query
+        # to resolve xref --> assetId
+        if definition is None:
+            return None, (), asset_id_type
+
+        sd = definition.dimensions.symbolDimensions
+        if definition.parameters.symbolStrategy == 'MDAPI' or ('assetId' not in sd and 'gsid' not in sd):
+            xref_type = min(cls.__xref_keys(query))
+            if asset_id_type is None:
+                asset_id_type = xref_type
+
+            xref_values = query.where.as_dict()[asset_id_type]
+            xref_values = (xref_values,) if isinstance(xref_values, str) else xref_values
+            return xref_type, xref_values, asset_id_type
+
+        return None, (), asset_id_type
+
+    @classmethod
+    def __set_asset_ids(cls, query: DataQuery, xref_type: str, xref_values: tuple,
+                        asset_id_type: Union[GsIdType, str], asset_id_map: dict):
+        if len(asset_id_map) != len(xref_values):
+            raise MqValueError('Not all {} were resolved to asset Ids'.format(asset_id_type))
+
+        setattr(query.where, xref_type, None)
+        query.where.assetId = [asset_id_map[x] for x in xref_values]
+
+    @classmethod
+    def __asset_ids_to_resolve(cls, results: Union[list, tuple], asset_id_type: Optional[Union[GsIdType, str]]) \
+            -> tuple:
+        if asset_id_type in {GsIdType.id, None}:
+            return ()
+
+        return tuple(set(filter(None, (r.get('assetId') for r in results))))
+
+    @classmethod
+    def __set_xrefs(cls, results: Union[list, tuple], asset_ids: tuple, asset_id_type: Union[GsIdType, str],
+                    xref_map: dict):
+        if len(xref_map) != len(asset_ids):
+            raise MqValueError('Not all asset Ids were resolved to {}'.format(asset_id_type))
+
+        for result in results:
+            result[asset_id_type] = xref_map[result['assetId']]
 
     @classmethod
     def last_data(cls, query: DataQuery, dataset_id: str = None) -> Union[list, tuple]:
@@ -139,6 +269,41 @@ class GsDataApi(DataApi):
 
     # GS-specific functionality
 
+    @classmethod
+    def set_sharding(cls, dataset_id: str, date_shards: int = 1, asset_ids_per_shard: Optional[int] = None,
+                     max_concurrent: int = 8):
+        """
+        Split queries of a dataset into shards, which are queried concurrently and whose results are concatenated in
+        order. Suits long ranges or many assets, for which a single query is bound by the latency of the server
+
+        :param dataset_id: The dataset's identifier
+        :param date_shards: The number of sub-ranges into which to split the start/end range of each query
+        :param asset_ids_per_shard: The maximum number of asset ids (where.assetId) in each shard
+        :param max_concurrent: The maximum number of shards queried at once. Concurrent synchronous queries share the
+        connection pool of the session's http_adapter, so this should not exceed its pool size
+
+        **Examples**
+
+        Query a month of intraday data for 500 assets as 4 weekly ranges of 50 assets each, 8 queries at a time:
+
+        >>> from gs_quant.api.gs.data import GsDataApi
+        >>>
+        >>> GsDataApi.set_sharding('EDRVOL_PERCENT_INTRADAY', date_shards=4, asset_ids_per_shard=50, max_concurrent=8)
+        """
+        if date_shards < 1 or max_concurrent < 1 or (asset_ids_per_shard is not None and asset_ids_per_shard < 1):
+            raise MqValueError('date_shards, asset_ids_per_shard and max_concurrent must be positive')
+
+        cls.__sharding[dataset_id] = (date_shards, asset_ids_per_shard, max_concurrent)
+
+    @classmethod
+    def remove_sharding(cls, dataset_id: str):
+        """
+        Query a dataset with a single request per query again
+
+        :param dataset_id: The dataset's identifier
+        """
+        cls.__sharding.pop(dataset_id, None)
+
     @classmethod
     def get_coverage(
             cls,
@@ -201,6 +366,18 @@ class GsDataApi(DataApi):
 
         return definition
 
+    @classmethod
+    async def get_definition_async(cls, dataset_id: str) -> DataSetEntity:
+        definition = cls.__definitions.get(dataset_id)
+        if not definition:
+            definition = await GsSession.current._get_async('/data/datasets/{}'.format(dataset_id), cls=DataSetEntity)
+            if not definition:
+                raise MqValueError('Unknown dataset {}'.format(dataset_id))
+
+            cls.__definitions[dataset_id] = definition
+
+        return definition
+
     @staticmethod
     def build_market_data_query(asset_ids: List[str], query_type: QueryType, where: Union[FieldFilterMap] = None,
                                 source: Union[str] = None, real_time: bool = False):
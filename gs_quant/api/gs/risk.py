@@ -31,10 +31,19 @@ class GsRiskApi(RiskApi):
         result = cls._exec(request)
         return cls._handle_results(request, result) if request.waitForResults else result['reportId']
 
+    @classmethod
+    async def calc_async(cls, request: RiskRequest) -> Union[Iterable, str]:
+        result = await cls._exec_async(request)
+        return cls._handle_results(request, result) if request.waitForResults else result['reportId']
+
     @classmethod
     def _exec(cls, request: RiskRequest) -> Union[Iterable, dict]:
         return GsSession.current._post(r'/risk/calculate', request)
 
+    @classmethod
+    async def _exec_async(cls, request: RiskRequest) -> Union[Iterable, dict]:
+        return await GsSession.current._post_async(r'/risk/calculate', request)
+
     @classmethod
     def get_results(cls, risk_request: RiskRequest, result_id: str) -> dict:
         session = GsSession.current
@@ -14,9 +14,11 @@ specific language governing permissions and limitations
 under the License.
 """
 from abc import ABCMeta, abstractmethod
+import asyncio
 from typing import Iterable, Union
 
 from gs_quant.risk import Formatters, RiskRequest
+from gs_quant.session import GsSession
 
 
 class RiskApi(metaclass=ABCMeta):
@@ -26,6 +28,17 @@ class RiskApi(metaclass=ABCMeta):
     def calc(cls, request: RiskRequest) -> Union[Iterable, str]:
         raise NotImplementedError('Must implement calc')
 
+    @classmethod
+    async def calc_async(cls, request: RiskRequest) -> Union[Iterable, str]:
+        # Providers without an asynchronous implementation run calc on the event loop's executor, in this session
+        session = GsSession.current
+
+        def calc():
+            with session:
+                return cls.calc(request)
+
+        return await asyncio.get_running_loop().run_in_executor(None, calc)
+
     @classmethod
     @abstractmethod
     def get_results(cls, risk_request: RiskRequest, result_id: str) -> dict:
@@ -34,13 +47,16 @@ class RiskApi(metaclass=ABCMeta):
     @classmethod
     def _handle_results(cls, request: RiskRequest, results: Iterable) -> dict:
         formatted_results = {}
+        # Results of more than one date are indexed by date. This is decided by the request rather than the current
+        # PricingContext, as requests may be run (and their results formatted) on other threads
+        dated = len(request.pricing_and_market_data_as_of or ()) > 1
 
         for measure_idx, position_results in enumerate(results):
             risk_measure = request.measures[measure_idx]
             formatter = Formatters.get(risk_measure)
             for position_idx, result in enumerate(position_results):
                 position = request.positions[position_idx]
-                result = formatter(result) if formatter else result
+                result = formatter(result, dated) if formatter else result
                 formatted_results.setdefault(risk_measure, {})[position] = result
 
         return formatted_results
@@ -19,24 +19,31 @@ import copy
 import datetime as dt
 import dateutil
 from enum import EnumMeta
-from functools import wraps
+from functools import lru_cache, wraps
 import inflection
 from inspect import signature, Parameter
 import keyword
 import logging
-from typing import Union, get_type_hints
+import re
+from typing import Any, Callable, Tuple, Union, get_type_hints
 
 
 _logger = logging.getLogger(__name__)
+__builtin_names = frozenset(dir(builtins))
 
 
 def _normalise_arg(arg: str) -> str:
-    if keyword.iskeyword(arg) or arg in dir(builtins):
+    if keyword.iskeyword(arg) or arg in __builtin_names:
         return arg + '_'
     else:
         return arg
 
 
+@lru_cache(maxsize=None)
+def _snake_case(arg: str) -> str:
+    return inflection.underscore(arg)
+
+
 def camel_case_translate(f):
     @wraps(f)
     def wrapper(*args, **kwargs):
@@ -45,7 +52,7 @@ def camel_case_translate(f):
             arg = _normalise_arg(arg)
 
             if not arg.isupper():
-                snake_case_arg = inflection.underscore(arg)
+                snake_case_arg = _snake_case(arg)
                 if snake_case_arg != arg:
                     if snake_case_arg in kwargs:
                         raise ValueError('{} and {} both specified'.format(arg, snake_case_arg))
@@ -72,7 +79,19 @@ class Base(metaclass=ABCMeta):
 
     """The base class for all generated classes"""
 
-    __properties = set()
+    __properties = None
+    __aliases = {}
+    __getters = None
+    __schema = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Each class resolves its own properties, aliases and schema, on first use
+        cls.__properties = None
+        cls.__aliases = {}
+        cls.__getters = None
+        cls.__schema = None
 
     def __init__(self, **_kwargs):
         self.__calced_hash: int = None
@@ -84,22 +103,33 @@ class Base(metaclass=ABCMeta):
             pass
 
     def __getattr__(self, item):
-        snake_case_item = inflection.underscore(item)
-        if snake_case_item in super().__getattribute__('properties')():
-            return super().__getattribute__(snake_case_item)
-        else:
-            return super().__getattribute__(item)
+        return super().__getattribute__(type(self).__aliases.get(item) or type(self).__alias(item))
 
     def __setattr__(self, key, value):
-        properties = super().__getattribute__('properties')()
-        snake_case_key = inflection.underscore(key)
-        key_is_property = key in properties
-        snake_case_key_is_property = snake_case_key in properties
+        return super().__setattr__(type(self).__aliases.get(key) or type(self).__alias(key), value)
 
-        if snake_case_key_is_property and not key_is_property:
-            return super().__setattr__(snake_case_key, value)
-        else:
-            return super().__setattr__(key, value)
+    @classmethod
+    def __alias(cls, name: str) -> str:
+        # The property which name (e.g. a camel case property name) refers to, else name itself
+        aliases = cls.__aliases
+        if not aliases:
+            for prop in cls.properties():
+                aliases[prop] = prop
+                camel_case_prop = inflection.camelize(prop, uppercase_first_letter=False)
+                if inflection.underscore(camel_case_prop) == prop:
+                    aliases.setdefault(camel_case_prop, prop)
+
+        alias = aliases.get(name)
+        if alias is None:
+            # Only names of properties are stored, so that looking up other attributes does not grow the table
+            snake_case_name = inflection.underscore(name)
+            properties = cls.properties()
+            if snake_case_name in properties and name not in properties:
+                alias = aliases[name] = snake_case_name
+            else:
+                alias = name
+
+        return alias
 
     def __repr__(self):
         if self.name is not None:
@@ -115,21 +145,21 @@ class Base(metaclass=ABCMeta):
         return self.__calced_hash is not None
 
     def __hash__(self) -> int:
-        if not self._hash_is_calced:
+        calced_hash = self.__calced_hash
+        if calced_hash is None:
             calced_hash = hash(self.name)
-            for prop in self.properties():
-                calced_hash ^= hash(super().__getattribute__(prop))
+            for getter in type(self).__property_getters():
+                calced_hash ^= hash(getter(self))
 
             self.__calced_hash = calced_hash
 
-        return self.__calced_hash
+        return calced_hash
 
     def __eq__(self, other) -> bool:
         return\
             type(self) == type(other) and self.name == other.name and\
             (self.__calced_hash is None or other.__calced_hash is None or self.__calced_hash == other.__calced_hash) \
-            and all(super(Base, self).__getattribute__(p) == super(Base, other).__getattribute__(p)
-                    for p in self.properties())
+            and all(getter(self) == getter(other) for getter in type(self).__property_getters())
 
     def __ne__(self, other) -> bool:
         return not self.__eq__(other)
@@ -162,11 +192,18 @@ class Base(metaclass=ABCMeta):
     @classmethod
     def properties(cls) -> set:
         """The public property names of this class"""
-        if not cls.__properties:
+        if cls.__properties is None:
             cls.__properties = set(i for i in dir(cls) if isinstance(getattr(cls, i), property)
                                    and not i.startswith('_'))
         return cls.__properties
 
+    @classmethod
+    def __property_getters(cls) -> tuple:
+        if cls.__getters is None:
+            cls.__getters = tuple(getattr(cls, p).fget for p in cls.properties())
+
+        return cls.__getters
+
     def as_dict(self, as_camel_case: bool=False) -> dict:
         """Dictionary of the public, non-null properties and values"""
         raw_properties = self.properties()
@@ -193,76 +230,22 @@ class Base(metaclass=ABCMeta):
         return_hints = get_type_hints(getattr(cls, prop).fget).get('return')
         return return_hints.__args__[0]
 
-    def __from_dict(self, values: dict):
-        for prop in self.properties():
-            prop_value = values.get(prop, values.get(inflection.camelize(prop, uppercase_first_letter=False)))
-
-            if prop_value is not None:
-                prop_type = self.prop_type(prop)
-
-                if prop_type is None:
-                    # This shouldn't happen
-                    setattr(self, prop, prop_value)
-                elif issubclass(prop_type, dt.datetime):
-                    if isinstance(prop_value, int):
-                        setattr(self, prop, dt.datetime.fromtimestamp(prop_value / 1000).isoformat())
-                    else:
-                        import re
-                        matcher = re.search('\.([0-9]*)Z$', prop_value)
-                        if matcher:
-                            sub_seconds = matcher.group(1)
-                            if len(sub_seconds) > 6:
-                                prop_value = re.sub(matcher.re, '.{}Z'.format(sub_seconds[:6]), prop_value)
-                        setattr(self, prop, dateutil.parser.isoparse(prop_value))
-                elif issubclass(prop_type, dt.date):
-                    setattr(self, prop, dateutil.parser.isoparse(prop_value).date())
-                elif issubclass(prop_type, EnumBase):
-                    setattr(self, prop, get_enum_value(prop_type, prop_value))
-                elif issubclass(prop_type, Base):
-                    if isinstance(prop_value, Base):
-                        setattr(self, prop, prop_value)
-                    else:
-                        setattr(self, prop, prop_type.from_dict(prop_value))
-                elif issubclass(prop_type, (list, tuple)):
-                    item_type = self.prop_item_type(prop)
-                    item_args = [i for i in getattr(item_type, '__args__', ()) if isinstance(i, type)]
-                    if item_args:
-                        item_type = next((a for a in item_args if issubclass(a, (Base, EnumBase))), item_args[-1])
-
-                    if issubclass(item_type, Base):
-                        item_values = tuple(v if isinstance(v, (Base, EnumBase)) else item_type.from_dict(v)
-                                            for v in prop_value)
-                    elif issubclass(item_type, EnumBase):
-                        item_values = tuple(get_enum_value(item_type, v) for v in prop_value)
-                    else:
-                        item_values = tuple(prop_value)
-                    setattr(self, prop, item_values)
-                else:
-                    setattr(self, prop, prop_value)
-
     @classmethod
-    def _from_dict(cls, values: dict) -> 'Base':
-        args = [k for k, v in signature(cls.__init__).parameters.items() if k != 'kwargs'
-                and v.default == Parameter.empty][1:]
-        required = {}
-
-        for arg in args:
-            prop_name = arg[:-1] if arg.endswith('_') and not keyword.iskeyword(arg) else arg
-            prop_type = cls.prop_type(prop_name)
-            value = values.pop(arg, None)
+    def _schema(cls) -> '_Schema':
+        """The decoding schema of this class, built on first use"""
+        if cls.__schema is None:
+            cls.__schema = _Schema(cls)
 
-            if prop_type:
-                if issubclass(prop_type, Base):
-                    if isinstance(value, dict):
-                        value = prop_type.from_dict(value)
-                elif issubclass(prop_type, EnumBase):
-                    value = get_enum_value(prop_type, value)
+        return cls.__schema
 
-            required[arg] = value
+    @classmethod
+    def _decoder(cls) -> Callable[[dict], 'Base']:
+        """A function which constructs an instance of this type from a dictionary"""
+        return cls._schema().decode if cls.from_dict.__func__ is Base.from_dict.__func__ else cls.from_dict
 
-        instance = cls(**required)
-        instance.__from_dict(values)
-        return instance
+    @classmethod
+    def _from_dict(cls, values: dict) -> 'Base':
+        return cls._schema().decode(values)
 
     @classmethod
     def from_dict(cls, values: dict) -> 'Base':
@@ -427,3 +410,130 @@ def get_enum_value(enum_type: EnumMeta, value: Union[EnumBase, str]):
         enum_value = value
 
     return enum_value
+
+
+__sub_seconds = re.compile(r'\.([0-9]*)Z$')
+
+
+def _decode_datetime(value: Union[int, str]) -> Union[dt.datetime, str]:
+    if isinstance(value, int):
+        return dt.datetime.fromtimestamp(value / 1000).isoformat()
+
+    matcher = __sub_seconds.search(value)
+    if matcher:
+        sub_seconds = matcher.group(1)
+        if len(sub_seconds) > 6:
+            value = __sub_seconds.sub('.{}Z'.format(sub_seconds[:6]), value)
+
+    return dateutil.parser.isoparse(value)
+
+
+def _decode_date(value: str) -> dt.date:
+    return dateutil.parser.isoparse(value).date()
+
+
+def _decode_as_is(value: Any) -> Any:
+    return value
+
+
+class _Schema:
+
+    """
+    The fields of a generated class and how to decode each from a dictionary, resolved once per class rather than
+    on every from_dict()
+    """
+
+    def __init__(self, cls: type):
+        self.__cls = cls
+
+        # Non-defaulted __init__ args, which must be supplied on construction
+        args = [k for k, v in signature(cls.__init__).parameters.items() if k != 'kwargs'
+                and v.default == Parameter.empty][1:]
+        self.__required = tuple((a, self.__required_decoder(
+            a[:-1] if a.endswith('_') and not keyword.iskeyword(a) else a)) for a in args)
+
+        # Properties which override Base.__setattr__ are set via setattr(), all others via their setter directly
+        direct = cls.__setattr__ is Base.__setattr__
+        self.__fields = tuple((p,
+                               inflection.camelize(p, uppercase_first_letter=False),
+                               self.__lazy_decoder(p),
+                               getattr(cls, p).fset if direct and getattr(cls, p).fset else
+                               lambda o, v, p=p: setattr(o, p, v))
+                              for p in sorted(cls.properties()))
+
+    @property
+    def required(self) -> Tuple[str, ...]:
+        """The names of the args which must be supplied on construction"""
+        return tuple(a for a, _ in self.__required)
+
+    @property
+    def fields(self) -> Tuple[Tuple[str, str], ...]:
+        """(snake case, camel case) names of the properties"""
+        return tuple((p, c) for p, c, _, _ in self.__fields)
+
+    def __required_decoder(self, prop: str) -> Callable[[Any], Any]:
+        prop_type = self.__cls.prop_type(prop)
+        if prop_type:
+            if issubclass(prop_type, Base):
+                return lambda v: prop_type.from_dict(v) if isinstance(v, dict) else v
+            elif issubclass(prop_type, EnumBase):
+                return lambda v: get_enum_value(prop_type, v)
+
+        return _decode_as_is
+
+    def __lazy_decoder(self, prop: str) -> Callable[[Any], Any]:
+        try:
+            return self.__decoder(prop)
+        except (AttributeError, TypeError) as e:
+            # Some property types cannot be decoded. Fail only if a value is actually supplied, as from_dict always has
+            error = e
+
+            def decoder(_value):
+                raise error
+
+            return decoder
+
+    def __decoder(self, prop: str) -> Callable[[Any], Any]:
+        prop_type = self.__cls.prop_type(prop)
+
+        if prop_type is None:
+            # This shouldn't happen
+            return _decode_as_is
+        elif issubclass(prop_type, dt.datetime):
+            return _decode_datetime
+        elif issubclass(prop_type, dt.date):
+            return _decode_date
+        elif issubclass(prop_type, EnumBase):
+            return lambda v: get_enum_value(prop_type, v)
+        elif issubclass(prop_type, Base):
+            return lambda v: v if isinstance(v, Base) else prop_type.from_dict(v)
+        elif issubclass(prop_type, (list, tuple)):
+            item_type = self.__cls.prop_item_type(prop)
+            item_args = [i for i in getattr(item_type, '__args__', ()) if isinstance(i, type)]
+            if item_args:
+                item_type = next((a for a in item_args if issubclass(a, (Base, EnumBase))), item_args[-1])
+
+            if issubclass(item_type, Base):
+                return lambda v: tuple(i if isinstance(i, (Base, EnumBase)) else item_type.from_dict(i) for i in v)
+            elif issubclass(item_type, EnumBase):
+                return lambda v: tuple(get_enum_value(item_type, i) for i in v)
+            else:
+                return tuple
+        else:
+            return _decode_as_is
+
+    def decode(self, values: dict) -> Base:
+        """
+        Construct an instance of the class from a dictionary
+
+        :param values: a dictionary (potentially nested), keyed by camel or snake case property names
+        :return: an instance of the class, populated with values
+        """
+        instance = self.__cls(**{a: decode(values.pop(a, None)) for a, decode in self.__required})
+
+        for prop, camel_case_prop, decode, set_value in self.__fields:
+            value = values.get(prop, values.get(camel_case_prop))
+            if value is not None:
+                set_value(instance, decode(value))
+
+        return instance
@@ -15,6 +15,7 @@ under the License.
 """
 
 
+from .cache import DatasetCache
 from .dataset import Dataset
 from .dataset import Fields
 from .core import DataContext
@@ -0,0 +1,288 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+import datetime as dt
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import dateutil.parser
+import numpy as np
+import pandas as pd
+
+from gs_quant.json_encoder import JSONEncoder
+
+_logger = logging.getLogger(__name__)
+
+DateRange = Tuple[dt.date, dt.date]
+
+# Readers (in other processes) which read the meta file before it was replaced may still be loading the version it
+# named, so versions are only removed once they have been superseded (or, if never current, written) for this long
+STALE_VERSION_AGE = dt.timedelta(minutes=1)
+
+
+class DatasetCache:
+
+    """
+    An on-disk, columnar store of dataset query results, which records the date ranges already fetched for each query
+    so that only the gaps need be queried again. Each column is stored as a numpy array file and memory-mapped on read
+    """
+
+    def __init__(self, path: Optional[str] = None, revision_interval: Optional[dt.timedelta] = dt.timedelta(hours=1)):
+        """
+        An on-disk, columnar store of dataset query results
+
+        :param path: the directory of the store. Defaults to ~/.gs_quant/dataset_cache
+        :param revision_interval: how often to query for revisions (data updated since it was stored) to the ranges
+        already fetched. None never queries for revisions
+
+        **Examples**
+
+        Cache queries of EDRVOL_PERCENT_LONG, checking for revisions at most every 4 hours:
+
+        >>> from gs_quant.data import Dataset, DatasetCache
+        >>> import datetime as dt
+        >>>
+        >>> cache = DatasetCache(revision_interval=dt.timedelta(hours=4))
+        >>> vol = Dataset(Dataset.GS.EDRVOL_PERCENT_LONG, cache=cache)
+        >>> df = vol.get_data(dt.date(2019, 1, 2), dt.date(2019, 12, 31), assetId='MA4B66MW5E27U8P32SB')
+        """
+        self.__path = path or os.path.join(os.path.expanduser('~'), '.gs_quant', 'dataset_cache')
+        self.__revision_interval = revision_interval
+        self.__lock = threading.RLock()
+
+    @property
+    def path(self) -> str:
+        """The directory of the store"""
+        return self.__path
+
+    @property
+    def revision_interval(self) -> Optional[dt.timedelta]:
+        """How often to query for revisions to the ranges already fetched"""
+        return self.__revision_interval
+
+    def get_data(
+            self,
+            dataset_id: str,
+            key: dict,
+            start: dt.date,
+            end: dt.date,
+            fetch: Callable[[dt.date, dt.date, Optional[dt.datetime]], pd.DataFrame],
+            symbol_dimensions: Callable[[], Iterable[str]]
+    ) -> pd.DataFrame:
+        """
+        Data for start to end (inclusive), fetching only the ranges (and revisions) not already stored
+
+        :param dataset_id: The dataset's identifier
+        :param key: The query parameters, other than the range, which identify the data (e.g. the assetId filter)
+        :param start: The first date of data
+        :param end: The last date of data
+        :param fetch: A function of (start, end, since) which queries the dataset, returning a date-indexed Dataframe
+        :param symbol_dimensions: A function returning the dataset's symbol dimensions, which (with date) identify rows
+        :return: A Dataframe of the data, indexed by date
+        """
+        directory = os.path.join(self.__path, dataset_id, self.__key_hash(key))
+
+        with self.__lock:
+            meta = self.__read_meta(directory)
+            ranges = [tuple(dateutil.parser.isoparse(d).date() for d in r) for r in meta['ranges']] if meta else []
+            checked = dateutil.parser.isoparse(meta['checked']) if meta else None
+            gaps = self.__gaps(ranges, start, end)
+            now = dt.datetime.now(dt.timezone.utc)
+            frames = []
+
+            if ranges and self.__revision_interval is not None and now - checked >= self.__revision_interval:
+                frames.append(fetch(ranges[0][0], ranges[-1][1], checked))
+                checked = now
+            elif not ranges:
+                checked = now
+
+            for gap_start, gap_end in gaps:
+                frames.append(fetch(gap_start, gap_end, None))
+
+            frames = [f for f in frames if not f.empty]
+            if any(f.index.name != 'date' for f in frames):
+                # Only date-indexed datasets can be stored, so others have no stored ranges, and the range was fetched
+                # as a whole
+                _logger.warning('{} is not indexed by date, so cannot be cached'.format(dataset_id))
+                return frames[0] if not ranges else fetch(start, end, None)
+
+            if frames or gaps or not meta or meta['checked'] != checked.isoformat():
+                meta = self.__write(directory, meta, frames, self.__merge_ranges(ranges + gaps), checked, key,
+                                    symbol_dimensions)
+
+            return self.__read(directory, meta, start, end)
+
+    def clear(self, dataset_id: Optional[str] = None):
+        """
+        Remove all stored data, or only that of a dataset
+
+        :param dataset_id: The dataset whose data to remove
+        """
+        with self.__lock:
+            shutil.rmtree(os.path.join(self.__path, dataset_id) if dataset_id else self.__path, ignore_errors=True)
+
+    @staticmethod
+    def __key_hash(key: dict) -> str:
+        content = json.dumps(key, cls=JSONEncoder, sort_keys=True, default=str)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()[:32]
+
+    @staticmethod
+    def __gaps(ranges: List[DateRange], start: dt.date, end: dt.date) -> List[DateRange]:
+        gaps = []
+        for range_start, range_end in ranges:
+            if range_start > start:
+                gaps.append((start, min(end, range_start - dt.timedelta(days=1))))
+            start = max(start, range_end + dt.timedelta(days=1))
+            if start > end:
+                break
+
+        if start <= end:
+            gaps.append((start, end))
+
+        return [g for g in gaps if g[0] <= g[1]]
+
+    @staticmethod
+    def __merge_ranges(ranges: List[DateRange]) -> List[DateRange]:
+        merged = []
+        for range_start, range_end in sorted(ranges):
+            if merged and range_start <= merged[-1][1] + dt.timedelta(days=1):
+                merged[-1] = (merged[-1][0], max(merged[-1][1], range_end))
+            else:
+                merged.append((range_start, range_end))
+
+        return merged
+
+    @staticmethod
+    def __read_meta(directory: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(directory, 'meta.json')) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            _logger.warning('Unable to read cached data in {}: {}'.format(directory, e))
+            return None
+
+    def __write(self, directory: str, meta: Optional[dict], frames: List[pd.DataFrame], ranges: List[DateRange],
+                checked: dt.datetime, key: dict, symbol_dimensions: Callable[[], Iterable[str]]) -> dict:
+        version = meta['version'] if meta else None
+        columns = meta['columns'] if meta else []
+        superseded = dict(meta.get('superseded', {})) if meta else {}
+
+        if frames:
+            stored = [self.__read(directory, meta, None, None, mmap=False)] if version else []
+            df = pd.concat(stored + frames).reset_index()
+
+            # Later rows (revisions and new fetches) replace earlier ones for the same date and symbol
+            row_key = ['date'] + [d for d in symbol_dimensions() if d in df.columns]
+            df = df.drop_duplicates(subset=row_key, keep='last').sort_values('date', kind='mergesort')
+
+            if version:
+                superseded[version] = dt.datetime.now(dt.timezone.utc).isoformat()
+
+            version = uuid.uuid4().hex
+            columns = self.__write_columns(os.path.join(directory, version), df)
+
+        stale = self.__stale_versions(directory, version, superseded)
+        superseded = {v: t for v, t in superseded.items()
+                      if v not in stale and os.path.isdir(os.path.join(directory, v))}
+
+        new_meta = {
+            'key': json.loads(json.dumps(key, cls=JSONEncoder, default=str)),
+            'ranges': [[r[0].isoformat(), r[1].isoformat()] for r in ranges],
+            'checked': checked.isoformat(),
+            'version': version,
+            'columns': columns,
+            'superseded': superseded
+        }
+
+        # Readers only ever see a complete version, via the atomically replaced meta file
+        os.makedirs(directory, exist_ok=True)
+        meta_file = os.path.join(directory, 'meta.json')
+        with open(meta_file + '.tmp', 'w') as f:
+            json.dump(new_meta, f)
+        os.replace(meta_file + '.tmp', meta_file)
+
+        for stale_version in stale:
+            shutil.rmtree(os.path.join(directory, stale_version), ignore_errors=True)
+
+        return new_meta
+
+    @staticmethod
+    def __stale_versions(directory: str, version: Optional[str], superseded: dict) -> List[str]:
+        # Versions of concurrent writers, whose meta files were replaced before being read, are aged by their mtime
+        if not os.path.isdir(directory):
+            return []
+
+        now = time.time()
+        stale = []
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name == version or not os.path.isdir(path):
+                continue
+
+            since = dateutil.parser.isoparse(superseded[name]).timestamp() if name in superseded else \
+                os.path.getmtime(path)
+            if now - since >= STALE_VERSION_AGE.total_seconds():
+                stale.append(name)
+
+        return stale
+
+    @staticmethod
+    def __write_columns(directory: str, df: pd.DataFrame) -> List[dict]:
+        os.makedirs(directory, exist_ok=True)
+        columns = []
+
+        for i, name in enumerate(df.columns):
+            values = df[name].to_numpy()
+            is_str = values.dtype == object and all(isinstance(v, str) for v in values)
+            if is_str:
+                # Fixed-width strings may be memory-mapped, unlike arbitrary objects
+                values = values.astype(str)
+
+            np.save(os.path.join(directory, '{}.npy'.format(i)), values, allow_pickle=True)
+            columns.append({'name': name, 'mmap': values.dtype != object, 'str': bool(is_str)})
+
+        return columns
+
+    @staticmethod
+    def __read(directory: str, meta: dict, start: Optional[dt.date], end: Optional[dt.date], mmap: bool = True) \
+            -> pd.DataFrame:
+        if not meta['version']:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name='date'))
+
+        version = os.path.join(directory, meta['version'])
+        arrays = {c['name']: np.load(os.path.join(version, '{}.npy'.format(i)),
+                                     mmap_mode='r' if mmap and c['mmap'] else None,
+                                     allow_pickle=not c['mmap'])
+                  for i, c in enumerate(meta['columns'])}
+
+        # Rows are sorted by date, so the range is a contiguous slice
+        dates = arrays['date']
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(start), side='left')
+        hi = len(dates) if end is None else \
+            np.searchsorted(dates, np.datetime64(end + dt.timedelta(days=1)), side='left')
+        # An empty range is an empty slice, so has the same columns and date index as any other
+        lo = min(lo, hi)
+        df = pd.DataFrame({c['name']: arrays[c['name']][lo:hi].astype(object) if c['str'] else arrays[c['name']][lo:hi]
+                           for c in meta['columns']})
+        return df.set_index('date')
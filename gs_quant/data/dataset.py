@@ -13,16 +13,20 @@ KIND, either express or implied.  See the License for the
 specific language governing permissions and limitations
 under the License.
 """
+from concurrent.futures import ThreadPoolExecutor
 import datetime as dt
 from enum import Enum
-from typing import Iterable, Optional, Union, List
+from typing import Iterable, Iterator, Optional, Tuple, Union, List
 
 import pandas as pd
 
 from gs_quant.api.data import DataApi
+from gs_quant.context_base import nullcontext
+from gs_quant.data.cache import DatasetCache
 from gs_quant.data.fields import Fields
 from gs_quant.data.utils import construct_dataframe_with_types
-from gs_quant.errors import MqValueError
+from gs_quant.errors import MqUninitialisedError, MqValueError
+from gs_quant.session import GsSession
 
 
 class Dataset:
@@ -55,14 +59,17 @@ class Dataset:
         TR = 'TR'
         TR_FXSPOT = 'TR_FXSPOT'
 
-    def __init__(self, dataset_id: Union[str, Vendor], provider: DataApi = None):
+    def __init__(self, dataset_id: Union[str, Vendor], provider: DataApi = None, cache: DatasetCache = None):
         """
 
         :param dataset_id: The dataset's identifier
         :param provider: The data provider
+        :param cache: A local store of query results. get_data() for a date range then queries only the dates (and
+        revisions) not already stored
         """
         self.__id = self._get_dataset_id_str(dataset_id)
         self.__provider = provider
+        self.__cache = cache
 
     def _get_dataset_id_str(self, dataset_id):
         return dataset_id.value if isinstance(dataset_id, Dataset.Vendor) else dataset_id
@@ -91,8 +98,9 @@ class Dataset:
             since: Optional[dt.datetime] = None,
             fields: Optional[Iterable[Union[str, Fields]]] = None,
             asset_id_type: str = None,
+            chunk: Optional[dt.timedelta] = None,
             **kwargs
-    ) -> pd.DataFrame:
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """
         Get data for the given range and parameters
 
@@ -101,6 +109,8 @@ class Dataset:
         :param as_of: Request data as_of
         :param since: Request data since
         :param fields: DataSet fields to include
+        :param chunk: If specified, query the range in chunks of this length and return an iterator of their
+        Dataframes, as iter_data() does
         :param kwargs: Extra query arguments, e.g. ticker='EDZ19'
         :return: A Dataframe of the requested data
 
@@ -112,20 +122,154 @@ class Dataset:
         >>> weather = Dataset('WEATHER')
         >>> weather_data = weather.get_data(dt.date(2016, 1, 15), dt.date(2016, 1, 16), city=('Boston', 'Austin'))
         """
+        if chunk is not None:
+            return self.iter_data(start, end, as_of=as_of, since=since, fields=fields, asset_id_type=asset_id_type,
+                                  chunk=chunk, **kwargs)
+
+        if self.__cache is not None and self.__is_date(start) and self.__is_date(end) and as_of is None and \
+                since is None:
+            def fetch(fetch_start: dt.date, fetch_end: dt.date, fetch_since: Optional[dt.datetime]) -> pd.DataFrame:
+                query = self.__build_query(fetch_start, fetch_end, None, fetch_since, fields, **kwargs)
+                return self.__query_dataframe(query, asset_id_type)
+
+            key = {
+                'fields': None if fields is None else sorted(self.__field_names(fields)),
+                'asset_id_type': asset_id_type,
+                'where': kwargs
+            }
+            return self.__cache.get_data(self.id, key, start, end, fetch,
+                                         lambda: self.provider.symbol_dimensions(self.id))
+
+        query = self.__build_query(start, end, as_of, since, fields, **kwargs)
+        data = self.provider.query_data(query, self.id, asset_id_type=asset_id_type)
 
-        field_names = None if fields is None else list(map(lambda f: f if isinstance(f, str) else f.value, fields))
+        return construct_dataframe_with_types(self.id, data)
 
-        query = self.provider.build_query(
+    def iter_data(
+            self,
+            start: Union[dt.date, dt.datetime],
+            end: Optional[Union[dt.date, dt.datetime]] = None,
+            as_of: Optional[dt.datetime] = None,
+            since: Optional[dt.datetime] = None,
+            fields: Optional[Iterable[Union[str, Fields]]] = None,
+            asset_id_type: str = None,
+            chunk: dt.timedelta = dt.timedelta(days=30),
+            prefetch: bool = False,
+            **kwargs
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Iterate over data for the given range and parameters, one chunk of the range at a time. Only one chunk (two,
+        if prefetching) is held in memory at once, however long the range
+
+        :param start: Requested start date/datetime for data
+        :param end: Requested end date/datetime for data. Defaults to today (or now, if start is a datetime)
+        :param as_of: Request data as_of
+        :param since: Request data since
+        :param fields: DataSet fields to include
+        :param chunk: The length of the range queried at a time. Must be whole days, if start is a date
+        :param prefetch: Query the next chunk on a background thread, while the current one is being consumed
+        :param kwargs: Extra query arguments, e.g. ticker='EDZ19'
+        :return: An iterator of Dataframes of the requested data, in range order. Chunks without data are skipped
+
+        **Examples**
+
+        >>> from gs_quant.data import Dataset
+        >>> import datetime as dt
+        >>>
+        >>> intraday = Dataset(Dataset.GS.EDRVOL_PERCENT_INTRADAY)
+        >>> for df in intraday.iter_data(dt.datetime(2019, 1, 1), dt.datetime(2019, 7, 1), chunk=dt.timedelta(days=7),
+        >>>                              prefetch=True, assetId='MA4B66MW5E27U8P32SB'):
+        >>>     print(df.impliedVolatility.max())
+        """
+        queries = (self.__build_query(chunk_start, chunk_end, as_of, since, fields, **kwargs)
+                   for chunk_start, chunk_end in self.__chunks(start, end, chunk))
+
+        if not prefetch:
+            for query in queries:
+                df = self.__query_dataframe(query, asset_id_type)
+                if not df.empty:
+                    yield df
+
+            return
+
+        try:
+            session = GsSession.current
+        except MqUninitialisedError:
+            # Custom providers may not need one
+            session = None
+
+        with ThreadPoolExecutor(1) as pool:
+            query = next(queries, None)
+            future = None if query is None else pool.submit(self.__query_dataframe, query, asset_id_type, session)
+            try:
+                while future is not None:
+                    df = future.result()
+
+                    # Request the next chunk before handing over the current one
+                    query = next(queries, None)
+                    future = None if query is None else pool.submit(self.__query_dataframe, query, asset_id_type,
+                                                                    session)
+                    if not df.empty:
+                        yield df
+
+                    df = None
+            finally:
+                if future is not None:
+                    future.cancel()
+
+    def __build_query(
+            self,
+            start: Optional[Union[dt.date, dt.datetime]],
+            end: Optional[Union[dt.date, dt.datetime]],
+            as_of: Optional[dt.datetime],
+            since: Optional[dt.datetime],
+            fields: Optional[Iterable[Union[str, Fields]]],
+            **kwargs
+    ):
+        return self.provider.build_query(
             start=start,
             end=end,
             as_of=as_of,
             since=since,
-            fields=field_names,
+            fields=None if fields is None else self.__field_names(fields),
             **kwargs
         )
-        data = self.provider.query_data(query, self.id, asset_id_type=asset_id_type)
 
-        return construct_dataframe_with_types(self.id, data)
+    @staticmethod
+    def __field_names(fields: Iterable[Union[str, Fields]]) -> List[str]:
+        return list(map(lambda f: f if isinstance(f, str) else f.value, fields))
+
+    @staticmethod
+    def __is_date(value) -> bool:
+        return isinstance(value, dt.date) and not isinstance(value, dt.datetime)
+
+    def __query_dataframe(self, query, asset_id_type: Optional[str], session: Optional[GsSession] = None) \
+            -> pd.DataFrame:
+        with session or nullcontext():
+            data = self.provider.query_data(query, self.id, asset_id_type=asset_id_type)
+            return construct_dataframe_with_types(self.id, data)
+
+    @staticmethod
+    def __chunks(
+            start: Union[dt.date, dt.datetime],
+            end: Optional[Union[dt.date, dt.datetime]],
+            chunk: dt.timedelta
+    ) -> Iterator[Tuple[Union[dt.date, dt.datetime], Union[dt.date, dt.datetime]]]:
+        is_time = isinstance(start, dt.datetime)
+        if end is None:
+            end = dt.datetime.now(start.tzinfo) if is_time else dt.date.today()
+
+        # Query bounds are inclusive, so each chunk ends one day (or one millisecond, the finest time resolution
+        # of queries) before the next starts
+        resolution = dt.timedelta(milliseconds=1) if is_time else dt.timedelta(days=1)
+        if chunk < resolution or (not is_time and chunk % resolution):
+            raise MqValueError('chunk must be a positive number of {}'.format('milliseconds' if is_time else 'days'))
+
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + chunk - resolution, end)
+            yield chunk_start, chunk_end
+            chunk_start = chunk_end + resolution
 
     def get_data_series(
             self,
@@ -17,5 +17,6 @@ from .date import *
 from .time import *
 from .gscalendar import *
 from .point import *
+from .tenor import *
 
 __name__ = 'datetime'
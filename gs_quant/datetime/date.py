@@ -15,6 +15,7 @@ under the License.
 """
 
 import datetime as dt
+from collections.abc import Sequence
 from typing import Iterable, Optional, Tuple, Union
 
 import numpy as np
@@ -112,10 +113,64 @@ def business_day_count(begin_dates: DateOrDates, end_dates: DateOrDates, calenda
     return tuple(res) if isinstance(res, np.ndarray) else res
 
 
+class DateRange(Sequence):
+
+    """
+    An immutable sequence of dates, backed by a numpy array of datetime64[D]
+    """
+
+    def __init__(self, values: Iterable):
+        """
+        A sequence of dates
+
+        :param values: The dates, as datetime64 values or dates
+        """
+        values = np.array(values, dtype='datetime64[D]')
+        values.flags.writeable = False
+        self.__values = values
+
+    def __repr__(self):
+        return 'DateRange({})'.format(', '.join(str(d) for d in self.__values))
+
+    def __len__(self):
+        return len(self.__values)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return DateRange(self.__values[item])
+        return self.__values[item].item()
+
+    def __iter__(self):
+        return iter(self.__values.tolist())
+
+    def __reversed__(self):
+        return iter(self.__values[::-1].tolist())
+
+    def __contains__(self, item):
+        if not isinstance(item, dt.date) or isinstance(item, dt.datetime):
+            return False
+        return bool((self.__values == np.datetime64(item, 'D')).any())
+
+    def __eq__(self, other):
+        if isinstance(other, DateRange):
+            return np.array_equal(self.__values, other.values)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __array__(self, dtype=None):
+        return self.__values if dtype is None else self.__values.astype(dtype)
+
+    @property
+    def values(self) -> np.ndarray:
+        """The read-only array of dates, as datetime64[D]"""
+        return self.__values
+
+
 def date_range(begin: Union[int, dt.date],
                end: Union[int, dt.date],
                calendars: Union[str, Tuple[str, ...]] = (),
-               week_mask: Optional[str] = None) -> Iterable[dt.date]:
+               week_mask: Optional[str] = None) -> DateRange:
     """
     Construct a range of dates
 
@@ -125,7 +180,7 @@ def date_range(begin: Union[int, dt.date],
     (which must be a date)
     :param calendars: Calendars to use for holidays
     :param week_mask: Which days are considered weekends (defaults to Saturday and Sunday)
-    :return: A generator of dates
+    :return: A sequence of dates, whose values are a numpy array of datetime64[D]
 
     >>> import datetime as dt
     >>> today = dt.date.today()
@@ -135,26 +190,104 @@ def date_range(begin: Union[int, dt.date],
     >>>     print(date)
     """
     if isinstance(begin, dt.date):
+        calendar = _business_day_calendar(calendars, week_mask)
+        begin = np.datetime64(begin, 'D')
         if isinstance(end, dt.date):
-            def f():
-                prev = begin
-                if prev > end:
-                    raise ValueError('begin must be <= end')
+            end = np.datetime64(end, 'D')
+            if begin > end:
+                raise ValueError('begin must be <= end')
 
-                while prev <= end:
-                    yield prev
-                    prev = business_day_offset(prev, 1, calendars=calendars, week_mask=week_mask)
-
-            return (d for d in f())
+            # begin, then each business day after it to end
+            count = np.busday_count(begin, end + 1, busdaycal=calendar)
+            return DateRange(np.busday_offset(begin, np.arange(max(count, 1)), busdaycal=calendar))
         elif isinstance(end, int):
-            return (business_day_offset(begin, i, calendars=calendars, week_mask=week_mask) for i in range(end))
+            return DateRange(np.busday_offset(begin, np.arange(end), busdaycal=calendar))
         else:
             raise ValueError('end must be a date or int')
     elif isinstance(begin, int):
         if isinstance(end, dt.date):
-            return (business_day_offset(end, -i, roll='preceding', calendars=calendars, week_mask=week_mask)
-                    for i in range(begin))
+            return DateRange(np.busday_offset(np.datetime64(end, 'D'), -np.arange(begin), roll='preceding',
+                                              busdaycal=_business_day_calendar(calendars, week_mask)))
         else:
             raise ValueError('end must be a date if begin is an int')
     else:
         raise ValueError('begin must be a date or int')
+
+
+def is_business_day_array(dates: Iterable, calendars: Union[str, Tuple[str, ...]] = (),
+                          week_mask: Optional[str] = None) -> np.ndarray:
+    """
+    Determine whether each date in an array of dates is a business day
+
+    :param dates: Array of dates (datetime64, or dates)
+    :param calendars: Calendars to use for holidays
+    :param week_mask: Which days are considered weekends (defaults to Saturday and Sunday)
+    :return: Array of whether each date is a business day
+
+    **Examples**
+
+    >>> import numpy as np
+    >>> is_bus_date = is_business_day_array(np.arange('2019-07-01', '2019-08-01', dtype='datetime64[D]'), 'NYSE')
+    """
+    return np.is_busday(_to_days(dates), busdaycal=_business_day_calendar(calendars, week_mask))
+
+
+def business_day_offset_array(dates: Iterable, offsets: Union[int, Iterable[int]], roll: str = 'raise',
+                              calendars: Union[str, Tuple[str, ...]] = (), week_mask: Optional[str] = None) \
+        -> np.ndarray:
+    """
+    Apply offsets to an array of dates and move to the nearest business date
+
+    :param dates: Array of dates (datetime64, or dates)
+    :param offsets: The number of days by which to adjust the dates, or an array of them for each date
+    :param roll: Which direction to roll, in order to get to the nearest business date
+    :param calendars: Calendars to use for holidays
+    :param week_mask: Which days are considered weekends (defaults to Saturday and Sunday)
+    :return: Array of the adjusted dates, as datetime64[D]
+
+    **Examples**
+
+    >>> import numpy as np
+    >>> dates = np.arange('2019-07-01', '2019-08-01', dtype='datetime64[D]')
+    >>> next_bus_dates = business_day_offset_array(dates, 1, roll='forward')
+    """
+    return np.busday_offset(_to_days(dates), offsets, roll, busdaycal=_business_day_calendar(calendars, week_mask))
+
+
+def prev_business_date_array(dates: Iterable, calendars: Union[str, Tuple[str, ...]] = (),
+                             week_mask: Optional[str] = None) -> np.ndarray:
+    """
+    Returns the previous business date of each date in an array of dates
+
+    :param dates: Array of dates (datetime64, or dates)
+    :param calendars: Calendars to use for holidays
+    :param week_mask: Which days are considered weekends (defaults to Saturday and Sunday)
+    :return: Array of the previous business dates, as datetime64[D]
+    """
+    return business_day_offset_array(dates, -1, roll='forward', calendars=calendars, week_mask=week_mask)
+
+
+def business_day_count_array(begin_dates: Iterable, end_dates: Iterable, calendars: Union[str, Tuple[str, ...]] = (),
+                             week_mask: Optional[str] = None) -> np.ndarray:
+    """
+    Determine the number of business days between arrays of begin dates and end dates
+
+    :param begin_dates: Array of beginning dates (datetime64, or dates)
+    :param end_dates: Array of end dates (datetime64, or dates)
+    :param calendars: Calendars to use for holidays
+    :param week_mask: Which days are considered weekends (defaults to Saturday and Sunday)
+    :return: Array of the number of business days between each begin date and end date
+    """
+    return np.busday_count(_to_days(begin_dates), _to_days(end_dates),
+                           busdaycal=_business_day_calendar(calendars, week_mask))
+
+
+def _business_day_calendar(calendars: Union[str, Tuple[str, ...]], week_mask: Optional[str]) -> np.busdaycalendar:
+    return GsCalendar.get(calendars).business_day_calendar(week_mask)
+
+
+def _to_days(dates: Iterable) -> np.ndarray:
+    # Dates of any type (e.g. a DatetimeIndex, or a tuple of dates) as datetime64[D]
+    if isinstance(dates, DateRange):
+        return dates.values
+    return np.asarray(dates, dtype='datetime64[D]')
@@ -14,16 +14,187 @@ specific language governing permissions and limitations
 under the License.
 """
 import datetime as dt
-from typing import Tuple, Union
+import json
+import logging
+import os
+import threading
+import uuid
+from typing import Dict, Iterable, Optional, Tuple, Union
 
+import dateutil.parser
 import numpy as np
 
 from gs_quant.data import Dataset
 
+_logger = logging.getLogger(__name__)
+
+
+class HolidayStore:
+
+    """
+    A store of the holidays of exchanges, which fetches those of many exchanges in one query and persists them to a
+    local file, memory-mapped read-only by each process which uses it
+    """
+
+    def __init__(self, path: Optional[str] = None, refresh_interval: Optional[dt.timedelta] = dt.timedelta(days=1),
+                 persist: bool = True):
+        """
+        A store of the holidays of exchanges
+
+        :param path: the directory of the store. Defaults to ~/.gs_quant/holidays
+        :param refresh_interval: how often to fetch the holidays of each exchange again. None never fetches them again
+        :param persist: whether to store holidays in the directory, rather than only in memory
+
+        **Examples**
+
+        Fetch the holidays of several exchanges in one query, and refresh them weekly:
+
+        >>> from gs_quant.datetime import GsCalendar, HolidayStore
+        >>> import datetime as dt
+        >>>
+        >>> GsCalendar.set_holiday_store(HolidayStore(refresh_interval=dt.timedelta(weeks=1)))
+        >>> GsCalendar.prefetch(('NYSE', 'LSE', 'TSE'))
+        """
+        self.__path = path or os.path.join(os.path.expanduser('~'), '.gs_quant', 'holidays')
+        self.__persistent = persist
+        self.__refresh_interval = refresh_interval
+        self.__holidays: Dict[str, Tuple[dt.datetime, np.ndarray]] = {}
+        self.__lock = threading.RLock()
+
+    @property
+    def path(self) -> str:
+        """The directory of the store"""
+        return self.__path
+
+    @property
+    def persist(self) -> bool:
+        """Whether holidays are stored in the directory, rather than only in memory"""
+        return self.__persistent
+
+    @property
+    def refresh_interval(self) -> Optional[dt.timedelta]:
+        """How often to fetch the holidays of each exchange again"""
+        return self.__refresh_interval
+
+    def get(self, exchanges: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        The holidays of each exchange, fetching those not stored (or due to be refreshed) in one query
+
+        :param exchanges: The exchanges
+        :return: A read-only, sorted array of datetime64[D] of the holidays of each exchange
+        """
+        exchanges = tuple(dict.fromkeys(exchanges))
+
+        with self.__lock:
+            now = dt.datetime.now(dt.timezone.utc)
+            if self.__persistent and any(self.__due(e, now) for e in exchanges):
+                # Another process may have fetched them
+                self.__read()
+
+            due = [e for e in exchanges if self.__due(e, now)]
+            if due:
+                fetched = self.__fetch(due)
+                for exchange in due:
+                    holidays = fetched.get(exchange, np.array([], dtype='datetime64[D]'))
+                    holidays.flags.writeable = False
+                    self.__holidays[exchange] = (now, holidays)
+
+                if self.__persistent:
+                    self.__write()
+
+            return {e: self.__holidays[e][1] for e in exchanges}
+
+    def clear(self):
+        """
+        Remove all stored holidays
+        """
+        with self.__lock:
+            self.__holidays.clear()
+            if self.__persistent:
+                for name in os.listdir(self.__path) if os.path.isdir(self.__path) else ():
+                    self.__remove(os.path.join(self.__path, name))
+
+    def __due(self, exchange: str, now: dt.datetime) -> bool:
+        stored = self.__holidays.get(exchange)
+        return stored is None or (self.__refresh_interval is not None and now - stored[0] >= self.__refresh_interval)
+
+    @staticmethod
+    def __fetch(exchanges: Iterable[str]) -> Dict[str, np.ndarray]:
+        exchanges = tuple(exchanges)
+        data = Dataset(Dataset.GS.HOLIDAY).get_data(exchange=exchanges, start=GsCalendar.DATE_LOW_LIMIT,
+                                                    end=GsCalendar.DATE_HIGH_LIMIT)
+        if data.empty:
+            return {}
+
+        dates = data.index.values.astype('datetime64[D]')
+        if 'exchange' in data.columns:
+            names = data['exchange'].values
+            return {e: np.unique(dates[names == e]) for e in exchanges}
+        elif len(exchanges) == 1:
+            return {exchanges[0]: np.unique(dates)}
+
+        # Holidays cannot be attributed to exchanges without their names, so each is fetched alone
+        return {e: h for exchange in exchanges for e, h in HolidayStore.__fetch((exchange,)).items()}
+
+    def __read(self):
+        try:
+            with open(os.path.join(self.__path, 'meta.json')) as f:
+                meta = json.load(f)
+            values = np.load(os.path.join(self.__path, meta['version'] + '.npy'), mmap_mode='r')
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError) as e:
+            _logger.warning('Unable to read stored holidays in {}: {}'.format(self.__path, e))
+            return
+
+        for exchange, (fetched, start, end) in meta['exchanges'].items():
+            fetched = dateutil.parser.isoparse(fetched)
+            stored = self.__holidays.get(exchange)
+            if stored is None or stored[0] < fetched:
+                self.__holidays[exchange] = (fetched, values[start:end])
+
+    def __write(self):
+        exchanges = sorted(self.__holidays)
+        arrays = [self.__holidays[e][1] for e in exchanges]
+        ends = np.cumsum([len(a) for a in arrays], dtype=int)
+        meta = {
+            'version': uuid.uuid4().hex,
+            'exchanges': {e: [self.__holidays[e][0].isoformat(), int(end - len(a)), int(end)]
+                          for e, a, end in zip(exchanges, arrays, ends)}
+        }
+
+        try:
+            os.makedirs(self.__path, exist_ok=True)
+            values = np.concatenate(arrays) if arrays else np.array([], dtype='datetime64[D]')
+            np.save(os.path.join(self.__path, meta['version'] + '.npy'), values)
+
+            # Readers only ever see a complete version, via the atomically replaced meta file
+            meta_file = os.path.join(self.__path, 'meta.json')
+            with open(meta_file + '.tmp', 'w') as f:
+                json.dump(meta, f)
+            os.replace(meta_file + '.tmp', meta_file)
+        except OSError as e:
+            _logger.warning('Unable to store holidays in {}: {}'.format(self.__path, e))
+            return
+
+        # Processes which have mapped previous versions keep them until they are unmapped
+        for name in os.listdir(self.__path):
+            if name.endswith('.npy') and name != meta['version'] + '.npy':
+                self.__remove(os.path.join(self.__path, name))
+
+    @staticmethod
+    def __remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
 
 class GsCalendar:
 
     __CALENDAR_CACHE = {}
+    __CALENDAR_CACHE_LOCK = threading.Lock()
+    __HOLIDAY_STORE = HolidayStore()
 
     DATE_LOW_LIMIT = dt.date(1952, 1, 1)
     DATE_HIGH_LIMIT = dt.date(2052, 12, 31)
@@ -34,34 +205,73 @@ class GsCalendar:
             calendars = (calendars,)
 
         self.__calendars = calendars
-        self.__holidays = set()
+        self.__holidays = None
         self.__business_day_calendars = {}
+        self.__lock = threading.RLock()
 
     @staticmethod
     def get(calendars: Union[str, Tuple]):
         if isinstance(calendars, str):
             calendars = (calendars,)
 
-        return GsCalendar.__CALENDAR_CACHE.setdefault(calendars, GsCalendar(calendars))
+        with GsCalendar.__CALENDAR_CACHE_LOCK:
+            calendar = GsCalendar.__CALENDAR_CACHE.get(calendars)
+            if calendar is None:
+                calendar = GsCalendar(calendars)
+                GsCalendar.__CALENDAR_CACHE[calendars] = calendar
+
+        return calendar
 
     @staticmethod
     def reset():
-        GsCalendar.__CALENDAR_CACHE = set()
+        with GsCalendar.__CALENDAR_CACHE_LOCK:
+            GsCalendar.__CALENDAR_CACHE = {}
+
+    @staticmethod
+    def holiday_store() -> HolidayStore:
+        """The store of the holidays of all calendars"""
+        return GsCalendar.__HOLIDAY_STORE
+
+    @staticmethod
+    def set_holiday_store(store: HolidayStore):
+        """
+        Set the store of the holidays of all calendars, resetting the calendars
+
+        :param store: The store
+        """
+        GsCalendar.__HOLIDAY_STORE = store
+        GsCalendar.reset()
+
+    @staticmethod
+    def prefetch(calendars: Iterable[str]):
+        """
+        Fetch the holidays of calendars which will be used, in one query
+
+        :param calendars: The calendars
+        """
+        GsCalendar.__HOLIDAY_STORE.get(calendars)
 
     def calendars(self) -> Tuple:
         return self.__calendars
 
     @property
     def holidays(self) -> set:
-        if self.__calendars and not self.__holidays:
-            dataset = Dataset(Dataset.GS.HOLIDAY)
-            for holiday_id in self.__calendars:
-                data = dataset.get_data(exchange=holiday_id, start=self.DATE_LOW_LIMIT, end=self.DATE_HIGH_LIMIT)
-                if not data.empty:
-                    self.__holidays.update(data.index.values.astype('datetime64[D]'))
-
-        return self.__holidays
+        return set(self.__holiday_dates())
 
     def business_day_calendar(self, week_mask: str = None) -> np.busdaycalendar:
-        return self.__business_day_calendars.setdefault(week_mask, np.busdaycalendar(
-            weekmask=week_mask or self.DEFAULT_WEEK_MASK, holidays=tuple(self.holidays)))
+        with self.__lock:
+            calendar = self.__business_day_calendars.get(week_mask)
+            if calendar is None:
+                calendar = np.busdaycalendar(weekmask=week_mask or self.DEFAULT_WEEK_MASK,
+                                             holidays=self.__holiday_dates())
+                self.__business_day_calendars[week_mask] = calendar
+
+        return calendar
+
+    def __holiday_dates(self) -> np.ndarray:
+        with self.__lock:
+            if self.__holidays is None:
+                holidays = GsCalendar.holiday_store().get(self.__calendars).values() if self.__calendars else ()
+                self.__holidays = np.unique(np.concatenate(tuple(holidays) + (np.array([], dtype='datetime64[D]'),)))
+
+        return self.__holidays
@@ -14,8 +14,13 @@ specific language governing permissions and limitations
 under the License.
 """
 import datetime as dt
+from functools import lru_cache
 import re
 import string
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
 
 ConstPoints = {
     "O/N": 0,
@@ -88,12 +93,17 @@ DictDayRule = {
 }
 
 
+# Pre-compiled patterns
+__date_rule_pattern = re.compile(DateRuleReg)
+
+
+@lru_cache(maxsize=2 ** 12)
 def relative_days_add(date_rule: str, strict: bool = False) -> float:
     """Change the string in date rule format to the number of days. E.g 1d to 1, 1y to 365, 1m to 30, -1w to -7"""
     days = ''
 
-    if re.search(DateRuleReg, date_rule) is not None:
-        res = re.search(DateRuleReg, date_rule)
+    res = __date_rule_pattern.search(date_rule)
+    if res is not None:
         date_str = res.group(1)
         scale = 0
         num = 0
@@ -116,6 +126,71 @@ def relative_days_add(date_rule: str, strict: bool = False) -> float:
     return 0
 
 
+def __days_to(date_str: str, format_str: str, ref_date: dt.date) -> int:
+    return (dt.datetime.strptime(date_str, format_str).date() - ref_date).days
+
+
+def __fut_month(code: str) -> int:
+    return FutMonth.find(code) + 1
+
+
+def __repo_gc_days(point: str, res, _ref_date: dt.date) -> Optional[float]:
+    if point == 'ON GC':
+        return 0
+    elif point == 'TN GC':
+        return 1
+    elif point == 'SN GC':
+        return 2
+    elif res.group(2).strip() in DictDayRule:
+        return float(res.group(1)) * DictDayRule[res.group(2).strip()]
+
+
+def __relative_days(_point: str, res, _ref_date: dt.date) -> Optional[float]:
+    rule = string.capwords(res.group(2))
+    if rule in DictDayRule:
+        return float(res.group(1)) * DictDayRule[rule]
+
+
+__spike_qe_months = {'QE1': 'Mar', 'QE2': 'Jun', 'QE3': 'Sep', 'QE4': 'Dec'}
+
+# The number of days for each type of point, in order of precedence: (pattern, f(point, match, ref_date) -> days)
+__point_rules = tuple((re.compile(pattern), fn) for pattern, fn in (
+    # TODO: check whether required
+    (InflVolReg, lambda p, r, d: {'Caplet': 0, 'ZCCap': 1, 'Swaption': 2, 'ZCSwo': 3}.get(r.group(1))),
+    (CopulaReg, lambda p, r, d: None),
+    # TODO: check whether required
+    (SeasonalFrontReg, lambda p, r, d: 0 if r.group(1) == 'Front' else 1),
+    # TODO: to confirm the behavior
+    (MMMReg, lambda p, r, d: __days_to('1' + r.group(1) + '2000', '%d%b%Y', d)),
+    (EuroOrFraReg, lambda p, r, d: __days_to('15' + r.group(1) + r.group(2), '%d%b%y', d)),
+    (RDatePartReg, lambda p, r, d: relative_days_add(r.group(1))),
+    (CashFXReg, lambda p, r, d: relative_days_add(r.group(1))),
+    (PricerBFReg, lambda p, r, d: relative_days_add(r.group(1))),
+    (FRAxReg, lambda p, r, d: relative_days_add(r.group(1) + 'm')),
+    (SpikeQEReg, lambda p, r, d: __days_to('1' + __spike_qe_months[r.group(1)] + r.group(2), '%d%b%Y', d)),
+    (MMMYYYYReg, lambda p, r, d: __days_to('1' + r.group(1), '%d%b%Y', d)),
+    (DDMMMYYYYReg, lambda p, r, d: __days_to(r.group(1), '%d%b%Y', d)),
+    (NumberReg, lambda p, r, d: float(r.group(1))),
+    (FloatingYear, lambda p, r, d: 365 * float(r.group(1))),
+    (PricerCoordRegI, lambda p, r, d: float(r.group(2))),
+    (PricerCoordRegII, lambda p, r, d: float(r.group(2))),
+    (PricerBondSpreadReg, lambda p, r, d: None),
+    (LYYReg, lambda p, r, d: __days_to(r.group(2) + '-' + str(__fut_month(r.group(1))) + '-1', '%y-%m-%d', d)),
+    (DatePairReg, lambda p, r, d: __days_to(r.group(2), '%Y%m%d', d)),
+    (DatePairReg2, lambda p, r, d: __days_to(r.group(2), '%Y%m%d', d)),
+    (MMMYYReg, lambda p, r, d: __days_to('1' + r.group(1) + r.group(2), '%d%b%y', d)),
+    (FXVolAddonParmsReg, lambda p, r, d: None),
+    (BondCoordReg, lambda p, r, d: __days_to(r.group(2), '%d/%m/%Y', d)),
+    # TODO: to confirm the behavior
+    (BondFutReg, lambda p, r, d: __days_to(str(d.year) + '-' + str(__fut_month(r.group(1))) + '-1', '%Y-%m-%d', d)),
+    # TODO: to confirm the behavior
+    (FFFutReg, lambda p, r, d: __days_to(str(d.year) + '-' + str(__fut_month(r.group(1))) + '-1', '%Y-%m-%d', d)),
+    (RepoGCReg, __repo_gc_days),
+    (RelativeReg, __relative_days),
+    (DDMMMYYReg, lambda p, r, d: __days_to(r.group(1), '%d%b%y', d))
+))
+
+
 def point_sort_order(point: str, ref_date: dt.date = dt.date.today()) -> float:
     """
     Calculates a number that can be used to sort Mkt Points by it.
@@ -133,6 +208,11 @@ def point_sort_order(point: str, ref_date: dt.date = dt.date.today()) -> float:
     if not point or not isinstance(point, str):
         return 0
 
+    return __point_sort_order(point, ref_date)
+
+
+@lru_cache(maxsize=2 ** 16)
+def __point_sort_order(point: str, ref_date: dt.date) -> float:
     const_value = ConstPoints.get(point.upper())
     if const_value is not None:
         return const_value
@@ -145,174 +225,31 @@ def point_sort_order(point: str, ref_date: dt.date = dt.date.today()) -> float:
 
         return first + (0.1 * sum(point_sort_order(p, ref_date) for p in parts[1:]) / first)
 
-    days = None
-
-    if point == 'o/n':
-        days = 0
-    elif point == 't/n':
-        days = 0.1
-    elif point == 'Cash Stub':
-        days = 1.1
-    elif point == 'CashStub':
-        days = 1.1
-    elif point == 'Default':
-        days = 0
-    elif point == 'In':
-        days = 0.1
-    elif point == 'Out':
-        days = 0.2
-    elif re.search(InflVolReg, point) is not None:
-        # TODO: check whether required
-        res = re.search(InflVolReg, point)
-        inflVol = res.group(1)
-        if inflVol == 'Caplet':
-            days = 0
-        elif inflVol == 'ZCCap':
-            days = 1
-        elif inflVol == 'Swaption':
-            days = 2
-        elif inflVol == 'ZCSwo':
-            days = 3
-    elif re.search(CopulaReg, point) is not None:
-        pass
-    elif re.search(SeasonalFrontReg, point) is not None:
-        # TODO: check whether required
-        res = re.search(SeasonalFrontReg, point)
-        if res.group(1) == 'Front':
-            days = 0
-        else:
-            days = 1
-    elif re.search(MMMReg, point) is not None:
-        # TODO: to confirm the behavior
-        res = re.search(MMMReg, point)
-        date_str = '1' + res.group(1) + '2000'
-        format_str = '%d%b%Y'
-        days = (dt.datetime.strptime(date_str, format_str).date() - ref_date).days
-    elif re.search(EuroOrFraReg, point) is not None:
-        res = re.search(EuroOrFraReg, point)
-        date_str = '15' + res.group(1) + res.group(2)
-        format_str = '%d%b%y'
-        days = (dt.datetime.strptime(date_str, format_str).date() - ref_date).days
-    elif re.search(RDatePartReg, point) is not None:
-        res = re.search(RDatePartReg, point)
-        date_str = res.group(1)
-        days = relative_days_add(date_str)
-    elif re.search(CashFXReg, point) is not None:
-        res = re.search(CashFXReg, point)
-        date_str = res.group(1)
-        days = relative_days_add(date_str)
-    elif re.search(PricerBFReg, point) is not None:
-        res = re.search(PricerBFReg, point)
-        date_str = res.group(1)
-        days = relative_days_add(date_str)
-    elif re.search(FRAxReg, point) is not None:
-        res = re.search(FRAxReg, point)
-        date_str = res.group(1) + 'm'
-        days = relative_days_add(date_str)
-    elif re.search(SpikeQEReg, point) is not None:
-        res = re.search(SpikeQEReg, point)
-        QE = res.group(1)
-        if QE == 'QE1':
-            month = "Mar"
-        elif QE == 'QE2':
-            month = "Jun"
-        elif QE == 'QE3':
-            month = "Sep"
-        elif QE == 'QE4':
-            month = "Dec"
-        date_str = "1" + month + res.group(2)
-        format_str = '%d%b%Y'
-        days = (dt.datetime.strptime(date_str, format_str).date() - ref_date).days
-    elif re.search(MMMYYYYReg, point) is not None:
-        res = re.search(MMMYYYYReg, point)
-        date_str = '1' + res.group(1)
-        format_str = '%d%b%Y'
-        days = (dt.datetime.strptime(date_str, format_str).date() - ref_date).days
-    elif re.search(DDMMMYYYYReg, point) is not None:
-        res = re.search(DDMMMYYYYReg, point)
-        date_str = res.group(1)
-        format_str = '%d%b%Y'
-        days = (dt.datetime.strptime(date_str, format_str).date() - ref_date).days
-    elif re.search(NumberReg, point) is not None:
-        res = re.search(NumberReg, point)
-        days = float(res.group(1))
-    elif re.search(FloatingYear, point) is not None:
-        res = re.search(FloatingYear, point)
-        year = float(res.group(1))
-        days = 365 * year
-    elif re.search(PricerCoordRegI, point) is not None:
-        res = re.search(PricerCoordRegI, point)
-        days = float(res.group(2))
-    elif re.search(PricerCoordRegII, point) is not None:
-        res = re.search(PricerCoordRegII, point)
-        days = float(res.group(2))
-    elif re.search(PricerBondSpreadReg, point) is not None:
-        pass
-    elif re.search(LYYReg, point) is not None:
-        res = re.search(LYYReg, point)
-        month = FutMonth.find(res.group(1)) + 1
-        year = res.group(2)
-        date_str = year + '-' + str(month) + '-1'
-        format_str = '%y-%m-%d'
-        days = (dt.datetime.strptime(date_str, format_str).date() - ref_date).days
-    elif re.search(DatePairReg, point) is not None:
-        res = re.search(DatePairReg, point)
-        date_str = res.group(2)
-        format_str = '%Y%m%d'
-        days = (dt.datetime.strptime(date_str, format_str).date() - ref_date).days
-    elif re.search(DatePairReg2, point) is not None:
-        res = re.search(DatePairReg2, point)
-        date_str = res.group(2)
-        format_str = '%Y%m%d'
-        days = (dt.datetime.strptime(date_str, format_str).date() - ref_date).days
-    elif re.search(MMMYYReg, point) is not None:
-        res = re.search(MMMYYReg, point)
-        date_str = '1' + res.group(1) + res.group(2)
-        format_str = '%d%b%y'
-        days = (dt.datetime.strptime(date_str, format_str).date() - ref_date).days
-    elif re.search(FXVolAddonParmsReg, point) is not None:
-        pass
-    elif re.search(BondCoordReg, point) is not None:
-        res = re.search(BondCoordReg, point)
-        date_str = res.group(2)
-        format_str = '%d/%m/%Y'
-        days = (dt.datetime.strptime(date_str, format_str).date() - ref_date).days
-    elif re.search(BondFutReg, point) is not None:
-        # TODO: to confirm the behavior
-        res = re.search(BondFutReg, point)
-        month = FutMonth.find(res.group(1)) + 1
-        date_str = str(ref_date.year) + "-" + str(month) + "-1"
-        format_str = '%Y-%m-%d'
-        days = (dt.datetime.strptime(date_str, format_str).date() - ref_date).days
-    elif re.search(FFFutReg, point) is not None:
-        # TODO: to confirm the behavior
-        res = re.search(FFFutReg, point)
-        month = FutMonth.find(res.group(1)) + 1
-        date_str = str(ref_date.year) + "-" + str(month) + "-1"
-        format_str = '%Y-%m-%d'
-        days = (dt.datetime.strptime(date_str, format_str).date() - ref_date).days
-    elif re.search(RepoGCReg, point) is not None:
-        res = re.search(RepoGCReg, point)
-        if point == 'ON GC':
-            days = 0
-        elif point == 'TN GC':
-            days = 1
-        elif point == 'SN GC':
-            days = 2
-        elif res.group(2).strip() in DictDayRule:
-            scale = DictDayRule[res.group(2).strip()]
-            num = float(res.group(1))
-            days = num * scale
-    elif re.search(RelativeReg, point) is not None:
-        res = re.search(RelativeReg, point)
-        rule = string.capwords(res.group(2))
-        if rule in DictDayRule:
-            scale = DictDayRule[rule]
-            num = float(res.group(1))
-            days = num * scale
-    elif re.search(DDMMMYYReg, point) is not None:
-        res = re.search(DDMMMYYReg, point)
-        date_str = res.group(1)
-        format_str = '%d%b%y'
-        days = (dt.datetime.strptime(date_str, format_str).date() - ref_date).days
-    return days
+    for pattern, fn in __point_rules:
+        res = pattern.search(point)
+        if res is not None:
+            return fn(point, res, ref_date)
+
+    return None
+
+
+def point_sort_orders(points: Union[np.ndarray, Iterable[str]], ref_date: dt.date = dt.date.today()) -> np.ndarray:
+    """
+    Calculates numbers that can be used to sort an array of Mkt Points by.
+
+    :param points: The point strings from MarketDataCoordinates.
+    :param ref_date: Reference date, normally the pricing date.
+    :return: An array of the number of days from the reference date to the date specified by each point string (NaN
+    for points which cannot be ordered)
+
+    **Examples**
+
+    >>> import datetime as dt
+    >>> import numpy as np
+    >>> days = point_sort_orders(np.array(['1y', '3m', 'Dec20']), ref_date=dt.date.today())
+    """
+    codes, uniques = pd.factorize(np.asarray(points, dtype=object))
+
+    # Missing points (code -1) take the last value, consistent with point_sort_order
+    orders = np.array([point_sort_order(p, ref_date) for p in uniques] + [0], dtype=float)
+    return orders[codes]
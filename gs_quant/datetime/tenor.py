@@ -0,0 +1,201 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+import re
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from gs_quant.datetime.date import _business_day_calendar, _to_days
+from gs_quant.datetime.point import FutMonth
+
+__tenor_pattern = re.compile(r'(?:[+-]?\d+[dwmyb])+', re.IGNORECASE)
+__tenor_part_pattern = re.compile(r'([+-]?\d+)([dwmyb])', re.IGNORECASE)
+__imm_pattern = re.compile(r'IMM([1-9]\d*)', re.IGNORECASE)
+__contract_pattern = re.compile(r'([{}])(\d{{2}})'.format(FutMonth))
+
+# The IMM month of a tenor which is not a contract code
+__NO_MONTH = np.iinfo(np.int64).min
+
+
+class Tenor(NamedTuple):
+
+    """
+    A parsed tenor: a number of months and days followed by a number of business days, the nth IMM date after a date,
+    or the IMM date of a month
+    """
+
+    months: int = 0
+    days: int = 0
+    business_days: int = 0
+    imm: int = 0
+    imm_month: Optional[np.datetime64] = None
+
+
+@lru_cache(maxsize=2 ** 12)
+def parse_tenor(tenor: str) -> Tenor:
+    """
+    Parse a tenor string, caching the result
+
+    :param tenor: A tenor, e.g. 3m, 10y, 2b, 1y6m, -1w, IMM2 (the second IMM date after a date) or Z19 (the IMM date of
+    a futures contract month)
+    :return: The parsed tenor
+
+    **Examples**
+
+    >>> parse_tenor('1y6m')
+    Tenor(months=18, days=0, business_days=0, imm=0, imm_month=None)
+    """
+    if not isinstance(tenor, str):
+        raise ValueError('invalid tenor {}'.format(tenor))
+
+    if __tenor_pattern.fullmatch(tenor):
+        months = days = business_days = 0
+        for count, unit in __tenor_part_pattern.findall(tenor):
+            count, unit = int(count), unit.lower()
+            if unit == 'y':
+                months += 12 * count
+            elif unit == 'm':
+                months += count
+            elif unit == 'w':
+                days += 7 * count
+            elif unit == 'd':
+                days += count
+            else:
+                business_days += count
+        return Tenor(months, days, business_days)
+
+    matcher = __imm_pattern.fullmatch(tenor)
+    if matcher:
+        return Tenor(imm=int(matcher.group(1)))
+
+    matcher = __contract_pattern.fullmatch(tenor)
+    if matcher:
+        month = FutMonth.find(matcher.group(1)) + 1
+        return Tenor(imm_month=np.datetime64('20{}-{:02d}'.format(matcher.group(2), month), 'M'))
+
+    raise ValueError('invalid tenor ' + tenor)
+
+
+def add_tenors(dates: Iterable, tenors: Union[str, Iterable[str]], roll: str = 'modifiedfollowing',
+               calendars: Union[str, Tuple[str, ...]] = (), week_mask: Optional[str] = None) -> np.ndarray:
+    """
+    Apply tenors to dates, adjusting the results to business dates
+
+    :param dates: A date, or array of dates (datetime64, or dates)
+    :param tenors: A tenor, or array of tenors for each date (see :func:`parse_tenor`)
+    :param roll: How to adjust dates which are not business dates: following, preceding, modifiedfollowing,
+    modifiedpreceding or raise. Dates offset by business days are first moved to the adjacent business date in the
+    opposite direction, so that 1b after a holiday is the next business date
+    :param calendars: Calendars to use for holidays
+    :param week_mask: Which days are considered weekends (defaults to Saturday and Sunday)
+    :return: The dates (datetime64[D]), or an array of them of the shape of the dates and tenors broadcast together
+
+    Months are added first, moving to the last day of the month where the day does not exist in it (e.g. 1m after
+    31 January is 28 or 29 February), followed by days and then business days. Each distinct tenor is parsed once, and
+    each step is applied to all dates in one numpy operation.
+
+    **Examples**
+
+    >>> import numpy as np
+    >>> dates = np.arange('2019-07-01', '2019-08-01', dtype='datetime64[D]')
+    >>> expiries = add_tenors(dates, '3m', calendars='NYSE')
+    >>> expiries = add_tenors(dates[0], ['1w', '1m', '1y', 'IMM1'], roll='preceding')
+
+    **See also**
+
+    :func:`parse_tenor` :func:`business_day_offset_array`
+    """
+    days = _to_days(dates)
+    codes, table = _tenor_table(tenors)
+    shape = np.broadcast_shapes(days.shape, codes.shape)
+    days = np.broadcast_to(days, shape).ravel()
+    codes = np.broadcast_to(codes, shape).ravel()
+
+    # Each step is skipped unless one of the distinct tenors needs it
+    months, calendar_days, business_days, imm, imm_month = table.T
+    result = days
+    if months.any():
+        # Months, clipped to the length of the month
+        month = days.astype('datetime64[M]')
+        day = days - month.astype('datetime64[D]')
+        month = month + months[codes]
+        length = (month + 1).astype('datetime64[D]') - month.astype('datetime64[D]')
+        result = month.astype('datetime64[D]') + np.minimum(day, length - 1)
+    if calendar_days.any():
+        result = result + calendar_days[codes]
+    if imm.any():
+        result = np.where(imm[codes] > 0, _imm_dates(days, imm[codes]), result)
+    contracts = imm_month != __NO_MONTH
+    if contracts.any():
+        result = np.where(contracts[codes], _third_wednesday(imm_month[codes].astype('datetime64[M]')), result)
+
+    calendar = _business_day_calendar(calendars, week_mask)
+    directions = np.sign(business_days)
+    if len(np.unique(directions)) <= 1:
+        direction = directions[0] if len(directions) else 0
+        result = np.busday_offset(result, business_days[codes], __roll(direction, roll), busdaycal=calendar)
+    else:
+        directions = directions[codes]
+        result = np.array(result)
+        for direction in (-1, 0, 1):
+            mask = directions == direction
+            if mask.any():
+                result[mask] = np.busday_offset(result[mask], business_days[codes[mask]], __roll(direction, roll),
+                                                busdaycal=calendar)
+
+    result = result.reshape(shape)
+    return result[()] if result.ndim == 0 else result
+
+
+def __roll(direction: int, roll: str) -> str:
+    # Business days are counted from the adjacent business date opposite to their direction
+    return roll if direction == 0 else 'preceding' if direction > 0 else 'following'
+
+
+def _tenor_table(tenors: Union[str, Iterable[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    # The index of each tenor among the distinct tenors, and an array of the fields of the distinct tenors
+    if isinstance(tenors, str):
+        return np.zeros((), dtype=np.intp), np.array([_tenor_fields(parse_tenor(tenors))], dtype=np.int64)
+
+    tenors = np.asarray(tenors, dtype=object)
+    codes, uniques = pd.factorize(tenors.ravel())
+    if (codes < 0).any():
+        raise ValueError('invalid tenor {}'.format(tenors.ravel()[codes < 0][0]))
+
+    table = np.array([_tenor_fields(parse_tenor(t)) for t in uniques], dtype=np.int64).reshape(-1, 5)
+    return codes.reshape(tenors.shape), table
+
+
+def _tenor_fields(tenor: Tenor) -> Tuple[int, int, int, int, int]:
+    imm_month = __NO_MONTH if tenor.imm_month is None else tenor.imm_month.astype(np.int64)
+    return tenor.months, tenor.days, tenor.business_days, tenor.imm, imm_month
+
+
+def _third_wednesday(months: np.ndarray) -> np.ndarray:
+    first = months.astype('datetime64[D]')
+    # 1970-01-01 was a Thursday, and Monday is 0
+    weekday = (first.astype(np.int64) + 3) % 7
+    return first + ((2 - weekday) % 7 + 14)
+
+
+def _imm_dates(days: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    # The nth IMM date (third Wednesday of March, June, September or December) after each date
+    month = days.astype('datetime64[M]').astype(np.int64)
+    quarter = month + (2 - month % 12) % 3
+    quarter = np.where(_third_wednesday(quarter.astype('datetime64[M]')) <= days, quarter + 3, quarter)
+    return _third_wednesday((quarter + 3 * (np.maximum(counts, 1) - 1)).astype('datetime64[M]'))
@@ -14,4 +14,7 @@ specific language governing permissions and limitations
 under the License.
 """
 from .core import *
+from .cache import PricingCacheBackend, SqlitePricingCacheBackend
+from .dispatcher import RequestDispatcher
 from .historical import HistoricalPricingContext
+from .planner import RequestPlanner
@@ -0,0 +1,213 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+from abc import ABCMeta, abstractmethod
+import datetime as dt
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Union
+
+from gs_quant.base import Priceable
+from gs_quant.json_encoder import JSONEncoder
+from gs_quant.target.risk import RiskMeasure
+
+_logger = logging.getLogger(__name__)
+
+
+def priceable_content_hash(priceable: Priceable) -> str:
+    """
+    A hash of the content of priceable, which is identical across processes for identical priceables
+
+    :param priceable: The priceable (e.g. instrument)
+    :return: A hex digest
+    """
+    content = json.dumps((type(priceable).__name__, priceable), cls=JSONEncoder, sort_keys=True)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def pricing_cache_key(content_hash: str,
+                      location: str,
+                      risk_measure: RiskMeasure,
+                      pricing_date: dt.date,
+                      market_data_as_of: Union[dt.date, dt.datetime],
+                      scenario=None) -> str:
+    """
+    A key for a cached calc, which is identical across processes for identical inputs
+
+    :param content_hash: The content hash of the priceable, as returned by priceable_content_hash()
+    :param location: The market data location
+    :param risk_measure: The risk measure
+    :param pricing_date: The pricing date
+    :param market_data_as_of: The date/datetime for sourcing market data
+    :param scenario: The scenario (e.g. the current ScenarioContext), if any
+    :return: A hex digest
+    """
+    content = json.dumps((content_hash, location, risk_measure, pricing_date, market_data_as_of, scenario),
+                         cls=JSONEncoder,
+                         sort_keys=True)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class PricingCacheBackend(metaclass=ABCMeta):
+
+    """
+    A store for calc results, keyed by pricing_cache_key(), which PricingCache consults for results not held in memory
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """
+        The cached result for key, or None if it is not present (or has expired)
+        """
+        raise NotImplementedError('Must implement get')
+
+    @abstractmethod
+    def put(self, key: str, result: Any):
+        """
+        Store the result for key
+        """
+        raise NotImplementedError('Must implement put')
+
+    @abstractmethod
+    def clear(self):
+        """
+        Remove all results
+        """
+        raise NotImplementedError('Must implement clear')
+
+
+class SqlitePricingCacheBackend(PricingCacheBackend):
+
+    """
+    An on-disk store for calc results, which may be shared by multiple processes on the same host
+    """
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 max_size: Optional[int] = None,
+                 ttl: Optional[Union[float, dt.timedelta]] = None):
+        """
+        An on-disk store for calc results, which may be shared by multiple processes on the same host
+
+        :param path: the database file. Defaults to ~/.gs_quant/pricing_cache.db
+        :param max_size: the maximum total size (in bytes) of stored results. Least recently used results are evicted
+        once this is exceeded
+        :param ttl: the time to live of results, in seconds or as a timedelta. Expired results are evicted
+
+        **Examples**
+
+        Share results between all processes on this host, keeping at most 1GB of results for 12 hours:
+
+        >>> from gs_quant.markets import PricingCache, SqlitePricingCacheBackend
+        >>> import datetime as dt
+        >>>
+        >>> PricingCache.set_backend(SqlitePricingCacheBackend(max_size=2 ** 30, ttl=dt.timedelta(hours=12)))
+        """
+        self.__path = path or os.path.join(os.path.expanduser('~'), '.gs_quant', 'pricing_cache.db')
+        self.__max_size = max_size
+        self.__ttl = ttl.total_seconds() if isinstance(ttl, dt.timedelta) else ttl
+        self.__local = threading.local()
+
+        directory = os.path.dirname(self.__path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self.__connection as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS results ('
+                               'key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, '
+                               'created REAL NOT NULL, accessed REAL NOT NULL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+
+    @property
+    def path(self) -> str:
+        """The database file"""
+        return self.__path
+
+    @property
+    def max_size(self) -> Optional[int]:
+        """The maximum total size (in bytes) of stored results"""
+        return self.__max_size
+
+    @property
+    def ttl(self) -> Optional[float]:
+        """The time to live of results, in seconds"""
+        return self.__ttl
+
+    @property
+    def __connection(self) -> sqlite3.Connection:
+        # sqlite connections may not be shared between threads
+        connection = getattr(self.__local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.__path, timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self.__local.connection = connection
+
+        return connection
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+
+        with self.__connection as connection:
+            row = connection.execute('SELECT value, created FROM results WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+
+            value, created = row
+            if self.__ttl is not None and now - created > self.__ttl:
+                connection.execute('DELETE FROM results WHERE key = ?', (key,))
+                return None
+
+            connection.execute('UPDATE results SET accessed = ? WHERE key = ?', (now, key))
+
+        try:
+            return pickle.loads(value)
+        except Exception as e:
+            _logger.warning('Unable to read cached result {}: {}'.format(key, e))
+            return None
+
+    def put(self, key: str, result: Any):
+        now = time.time()
+        value = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with self.__connection as connection:
+            connection.execute('INSERT OR REPLACE INTO results (key, value, size, created, accessed) '
+                               'VALUES (?, ?, ?, ?, ?)', (key, value, len(value), now, now))
+            self.__evict(connection, now)
+
+    def clear(self):
+        with self.__connection as connection:
+            connection.execute('DELETE FROM results')
+
+    def __evict(self, connection: sqlite3.Connection, now: float):
+        if self.__ttl is not None:
+            connection.execute('DELETE FROM results WHERE created < ?', (now - self.__ttl,))
+
+        if self.__max_size is not None:
+            excess = (connection.execute('SELECT SUM(size) FROM results').fetchone()[0] or 0) - self.__max_size
+            if excess > 0:
+                evicted = []
+                for key, size in connection.execute('SELECT key, size FROM results ORDER BY accessed, created'):
+                    evicted.append((key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+
+                connection.executemany('DELETE FROM results WHERE key = ?', evicted)
@@ -14,13 +14,15 @@ specific language governing permissions and limitations
 under the License.
 """
 from abc import ABCMeta
-from concurrent.futures import Future, ThreadPoolExecutor
+import backoff
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 import copy
 import datetime as dt
 import functools
 import inflection
 import logging
 import pandas as pd
+import threading
 from typing import Iterable, Optional, Tuple, Union
 import weakref
 
@@ -28,6 +30,9 @@ from gs_quant.base import Priceable
 from gs_quant.context_base import ContextBaseWithDefault
 from gs_quant.datetime.date import business_day_offset
 from gs_quant.session import GsSession
+from .cache import PricingCacheBackend, priceable_content_hash, pricing_cache_key
+from .dispatcher import RequestDispatcher
+from .planner import RequestPlanner
 from gs_quant.target.common import MarketDataCoordinate as __MarketDataCoordinate
 from gs_quant.target.risk import PricingDateAndMarketDataAsOf, RiskMeasure, RiskPosition, RiskRequest
 
@@ -43,13 +48,77 @@ class MarketDataCoordinate(__MarketDataCoordinate):
 
 class PricingCache(metaclass=ABCMeta):
     """
-    Weakref cache for instrument calcs
+    Weakref cache for instrument calcs, optionally backed by a persistent PricingCacheBackend
     """
     __cache = weakref.WeakKeyDictionary()
+    __keys = weakref.WeakKeyDictionary()
+    __backend = None
 
     @classmethod
     def clear(cls):
-        __cache = weakref.WeakKeyDictionary()
+        cls.__cache.clear()
+        cls.__keys.clear()
+
+    @classmethod
+    def backend(cls) -> Optional[PricingCacheBackend]:
+        """The persistent backend, if one has been set"""
+        return cls.__backend
+
+    @classmethod
+    def set_backend(cls, backend: Optional[PricingCacheBackend]):
+        """
+        Set (or, if None, remove) the persistent backend
+
+        :param backend: A store for results, which is consulted for results not held in memory and updated with new
+        results. Results are keyed on the content of the instrument, so are shared by identical instruments
+
+        **Examples**
+
+        >>> from gs_quant.markets import PricingCache, SqlitePricingCacheBackend
+        >>>
+        >>> PricingCache.set_backend(SqlitePricingCacheBackend())
+        """
+        cls.__backend = backend
+
+    @classmethod
+    def __backend_key(cls,
+                      priceable: Priceable,
+                      location: str,
+                      risk_measure: RiskMeasure,
+                      date: dt.date,
+                      market_data_as_of: Union[dt.date, dt.datetime],
+                      scenario) -> str:
+        # The content hash is the expensive part: remember it until the priceable is changed (and so dropped)
+        content_hash = cls.__keys.get(priceable)
+        if content_hash is None:
+            content_hash = priceable_content_hash(priceable)
+            cls.__keys[priceable] = content_hash
+
+        return pricing_cache_key(content_hash, location, risk_measure, date, market_data_as_of, scenario)
+
+    @classmethod
+    def __load(cls,
+               priceable: Priceable,
+               location: str,
+               risk_measure: RiskMeasure,
+               dates: Iterable[dt.date],
+               pricing_and_market_data_as_of: Iterable[PricingDateAndMarketDataAsOf],
+               scenario):
+        if cls.__backend is None:
+            return
+
+        results = cls.__cache.get(priceable, {}).get((location, risk_measure), {})
+        market_data_as_of = {p.pricing_date: p.market_data_as_of for p in pricing_and_market_data_as_of}
+        loaded = {}
+        for date in dates:
+            if date not in results and date in market_data_as_of:
+                result = cls.__backend.get(cls.__backend_key(priceable, location, risk_measure, date,
+                                                             market_data_as_of[date], scenario))
+                if result is not None:
+                    loaded[date] = result
+
+        if loaded:
+            cls.__cache.setdefault(priceable, {}).setdefault((location, risk_measure), {}).update(loaded)
 
     @classmethod
     def dates(cls,
@@ -64,7 +133,24 @@ class PricingCache(metaclass=ABCMeta):
             priceable: Priceable,
             location: str,
             risk_measure: RiskMeasure,
-            dates: Union[dt.date, Iterable[dt.date]]):
+            dates: Union[dt.date, Iterable[dt.date]],
+            pricing_and_market_data_as_of: Iterable[PricingDateAndMarketDataAsOf] = (),
+            scenario=None):
+        """
+        The cached results for dates
+
+        :param priceable: The priceable (e.g. instrument)
+        :param location: The market data location
+        :param risk_measure: The risk measure
+        :param dates: The pricing date, or dates
+        :param pricing_and_market_data_as_of: The market data as of of each pricing date. The backend (if any) is
+        consulted for results of these dates which are not held in memory
+        :param scenario: The scenario, if any, under which results are looked up in the backend
+        :return: The result for a date, or a Series or DataFrame (indexed by date) of the results for dates
+        """
+        cls.__load(priceable, location, risk_measure, (dates,) if isinstance(dates, dt.date) else dates,
+                   pricing_and_market_data_as_of, scenario)
+
         if priceable not in cls.__cache or (location, risk_measure) not in cls.__cache[priceable]:
             return
 
@@ -77,6 +163,9 @@ class PricingCache(metaclass=ABCMeta):
         else:
             if isinstance(next(iter(results.values())), pd.DataFrame):
                 dfs = [results[date].assign(date=date) for date in dates if date in results]
+                if not dfs:
+                    return None
+
                 ret = pd.concat(dfs)
                 return ret.set_index('date')
             else:
@@ -88,23 +177,48 @@ class PricingCache(metaclass=ABCMeta):
             priceable: Priceable,
             location: str,
             risk_measure: RiskMeasure,
-            result: Union[float, str, pd.DataFrame, pd.Series]):
+            result: Union[float, str, pd.DataFrame, pd.Series],
+            pricing_and_market_data_as_of: Tuple[PricingDateAndMarketDataAsOf, ...],
+            scenario=None):
+        """
+        Store a result
+
+        :param priceable: The priceable (e.g. instrument)
+        :param location: The market data location
+        :param risk_measure: The risk measure
+        :param result: The result, which is indexed by date if it is of more than one pricing date
+        :param pricing_and_market_data_as_of: The pricing dates and market data as of of the request which calculated
+        result (rather than those of the current context, as results may be handled on other threads)
+        :param scenario: The scenario, if any, of the request which calculated result
+        """
         cache_results = {}
 
         if isinstance(result, pd.Series):
-            cache_results = dict(zip(result.index.unique(), (result.loc[d] for d in result.index.values)))
-        elif isinstance(result, pd.DataFrame) and len(result.index.values):
-            cache_results = dict(zip(result.index.unique(), (result.loc[d].reset_index(drop=True) for d in result.index.values)))
+            cache_results = dict(zip(result.index.unique(), (result.loc[d] for d in result.index.unique())))
+        elif isinstance(result, pd.DataFrame) and result.index.name == 'date':
+            cache_results = dict(zip(result.index.unique(),
+                                     (result.loc[[d]].reset_index(drop=True) for d in result.index.unique())))
         else:
-            cache_results[PricingContext.current.pricing_date] = result
+            cache_results[pricing_and_market_data_as_of[0].pricing_date] = result
 
         cls.__cache.setdefault(priceable, {}).setdefault((location, risk_measure), {}).update(cache_results)
 
+        if cls.__backend is not None:
+            market_data_as_of = {p.pricing_date: p.market_data_as_of for p in pricing_and_market_data_as_of}
+            for date, date_result in cache_results.items():
+                # Don't persist errors
+                if not isinstance(date_result, str) and date in market_data_as_of:
+                    cls.__backend.put(cls.__backend_key(priceable, location, risk_measure, date,
+                                                        market_data_as_of[date], scenario), date_result)
+
     @classmethod
     def drop(cls, priceable: Priceable):
         if priceable in cls.__cache:
             cls.__cache.pop(priceable)
 
+        if priceable in cls.__keys:
+            cls.__keys.pop(priceable)
+
 
 class PricingContext(ContextBaseWithDefault):
 
@@ -112,13 +226,19 @@ class PricingContext(ContextBaseWithDefault):
     A context for controlling pricing and market data behaviour
     """
 
+    __dispatcher = None
+
     def __init__(self,
                  pricing_date: Optional[dt.date] = None,
                  market_data_as_of: Optional[Union[dt.date, dt.datetime]] = None,
                  market_data_location: Optional[str] = None,
                  is_async: bool = False,
                  is_batch: bool = False,
-                 use_cache: bool = False):
+                 use_cache: bool = False,
+                 max_positions_per_request: Optional[int] = None,
+                 max_in_flight_requests: Optional[int] = None,
+                 retries: int = 0,
+                 request_planner: Optional[RequestPlanner] = None):
         """
         The methods on this class should not be called directly. Instead, use the methods on the instruments, as per the examples
 
@@ -128,6 +248,12 @@ class PricingContext(ContextBaseWithDefault):
         :param is_async: if True, return (a future) immediately. If False, block
         :param is_batch: use for calculations expected to run longer than 3 mins, to avoid timeouts. It can be used with is_aync=True|False
         :param use_cache: store results in the pricing cache
+        :param max_positions_per_request: split requests into chunks of at most this many positions. Default is no limit
+        :param max_in_flight_requests: the maximum number of requests to run concurrently. Default is one at a time,
+        or all at once if is_async
+        :param retries: the number of times to retry a failed request (or chunk of a request)
+        :param request_planner: merges positions with different measures into fewer requests, according to its cost
+        model. Default is to send each distinct set of measures in its own requests
 
         **Examples**
 
@@ -155,6 +281,17 @@ class PricingContext(ContextBaseWithDefault):
         >>>
         >>> while not price_f.done():
         >>>     ...
+
+        For a large portfolio, sent as requests of at most 500 positions, 4 at a time:
+
+        >>> with PricingContext(max_positions_per_request=500, max_in_flight_requests=4, retries=2):
+        >>>     delta_f = [inst.calc(IRDelta) for inst in instruments]
+
+        To send positions with different measures in the same requests, where that is estimated to be cheaper:
+
+        >>> with PricingContext(request_planner=RequestPlanner(request_cost=100)):
+        >>>     price_f = [inst.dollar_price() for inst in instruments]
+        >>>     delta_f = [inst.calc(IRDelta) for inst in instruments[:10]]
         """
         super().__init__()
         self.__pricing_date = pricing_date or dt.date.today()
@@ -165,63 +302,88 @@ class PricingContext(ContextBaseWithDefault):
         self.__is_batch = is_batch
         self.__risk_measures_by_provider_and_position = {}
         self.__futures = {}
+        self.__futures_lock = threading.Lock()
         self.__use_cache = use_cache
+        self.__max_positions_per_request = max_positions_per_request
+        self.__max_in_flight_requests = max_in_flight_requests
+        self.__retries = retries
+        self.__request_planner = request_planner or RequestPlanner(request_cost=0)
 
     def _on_exit(self, exc_type, exc_val, exc_tb):
         self._calc()
 
     def _calc(self):
-        from gs_quant.risk import ScenarioContext
+        from gs_quant.api.risk import RiskApi
 
-        def run_request(request: RiskRequest, session: GsSession):
+        def run_request(risk_provider: RiskApi, request: RiskRequest, session: GsSession):
             calc_result = {}
 
             try:
                 with session:
-                    calc_result = provider.calc(request)
+                    calc_result = backoff.on_exception(backoff.expo, Exception,
+                                                       max_tries=self.__retries + 1)(risk_provider.calc)(request)
             except Exception as e:
                 for risk_measure in request.measures:
                     measure_results = {}
-                    for result_position in risk_request.positions:
+                    for result_position in request.positions:
                         measure_results[result_position] = str(e)
 
                     calc_result[risk_measure] = measure_results
             finally:
-                self._handle_results(calc_result)
-
-        from gs_quant.api.risk import RiskApi
+                self._handle_results(request, calc_result)
 
         def get_batch_results(request: RiskRequest, session: GsSession,
                               batch_provider: RiskApi, batch_result_id: str):
             with session:
                 results = batch_provider.get_results(request, batch_result_id)
-            self._handle_results(results)
+            self._handle_results(request, results)
+
+        dispatcher = PricingContext.__dispatcher
+        if dispatcher is not None and not self.__is_batch:
+            # The dispatcher sends our positions with those of other contexts, and calls us back with the results
+            submitted = []
+            while self.__risk_measures_by_provider_and_position:
+                provider, risk_measures_by_position = self.__risk_measures_by_provider_and_position.popitem()
+                submitted.append(dispatcher.submit(provider, risk_measures_by_position, self._handle_results,
+                                                   self.market_data_location, self._pricing_market_data_as_of,
+                                                   self._scenario, self.__max_positions_per_request, self.__retries,
+                                                   self.__request_planner))
+
+            if not self.__is_async:
+                wait(submitted)
+            return
 
+        risk_requests = []
         batch_results = []
-        pool = ThreadPoolExecutor(len(self.__risk_measures_by_provider_and_position)) if self.__is_async else None
 
         while self.__risk_measures_by_provider_and_position:
             provider, risk_measures_by_position = self.__risk_measures_by_provider_and_position.popitem()
-            positions_by_risk_measures = {}
-            for position, risk_measures in risk_measures_by_position.items():
-                positions_by_risk_measures.setdefault(tuple(risk_measures), []).append(position)
-
-            for risk_measures, positions in positions_by_risk_measures.items():
-                risk_request = RiskRequest(
-                    tuple(positions),
-                    tuple(sorted(risk_measures, key=lambda m: m.name)),
-                    wait_for_results=not self.__is_batch,
-                    pricing_location=self.market_data_location,
-                    scenario=ScenarioContext.current if ScenarioContext.current.scenario is not None else None,
-                    pricing_and_market_data_as_of=self._pricing_market_data_as_of
-                )
-
-                if self.__is_batch:
-                    batch_results.append((provider, risk_request, provider.calc(risk_request)))
-                elif pool:
-                    pool.submit(run_request, risk_request, GsSession.current)
-                else:
-                    run_request(risk_request, GsSession.current)
+
+            # Positions with different measures may share requests, whose unrequested results are discarded
+            for risk_measures, positions in self.__request_planner.plan(risk_measures_by_position,
+                                                                        self.__max_positions_per_request):
+                chunk_size = self.__max_positions_per_request or len(positions)
+                for chunk in (positions[i:i + chunk_size] for i in range(0, len(positions), chunk_size)):
+                    risk_requests.append((provider, RiskRequest(
+                        chunk,
+                        risk_measures,
+                        wait_for_results=not self.__is_batch,
+                        pricing_location=self.market_data_location,
+                        scenario=self._scenario,
+                        pricing_and_market_data_as_of=self._pricing_market_data_as_of
+                    )))
+
+        max_in_flight_requests = self.__max_in_flight_requests or (len(risk_requests) if self.__is_async else 1)
+        pool = ThreadPoolExecutor(min(len(risk_requests), max_in_flight_requests))\
+            if risk_requests and (self.__is_async or max_in_flight_requests > 1) else None
+
+        for provider, risk_request in risk_requests:
+            if self.__is_batch:
+                batch_results.append((provider, risk_request, provider.calc(risk_request)))
+            elif pool:
+                pool.submit(run_request, provider, risk_request, GsSession.current)
+            else:
+                run_request(provider, risk_request, GsSession.current)
 
         for provider, risk_request, result_id in batch_results:
             if pool:
@@ -232,31 +394,74 @@ class PricingContext(ContextBaseWithDefault):
         if pool:
             pool.shutdown(wait=not self.__is_async)
 
-    def _handle_results(self, results: dict):
+    def _handle_results(self, request: RiskRequest, results: dict):
         for risk_measure, position_results in results.items():
             for position, result in position_results.items():
-                if self.__use_cache:
-                    PricingCache.put(position.instrument, self.market_data_location, risk_measure, result)
-                    result = PricingCache.get(position.instrument, self.market_data_location, risk_measure, self.pricing_date)
+                with self.__futures_lock:
+                    positions_for_measure = self.__futures.get(risk_measure, {})
+                    future = positions_for_measure.pop(position, None)
 
-                positions_for_measure = self.__futures[risk_measure]
-                positions_for_measure.pop(position).set_result(result)
+                    if risk_measure in self.__futures and not positions_for_measure:
+                        self.__futures.pop(risk_measure)
 
-                if not positions_for_measure:
-                    self.__futures.pop(risk_measure)
+                if future is None:
+                    # A measure calculated only because the position shared a request with others which asked for it
+                    continue
+
+                if self.__use_cache:
+                    # Results may be handled on other threads, so are stored under the request's dates, not current's
+                    PricingCache.put(position.instrument, self.market_data_location, risk_measure, result,
+                                     request.pricing_and_market_data_as_of, request.scenario)
+                    result = PricingCache.get(position.instrument, self.market_data_location, risk_measure,
+                                              self.pricing_date)
 
-        # Now set an error string for any futures for which results were not returned
-        result = 'Error: no value returned'
-        while self.__futures:
-            _, positions_for_measure = self.__futures.popitem()
-            while positions_for_measure:
-                _, future = positions_for_measure.popitem()
                 future.set_result(result)
 
+        # Now set an error string for any futures in this request for which results were not returned
+        result = 'Error: no value returned'
+        for risk_measure in request.measures:
+            for position in request.positions:
+                with self.__futures_lock:
+                    positions_for_measure = self.__futures.get(risk_measure, {})
+                    future = positions_for_measure.pop(position, None)
+
+                    if risk_measure in self.__futures and not positions_for_measure:
+                        self.__futures.pop(risk_measure)
+
+                if future is not None:
+                    future.set_result(result)
+
+    @classmethod
+    def dispatcher(cls) -> Optional[RequestDispatcher]:
+        """The dispatcher shared by all contexts, if one has been set"""
+        return PricingContext.__dispatcher
+
+    @classmethod
+    def set_dispatcher(cls, dispatcher: Optional[RequestDispatcher]):
+        """
+        Set (or, if None, remove) the dispatcher shared by all contexts
+
+        :param dispatcher: Collects the positions of all contexts in the process (other than batch contexts), and sends
+        those with the same parameters together in batched requests. Contexts' max_positions_per_request, retries and
+        request_planner are among the parameters, while their max_in_flight_requests is replaced by the dispatcher's
+
+        **Examples**
+
+        >>> from gs_quant.markets import PricingContext, RequestDispatcher
+        >>>
+        >>> PricingContext.set_dispatcher(RequestDispatcher(max_latency=0.005, max_positions=500))
+        """
+        PricingContext.__dispatcher = dispatcher
+
     @property
     def _pricing_market_data_as_of(self) -> Tuple[PricingDateAndMarketDataAsOf, ...]:
         return PricingDateAndMarketDataAsOf(self.pricing_date, self.market_data_as_of),
 
+    @property
+    def _scenario(self):
+        from gs_quant.risk import ScenarioContext
+        return ScenarioContext.current if ScenarioContext.current.scenario is not None else None
+
     @property
     def pricing_date(self) -> dt.date:
         """Pricing date"""
@@ -265,12 +470,15 @@ class PricingContext(ContextBaseWithDefault):
     @property
     def market_data_as_of(self) -> Union[dt.date, dt.datetime]:
         """Market data as of"""
+        return self._market_data_as_of_for(self.pricing_date)
+
+    def _market_data_as_of_for(self, pricing_date: dt.date) -> Union[dt.date, dt.datetime]:
         if self.__market_data_as_of:
             return self.__market_data_as_of
-        elif self.pricing_date == dt.date.today():
-            return business_day_offset(self.pricing_date, -1, roll='preceding')
+        elif pricing_date == dt.date.today():
+            return business_day_offset(pricing_date, -1, roll='preceding')
         else:
-            return self.pricing_date
+            return pricing_date
 
     @property
     def market_data_location(self) -> str:
@@ -282,6 +490,11 @@ class PricingContext(ContextBaseWithDefault):
         """Cache results"""
         return self.__use_cache
 
+    @property
+    def request_planner(self) -> RequestPlanner:
+        """Plans which positions and measures are sent in each request"""
+        return self.__request_planner
+
     def calc(self, priceable: Priceable, risk_measure: Union[RiskMeasure, Iterable[RiskMeasure]])\
             -> Union[dict, float, str, pd.DataFrame, pd.Series, Future]:
         """
@@ -311,9 +524,8 @@ class PricingContext(ContextBaseWithDefault):
             if measure_future is None:
                 measure_future = Future()
                 if self.__use_cache:
-                    cached_result = PricingCache.get(priceable, self.market_data_location, risk_measure,
-                                                     self.pricing_date)
-                    if cached_result:
+                    cached_result = self._cached_result(priceable, measure)
+                    if cached_result is not None:
                         measure_future.set_result(cached_result)
 
                 if not measure_future.done():
@@ -334,6 +546,11 @@ class PricingContext(ContextBaseWithDefault):
         else:
             return future
 
+    def _cached_result(self, priceable: Priceable, risk_measure: RiskMeasure)\
+            -> Optional[Union[float, str, pd.DataFrame, pd.Series]]:
+        return PricingCache.get(priceable, self.market_data_location, risk_measure, self.pricing_date,
+                                self._pricing_market_data_as_of, self._scenario)
+
     def resolve_fields(self, priceable: Priceable, in_place: bool) -> Optional[Union[Priceable, Future]]:
         """
         Resolve fields on the priceable which were not supplied. Do not use directly, use via instruments
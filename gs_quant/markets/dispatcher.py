@@ -0,0 +1,261 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import backoff
+
+from gs_quant.session import GsSession
+from gs_quant.target.risk import PricingDateAndMarketDataAsOf, RiskMeasure, RiskPosition, RiskRequest
+from .planner import RequestPlanner
+
+_logger = logging.getLogger(__name__)
+
+ResultHandler = Callable[[RiskRequest, dict], None]
+
+
+class _Batch:
+
+    def __init__(self,
+                 provider,
+                 session: GsSession,
+                 parameters: dict,
+                 max_positions_per_request: int,
+                 retries: int,
+                 request_planner: RequestPlanner,
+                 deadline: float):
+        self.provider = provider
+        self.session = session
+        self.parameters = parameters
+        self.max_positions_per_request = max_positions_per_request
+        self.retries = retries
+        self.request_planner = request_planner
+        self.deadline = deadline
+        self.positions = set()
+        self.submissions: List[Tuple[Mapping[RiskPosition, Iterable[RiskMeasure]], ResultHandler, Future]] = []
+
+
+class RequestDispatcher:
+
+    """
+    Collects the positions to be priced by all pricing contexts in the process, and sends those with the same
+    parameters (session, pricing date, market data, location, scenario, max_positions_per_request, retries and
+    request_planner) together, in batched requests
+    """
+
+    def __init__(self,
+                 max_latency: float = 0.005,
+                 max_positions: int = 500,
+                 max_in_flight_requests: int = 8):
+        """
+        Collects the positions to be priced by all pricing contexts in the process into batched requests
+
+        :param max_latency: the longest time (in seconds) for which positions wait for others to share their request
+        :param max_positions: the number of positions with the same parameters at which they are sent without waiting,
+        and the maximum number of positions per request of contexts which do not set max_positions_per_request
+        :param max_in_flight_requests: the maximum number of requests to run concurrently, which replaces that of each
+        context
+
+        Batch contexts (is_batch=True) send their own requests. The max_positions_per_request, retries and
+        request_planner of contexts apply to their positions, which are only sent with those of contexts with the same
+        settings. Each context's results are those of its own positions and measures: others in the same request are
+        discarded.
+
+        **Examples**
+
+        Send the positions of concurrent contexts (e.g. of the users of a service) together, waiting at most 5ms:
+
+        >>> from gs_quant.markets import PricingContext, RequestDispatcher
+        >>>
+        >>> PricingContext.set_dispatcher(RequestDispatcher(max_latency=0.005, max_positions=500))
+        >>>
+        >>> with PricingContext():
+        >>>     price_f = swap.dollar_price()
+        """
+        self.__max_latency = max_latency
+        self.__max_positions = max_positions
+        self.__max_in_flight_requests = max_in_flight_requests
+        self.__batches: Dict[tuple, _Batch] = {}
+        self.__condition = threading.Condition()
+        self.__pool = None
+        self.__thread = None
+        self.__closed = False
+
+    @property
+    def max_latency(self) -> float:
+        """The longest time (in seconds) for which positions wait for others to share their request"""
+        return self.__max_latency
+
+    @property
+    def max_positions(self) -> int:
+        """The number of positions at which they are sent without waiting, and the maximum per request"""
+        return self.__max_positions
+
+    def submit(self,
+               provider,
+               measures_by_position: Mapping[RiskPosition, Iterable[RiskMeasure]],
+               handler: ResultHandler,
+               pricing_location: str,
+               pricing_and_market_data_as_of: Tuple[PricingDateAndMarketDataAsOf, ...],
+               scenario=None,
+               max_positions_per_request: Optional[int] = None,
+               retries: int = 0,
+               request_planner: Optional[RequestPlanner] = None) -> Future:
+        """
+        Add positions to be priced to the batch of those with the same parameters
+
+        :param provider: The risk provider (e.g. GsRiskApi)
+        :param measures_by_position: The measures to calculate for each position
+        :param handler: Called with each request of the batch and its results
+        :param pricing_location: The market data location
+        :param pricing_and_market_data_as_of: The pricing dates and market data as of
+        :param scenario: The scenario, if any
+        :param max_positions_per_request: The maximum number of positions per request. Default is max_positions
+        :param retries: The number of times to retry a failed request
+        :param request_planner: Merges positions with different measures into fewer requests. Default is to send
+        each distinct set of measures in its own requests
+        :return: A future, whose result is set (to None) once the handler has been called for all requests of the batch
+        """
+        future = Future()
+        session = GsSession.current
+        parameters = {'pricing_location': pricing_location, 'scenario': scenario,
+                      'pricing_and_market_data_as_of': pricing_and_market_data_as_of}
+        max_positions_per_request = max_positions_per_request or self.__max_positions
+        request_planner = request_planner or RequestPlanner(request_cost=0)
+        key = (provider, session, pricing_location, scenario, pricing_and_market_data_as_of, max_positions_per_request,
+               retries, request_planner)
+
+        with self.__condition:
+            if self.__closed:
+                raise RuntimeError('RequestDispatcher has been shut down')
+
+            batch = self.__batches.get(key)
+            if batch is None:
+                batch = self.__batches[key] = _Batch(provider, session, parameters, max_positions_per_request, retries,
+                                                     request_planner, time.monotonic() + self.__max_latency)
+                self.__start()
+
+            batch.submissions.append((measures_by_position, handler, future))
+            batch.positions.update(measures_by_position)
+            full = len(batch.positions) >= self.__max_positions
+            if full:
+                self.__batches.pop(key)
+            else:
+                self.__condition.notify()
+
+        if full:
+            self.__dispatch(batch)
+
+        return future
+
+    def flush(self):
+        """
+        Send all waiting positions now
+        """
+        with self.__condition:
+            batches = list(self.__batches.values())
+            self.__batches.clear()
+
+        for batch in batches:
+            self.__dispatch(batch)
+
+    def shutdown(self, wait: bool = True):
+        """
+        Send all waiting positions, and stop accepting more
+
+        :param wait: whether to wait for all requests to complete
+        """
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify()
+
+        self.flush()
+        if self.__pool is not None:
+            self.__pool.shutdown(wait=wait)
+
+    def __start(self):
+        # Called with the condition held: the pool and timer thread are only created once something is submitted
+        if self.__thread is None:
+            self.__pool = ThreadPoolExecutor(self.__max_in_flight_requests)
+            self.__thread = threading.Thread(target=self.__run_timer, name='RequestDispatcher', daemon=True)
+            self.__thread.start()
+
+    def __run_timer(self):
+        while True:
+            with self.__condition:
+                if self.__closed:
+                    return
+
+                now = time.monotonic()
+                due = [key for key, batch in self.__batches.items() if batch.deadline <= now]
+                batches = [self.__batches.pop(key) for key in due]
+                if not batches:
+                    deadline = min((b.deadline for b in self.__batches.values()), default=None)
+                    self.__condition.wait(None if deadline is None else deadline - now)
+                    continue
+
+            for batch in batches:
+                try:
+                    self.__dispatch(batch)
+                except Exception as e:
+                    _logger.warning('Unable to dispatch requests: {}'.format(e))
+
+    def __dispatch(self, batch: _Batch):
+        measures_by_position = {}
+        for submission_measures, _, _ in batch.submissions:
+            for position, measures in submission_measures.items():
+                measures_by_position.setdefault(position, set()).update(measures)
+
+        chunk_size = batch.max_positions_per_request
+        requests = [RiskRequest(positions[i:i + chunk_size], measures, wait_for_results=True, **batch.parameters)
+                    for measures, positions in batch.request_planner.plan(measures_by_position, chunk_size)
+                    for i in range(0, len(positions), chunk_size)]
+
+        _logger.debug('dispatching %d positions of %d submissions in %d requests', len(measures_by_position),
+                      len(batch.submissions), len(requests))
+
+        remaining = [len(requests)]
+        for request in requests:
+            self.__pool.submit(self.__run_request, batch, request, remaining)
+
+        if not requests:
+            for _, _, future in batch.submissions:
+                future.set_result(None)
+
+    def __run_request(self, batch: _Batch, request: RiskRequest, remaining: List[int]):
+        try:
+            with batch.session:
+                results = backoff.on_exception(backoff.expo, Exception,
+                                               max_tries=batch.retries + 1)(batch.provider.calc)(request)
+        except Exception as e:
+            results = {measure: {position: str(e) for position in request.positions} for measure in request.measures}
+
+        for _, handler, _ in batch.submissions:
+            try:
+                handler(request, results)
+            except Exception as e:
+                _logger.warning('Unable to handle results of request: {}'.format(e))
+
+        with self.__condition:
+            remaining[0] -= 1
+            done = remaining[0] == 0
+
+        if done:
+            for _, _, future in batch.submissions:
+                future.set_result(None)
@@ -19,9 +19,10 @@ import pandas as pd
 from typing import Iterable, Optional, Tuple, Union
 
 from gs_quant.base import Priceable
-from gs_quant.datetime.date import business_day_offset, date_range
+from gs_quant.datetime.date import date_range
 from gs_quant.target.risk import PricingDateAndMarketDataAsOf, RiskMeasure
 from .core import PricingCache, PricingContext
+from .planner import RequestPlanner
 
 
 class HistoricalPricingContext(PricingContext):
@@ -38,7 +39,11 @@ class HistoricalPricingContext(PricingContext):
             dates: Optional[Iterable[dt.date]] = None,
             is_async: bool = False,
             is_batch: bool = False,
-            use_cache: bool = False
+            use_cache: bool = False,
+            max_positions_per_request: Optional[int] = None,
+            max_in_flight_requests: Optional[int] = None,
+            retries: int = 0,
+            request_planner: Optional[RequestPlanner] = None
     ):
         """
         A context for producing valuations over multiple dates
@@ -51,6 +56,12 @@ class HistoricalPricingContext(PricingContext):
         :param is_batch: use for calculations expected to run longer than 3 mins, to avoid timeouts.
         It can be used with is_async=True|False
         :param use_cache: store results in the pricing cache
+        :param max_positions_per_request: split requests into chunks of at most this many positions. Default is no limit
+        :param max_in_flight_requests: the maximum number of requests to run concurrently. Default is one at a time,
+        or all at once if is_async
+        :param retries: the number of times to retry a failed request (or chunk of a request)
+        :param request_planner: merges positions with different measures into fewer requests, according to its cost
+        model. Default is to send each distinct set of measures in its own requests
 
         **Examples**
 
@@ -62,7 +73,10 @@ class HistoricalPricingContext(PricingContext):
         >>>
         >>> price_series = price_f.result()
         """
-        super().__init__(is_async=is_async, is_batch=is_batch, use_cache=use_cache)
+        super().__init__(is_async=is_async, is_batch=is_batch, use_cache=use_cache,
+                         max_positions_per_request=max_positions_per_request,
+                         max_in_flight_requests=max_in_flight_requests, retries=retries,
+                         request_planner=request_planner)
         self.__calc_dates = None
 
         if start is not None:
@@ -97,15 +111,33 @@ class HistoricalPricingContext(PricingContext):
     @property
     def _pricing_market_data_as_of(self) -> Tuple[PricingDateAndMarketDataAsOf, ...]:
         return tuple(
-            PricingDateAndMarketDataAsOf(
-                d, business_day_offset(d, -1, roll='preceding') if d == dt.date.today() else d)
+            PricingDateAndMarketDataAsOf(d, self._market_data_as_of_for(d))
             for d in (self.__calc_dates if self.__calc_dates is not None else self.__date_range))
 
     def calc(self, priceable: Priceable, risk_measure: Union[RiskMeasure, Iterable[RiskMeasure]])\
             -> Union[pd.DataFrame, pd.Series, Future]:
         if self.use_cache:
-            cached_dates = PricingCache.dates(priceable, self.market_data_location, risk_measure) or ()
-            calc_dates = set(self.__date_range).difference(cached_dates)
+            calc_dates = set()
+            for measure in (risk_measure,) if isinstance(risk_measure, RiskMeasure) else risk_measure:
+                calc_dates.update(self.__uncached_dates(priceable, measure))
+
             self.__calc_dates = calc_dates if self.__calc_dates is None else self.__calc_dates | calc_dates
 
         return super().calc(priceable, risk_measure)
+
+    def _cached_result(self, priceable: Priceable, risk_measure: RiskMeasure)\
+            -> Optional[Union[pd.DataFrame, pd.Series]]:
+        # Only use cached results if all dates are present, otherwise they are calculated
+        if self.__uncached_dates(priceable, risk_measure):
+            return None
+
+        return super()._cached_result(priceable, risk_measure)
+
+    def __uncached_dates(self, priceable: Priceable, risk_measure: RiskMeasure) -> set:
+        # Populates the in-memory cache from the backend (if any) for these dates
+        market_data_as_of = tuple(PricingDateAndMarketDataAsOf(d, self._market_data_as_of_for(d))
+                                  for d in self.__date_range)
+        PricingCache.get(priceable, self.market_data_location, risk_measure, self.__date_range, market_data_as_of,
+                         self._scenario)
+        cached_dates = PricingCache.dates(priceable, self.market_data_location, risk_measure) or ()
+        return set(self.__date_range).difference(cached_dates)
@@ -0,0 +1,159 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+import logging
+import math
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from gs_quant.target.risk import RiskMeasure, RiskPosition
+
+_logger = logging.getLogger(__name__)
+
+RequestGroup = Tuple[Tuple[RiskMeasure, ...], Tuple[RiskPosition, ...]]
+
+
+class RequestPlanner:
+
+    """
+    Plans the requests for the measures of positions, merging groups of positions with different measures into
+    requests for all of their measures where that is estimated to be cheaper than sending them separately
+    """
+
+    def __init__(self,
+                 request_cost: float = 100.,
+                 measure_costs: Optional[Mapping[RiskMeasure, float]] = None,
+                 default_measure_cost: float = 1.):
+        """
+        Plans the requests for the measures of positions
+
+        :param request_cost: the cost of each request (its round trip and fixed overhead), in the same units as the
+        cost of calculating a measure for a position. 0 never merges requests
+        :param measure_costs: the cost of calculating each measure for a position, e.g. {IRDelta: 20, DollarPrice: 1}
+        :param default_measure_cost: the cost of calculating measures not in measure_costs for a position
+
+        The cost of a request is request_cost plus the sum of the costs of its measures for each of its positions.
+        Groups of positions are merged, most beneficial first, while that reduces the total cost of the requests. The
+        measures which positions did not ask for are discarded from the results.
+
+        **Examples**
+
+        Send positions with different measures in one request unless that calculates more than 500 extra (equally
+        expensive) measures:
+
+        >>> from gs_quant.markets import PricingContext, RequestPlanner
+        >>>
+        >>> with PricingContext(request_planner=RequestPlanner(request_cost=500)):
+        >>>     price_f = [inst.dollar_price() for inst in instruments]
+        >>>     delta_f = [inst.calc(IRDelta) for inst in instruments[:10]]
+
+        Inspect the requests which would be sent:
+
+        >>> planner = RequestPlanner(measure_costs={IRDelta: 20})
+        >>> for measures, positions in planner.plan(measures_by_position):
+        >>>     print(measures, len(positions), planner.cost(len(positions), measures))
+        """
+        self.__request_cost = request_cost
+        self.__measure_costs = dict(measure_costs or {})
+        self.__default_measure_cost = default_measure_cost
+
+    def __eq__(self, other):
+        return isinstance(other, RequestPlanner) and self.__key() == other.__key()
+
+    def __hash__(self):
+        return hash(self.__key())
+
+    @property
+    def request_cost(self) -> float:
+        """The cost of each request"""
+        return self.__request_cost
+
+    @property
+    def measure_costs(self) -> Dict[RiskMeasure, float]:
+        """The cost of calculating each measure for a position"""
+        return dict(self.__measure_costs)
+
+    @property
+    def default_measure_cost(self) -> float:
+        """The cost of calculating measures not in measure_costs for a position"""
+        return self.__default_measure_cost
+
+    def cost(self, positions: int, measures: Iterable[RiskMeasure],
+             max_positions_per_request: Optional[int] = None) -> float:
+        """
+        The estimated cost of requesting measures for a number of positions
+
+        :param positions: The number of positions
+        :param measures: The measures
+        :param max_positions_per_request: The number of positions after which the positions are split into requests
+        :return: The cost of the requests
+        """
+        return self.__cost(positions, self.__measures_cost(measures), max_positions_per_request)
+
+    def plan(self, measures_by_position: Mapping[RiskPosition, Iterable[RiskMeasure]],
+             max_positions_per_request: Optional[int] = None) -> Tuple[RequestGroup, ...]:
+        """
+        The groups of positions to be requested together, and their measures
+
+        :param measures_by_position: The measures asked for each position
+        :param max_positions_per_request: The number of positions after which a group is split into requests
+        :return: The measures (sorted by name) and positions of each group, which include every position and measure
+        asked for, and the measures of other positions in the group
+        """
+        positions_by_measures: Dict[frozenset, List[RiskPosition]] = {}
+        for position, measures in measures_by_position.items():
+            positions_by_measures.setdefault(frozenset(measures), []).append(position)
+
+        groups = [[measures, positions, self.__measures_cost(measures)]
+                  for measures, positions in positions_by_measures.items()]
+
+        unmerged = len(groups)
+        costs = [self.__cost(len(p), c, max_positions_per_request) for _, p, c in groups]
+        while len(groups) > 1:
+            # The merge of two groups which most reduces the total cost
+            best, best_saving = None, 0.
+            for i in range(len(groups)):
+                for j in range(i + 1, len(groups)):
+                    measures = groups[i][0] | groups[j][0]
+                    measures_cost = self.__measures_cost(measures)
+                    merged_cost = self.__cost(len(groups[i][1]) + len(groups[j][1]), measures_cost,
+                                              max_positions_per_request)
+                    saving = costs[i] + costs[j] - merged_cost
+                    if saving > best_saving:
+                        best, best_saving = (i, j, measures, measures_cost, merged_cost), saving
+
+            if best is None:
+                break
+
+            i, j, measures, measures_cost, merged_cost = best
+            groups[i] = [measures, groups[i][1] + groups[j][1], measures_cost]
+            costs[i] = merged_cost
+            del groups[j], costs[j]
+
+        if len(groups) < unmerged:
+            _logger.debug('merged %d groups of measures into %d, with an estimated cost of %.1f', unmerged,
+                          len(groups), sum(costs))
+
+        return tuple((tuple(sorted(measures, key=lambda m: m.name)), tuple(positions))
+                     for measures, positions, _ in groups)
+
+    def __key(self) -> tuple:
+        return self.__request_cost, frozenset(self.__measure_costs.items()), self.__default_measure_cost
+
+    def __cost(self, positions: int, measures_cost: float, max_positions_per_request: Optional[int]) -> float:
+        requests = math.ceil(positions / max_positions_per_request) if max_positions_per_request else 1
+        return requests * self.__request_cost + positions * measures_cost
+
+    def __measures_cost(self, measures: Iterable[RiskMeasure]) -> float:
+        return sum(self.__measure_costs.get(m, self.__default_measure_cost) for m in measures)
@@ -58,19 +58,15 @@ class PriceableImpl(Priceable, metaclass=ABCMeta):
         self.unresolved: Priceable = None
 
     def __getattribute__(self, name):
-        resolved = False
+        value = super().__getattribute__(name)
 
-        try:
-            resolved = super().__getattribute__('_resolution_info') is not None
-        except AttributeError:
-            pass
+        # Only unset properties of unresolved instruments, while a session is set, need resolving
+        if value is None and name in type(self).properties() and \
+                super().__getattribute__('__dict__').get('_resolution_info') is None and GsSession.current_is_set:
+            self.resolve()
+            value = super().__getattribute__(name)
 
-        if GsSession.current_is_set and not resolved:
-            attr = getattr(super().__getattribute__('__class__'), name, None)
-            if attr and isinstance(attr, property) and super().__getattribute__(name) is None:
-                self.resolve()
-
-        return super().__getattribute__(name)
+        return value
 
     def _property_changed(self, prop: str):
         if self._hash_is_calced:
@@ -15,81 +15,108 @@ under the License.
 """
 from concurrent.futures import Future
 from copy import copy
-from typing import Iterable, List, Optional, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 import dateutil
+import numpy as np
 import pandas as pd
 
 from gs_quant.common import AssetClass
-from gs_quant.datetime import point_sort_order
+from gs_quant.datetime import point_sort_orders
 from gs_quant.markets.core import PricingContext
 from gs_quant.markets.historical import HistoricalPricingContext
 from gs_quant.target.risk import RiskMeasure, RiskMeasureType, RiskMeasureUnit
 
 __column_sort_fns = {
-    'label1': point_sort_order,
-    'mkt_point': point_sort_order,
-    'point': point_sort_order
+    'label1': point_sort_orders,
+    'mkt_point': point_sort_orders,
+    'point': point_sort_orders
 }
 __risk_columns = ('date', 'time', 'marketDataType', 'assetId', 'pointClass', 'point')
 __crif_columns = ('date', 'time', 'riskType', 'amountCurrency', 'qualifier', 'bucket', 'label1', 'label2')
 
 
-def sum_formatter(result: List) -> float:
+def sum_formatter(result: List, dated: Optional[bool] = None) -> float:
     return sum(r.get('value', result[0].get('Val')) for r in result)
 
 
-def __flatten_result(item: Union[List, Tuple]):
+def __flatten_rows(item: Union[List, Tuple]) -> List[dict]:
     rows = []
     for elem in item:
         if isinstance(elem, (list, tuple)):
-            rows.extend(__flatten_result(elem))
+            rows.extend(__flatten_rows(elem))
         else:
-            excluded_fields = ['calculationTime', 'queueingTime']
-            if not issubclass(PricingContext.current.__class__, HistoricalPricingContext):
-                excluded_fields.append('date')
-            else:
-                date = elem.get('date')
-                if date is not None:
-                    elem['date'] = dateutil.parser.isoparse(date).date()
-
-            for field in excluded_fields:
-                if field in elem:
-                    elem.pop(field)
-
             rows.append(elem)
 
     return rows
 
 
-def scalar_formatter(result: List) -> Optional[Union[float, pd.Series]]:
+def __result_columns(item: Union[List, Tuple], dated: Optional[bool]) -> Dict[str, list]:
+    rows = __flatten_rows(item)
+
+    # Collect the union of fields, in the order first seen, then build each column in one pass over the rows
+    fields = {}
+    for row in rows:
+        fields.update(row)
+
+    excluded_fields = {'calculationTime', 'queueingTime'}
+    if dated is None:
+        # Results may be formatted on other threads, so callers which know the request's dates should say so
+        dated = isinstance(PricingContext.current, HistoricalPricingContext)
+
+    if not dated:
+        excluded_fields.add('date')
+
+    columns = {f: [r.get(f) for r in rows] for f in fields if f not in excluded_fields}
+
+    dates = columns.get('date')
+    if dates is not None:
+        # Results typically contain very few distinct dates, so parse each only once
+        parsed = {d: dateutil.parser.isoparse(d).date() for d in set(dates) if d is not None}
+        columns['date'] = [parsed.get(d) for d in dates]
+
+    return columns
+
+
+def __values(columns: Dict[str, list]) -> list:
+    values = columns.get('value')
+    alternative_values = columns.get('Val')
+
+    if values is None:
+        return alternative_values
+    elif alternative_values is None:
+        return values
+
+    return [v if v is not None else a for v, a in zip(values, alternative_values)]
+
+
+def scalar_formatter(result: List, dated: Optional[bool] = None) -> Optional[Union[float, pd.Series]]:
     if not result:
         return None
 
-    result = __flatten_result(result)
+    columns = __result_columns(result, dated)
+    values = __values(columns)
+    dates = columns.get('date')
 
-    if len(result) > 1 and 'date' in result[0]:
-        series = pd.Series(
-            data=[r.get('value', r.get('Val')) for r in result],
-            index=[r['date'] for r in result]
-        )
+    if len(values) > 1 and dates is not None and dates[0] is not None:
+        series = pd.Series(data=values, index=dates)
         return series.sort_index()
     else:
-        return result[0].get('value', result[0].get('Val'))
+        return values[0]
 
 
-def structured_formatter(result: List) -> Optional[pd.DataFrame]:
+def structured_formatter(result: List, dated: Optional[bool] = None) -> Optional[pd.DataFrame]:
     if not result:
         return None
 
-    return sort_risk(pd.DataFrame.from_records(__flatten_result(result)))
+    return sort_risk(pd.DataFrame(__result_columns(result, dated)))
 
 
-def crif_formatter(result: List) -> Optional[pd.DataFrame]:
+def crif_formatter(result: List, dated: Optional[bool] = None) -> Optional[pd.DataFrame]:
     if not result:
         return None
 
-    return sort_risk(pd.DataFrame.from_records(__flatten_result(result)), __crif_columns)
+    return sort_risk(pd.DataFrame(__result_columns(result, dated)), __crif_columns)
 
 
 def aggregate_risk(results: Iterable[Union[pd.DataFrame, Future]], threshold: Optional[float] = None) -> pd.DataFrame:
@@ -165,6 +192,14 @@ def subtract_risk(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
     return aggregate_risk((left, right_negated))
 
 
+def __sort_key(column: str, values: np.ndarray) -> np.ndarray:
+    fn = __column_sort_fns.get(column)
+    if fn:
+        return fn(values)
+    else:
+        return pd.factorize(values, sort=True)[0]
+
+
 def sort_risk(df: pd.DataFrame, by: Tuple[str, ...] = __risk_columns) -> pd.DataFrame:
     """
     Sort bucketed risk
@@ -174,17 +209,13 @@ def sort_risk(df: pd.DataFrame, by: Tuple[str, ...] = __risk_columns) -> pd.Data
     :return: A sorted Dataframe
     """
     columns = tuple(df.columns)
-    indices = [columns.index(c) if c in columns else -1 for c in by]
-    fns = [__column_sort_fns.get(c) for c in columns]
-
-    def cmp(row) -> tuple:
-        return tuple(fns[i](row[i]) if fns[i] else row[i] for i in indices if i != -1)
-
-    data = sorted((tuple(r)[1:] for r in df.to_records()), key=cmp)
     fields = [f for f in by if f in columns]
+    keys = [__sort_key(f, df[f].values) for f in fields]
     fields.extend(f for f in columns if f not in fields)
 
-    result = pd.DataFrame.from_records(data, columns=columns)[fields]
+    # np.lexsort sorts by the last key first, and is stable
+    indices = np.lexsort(keys[::-1]) if keys else np.arange(len(df))
+    result = df.take(indices)[fields].reset_index(drop=True)
     if 'date' in result:
         result = result.set_index('date')
 
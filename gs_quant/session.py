@@ -14,6 +14,7 @@ specific language governing permissions and limitations
 under the License.
 """
 
+import asyncio
 import inspect
 import json
 import os
@@ -34,6 +35,11 @@ from gs_quant.context_base import ContextBase
 from gs_quant.errors import MqError, MqRequestError, MqAuthenticationError, MqUninitialisedError
 from gs_quant.json_encoder import JSONEncoder
 
+try:
+    import aiohttp
+except ModuleNotFoundError:
+    aiohttp = None
+
 API_VERSION = 'v1'
 DEFAULT_APPLICATION = 'gs-quant'
 
@@ -69,14 +75,19 @@ class GsSession(ContextBase):
             ]
 
     def __init__(self, domain: str, api_version: str = API_VERSION, application: str = DEFAULT_APPLICATION, verify=True,
-                 http_adapter: requests.adapters.HTTPAdapter = None):
+                 http_adapter: requests.adapters.HTTPAdapter = None, async_pool_size: int = 100,
+                 async_pool_size_per_host: int = 0):
         super().__init__()
         self._session = None
+        self._async_session = None
+        self.__async_loop = None
         self.domain = domain
         self.api_version = api_version
         self.application = application
         self.verify = verify
         self.http_adapter = http_adapter
+        self.async_pool_size = async_pool_size
+        self.async_pool_size_per_host = async_pool_size_per_host
 
     @backoff.on_exception(lambda: backoff.expo(factor=2),
                           (requests.exceptions.HTTPError, requests.exceptions.Timeout),
@@ -112,28 +123,71 @@ class GsSession(ContextBase):
             self._session.close()
         self._session = None
 
+    async def close_async(self):
+        """
+        Close the connection pool used for asynchronous requests
+        """
+        if self._async_session is not None:
+            await self._async_session.close()
+            self._async_session = None
+
+    async def __init_async(self):
+        if aiohttp is None:
+            raise MqUninitialisedError('aiohttp must be installed to make asynchronous requests')
+
+        if not self._session:
+            self.init()
+
+        loop = asyncio.get_running_loop()
+        if self._async_session is None or self._async_session.closed or self.__async_loop is not loop:
+            previous, previous_loop = self._async_session, self.__async_loop
+            if previous is not None and not previous.closed:
+                # Close the pool of the previous event loop on that loop, rather than leak its connections
+                if previous_loop.is_closed():
+                    await previous.close()
+                elif previous_loop.is_running():
+                    asyncio.run_coroutine_threadsafe(previous.close(), previous_loop)
+                else:
+                    await loop.run_in_executor(None, previous_loop.run_until_complete, previous.close())
+
+            # A pool of keep-alive connections, shared by all requests from this session on this event loop
+            connector = aiohttp.TCPConnector(
+                limit=self.async_pool_size,
+                limit_per_host=self.async_pool_size_per_host,
+                ssl=None if self.verify else False)
+            self._async_session = aiohttp.ClientSession(connector=connector)
+            self.__async_loop = loop
+
     def __unpack(self, results: Union[dict, list], cls: type) -> Union[Base, tuple, dict]:
         if issubclass(cls, Base):
+            decode = cls._decoder()
             if isinstance(results, list):
-                return tuple(None if r is None else cls.from_dict(r) for r in results)
+                return tuple(None if r is None else decode(r) for r in results)
             else:
-                return None if results is None else cls.from_dict(results)
+                return None if results is None else decode(results)
         else:
             if isinstance(results, list):
                 return tuple(cls(**r) for r in results)
             else:
                 return cls(**results)
 
-    def __request(
+    def __unpack_results(self, res: Union[dict, list], cls: Optional[type]) -> Union[Base, tuple, dict]:
+        if cls:
+            if isinstance(res, dict) and 'results' in res:
+                res['results'] = self.__unpack(res['results'], cls)
+            else:
+                res = self.__unpack(res, cls)
+
+        return res
+
+    def __request_args(
             self,
             method: str,
             path: str,
-            payload: Optional[Union[dict, str, Base, pd.DataFrame]] = None,
-            request_headers: Optional[dict] = None,
-            cls: Optional[type] = None,
-            try_auth=True,
-            include_version: bool = True
-    ) -> Union[Base, tuple, dict]:
+            payload: Optional[Union[dict, str, Base, pd.DataFrame]],
+            request_headers: Optional[dict],
+            include_version: bool
+    ) -> Tuple[str, dict]:
         is_dataframe = isinstance(payload, pd.DataFrame)
         if not is_dataframe:
             payload = payload or {}
@@ -155,6 +209,20 @@ class GsSession(ContextBase):
         else:
             raise MqError('not implemented')
 
+        return url, kwargs
+
+    def __request(
+            self,
+            method: str,
+            path: str,
+            payload: Optional[Union[dict, str, Base, pd.DataFrame]] = None,
+            request_headers: Optional[dict] = None,
+            cls: Optional[type] = None,
+            try_auth=True,
+            include_version: bool = True
+    ) -> Union[Base, tuple, dict]:
+        url, kwargs = self.__request_args(method, path, payload, request_headers, include_version)
+
         response = self._session.request(method, url, **kwargs)
         if response.status_code == 401:
             # Expired token or other authorization issue
@@ -165,25 +233,49 @@ class GsSession(ContextBase):
         elif not 199 < response.status_code < 300:
             raise MqRequestError(response.status_code, response.text, context='{} {}'.format(method, url))
         elif 'application/x-msgpack' in response.headers['content-type']:
-            res = msgpack.unpackb(response.content, raw=False)
+            return self.__unpack_results(msgpack.unpackb(response.content, raw=False), cls)
+        elif 'application/json' in response.headers['content-type']:
+            return self.__unpack_results(json.loads(response.text), cls)
+        else:
+            return {'raw': response}
 
-            if cls:
-                if isinstance(res, dict) and 'results' in res:
-                    res['results'] = self.__unpack(res['results'], cls)
-                else:
-                    res = self.__unpack(res, cls)
+    async def __request_async(
+            self,
+            method: str,
+            path: str,
+            payload: Optional[Union[dict, str, Base, pd.DataFrame]] = None,
+            request_headers: Optional[dict] = None,
+            cls: Optional[type] = None,
+            try_auth=True,
+            include_version: bool = True
+    ) -> Union[Base, tuple, dict]:
+        await self.__init_async()
+        url, kwargs = self.__request_args(method, path, payload, request_headers, include_version)
 
-            return res
-        elif 'application/json' in response.headers['content-type']:
-            res = json.loads(response.text)
+        # aiohttp does not share the requests session's headers and cookies, nor accept non-str query values
+        kwargs['headers'] = dict(kwargs.get('headers', self._session.headers))
+        if self._session.cookies:
+            kwargs['cookies'] = self._session.cookies.get_dict()
+        if isinstance(kwargs.get('params'), dict):
+            kwargs['params'] = [(k, str(i)) for k, v in kwargs['params'].items()
+                                for i in (v if isinstance(v, (list, tuple)) else (v,))]
 
-            if cls:
-                if isinstance(res, dict) and 'results' in res:
-                    res['results'] = self.__unpack(res['results'], cls)
-                else:
-                    res = self.__unpack(res, cls)
+        async with self._async_session.request(method, url, **kwargs) as response:
+            await response.read()
 
-            return res
+        if response.status == 401:
+            # Expired token or other authorization issue
+            if not try_auth:
+                raise MqRequestError(response.status, await response.text(), context='{} {}'.format(method, url))
+            self._authenticate()
+            return await self.__request_async(method, path, payload=payload, request_headers=request_headers, cls=cls,
+                                              try_auth=False, include_version=include_version)
+        elif not 199 < response.status < 300:
+            raise MqRequestError(response.status, await response.text(), context='{} {}'.format(method, url))
+        elif 'application/x-msgpack' in response.headers['content-type']:
+            return self.__unpack_results(msgpack.unpackb(await response.read(), raw=False), cls)
+        elif 'application/json' in response.headers['content-type']:
+            return self.__unpack_results(json.loads(await response.text()), cls)
         else:
             return {'raw': response}
 
@@ -208,6 +300,30 @@ class GsSession(ContextBase):
         return self.__request('PUT', path, payload=payload, request_headers=request_headers,
                               cls=cls, include_version=include_version)
 
+    async def _get_async(self, path: str, payload: Optional[Union[dict, Base]] = None,
+                         request_headers: Optional[dict] = None, cls: Optional[type] = None,
+                         include_version: bool = True) -> Union[Base, tuple, dict]:
+        return await self.__request_async('GET', path, payload=payload, request_headers=request_headers,
+                                          cls=cls, include_version=include_version)
+
+    async def _post_async(self, path: str, payload: Optional[Union[dict, Base, pd.DataFrame]] = None,
+                          request_headers: Optional[dict] = None, cls: Optional[type] = None,
+                          include_version: bool = True) -> Union[Base, tuple, dict]:
+        return await self.__request_async('POST', path, payload=payload, request_headers=request_headers,
+                                          cls=cls, include_version=include_version)
+
+    async def _delete_async(self, path: str, payload: Optional[Union[dict, Base]] = None,
+                            request_headers: Optional[dict] = None, cls: Optional[type] = None,
+                            include_version: bool = True) -> Union[Base, tuple, dict]:
+        return await self.__request_async('DELETE', path, payload=payload, request_headers=request_headers,
+                                          cls=cls, include_version=include_version)
+
+    async def _put_async(self, path: str, payload: Optional[Union[dict, Base]] = None,
+                         request_headers: Optional[dict] = None, cls: Optional[type] = None,
+                         include_version: bool = True) -> Union[Base, tuple, dict]:
+        return await self.__request_async('PUT', path, payload=payload, request_headers=request_headers,
+                                          cls=cls, include_version=include_version)
+
     @classmethod
     def _config_for_environment(cls, environment):
         if cls.__config is None:
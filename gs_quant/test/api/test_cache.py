@@ -17,11 +17,14 @@ under the License.
 from unittest import mock
 
 import datetime as dt
+import functools
 import pandas as pd
+import time
 
 from gs_quant.api.gs.risk import GsRiskApi
 from gs_quant.instrument import IRSwap, IRSwaption
-from gs_quant.markets import HistoricalPricingContext, PricingCache, PricingContext
+from gs_quant.markets import HistoricalPricingContext, PricingCache, PricingContext, SqlitePricingCacheBackend
+from gs_quant.markets.cache import pricing_cache_key
 import gs_quant.risk as risk
 from gs_quant.session import Environment, GsSession
 
@@ -202,3 +205,124 @@ def test_multiple_measures(mocker):
     subset += (dt.date(2019, 10, 2),)
     cached5 = PricingCache.get(ir_swaption, market_data_location, risk.Price, subset)
     assert len(cached5) == len(subset) - 1
+
+
+@mock.patch.object(GsRiskApi, '_exec')
+def test_cache_backend(mocker, tmp_path):
+    set_session()
+    PricingCache.set_backend(SqlitePricingCacheBackend(str(tmp_path / 'cache.db')))
+
+    try:
+        values = [
+            {'marketDataType': 'IR', 'assetId': 'USD', 'pointClass': 'Swap', 'point': '1y', 'value': 0.01},
+            {'marketDataType': 'IR', 'assetId': 'USD', 'pointClass': 'Swap', 'point': '2y', 'value': 0.015}
+        ]
+        # Measures are requested in name order
+        mocker.return_value = [[values], [[{'value': 0.01}]]]
+
+        with PricingContext(pricing_date=dt.date(2019, 10, 7), use_cache=True):
+            price_f = IRSwap('Pay', '10y', 'DKK').price()
+            delta_f = IRSwap('Pay', '10y', 'DKK').calc(risk.IRDelta)
+
+        assert price_f.result() == 0.01
+        assert len(delta_f.result()) == 2
+        assert mocker.call_count == 1
+
+        # A new, identical instrument should be priced from the backend, even once the in-memory cache is gone
+        PricingCache.clear()
+        with PricingContext(pricing_date=dt.date(2019, 10, 7), use_cache=True):
+            price_f2 = IRSwap('Pay', '10y', 'DKK').price()
+            delta_f2 = IRSwap('Pay', '10y', 'DKK').calc(risk.IRDelta)
+
+        assert mocker.call_count == 1
+        assert price_f2.result() == 0.01
+        assert delta_f2.result().equals(delta_f.result())
+
+        # Different instrument, date or measure should not be found
+        PricingCache.clear()
+        with PricingContext(pricing_date=dt.date(2019, 10, 7), use_cache=True):
+            IRSwap('Pay', '10y', 'EUR').price()
+
+        assert mocker.call_count == 2
+
+        mocker.return_value = [[[{'value': 0.02}]]]
+        with PricingContext(pricing_date=dt.date(2019, 10, 8), use_cache=True):
+            price_f3 = IRSwap('Pay', '10y', 'DKK').price()
+
+        assert mocker.call_count == 3
+        assert price_f3.result() == 0.02
+    finally:
+        PricingCache.set_backend(None)
+        PricingCache.clear()
+
+
+@mock.patch.object(GsRiskApi, '_exec')
+def test_cache_backend_market_data_as_of(mocker, tmp_path):
+    set_session()
+    PricingCache.set_backend(SqlitePricingCacheBackend(str(tmp_path / 'cache.db')))
+
+    try:
+        # Results are handled on the pool's threads, whose current context is the default
+        mocker.return_value = [[[{'value': 1.0}]]]
+        with PricingContext(pricing_date=dt.date(2019, 10, 7), market_data_as_of=dt.date(2019, 1, 2), use_cache=True,
+                            max_in_flight_requests=2):
+            price_f = IRSwap('Pay', '10y', 'DKK').price()
+
+        assert price_f.result() == 1.0
+        assert mocker.call_count == 1
+
+        # Results of other market data should not be found by another process
+        PricingCache.clear()
+        mocker.return_value = [[[{'value': 2.0}]]]
+        with PricingContext(pricing_date=dt.date(2019, 10, 7), use_cache=True, max_in_flight_requests=2):
+            price_f2 = IRSwap('Pay', '10y', 'DKK').price()
+
+        assert mocker.call_count == 2
+        assert price_f2.result() == 2.0
+
+        PricingCache.clear()
+        with PricingContext(pricing_date=dt.date(2019, 10, 7), market_data_as_of=dt.date(2019, 1, 2), use_cache=True,
+                            max_in_flight_requests=2):
+            price_f3 = IRSwap('Pay', '10y', 'DKK').price()
+
+        assert mocker.call_count == 2
+        assert price_f3.result() == 1.0
+    finally:
+        PricingCache.set_backend(None)
+        PricingCache.clear()
+
+
+def test_pricing_cache_key_scenario():
+    key = functools.partial(pricing_cache_key, 'hash', 'LDN', risk.Price, dt.date(2019, 10, 7), dt.date(2019, 10, 4))
+    scenario = risk.ScenarioContext(risk.CarryScenario(time_shift=1))
+
+    assert key() == key(None)
+    assert key(scenario) != key()
+    assert key(scenario) == key(risk.ScenarioContext(risk.CarryScenario(time_shift=1)))
+    assert key(scenario) != key(risk.ScenarioContext(risk.CarryScenario(time_shift=2)))
+
+
+def test_sqlite_backend_eviction(tmp_path):
+    backend = SqlitePricingCacheBackend(str(tmp_path / 'cache.db'), max_size=2000)
+    backend.put('a', 'x' * 900)
+    backend.put('b', 'x' * 900)
+    assert backend.get('a') == 'x' * 900
+
+    # 'b' is the least recently used
+    backend.put('c', 'x' * 900)
+    assert backend.get('b') is None
+    assert backend.get('a') == 'x' * 900
+    assert backend.get('c') == 'x' * 900
+
+    # Results are shared by other instances using the same file
+    other = SqlitePricingCacheBackend(backend.path)
+    assert other.get('a') == 'x' * 900
+
+    backend.clear()
+    assert other.get('a') is None
+
+    backend = SqlitePricingCacheBackend(str(tmp_path / 'ttl.db'), ttl=dt.timedelta(milliseconds=50))
+    backend.put('a', 1.0)
+    assert backend.get('a') == 1.0
+    time.sleep(0.1)
+    assert backend.get('a') is None
@@ -14,6 +14,8 @@ specific language governing permissions and limitations
 under the License.
 """
 import datetime as dt
+import threading
+import time
 
 import pandas as pd
 import pytest
@@ -249,5 +251,59 @@ def test_coordinates_converter():
         GsDataApi._coordinate_from_str("A")
 
 
+def test_query_data_sharding(mocker):
+    asset_ids = ['MA{:017d}'.format(i) for i in range(5)]
+    dates = [dt.date(2019, 1, 1) + dt.timedelta(days=i) for i in range(10)]
+    lock = threading.Lock()
+    in_flight = []
+
+    def post(path, payload):
+        with lock:
+            in_flight.append(path)
+            assert len(in_flight) <= 2
+        time.sleep(0.01)
+
+        ids = payload.where.asset_id
+        data = [{'date': d, 'assetId': a} for d in dates for a in asset_ids
+                if payload.start_date <= d <= payload.end_date and a in ids]
+
+        with lock:
+            in_flight.pop()
+
+        return {'data': data}
+
+    session = GsSession.get(Environment.QA, 'client_id', 'secret')
+    session._session = mocker.MagicMock()
+    mocker.patch.object(session, '_post', side_effect=post)
+    query = GsDataApi.build_query(start=dates[0], end=dates[-1], assetId=asset_ids)
+
+    GsDataApi.set_sharding('TEST_SHARDING', date_shards=3, asset_ids_per_shard=2, max_concurrent=2)
+    try:
+        with session:
+            results = GsDataApi.query_data(query, 'TEST_SHARDING')
+    finally:
+        GsDataApi.remove_sharding('TEST_SHARDING')
+
+    shards = [c[1]['payload'] for c in session._post.call_args_list]
+    assert len(shards) == 9
+    assert sorted({(s.start_date, s.end_date) for s in shards}) == [
+        (dt.date(2019, 1, 1), dt.date(2019, 1, 3)),
+        (dt.date(2019, 1, 4), dt.date(2019, 1, 6)),
+        (dt.date(2019, 1, 7), dt.date(2019, 1, 10))]
+    assert sorted({tuple(s.where.asset_id) for s in shards}) == [
+        tuple(asset_ids[0:2]), tuple(asset_ids[2:4]), tuple(asset_ids[4:])]
+
+    # Results are concatenated in shard order: by date range, then asset ids
+    expected = [{'date': d, 'assetId': a} for r in ((0, 3), (3, 6), (6, 10)) for ids in (0, 2, 4)
+                for d in dates[r[0]:r[1]] for a in asset_ids[ids:ids + 2]]
+    assert results == expected
+
+    # The original query is untouched
+    assert query.start_date == dates[0] and query.end_date == dates[-1] and query.where.asset_id == asset_ids
+
+    with pytest.raises(MqValueError):
+        GsDataApi.set_sharding('TEST_SHARDING', date_shards=0)
+
+
 if __name__ == "__main__":
     pytest.main(args=["test_data.py"])
@@ -14,7 +14,12 @@ specific language governing permissions and limitations
 under the License.
 """
 
+from unittest import mock
+
+import pytest
+
 from gs_quant.instrument import Instrument, IRSwap
+from gs_quant.session import Environment, GsSession
 
 
 def test_from_dict():
@@ -22,3 +27,65 @@ def test_from_dict():
     properties = swap.as_dict()
     new_swap = Instrument.from_dict(properties)
     assert swap == new_swap
+
+
+def test_attribute_aliases():
+    swap = IRSwap('Pay', '10y', 'USD', fixedRate=0.01)
+    assert swap.fixedRate == swap.fixed_rate == 0.01
+
+    swap.notionalAmount = 1e6
+    assert swap.notional_amount == 1e6
+    assert 'notionalAmount' not in swap.__dict__
+
+    # Non-properties are left as they are
+    swap.someAttribute = 1
+    assert swap.__dict__['someAttribute'] == 1
+
+    with pytest.raises(AttributeError):
+        _ = swap.notAProperty
+
+    # Only names of properties are stored in the class's aliases
+    assert swap.FixedRate == 0.01
+    aliases = IRSwap._Base__aliases
+    assert aliases['FixedRate'] == 'fixed_rate'
+    assert 'someAttribute' not in aliases and 'notAProperty' not in aliases
+
+
+def test_resolve_on_access(mocker):
+    from gs_quant.session import OAuth2Session
+    OAuth2Session.init = mock.MagicMock(return_value=None)
+    GsSession.use(Environment.QA, 'client_id', 'secret')
+
+    swap = IRSwap('Pay', '10y', 'USD')
+
+    def resolve(in_place: bool = True):
+        swap.fixed_rate = 0.01
+        swap._resolution_info = {'pricingDate': '2019-01-02'}
+
+    resolve_mock = mocker.patch.object(IRSwap, 'resolve', side_effect=resolve)
+
+    with GsSession.current:
+        assert swap.fixed_rate == 0.01
+        assert swap.clearing_house is None
+        assert swap.fixedRate == 0.01
+
+    # Once resolved, reading a property costs no further resolution
+    assert resolve_mock.call_count == 1
+
+    # Changing a property invalidates the resolution
+    swap.fixed_rate = None
+    with GsSession.current:
+        assert swap.fixed_rate == 0.01
+
+    assert resolve_mock.call_count == 2
+
+
+def test_hash_and_eq():
+    swaps = [IRSwap('Pay', '{}y'.format(t), 'USD', fixedRate=0.01) for t in (1, 2, 1)]
+    assert swaps[0] == swaps[2] and hash(swaps[0]) == hash(swaps[2])
+    assert swaps[0] != swaps[1]
+    assert len(set(swaps)) == 2
+
+    swaps[2].fixed_rate = 0.02
+    assert swaps[0] != swaps[2]
+    assert hash(swaps[0]) != hash(swaps[2])
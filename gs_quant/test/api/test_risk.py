@@ -14,6 +14,8 @@ specific language governing permissions and limitations
 under the License.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import datetime as dt
 from unittest import mock
 
 import pandas as pd
@@ -22,9 +24,11 @@ import gs_quant.risk as risk
 from gs_quant.api.gs.risk import GsRiskApi, RiskModelRequest
 from gs_quant.base import Priceable
 from gs_quant.common import AssetClass
+from gs_quant.datetime import point_sort_order
 from gs_quant.instrument import CommodSwap, EqForward, EqOption, FXOption, IRBasisSwap, IRSwap, IRSwaption, IRCap, \
     IRFloor
-from gs_quant.markets import PricingContext
+from gs_quant.markets import HistoricalPricingContext, PricingCache, PricingContext, RequestDispatcher, \
+    RequestPlanner
 from gs_quant.session import Environment, GsSession
 
 priceables = (
@@ -178,3 +182,268 @@ def test_async_calc(mocker):
 
     prices = tuple(f.result() for f in dollar_price_f)
     assert prices == tuple(0.01 * i for i in range(len(priceables)))
+
+
+@mock.patch.object(GsRiskApi, '_exec')
+def test_chunked_calc(mocker):
+    set_session()
+
+    def results(request: risk.RiskRequest):
+        return [[[{'value': priceables.index(p.instrument) * 0.01}] for p in request.positions]]
+
+    mocker.side_effect = results
+
+    with risk.PricingContext(max_positions_per_request=2, max_in_flight_requests=3):
+        dollar_price_f = [p.dollar_price() for p in priceables]
+
+    prices = tuple(f.result() for f in dollar_price_f)
+    assert prices == tuple(0.01 * i for i in range(len(priceables)))
+    assert mocker.call_count == (len(priceables) + 1) // 2
+    assert all(len(c[0][0].positions) <= 2 for c in mocker.call_args_list)
+
+
+@mock.patch.object(GsRiskApi, '_exec')
+def test_chunked_calc_cached(mocker):
+    set_session()
+    PricingCache.clear()
+
+    def results(request: risk.RiskRequest):
+        return [[[{'value': priceables.index(p.instrument) * 0.01}] for p in request.positions]]
+
+    mocker.side_effect = results
+    expected = tuple(0.01 * i for i in range(len(priceables)))
+
+    try:
+        # Results are handled on the pool's threads, and must be cached under the context's date, not today
+        with risk.PricingContext(pricing_date=dt.date(2019, 10, 7), use_cache=True, max_positions_per_request=2,
+                                 max_in_flight_requests=2):
+            dollar_price_f = [p.dollar_price() for p in priceables]
+
+        assert tuple(f.result() for f in dollar_price_f) == expected
+
+        with risk.PricingContext(pricing_date=dt.date(2019, 10, 8), market_data_as_of=dt.date(2019, 1, 2),
+                                 use_cache=True, is_async=True):
+            dollar_price_f = [p.dollar_price() for p in priceables]
+
+        assert tuple(f.result() for f in dollar_price_f) == expected
+    finally:
+        PricingCache.clear()
+
+
+@mock.patch.object(GsRiskApi, '_exec')
+def test_chunked_historical_calc(mocker):
+    set_session()
+
+    def results(request: risk.RiskRequest):
+        return [[[{'date': d.isoformat(), 'value': priceables.index(p.instrument) + 0.1 * i}
+                  for i, d in enumerate((dt.date(2019, 10, 7), dt.date(2019, 10, 8)))]
+                 for p in request.positions]]
+
+    mocker.side_effect = results
+
+    # Results are formatted on the pool's threads, whose current context is not the historical context
+    with HistoricalPricingContext(dates=(dt.date(2019, 10, 7), dt.date(2019, 10, 8)), max_positions_per_request=2,
+                                  max_in_flight_requests=2):
+        dollar_price_f = [p.dollar_price() for p in priceables]
+
+    for i, f in enumerate(dollar_price_f):
+        assert f.result().to_dict() == {dt.date(2019, 10, 7): i, dt.date(2019, 10, 8): i + 0.1}
+
+
+@mock.patch.object(GsRiskApi, '_exec')
+def test_merged_calc(mocker):
+    set_session()
+
+    def results(request: risk.RiskRequest):
+        return [[[{'value': priceables.index(p.instrument) + request.measures.index(m) * 0.1}]
+                 for p in request.positions] for m in request.measures]
+
+    mocker.side_effect = results
+
+    # Positions asking for different measures share a request, and the measures they did not ask for are discarded
+    with risk.PricingContext(request_planner=RequestPlanner(request_cost=100)):
+        dollar_price_f = [p.dollar_price() for p in priceables]
+        price_f = [p.calc(risk.Price) for p in priceables[:2]]
+
+    assert mocker.call_count == 1
+    request = mocker.call_args[0][0]
+    assert request.measures == (risk.DollarPrice, risk.Price) and len(request.positions) == len(priceables)
+    assert tuple(f.result() for f in dollar_price_f) == tuple(range(len(priceables)))
+    assert tuple(f.result() for f in price_f) == (0.1, 1.1)
+
+    # By default, each distinct set of measures is sent in its own requests
+    mocker.reset_mock()
+    with risk.PricingContext():
+        dollar_price_f = [p.dollar_price() for p in priceables]
+        price_f = [p.calc(risk.Price) for p in priceables[:2]]
+
+    assert sorted(len(c[0][0].positions) for c in mocker.call_args_list) == [2, len(priceables) - 2]
+    assert tuple(f.result() for f in dollar_price_f) == tuple(range(len(priceables)))
+
+
+@mock.patch.object(GsRiskApi, '_exec')
+def test_dispatched_calc(mocker):
+    set_session()
+
+    def results(request: risk.RiskRequest):
+        return [[[{'value': priceables.index(p.instrument) + request.measures.index(m) * 0.1}]
+                 for p in request.positions] for m in request.measures]
+
+    mocker.side_effect = results
+
+    session = GsSession.current
+    planner = RequestPlanner(request_cost=100)
+
+    def price(priceable: Priceable, measure: risk.RiskMeasure):
+        with session, risk.PricingContext(request_planner=planner):
+            future = priceable.calc(measure)
+        return future.result()
+
+    dispatcher = RequestDispatcher(max_latency=0.5)
+    PricingContext.set_dispatcher(dispatcher)
+    try:
+        # Concurrent contexts with the same parameters share a request, and get only the results they asked for
+        with ThreadPoolExecutor(max_workers=len(priceables)) as executor:
+            prices = tuple(executor.map(price, priceables, (risk.DollarPrice,) * (len(priceables) - 1) + (risk.Price,)))
+
+        assert mocker.call_count == 1
+        assert len(mocker.call_args[0][0].positions) == len(priceables)
+        assert prices == tuple(range(len(priceables) - 1)) + (len(priceables) - 0.9,)
+
+        # Contexts with different parameters do not
+        with risk.PricingContext(is_async=True):
+            price_f = priceables[0].dollar_price()
+        with risk.PricingContext(is_async=True, market_data_location='NYC'):
+            nyc_price_f = priceables[1].dollar_price()
+        assert (price_f.result(), nyc_price_f.result()) == (0, 1)
+        assert mocker.call_count == 3
+
+        # A batch is sent without waiting once it has max_positions
+        dispatcher.shutdown()
+        dispatcher = RequestDispatcher(max_latency=60, max_positions=2)
+        PricingContext.set_dispatcher(dispatcher)
+        with risk.PricingContext(is_async=True):
+            price_f = priceables[0].dollar_price()
+        with risk.PricingContext(is_async=True):
+            other_price_f = priceables[1].dollar_price()
+        assert (price_f.result(timeout=5), other_price_f.result(timeout=5)) == (0, 1)
+        assert mocker.call_count == 4
+    finally:
+        PricingContext.set_dispatcher(None)
+        dispatcher.shutdown()
+
+
+@mock.patch.object(GsRiskApi, '_exec')
+def test_dispatched_calc_settings(mocker):
+    set_session()
+    PricingCache.clear()
+
+    def results(request: risk.RiskRequest):
+        return [[[{'value': priceables.index(p.instrument) + request.measures.index(m) * 0.1}]
+                 for p in request.positions] for m in request.measures]
+
+    mocker.side_effect = results
+
+    dispatcher = RequestDispatcher(max_latency=60)
+    PricingContext.set_dispatcher(dispatcher)
+    try:
+        # Results are handled on the dispatcher's threads, and must be cached under the context's date, not today
+        with risk.PricingContext(pricing_date=dt.date(2019, 10, 7), use_cache=True, is_async=True):
+            cached_price_f = priceables[0].dollar_price()
+
+        # Each context's max_positions_per_request, retries and request_planner apply to its positions
+        with risk.PricingContext(pricing_date=dt.date(2019, 10, 7), is_async=True, max_positions_per_request=2):
+            chunked_price_f = [p.dollar_price() for p in priceables[:4]]
+        with risk.PricingContext(pricing_date=dt.date(2019, 10, 7), is_async=True, retries=1):
+            retried_price_f = priceables[4].dollar_price()
+        with risk.PricingContext(pricing_date=dt.date(2019, 10, 7), is_async=True,
+                                 request_planner=RequestPlanner(request_cost=100)):
+            price_f = priceables[5].dollar_price()
+            other_price_f = priceables[6].calc(risk.Price)
+
+        dispatcher.flush()
+        assert cached_price_f.result(timeout=5) == 0
+        assert tuple(f.result(timeout=5) for f in chunked_price_f) == (0, 1, 2, 3)
+        assert retried_price_f.result(timeout=5) == 4
+        assert (price_f.result(timeout=5), other_price_f.result(timeout=5)) == (5, 6.1)
+
+        requests = sorted((len(c[0][0].positions), len(c[0][0].measures)) for c in mocker.call_args_list)
+        assert requests == [(1, 1), (1, 1), (2, 1), (2, 1), (2, 2)]
+    finally:
+        PricingContext.set_dispatcher(None)
+        dispatcher.shutdown()
+        PricingCache.clear()
+
+
+@mock.patch.object(GsRiskApi, '_exec')
+def test_dispatched_historical_calc(mocker):
+    set_session()
+
+    def results(request: risk.RiskRequest):
+        return [[[{'date': d.pricing_date.isoformat(), 'value': priceables.index(p.instrument) + 0.1 * i}
+                  for i, d in enumerate(request.pricing_and_market_data_as_of)]
+                 for p in request.positions]]
+
+    mocker.side_effect = results
+
+    dispatcher = RequestDispatcher(max_latency=60)
+    PricingContext.set_dispatcher(dispatcher)
+    try:
+        # Results are formatted on the dispatcher's threads, whose current context is not the historical context
+        dates = (dt.date(2019, 10, 7), dt.date(2019, 10, 8))
+        with HistoricalPricingContext(dates=dates, is_async=True):
+            dollar_price_f = [p.dollar_price() for p in priceables[:2]]
+        with PricingContext(pricing_date=dates[0], is_async=True):
+            price_f = priceables[2].dollar_price()
+
+        dispatcher.flush()
+        assert [f.result(timeout=5).to_dict() for f in dollar_price_f] == [{dates[0]: 0, dates[1]: 0.1},
+                                                                           {dates[0]: 1, dates[1]: 1.1}]
+        assert price_f.result(timeout=5) == 2
+    finally:
+        PricingContext.set_dispatcher(None)
+        dispatcher.shutdown()
+
+
+@mock.patch('time.sleep')
+@mock.patch.object(GsRiskApi, '_exec')
+def test_chunked_calc_retry(mocker, _sleep):
+    set_session()
+
+    failed = set()
+
+    def results(request: risk.RiskRequest):
+        # Fail the first attempt of each chunk
+        if request.positions not in failed:
+            failed.add(request.positions)
+            raise RuntimeError('timed out')
+
+        return [[[{'value': priceables.index(p.instrument) * 0.01}] for p in request.positions]]
+
+    mocker.side_effect = results
+
+    with risk.PricingContext(max_positions_per_request=4, retries=1):
+        dollar_price_f = [p.dollar_price() for p in priceables]
+
+    assert tuple(f.result() for f in dollar_price_f) == tuple(0.01 * i for i in range(len(priceables)))
+
+    failed.clear()
+    with risk.PricingContext(max_positions_per_request=4):
+        dollar_price_f = [p.dollar_price() for p in priceables]
+
+    assert all(f.result() == 'timed out' for f in dollar_price_f)
+
+
+def test_sort_risk():
+    points = ('10y', '1y', '3m', 'o/n', '2y', 'Dec20', '5y;3m')
+    values = [{'marketDataType': 'IR', 'assetId': asset, 'pointClass': 'Swap', 'point': p, 'value': float(i)}
+              for asset in ('USD', 'EUR') for i, p in enumerate(points)]
+
+    result = risk.sort_risk(pd.DataFrame(values[::-1]))
+
+    ordered = sorted(points, key=point_sort_order)
+    assert tuple(result.assetId) == ('EUR',) * len(points) + ('USD',) * len(points)
+    assert tuple(result.point) == tuple(ordered) * 2
+    assert tuple(result.value) == tuple(float(points.index(p)) for p in ordered) * 2
+    assert tuple(result.columns) == ('marketDataType', 'assetId', 'pointClass', 'point', 'value')
+    assert tuple(result.index) == tuple(range(len(values)))
@@ -14,10 +14,15 @@ specific language governing permissions and limitations
 under the License.
 """
 
+import datetime as dt
 import inspect
 import sys
 
 from gs_quant.base import Base
+from gs_quant.common import AssetClass, AssetType, Currency
+from gs_quant.instrument import Instrument
+from gs_quant.target.assets import Asset
+from gs_quant.target.common import Identifier
 
 
 def classes(module_name) -> list:
@@ -37,3 +42,42 @@ def test_classes():
                 _ = object.__getattribute__(obj, prop_name)
                 if getattr(typ, prop_name).fset is not None:
                     setattr(obj, prop_name, None)
+
+
+def test_from_dict():
+    values = {
+        'id': 'MA4B66MW5E27U8P32SB',
+        'assetClass': 'Equity',
+        'type': 'Index',
+        'name': 'S&P 500 INDEX',
+        'currency': 'USD',
+        'liveDate': '2010-01-04',
+        'createdTime': '2019-05-01T10:11:12.123456789Z',
+        'lastUpdatedTime': 1556705472000,
+        'identifiers': [{'type': 'Ticker', 'value': 'SPX'}],
+        'entitlements': {'view': ['internal'], 'edit': ['guid:1']},
+        'tags': ['a', 'b']
+    }
+
+    asset = Asset.from_dict(dict(values))
+    assert asset.asset_class == AssetClass.Equity
+    assert asset.type == AssetType.Index
+    assert asset.name == 'S&P 500 INDEX'
+    assert asset.id == 'MA4B66MW5E27U8P32SB'
+    assert asset.currency == Currency.USD
+    assert asset.live_date == dt.date(2010, 1, 4)
+    assert asset.created_time == dt.datetime(2019, 5, 1, 10, 11, 12, 123456, tzinfo=dt.timezone.utc)
+    assert asset.last_updated_time == dt.datetime.fromtimestamp(1556705472).isoformat()
+    assert asset.identifiers == (Identifier(type_='Ticker', value='SPX'),)
+    assert asset.entitlements.view == ('internal',)
+    assert asset.tags == ('a', 'b')
+
+    # Decoding is driven by a schema resolved once per class
+    schema = Asset._schema()
+    assert schema is Asset._schema()
+    assert schema.required == ('asset_class', 'type_', 'name')
+    assert ('live_date', 'liveDate') in schema.fields
+    assert Asset._decoder()(dict(values)) == asset
+
+    # Classes which override from_dict are decoded by it
+    assert Instrument._decoder() == Instrument.from_dict
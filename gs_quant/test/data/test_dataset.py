@@ -20,8 +20,9 @@ import pandas as pd
 import pytest
 
 from gs_quant.api.gs.data import GsDataApi
-from gs_quant.data import Dataset
+from gs_quant.data import Dataset, DatasetCache
 from gs_quant.data.utils import construct_dataframe_with_types
+from gs_quant.errors import MqValueError
 
 test_types = {
     'date': 'date',
@@ -206,5 +207,151 @@ def test_get_coverage(get_coverage, get_types):
     assert data.equals(construct_dataframe_with_types(str(Dataset.TR.TREOD), test_coverage_data))
 
 
+def query_data_in_range(query, dataset_id, asset_id_type=None):
+    return [d for d in test_data if query.start_date <= d['date'] <= query.end_date]
+
+
+@pytest.mark.parametrize('prefetch', (False, True))
+def test_iter_data(mocker, prefetch):
+    mocker.patch("gs_quant.data.utils.get_types", return_value=test_types)
+    query_data = mocker.patch.object(GsDataApi, 'query_data', side_effect=query_data_in_range)
+
+    dataset = Dataset(Dataset.TR.TREOD)
+    chunks = list(dataset.iter_data(dt.date(2019, 1, 1), dt.date(2019, 1, 12), chunk=dt.timedelta(days=3),
+                                    prefetch=prefetch, assetId='MA4B66MW5E27U8P32SB'))
+
+    queries = [c[0][0] for c in query_data.call_args_list]
+    assert [(q.start_date, q.end_date) for q in queries] == [
+        (dt.date(2019, 1, 1), dt.date(2019, 1, 3)),
+        (dt.date(2019, 1, 4), dt.date(2019, 1, 6)),
+        (dt.date(2019, 1, 7), dt.date(2019, 1, 9)),
+        (dt.date(2019, 1, 10), dt.date(2019, 1, 12))]
+    assert all(q.where.assetId == 'MA4B66MW5E27U8P32SB' for q in queries)
+
+    # The last chunk has no data, so is skipped
+    assert [len(c) for c in chunks] == [2, 1, 3]
+    assert pd.concat(chunks).equals(construct_dataframe_with_types(str(Dataset.TR.TREOD), test_data))
+
+    chunks = dataset.get_data(dt.date(2019, 1, 1), dt.date(2019, 1, 12), chunk=dt.timedelta(days=5))
+    assert [len(c) for c in chunks] == [3, 3]
+
+
+def test_iter_data_times(mocker):
+    query_data = mocker.patch.object(GsDataApi, 'query_data', return_value=[])
+
+    start = dt.datetime(2019, 1, 2, 9)
+    end = dt.datetime(2019, 1, 2, 17)
+    assert list(Dataset(Dataset.TR.TREOD).iter_data(start, end, chunk=dt.timedelta(hours=3))) == []
+
+    queries = [c[0][0] for c in query_data.call_args_list]
+    assert [(q.start_time, q.end_time) for q in queries] == [
+        (start, dt.datetime(2019, 1, 2, 11, 59, 59, 999000)),
+        (dt.datetime(2019, 1, 2, 12), dt.datetime(2019, 1, 2, 14, 59, 59, 999000)),
+        (dt.datetime(2019, 1, 2, 15), end)]
+
+    with pytest.raises(MqValueError):
+        next(Dataset(Dataset.TR.TREOD).iter_data(dt.date(2019, 1, 2), chunk=dt.timedelta(hours=12)))
+
+
+def test_cached_data(mocker, tmp_path):
+    mocker.patch("gs_quant.data.utils.get_types", return_value=test_types)
+    mocker.patch.object(GsDataApi, 'symbol_dimensions', return_value=('assetId',))
+    revisions = []
+
+    def query_data(query, dataset_id, asset_id_type=None):
+        data = revisions if query.since else test_data
+        return [d for d in data if query.start_date <= d['date'] <= query.end_date and
+                d['assetId'] == query.where.assetId]
+
+    query_data = mocker.patch.object(GsDataApi, 'query_data', side_effect=query_data)
+    expected = construct_dataframe_with_types(str(Dataset.TR.TREOD), test_data)
+
+    cache = DatasetCache(str(tmp_path), revision_interval=None)
+    dataset = Dataset(Dataset.TR.TREOD, cache=cache)
+
+    data = dataset.get_data(dt.date(2019, 1, 2), dt.date(2019, 1, 4), assetId='MA4B66MW5E27U8P32SB')
+    assert data.equals(expected.loc['2019-01-02':'2019-01-04'])
+
+    # Only the missing dates are queried
+    data = dataset.get_data(dt.date(2019, 1, 1), dt.date(2019, 1, 9), assetId='MA4B66MW5E27U8P32SB')
+    assert data.equals(expected)
+    queries = [c[0][0] for c in query_data.call_args_list]
+    assert [(q.start_date, q.end_date) for q in queries] == [
+        (dt.date(2019, 1, 2), dt.date(2019, 1, 4)),
+        (dt.date(2019, 1, 1), dt.date(2019, 1, 1)),
+        (dt.date(2019, 1, 5), dt.date(2019, 1, 9))]
+
+    # Stored data is read by other caches (and processes) with the same path, without querying
+    query_data.reset_mock()
+    dataset = Dataset(Dataset.TR.TREOD, cache=DatasetCache(str(tmp_path), revision_interval=None))
+    data = dataset.get_data(dt.date(2019, 1, 3), dt.date(2019, 1, 8), assetId='MA4B66MW5E27U8P32SB')
+    assert data.equals(expected.loc['2019-01-03':'2019-01-08'])
+    assert query_data.call_count == 0
+
+    # Other queries are stored separately
+    assert dataset.get_data(dt.date(2019, 1, 2), dt.date(2019, 1, 9), assetId='OTHER').empty
+    assert query_data.call_count == 1
+
+    # Revisions to stored data are picked up
+    dataset = Dataset(Dataset.TR.TREOD, cache=DatasetCache(str(tmp_path), revision_interval=dt.timedelta(0)))
+    revisions.append(dict(test_data[1], tradePrice=2448.0))
+    data = dataset.get_data(dt.date(2019, 1, 2), dt.date(2019, 1, 9), assetId='MA4B66MW5E27U8P32SB')
+    since_query = query_data.call_args_list[-1][0][0]
+    assert since_query.since is not None
+    assert (since_query.start_date, since_query.end_date) == (dt.date(2019, 1, 1), dt.date(2019, 1, 9))
+    assert data.loc['2019-01-03', 'tradePrice'] == 2448.0
+    assert len(data) == len(test_data)
+
+    cache.clear()
+    assert not tmp_path.exists() or not any(tmp_path.iterdir())
+
+
+def test_cached_data_not_dated(mocker, tmp_path):
+    mocker.patch("gs_quant.data.utils.get_types", return_value={'time': 'date-time', 'tradePrice': 'number'})
+    query_data = mocker.patch.object(GsDataApi, 'query_data', return_value=[
+        {'time': dt.datetime(2019, 1, 2, 10), 'tradePrice': 2510.03}])
+
+    # Datasets not indexed by date are not stored, and are queried once for the range
+    dataset = Dataset(Dataset.TR.TREOD, cache=DatasetCache(str(tmp_path), revision_interval=None))
+    data = dataset.get_data(dt.date(2019, 1, 2), dt.date(2019, 1, 4))
+    assert data.index.name == 'time' and list(data['tradePrice']) == [2510.03]
+    assert query_data.call_count == 1
+    assert not tmp_path.exists() or not any(tmp_path.iterdir())
+
+
+def test_cached_data_versions(mocker, tmp_path):
+    mocker.patch("gs_quant.data.utils.get_types", return_value=test_types)
+    mocker.patch.object(GsDataApi, 'symbol_dimensions', return_value=('assetId',))
+    mocker.patch.object(GsDataApi, 'query_data', side_effect=lambda query, dataset_id, asset_id_type=None: [
+        d for d in test_data if query.start_date <= d['date'] <= query.end_date])
+
+    dataset = Dataset(Dataset.TR.TREOD, cache=DatasetCache(str(tmp_path / 'main'), revision_interval=None))
+    data = dataset.get_data(dt.date(2019, 1, 2), dt.date(2019, 1, 4), assetId='MA4B66MW5E27U8P32SB')
+
+    # Empty ranges have the same date index as any other
+    for start, end in ((dt.date(2019, 1, 20), dt.date(2019, 1, 21)), (dt.date(2019, 1, 2), dt.date(2019, 1, 1))):
+        empty = dataset.get_data(start, end, assetId='MA4B66MW5E27U8P32SB')
+        assert empty.empty
+        assert (empty.index.name, empty.index.dtype) == (data.index.name, data.index.dtype)
+
+    empty = Dataset(Dataset.TR.TREOD, cache=DatasetCache(str(tmp_path / 'other'), revision_interval=None)).get_data(
+        dt.date(2019, 1, 20), dt.date(2019, 1, 21), assetId='MA4B66MW5E27U8P32SB')
+    assert empty.empty and empty.index.name == 'date'
+
+    # Superseded versions are kept for readers in other processes which have yet to load them, until they are stale
+    def versions():
+        return sorted(d.name for p in tmp_path.glob('main/*/*') for d in p.iterdir() if d.is_dir())
+
+    first = versions()
+    dataset.get_data(dt.date(2019, 1, 2), dt.date(2019, 1, 7), assetId='MA4B66MW5E27U8P32SB')
+    assert len(versions()) == 2 and set(first) < set(versions())
+
+    with mock.patch('gs_quant.data.cache.STALE_VERSION_AGE', dt.timedelta(0)):
+        data = dataset.get_data(dt.date(2019, 1, 2), dt.date(2019, 1, 9), assetId='MA4B66MW5E27U8P32SB')
+
+    assert len(versions()) == 1 and not set(first) & set(versions())
+    assert data.index[-1] == pd.Timestamp(2019, 1, 9)
+
+
 if __name__ == "__main__":
     pytest.main(args=["test_dataset.py"])
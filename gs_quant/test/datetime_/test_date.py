@@ -0,0 +1,76 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gs_quant.datetime import *
+
+
+def test_date_range():
+    # 2019-07-04 is a Thursday, and 2019-07-06 a Saturday
+    begin, end = dt.date(2019, 7, 1), dt.date(2019, 7, 10)
+    weekdays = [begin + dt.timedelta(days=i) for i in range(10) if i not in (5, 6)]
+
+    dates = date_range(begin, end)
+    assert isinstance(dates, DateRange)
+    assert tuple(dates) == tuple(weekdays)
+    assert dates.values.dtype == np.dtype('datetime64[D]')
+    assert dates[0] == begin and dates[-1] == end and isinstance(dates[1], dt.date)
+    assert tuple(dates[1:3]) == tuple(weekdays[1:3])
+    assert dt.date(2019, 7, 3) in dates and dt.date(2019, 7, 6) not in dates
+    assert tuple(reversed(dates)) == tuple(reversed(weekdays))
+    assert tuple(date_range(begin, end, week_mask='1110100')) == tuple(d for d in weekdays if d.weekday() != 3)
+    assert tuple(date_range(begin, begin)) == (begin,)
+
+    assert tuple(date_range(begin, 3)) == tuple(weekdays[:3])
+    assert tuple(date_range(3, dt.date(2019, 7, 7))) == (dt.date(2019, 7, 5), dt.date(2019, 7, 4), dt.date(2019, 7, 3))
+    assert date_range(begin, 3) == date_range(begin, dt.date(2019, 7, 3))
+
+    with pytest.raises(ValueError):
+        date_range(end, begin)
+    with pytest.raises(ValueError):
+        date_range(dt.date(2019, 7, 6), end)
+    with pytest.raises(ValueError):
+        date_range(begin, 'end')
+    with pytest.raises(ValueError):
+        date_range(3, 3)
+
+
+def test_array_helpers():
+    dates = np.arange('2019-06-28', '2019-07-10', dtype='datetime64[D]')
+    objects = tuple(dates.astype(dt.date))
+
+    assert (is_business_day_array(dates) == np.array(is_business_day(objects))).all()
+    assert (is_business_day_array(pd.DatetimeIndex(dates)) == np.is_busday(dates)).all()
+
+    offsets = business_day_offset_array(dates, 2, roll='forward')
+    assert offsets.dtype == np.dtype('datetime64[D]')
+    assert tuple(offsets.astype(dt.date)) == business_day_offset(objects, 2, roll='forward')
+    assert (business_day_offset_array(objects, np.arange(len(dates)), roll='preceding') ==
+            np.busday_offset(dates, np.arange(len(dates)), roll='preceding')).all()
+    assert tuple(prev_business_date_array(dates).astype(dt.date)) == prev_business_date(objects)
+
+    counts = business_day_count_array(dates, dates + 10)
+    assert tuple(counts) == business_day_count(objects, tuple(d + dt.timedelta(days=10) for d in objects))
+
+    # A date range is an array of dates
+    weekdays = date_range(dt.date(2019, 7, 1), dt.date(2019, 7, 10))
+    assert (np.asarray(weekdays) == weekdays.values).all()
+    assert is_business_day_array(weekdays).all()
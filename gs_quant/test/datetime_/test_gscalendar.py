@@ -0,0 +1,111 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gs_quant.data import Dataset
+from gs_quant.datetime import GsCalendar, HolidayStore, business_day_offset
+
+HOLIDAYS = {
+    'NYSE': ['2019-07-04', '2019-12-25'],
+    'LSE': ['2019-08-26', '2019-12-25', '2019-12-26'],
+}
+
+
+def get_data(_self, exchange, start, end):
+    rows = [(d, e) for e in exchange for d in HOLIDAYS.get(e, ())]
+    return pd.DataFrame({'exchange': [e for _, e in rows]},
+                        index=pd.DatetimeIndex([d for d, _ in rows], name='date'))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HolidayStore(str(tmp_path))
+    previous = GsCalendar.holiday_store()
+    GsCalendar.set_holiday_store(store)
+    yield store
+    GsCalendar.set_holiday_store(previous)
+
+
+def test_holiday_store(tmp_path):
+    with mock.patch.object(Dataset, 'get_data', autospec=True, side_effect=get_data) as query:
+        store = HolidayStore(str(tmp_path))
+
+        # Exchanges are fetched in one query
+        holidays = store.get(('NYSE', 'LSE', 'TSE'))
+        assert query.call_count == 1
+        assert query.call_args[1]['exchange'] == ('NYSE', 'LSE', 'TSE')
+        assert holidays['LSE'].tolist() == [dt.date(2019, 8, 26), dt.date(2019, 12, 25), dt.date(2019, 12, 26)]
+        assert len(holidays['TSE']) == 0
+        assert not holidays['NYSE'].flags.writeable
+
+        store.get(('LSE', 'NYSE'))
+        assert query.call_count == 1
+
+        # Another process reads the stored holidays, fetching only those of other exchanges
+        other = HolidayStore(str(tmp_path))
+        assert other.get(('NYSE', 'TSE'))['NYSE'].tolist() == [dt.date(2019, 7, 4), dt.date(2019, 12, 25)]
+        assert query.call_count == 1
+        other.get(('NYSE', 'HKEX'))
+        assert query.call_count == 2 and query.call_args[1]['exchange'] == ('HKEX',)
+        assert len(HolidayStore(str(tmp_path)).get(('HKEX', 'LSE'))['LSE']) == 3
+        assert query.call_count == 2
+
+        # Holidays are fetched again when due to be refreshed
+        refreshed = HolidayStore(str(tmp_path), refresh_interval=dt.timedelta(0))
+        refreshed.get(('NYSE',))
+        assert query.call_count == 3
+
+        # Without persistence, nothing is stored
+        memory = HolidayStore(str(tmp_path / 'memory'), persist=False)
+        memory.get(('NYSE',))
+        assert not (tmp_path / 'memory').exists()
+
+        store.clear()
+        HolidayStore(str(tmp_path)).get(('NYSE',))
+        assert query.call_count == 5
+
+
+def test_calendar(store):
+    with mock.patch.object(Dataset, 'get_data', autospec=True, side_effect=get_data) as query:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            calendars = list(executor.map(lambda _: GsCalendar.get(('NYSE', 'LSE')), range(32)))
+        assert all(c is calendars[0] for c in calendars)
+
+        calendar = calendars[0]
+        assert query.call_count == 0
+
+        # Business day calendars are built on first use, once per week mask
+        assert calendar.business_day_calendar() is calendar.business_day_calendar()
+        assert calendar.business_day_calendar('1111110') is not calendar.business_day_calendar()
+        assert len(calendar.holidays) == 4
+        assert query.call_count == 1
+
+        assert business_day_offset(dt.date(2019, 12, 24), 1, calendars=('NYSE', 'LSE')) == dt.date(2019, 12, 27)
+        assert business_day_offset(dt.date(2019, 7, 3), 1, calendars='NYSE') == dt.date(2019, 7, 5)
+        assert query.call_count == 1
+
+        GsCalendar.prefetch(('TSE', 'HKEX'))
+        assert query.call_count == 2
+        assert len(GsCalendar.get('TSE').holidays) == 0
+        assert (GsCalendar.get(()).business_day_calendar().holidays == np.array([], dtype='datetime64[D]')).all()
+        assert query.call_count == 2
@@ -14,6 +14,8 @@ specific language governing permissions and limitations
 under the License.
 """
 
+import numpy as np
+
 from gs_quant.datetime import *
 
 
@@ -45,3 +47,14 @@ def test_point_sort_order():
         day = dt.date(2019, 1, 1)
         actual = point_sort_order(input, day)
         assert expected == actual
+
+
+def test_point_sort_orders():
+    points = np.array(['1y', '3m', 'Copula', None, 'Jan20', '1y', '20Y;3M', 'QE1-2020', '3m'], dtype=object)
+    day = dt.date(2019, 1, 1)
+    actual = point_sort_orders(points, day)
+
+    assert actual.dtype == float
+    assert np.isnan(actual[2])
+    expected = [point_sort_order(p, day) for p in points]
+    assert np.array_equal(np.delete(actual, 2), np.delete(np.array(expected, dtype=float), 2))
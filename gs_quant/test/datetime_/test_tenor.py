@@ -0,0 +1,77 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gs_quant.datetime import Tenor, add_tenors, parse_tenor
+
+
+def test_parse_tenor():
+    assert parse_tenor('3m') == Tenor(months=3)
+    assert parse_tenor('10Y') == Tenor(months=120)
+    assert parse_tenor('1y6m') == Tenor(months=18)
+    assert parse_tenor('-1w') == Tenor(days=-7)
+    assert parse_tenor('2b') == Tenor(business_days=2)
+    assert parse_tenor('IMM3') == Tenor(imm=3)
+    assert parse_tenor('Z19') == Tenor(imm_month=np.datetime64('2019-12'))
+
+    # Tenors are parsed once
+    assert parse_tenor('3m') is parse_tenor('3m')
+
+    for invalid in ('5z', '', 'm', 'IMM0', 'A19', None):
+        with pytest.raises(ValueError):
+            parse_tenor(invalid)
+
+
+def test_add_tenors():
+    # Tenors of calendar days, weeks, months and years are those of pandas, rolled to business dates
+    dates = pd.date_range('2019-01-01', '2019-12-31', freq='7D')
+    offsets = {'3d': pd.DateOffset(days=3), '9w': pd.DateOffset(weeks=9), '1m': pd.DateOffset(months=1),
+               '2m': pd.DateOffset(months=2), '10y': pd.DateOffset(years=10)}
+    for tenor, offset in offsets.items():
+        expected = (dates + offset).values.astype('datetime64[D]')
+        assert (add_tenors(dates, tenor, roll='raise', week_mask='1111111') == expected).all()
+        assert (add_tenors(dates, tenor, roll='preceding') ==
+                np.busday_offset(expected, 0, roll='preceding')).all()
+
+    # A tenor for each date, or tenors of a date
+    tenors = np.array(list(offsets))[np.arange(len(dates)) % len(offsets)]
+    expected = [(d + offsets[t]).date() for d, t in zip(dates, tenors)]
+    assert list(add_tenors(dates, tenors, roll='raise', week_mask='1111111').astype(dt.date)) == expected
+    assert add_tenors(dt.date(2019, 1, 31), ['1m', '1y']).tolist() == [dt.date(2019, 2, 28), dt.date(2020, 1, 31)]
+
+    # 2019-05-25 is a Saturday, and 2019-03-30 a Saturday at the end of the month
+    assert add_tenors(dt.date(2019, 1, 30), '2m') == np.datetime64('2019-03-29')
+    assert add_tenors(dt.date(2019, 1, 30), '2m', roll='following') == np.datetime64('2019-04-01')
+    assert add_tenors(dt.date(2019, 5, 25), '-1b') == np.datetime64('2019-05-24')
+    assert add_tenors(dt.date(2019, 5, 25), '-3b') == np.datetime64('2019-05-22')
+    assert add_tenors(dt.date(2019, 5, 25), '2b') == np.datetime64('2019-05-28')
+    assert add_tenors(dt.date(2019, 5, 24), '1b', week_mask='1111000') == np.datetime64('2019-05-27')
+
+    # IMM dates are the third Wednesdays of March, June, September and December
+    days = np.array(['2019-03-19', '2019-03-20', '2019-12-31'], dtype='datetime64[D]')
+    assert add_tenors(days, 'IMM1').tolist() == [dt.date(2019, 3, 20), dt.date(2019, 6, 19), dt.date(2020, 3, 18)]
+    assert add_tenors(days, 'IMM2').tolist() == [dt.date(2019, 6, 19), dt.date(2019, 9, 18), dt.date(2020, 6, 17)]
+    assert add_tenors(days, 'H20').tolist() == [dt.date(2020, 3, 18)] * 3
+
+    with pytest.raises(ValueError):
+        add_tenors(days, ['1m', '1y'])
+    with pytest.raises(ValueError):
+        add_tenors(days, ['1m', None, '1y'])
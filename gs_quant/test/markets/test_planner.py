@@ -0,0 +1,48 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+from gs_quant.instrument import IRSwap
+from gs_quant.markets import RequestPlanner
+from gs_quant.risk import DollarPrice, IRDelta, IRVega, RiskPosition
+
+positions = tuple(RiskPosition(IRSwap('Pay', '{}y'.format(i + 1), 'USD'), 1) for i in range(10))
+
+
+def by_name(*measures):
+    return tuple(sorted(measures, key=lambda m: m.name))
+
+
+def test_plan():
+    price, delta, vega = by_name(DollarPrice), by_name(DollarPrice, IRDelta), by_name(DollarPrice, IRVega)
+    measures_by_position = {p: set(price if i < 6 else delta if i < 8 else vega) for i, p in enumerate(positions)}
+
+    # Each extra measure costs less than a request, so all positions share one
+    planner = RequestPlanner()
+    assert planner.plan(measures_by_position) == ((by_name(DollarPrice, IRDelta, IRVega), positions),)
+    assert planner.cost(10, (DollarPrice, IRDelta)) == 100 + 10 * 2
+
+    # Requests are not merged if they cost nothing, or if extra measures cost more than requests
+    assert RequestPlanner(request_cost=0).plan(measures_by_position) == \
+        ((price, positions[:6]), (delta, positions[6:8]), (vega, positions[8:]))
+    planner = RequestPlanner(request_cost=10, measure_costs={IRVega: 10})
+    assert planner.measure_costs == {IRVega: 10}
+    plan = planner.plan(measures_by_position)
+    assert plan == ((delta, positions[:8]), (vega, positions[8:]))
+    assert sum(planner.cost(len(p), m) for m, p in plan) < sum(planner.cost(len(p), m) for m, p in (
+        (price, positions[:6]), (delta, positions[6:8]), (vega, positions[8:])))
+
+    # Merging full requests saves none
+    assert len(RequestPlanner().plan(measures_by_position, max_positions_per_request=2)) == 3
+    assert RequestPlanner().plan({}) == ()
@@ -107,7 +107,8 @@ def test_portfolio(mocker):
     assert result[risk.DollarPrice]['swap3'] == 0.03
     assert result[risk.DollarPrice]['swap3'] == result['swap3'][risk.DollarPrice]
 
-    expected = risk.aggregate_risk([pd.DataFrame(v) for v in dollar_price_ir_delta_values[1]])
+    # Dates are only returned under a HistoricalPricingContext
+    expected = risk.aggregate_risk([pd.DataFrame(v).drop(columns='date') for v in dollar_price_ir_delta_values[1]])
     assert result[risk.IRDelta].aggregate().equals(expected)
 
     prices_only = result[risk.DollarPrice]
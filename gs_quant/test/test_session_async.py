@@ -0,0 +1,228 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+
+import asyncio
+import datetime as dt
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import gs_quant.risk as risk
+from gs_quant.api.gs.assets import GsAssetApi
+from gs_quant.api.gs.data import GsDataApi
+from gs_quant.api.gs.risk import GsRiskApi
+from gs_quant.api.risk import RiskApi
+from gs_quant.errors import MqRequestError
+from gs_quant.instrument import IRSwap
+from gs_quant.markets import PricingContext
+from gs_quant.session import GsSession
+from gs_quant.target.data import DataQuery
+
+pytest.importorskip('aiohttp')
+
+
+class StandInServer:
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.client_ports = set()
+        self.lock = threading.Lock()
+        self.responses = {}
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                self.respond()
+
+            def do_POST(self):
+                self.respond()
+
+            def respond(self):
+                with server.lock:
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    server.client_ports.add(self.client_address[1])
+
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length)) if length else None
+                server.requests.append((self.command, self.path, dict(self.headers), body))
+                time.sleep(server.delay)
+
+                status, response = server.responses.get(self.path.split('?')[0], (404, {'error': 'not found'}))
+                content = json.dumps(response).encode()
+
+                with server.lock:
+                    server.in_flight -= 1
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def domain(self) -> str:
+        return 'http://127.0.0.1:{}'.format(self.httpd.server_address[1])
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class StandInSession(GsSession):
+
+    def _authenticate(self):
+        self._session.headers.update({'Authorization': 'Bearer token'})
+
+
+def run(session: GsSession, coroutine):
+    async def with_session():
+        try:
+            return await coroutine
+        finally:
+            await session.close_async()
+
+    loop = asyncio.new_event_loop()
+    try:
+        with session:
+            return loop.run_until_complete(with_session())
+    finally:
+        loop.close()
+
+
+def test_pooled_requests():
+    with StandInServer(delay=0.05) as server:
+        server.responses['/v1/ping'] = (200, {'results': 'pong'})
+        session = StandInSession(server.domain, async_pool_size_per_host=4)
+
+        async def ping_all():
+            return await asyncio.gather(*(session._get_async('/ping', payload={'id': (i, i + 1)})
+                                          for i in range(20)))
+
+        results = run(session, ping_all())
+
+    assert results == [{'results': 'pong'}] * 20
+    assert 1 < server.max_in_flight <= 4
+
+    # Connections are kept alive and re-used
+    assert len(server.client_ports) <= 4
+
+    method, path, headers, _ = server.requests[0]
+    assert method == 'GET'
+    assert path.startswith('/v1/ping?id=')
+    assert headers['Authorization'] == 'Bearer token'
+
+
+def test_event_loop_change():
+    with StandInServer() as server:
+        server.responses['/v1/ping'] = (200, {'results': 'pong'})
+        session = StandInSession(server.domain)
+
+        first_loop = asyncio.new_event_loop()
+        try:
+            with session:
+                assert first_loop.run_until_complete(session._get_async('/ping')) == {'results': 'pong'}
+
+            first_pool = session._async_session
+
+            # The pool of the previous loop is closed, rather than leaked, when the session is used on another loop
+            assert run(session, session._get_async('/ping')) == {'results': 'pong'}
+            assert first_pool.closed
+        finally:
+            first_loop.close()
+
+
+def test_request_error():
+    with StandInServer() as server:
+        session = StandInSession(server.domain)
+
+        with pytest.raises(MqRequestError) as e:
+            run(session, session._post_async('/missing', payload={'a': 1}))
+
+    assert e.value.status == 404
+
+
+def test_async_apis():
+    with StandInServer() as server:
+        session = StandInSession(server.domain)
+
+        server.responses['/v1/risk/calculate'] = (200, [[[{'value': 0.01}], [{'value': 0.02}]]])
+        swaps = (IRSwap('Pay', '10y', 'USD'), IRSwap('Pay', '5y', 'USD'))
+        request = risk.RiskRequest(
+            positions=tuple(risk.RiskPosition(s, 1) for s in swaps),
+            measures=(risk.DollarPrice,),
+            pricingLocation=PricingContext.current.market_data_location,
+            pricingAndMarketDataAsOf=PricingContext.current._pricing_market_data_as_of,
+            waitForResults=True)
+
+        results = run(session, GsRiskApi.calc_async(request))
+        assert tuple(results[risk.DollarPrice].values()) == (0.01, 0.02)
+        assert server.requests[-1][3]['measures'][0]['measureType'] == 'Dollar Price'
+
+        data = [{'date': '2019-01-02', 'assetId': 'MA4B66MW5E27U8P32SB', 'impliedVolatility': 0.2}]
+        server.responses['/v1/data/EDRVOL_PERCENT_SHORT/query'] = (200, {'data': data})
+        results = run(session, GsDataApi.query_data_async(DataQuery(start_date='2019-01-02'),
+                                                          'EDRVOL_PERCENT_SHORT'))
+        assert results == data
+
+        GsDataApi.set_sharding('EDRVOL_PERCENT_SHORT', date_shards=2)
+        try:
+            num_requests = len(server.requests)
+            results = run(session, GsDataApi.query_data_async(
+                DataQuery(start_date=dt.date(2019, 1, 2), end_date=dt.date(2019, 1, 3)), 'EDRVOL_PERCENT_SHORT'))
+        finally:
+            GsDataApi.remove_sharding('EDRVOL_PERCENT_SHORT')
+
+        assert results == data * 2
+        assert sorted((r[3]['startDate'], r[3]['endDate']) for r in server.requests[num_requests:]) == \
+            [('2019-01-02', '2019-01-02'), ('2019-01-03', '2019-01-03')]
+
+        server.responses['/v1/assets/query'] = (200, {'results': [{'id': 'MA4B66MW5E27U8P32SB', 'name': 'SPX'}]})
+        results = run(session, GsAssetApi.get_many_assets_async(id=['MA4B66MW5E27U8P32SB']))
+        assert results[0].name == 'SPX'
+        assert server.requests[-1][3]['where']['id'] == ['MA4B66MW5E27U8P32SB']
+
+        # Providers without an asynchronous implementation run calc in an executor, in the same session
+        class SyncRiskApi(RiskApi):
+
+            @classmethod
+            def calc(cls, risk_request: risk.RiskRequest):
+                return GsSession.current, risk_request
+
+            @classmethod
+            def get_results(cls, risk_request: risk.RiskRequest, result_id: str) -> dict:
+                raise NotImplementedError
+
+        assert run(session, SyncRiskApi.calc_async(request)) == (session, request)
@@ -0,0 +1,102 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from gs_quant.errors import MqValueError
+from gs_quant.timeseries.buckets import HOLIDAY, BucketCalendar, BucketDefinition, get_bucket_calendar
+
+
+def hourly(start: dt.date, end: dt.date, timezone: str, nodes: int = 1) -> pd.DataFrame:
+    start, end = (pd.Timestamp(d).tz_localize(timezone) for d in (start, end + dt.timedelta(days=1)))
+    index = pd.date_range(start, end, freq='H', closed='left').tz_convert('UTC')
+    return pd.DataFrame(np.arange(len(index) * nodes, dtype=float).reshape(len(index), nodes), index=index)
+
+
+def test_buckets():
+    pjm = get_bucket_calendar('PJM')
+    assert get_bucket_calendar('pjm') is pjm
+    assert get_bucket_calendar('NYISO').timezone == 'US/Eastern'
+    assert get_bucket_calendar('MISO').peak_hours == (6, 22)
+
+    # Definitions are compiled once
+    peak = pjm.bucket('Peak')
+    assert pjm.bucket('peak') is peak
+    assert peak.hours.sum() == 5 * 16
+    assert not peak.hours[HOLIDAY].any()
+    assert (pjm.bucket('offpeak').hours == ~peak.hours).all()
+    assert (get_bucket_calendar('CAISO').bucket('2x16h').hours.sum(axis=1) == [0] * 6 + [16, 16]).all()
+
+    with pytest.raises(ValueError):
+        pjm.bucket('weekday')
+    with pytest.raises(MqValueError):
+        BucketDefinition('bad', np.ones((7, 24)))
+
+    # 2019-07-04 is a holiday, and 2019-03-10 (a Sunday) 23 hours long
+    days = np.array(['2019-07-03', '2019-07-04', '2019-07-06'], dtype='M8[D]').astype(np.int64)
+    assert list(pjm.day_types(days)) == [2, HOLIDAY, 5]
+
+    index = hourly(dt.date(2019, 3, 8), dt.date(2019, 3, 11), 'US/Eastern').index
+    local = index.tz_convert('US/Eastern')
+    expected = (local.dayofweek < 5) & (local.hour >= 7) & (local.hour < 23)
+    assert (pjm.mask(index, 'peak') == expected).all()
+
+    mornings = BucketDefinition.of('mornings', range(6, 10), days=range(5), holidays=False)
+    assert pjm.bucket(mornings) is mornings
+    assert (pjm.mask(index, mornings) == (local.dayofweek < 5) & (local.hour >= 6) & (local.hour < 10)).all()
+
+
+def test_bucketize():
+    calendar = BucketCalendar('test', 'US/Eastern')
+    prices = hourly(dt.date(2019, 3, 1), dt.date(2019, 4, 30), 'US/Eastern', nodes=2)
+    series = prices[0].rename('price')
+    local = series.tz_convert('US/Eastern')
+
+    actual = calendar.bucketize(series, 'peak')
+    peak = local[(local.index.dayofweek < 5) & (local.index.hour >= 7) & (local.index.hour < 23)]
+    expected = peak.groupby(peak.index.date).mean()
+    expected = expected.reindex(pd.date_range(expected.index[0], expected.index[-1]).date)
+    assert_series_equal(actual, expected, check_index_type=False)
+
+    # Dates with missing prices are excluded, and for monthly granularity their months
+    prices.iloc[500, 1] = np.nan
+    actual = calendar.bucketize(prices, '7x24', 'monthly')
+    assert list(actual.index) == [dt.date(2019, 3, 31), dt.date(2019, 4, 30)]
+    assert actual[0].tolist() == [local[:'2019-03-31'].mean(), local['2019-04-01':].mean()]
+    assert np.isnan(actual[1][0]) and actual[1][1] == prices[1].tz_convert('US/Eastern')['2019-04-01':].mean()
+
+    daily = calendar.bucketize(prices, '7x24', 'daily', dt.date(2019, 3, 1), dt.date(2019, 4, 30))
+    assert daily[1].isna().sum() == 1
+    for column in prices.columns:
+        assert_series_equal(daily[column], calendar.bucketize(prices[column].dropna(), '7x24'), check_names=False)
+
+    # Months are labelled by their last date, so only those ending within the dates are returned
+    assert calendar.bucketize(series, '7x24', 'm', dt.date(2019, 3, 1), dt.date(2019, 4, 15)).index.tolist() == \
+        [dt.date(2019, 3, 31)]
+    assert_frame_equal(calendar.bucketize(prices.iloc[:0], '7x24'), pd.DataFrame(columns=prices.columns, dtype=float),
+                       check_index_type=False)
+
+    with pytest.raises(ValueError):
+        calendar.bucketize(series, '7x24', 'weekly')
+
+
+if __name__ == "__main__":
+    pytest.main(args=["test_buckets.py"])
@@ -14,9 +14,12 @@ specific language governing permissions and limitations
 under the License.
 """
 
+from unittest import mock
+
 import pytest
-from pandas.util.testing import assert_series_equal
+from pandas.util.testing import assert_frame_equal, assert_series_equal
 
+import gs_quant.timeseries.econometrics as econometrics
 from gs_quant.timeseries import *
 
 
@@ -241,6 +244,26 @@ def test_annualize():
         annualize(invalid_series)
 
 
+def test_annualization_factor():
+    intraday = pd.Series(1.0, index=pd.date_range('2019-01-02 09:00', periods=10, freq='h'))
+    with pytest.raises(MqValueError):
+        annualize(intraday)
+
+    weekly = pd.Series(1.0, index=pd.date_range('2019-01-01 12:00', periods=10, freq='7D', tz='America/New_York'))
+    assert_series_equal(annualize(weekly), weekly * math.sqrt(52))
+
+    # The factor is inferred once for all the series sharing an index
+    x = generate_series(100)
+    with mock.patch.object(econometrics, '_day_distances', wraps=econometrics._day_distances) as distances:
+        volatility(x, 22)
+        volatility(x * 2, 10)
+        annualize(returns(x))
+        assert distances.call_count == 1
+
+        volatility(generate_series(100), 22)
+        assert distances.call_count == 2
+
+
 def test_volatility():
     x = pd.Series([])
     assert_series_equal(x, volatility(x))
@@ -311,6 +334,23 @@ def test_correlation():
     assert_series_equal(result, expected, check_less_precise=True)
 
 
+@pytest.mark.parametrize('w', [Window(None, 0), 22, Window(5, 2)])
+def test_correlation_matrix(w):
+    x = pd.DataFrame({'a': generate_series(1200), 'b': generate_series(1200), 'c': generate_series(1200)})
+
+    for type_, panel in ((SeriesType.PRICES, x), (SeriesType.RETURNS, returns(x))):
+        result = correlation_matrix(panel, w, type_)
+        for i in x.columns:
+            for j in x.columns:
+                expected = correlation(panel[i], panel[j], w, type_)
+                assert_series_equal(result.xs(j, level=1)[i], expected, check_names=False, atol=1e-10)
+
+        latest = correlation_matrix(panel, w, type_, latest=True)
+        assert list(latest.index) == list(latest.columns) == list(x.columns)
+        assert np.allclose(latest.values, result.xs(x.index[-1]).values)
+        assert np.allclose(np.diag(latest.values), 1)
+
+
 def test_beta():
     x = pd.Series([])
     assert_series_equal(pd.Series([]), beta(x, x))
@@ -356,6 +396,83 @@ def test_beta():
     assert_series_equal(result, expected, check_less_precise=True)
 
 
+def _least_squares(y, x, w, intercept):
+    # Coefficients, t-statistics and R-squared of each window, fitted from scratch
+    results = []
+    for i in range(len(y)):
+        start = max(0, i - w + 1)
+        y_ = y.values[start:i + 1]
+        x_ = x.values[start:i + 1]
+        present = ~np.isnan(y_) & ~np.isnan(x_).any(axis=1)
+        y_, x_ = y_[present], x_[present]
+        if intercept:
+            x_ = np.column_stack((np.ones(len(x_)), x_))
+        n, p = x_.shape
+        if n <= p:
+            results.append([np.nan] * (2 * p + 1))
+            continue
+        coefficients = np.linalg.lstsq(x_, y_, rcond=None)[0]
+        residual = y_ - x_ @ coefficients
+        errors = np.sqrt(residual @ residual / (n - p) * np.diag(np.linalg.inv(x_.T @ x_)))
+        total = ((y_ - y_.mean()) ** 2).sum() if intercept else (y_ ** 2).sum()
+        results.append(list(coefficients) + list(coefficients / errors) + [1 - residual @ residual / total])
+    return np.array(results)
+
+
+@pytest.mark.parametrize('w', [Window(None, 0), 22, Window(10, 2)])
+def test_rolling_regression(w):
+    rng = np.random.RandomState(1)
+    index = pd.date_range('2019-01-01', periods=1200)
+    x = pd.DataFrame(rng.normal(size=(1200, 3)), index=index, columns=['a', 'b', 'c']) + [100, 0, 5]
+    y = pd.DataFrame({'p': x @ [1, 2, 3] + rng.normal(size=1200), 'q': x @ [0, 1, -1] + rng.normal(size=1200),
+                      'r': rng.normal(size=1200)})
+    y.iloc[[5, 6, 700], 1] = np.nan
+    y.iloc[:50, 2] = np.nan
+    x.iloc[300, 2] = np.nan
+
+    window = normalize_window(y, w)
+    for intercept in (True, False):
+        result = rolling_regression(y, x, w, intercept)
+        names = (['intercept'] if intercept else []) + ['a', 'b', 'c']
+        assert list(result['coefficient'].columns) == list(result['t_stat'].columns) == names
+        assert list(result.index.get_level_values(0).unique()) == list(index[window.r:])
+
+        for name in y.columns:
+            expected = _least_squares(y[name], x, window.w, intercept)[window.r:]
+            actual = result.xs(name, level=1).values
+            assert np.allclose(actual, expected, rtol=1e-6, atol=1e-8, equal_nan=True)
+
+        series = rolling_regression(y['p'], x, w, intercept)
+        assert_frame_equal(series, result.xs('p', level=1))
+
+    # One factor, as beta
+    b = rolling_regression(returns(y['p']), returns(x['a']).to_frame(), w)[('coefficient', 'a')]
+    expected = beta(y['p'], x['a'], w)
+    assert_series_equal(b[3:], expected[3:], check_names=False)
+
+    # Sums updated over several blocks of rows and recomputed for each segment
+    values = y.to_numpy()
+    blocks = econometrics._rolling_regression(values, x.to_numpy(), window.w, True, 0, segment=100, block=100)
+    assert np.allclose(blocks, econometrics._rolling_regression(values, x.to_numpy(), window.w, True, 0),
+                       rtol=1e-6, atol=1e-8, equal_nan=True)
+
+    assert rolling_regression(y[:3], x, Window(5, 2)).empty
+
+
+def test_rolling_regression_volatility_fall():
+    # The sums keep the rounding errors of the large variations, which would swamp those of the small ones
+    rng = np.random.RandomState(1)
+    x = pd.DataFrame(rng.normal(size=(600, 2)), index=pd.date_range('2019-01-01', periods=600), columns=['a', 'b'])
+    x.iloc[300:] *= 1e-4
+    y = x @ [1, 2] + rng.normal(size=600)
+
+    for intercept in (True, False):
+        actual = rolling_regression(y, x, Window(30, 0), intercept).values
+        expected = _least_squares(y, x, 30, intercept)
+        assert np.allclose(actual, expected, rtol=1e-6, atol=1e-8, equal_nan=True)
+        np.testing.assert_allclose(actual[329:], expected[329:], rtol=1e-9)
+
+
 def test_max_drawdown():
     series = pd.Series([1, 5, 5, 4, 4, 1])
 
@@ -16,7 +16,10 @@ under the License.
 
 from enum import IntEnum
 
+import numpy as np
+import pandas as pd
 import pytest
+from pandas.testing import assert_frame_equal, assert_series_equal
 
 import gs_quant.timeseries as ts
 from gs_quant.timeseries.helper import _create_int_enum, plot_function, plot_measure, normalize_window, Window, \
@@ -143,5 +146,99 @@ def test_apply_ramp_raises_on_edge_cases():
         apply_ramp(x, Window(2, 11))
 
 
+def _panel() -> pd.DataFrame:
+    np.random.seed(42)
+    dates = pd.bdate_range('2019-01-01', periods=300)
+    panel = pd.DataFrame(100 + np.random.normal(size=(len(dates), 4)).cumsum(axis=0), index=dates,
+                         columns=['SPX', 'SX5E', 'NKY', 'SPX'])
+    panel.iloc[[5, 17], 1] = np.nan
+    panel.iloc[:20, 2] = np.nan
+    return panel
+
+
+@pytest.mark.parametrize('fn, args', (
+    (ts.add, (lambda p: p.iloc[::2, 0].rename(None),)),
+    (ts.subtract, (1.5,)),
+    (ts.multiply, (lambda p: p.iloc[::3, 0], ts.Interpolate.NAN)),
+    (ts.divide, (lambda p: p.iloc[:, 0], ts.Interpolate.INTERSECT)),
+    (ts.floordiv, (7,)),
+    (ts.exp, ()),
+    (ts.log, ()),
+    (ts.power, (2,)),
+    (ts.sqrt, ()),
+    (ts.abs_, ()),
+    (ts.floor, (100,)),
+    (ts.ceil, (100,)),
+    (ts.filter_, (ts.FilterOperator.GREATER, 100)),
+    (ts.first, ()),
+    (ts.last, ()),
+    (ts.count, ()),
+    (ts.diff, (2,)),
+    (ts.lag, (3,)),
+    (ts.returns, ()),
+    (ts.returns, (2, ts.Returns.LOGARITHMIC)),
+    (ts.prices, (1, ts.Returns.LOGARITHMIC)),
+    (ts.index, ()),
+    (ts.change, ()),
+    (ts.annualize, ()),
+    (ts.volatility, (Window(22, 10),)),
+    (ts.correlation, (lambda p: p.iloc[:, 0], 22)),
+    (ts.beta, (lambda p: p.iloc[:, 0], 22)),
+    (ts.max_drawdown, (Window(22, 0),)),
+    (ts.moving_average, (22,)),
+    (ts.bollinger_bands, (22,)),
+    (ts.interpolate, (lambda p: p.index[::7], ts.Interpolate.STEP)),
+    (ts.value, (lambda p: p.index[50],)),
+    (ts.month, ()),
+    (ts.min_, (22,)),
+    (ts.max_, (22,)),
+    (ts.range_, (Window(22, 0),)),
+    (ts.mean, (22,)),
+    (ts.median, (22,)),
+    (ts.mode, (22,)),
+    (ts.sum_, (22,)),
+    (ts.product, (5,)),
+    (ts.std, (22,)),
+    (ts.var, (Window(22, 0),)),
+    (ts.cov, (lambda p: p.iloc[:, 0], 22)),
+    (ts.zscores, ()),
+    (ts.zscores, (5,)),
+    (ts.zscores, (Window(22, 0),)),
+    (ts.winsorize, (2, 22)),
+    (ts.percentiles, (None, 22)),
+))
+def test_panel(fn, args):
+    panel = _panel()
+    args = tuple(a(panel) if callable(a) else a for a in args)
+
+    result = fn(panel, *args)
+
+    # Each column as if its series were passed alone
+    for i in range(len(panel.columns)):
+        expected = fn(panel.iloc[:, i].rename(None), *args)
+        if isinstance(expected, pd.DataFrame):
+            assert_frame_equal(result.iloc[:, 2 * i:2 * i + 2].droplevel(0, axis=1), expected)
+        elif isinstance(expected, pd.Series):
+            assert_series_equal(result.iloc[:, i].reindex(expected.index), expected, check_names=False)
+            assert result.iloc[:, i].drop(expected.index).isna().all()
+        else:
+            assert result.iloc[i] == expected
+
+
+def test_panel_alignment():
+    panel = _panel()
+    series = panel.iloc[::2, 0]
+
+    x, y = ts.align(series, panel, ts.Interpolate.NAN)
+    assert list(x.columns) == list(panel.columns)
+    assert x.index.equals(panel.index) and y.index.equals(panel.index)
+
+    result = ts.add(series, panel, ts.Interpolate.ZERO)
+    assert_frame_equal(result, ts.add(panel, series, ts.Interpolate.ZERO))
+
+    with pytest.raises(ts.MqValueError, match='same columns'):
+        ts.add(panel, panel.iloc[:, :2])
+
+
 if __name__ == "__main__":
     pytest.main(args=["test_helper.py"])
@@ -0,0 +1,141 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+
+import datetime as dt
+import threading
+from collections import Counter
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_series_equal
+
+import gs_quant.timeseries as ts
+from gs_quant.data import DataContext
+from gs_quant.errors import MqValueError
+from gs_quant.timeseries.helper import plot_function, plot_measure
+from gs_quant.timeseries.lazy import Expression, LazyEvaluation
+
+calls = Counter()
+
+
+@plot_function
+def counted_returns(x: pd.Series) -> pd.Series:
+    calls['returns'] += 1
+    return ts.returns(x)
+
+
+@plot_function
+def counted_volatility(x: pd.Series, w: int) -> pd.Series:
+    calls['volatility', w] += 1
+    return ts.volatility(x, w)
+
+
+@plot_measure()
+def start_date(asset: str) -> pd.Series:
+    calls[asset] += 1
+    return pd.Series([1.0], index=[DataContext.current.start_date])
+
+
+def test_lazy_evaluation():
+    calls.clear()
+    x = ts.generate_series(500)
+    expected = ts.zscores(ts.volatility(ts.returns(x), 22)) - ts.mean(ts.volatility(ts.returns(x), 22))
+
+    with LazyEvaluation() as lazy:
+        vol = counted_volatility(counted_returns(x), 22)
+        score = ts.zscores(counted_volatility(counted_returns(x.copy()), 22)) - ts.mean(vol)
+        other = counted_volatility(counted_returns(x), 10)
+
+        assert isinstance(score, Expression)
+        assert not score.done
+        assert counted_volatility(counted_returns(x), 22) is vol
+        assert counted_volatility(counted_returns(x), w=22) is not vol
+        assert len(lazy.expressions) == 7
+
+    assert score.done and other.done
+    assert calls == Counter({'returns': 1, ('volatility', 22): 2, ('volatility', 10): 1})
+    assert_series_equal(score.result(), expected)
+    assert_series_equal(other.result(), ts.volatility(ts.returns(x), 10))
+
+    # Identical series are evaluated once, but not series with different content
+    calls.clear()
+    y = x.copy()
+    y.iloc[-1] += 1
+    with LazyEvaluation():
+        a = counted_returns(x)
+        b = counted_returns(y)
+        assert a is not b
+        a.result()
+        assert a.done and not b.done
+
+    assert calls['returns'] == 2
+    assert_series_equal(a.result(), ts.returns(x))
+    assert_series_equal(b.result(), ts.returns(y))
+
+
+def test_lazy_parallel():
+    barrier = threading.Barrier(2, timeout=10)
+
+    @plot_function
+    def wait(x: pd.Series) -> pd.Series:
+        barrier.wait()
+        return x
+
+    # Independent branches are evaluated in parallel, so both reach the barrier
+    x = ts.generate_series(10)
+    with LazyEvaluation(max_workers=2):
+        total = wait(x) + wait(x * 2)
+
+    assert_series_equal(total.result(), x * 3)
+
+
+def test_lazy_errors():
+    x = ts.generate_series(10)
+    y = ts.generate_series(10)
+    y.index = y.index + pd.DateOffset(days=1)
+
+    with LazyEvaluation():
+        diff = ts.subtract(ts.align(x, y, ts.Interpolate.INTERSECT)[0], x)
+        error = ts.add(pd.DataFrame({'a': x}), pd.DataFrame({'b': x}))
+
+    assert_series_equal(diff.result(), ts.subtract(ts.align(x, y, ts.Interpolate.INTERSECT)[0], x))
+    with pytest.raises(MqValueError):
+        error.result()
+
+
+def test_lazy_measures():
+    calls.clear()
+    first = DataContext(dt.date(2019, 1, 2), dt.date(2019, 2, 1))
+    second = DataContext(dt.date(2019, 3, 1), dt.date(2019, 4, 1))
+
+    with LazyEvaluation():
+        with first:
+            a = start_date('SPX')
+            b = start_date('SPX')
+        with second:
+            c = start_date('SPX')
+
+    assert a is b and a is not c
+    assert calls['SPX'] == 2
+    assert a.result().index[0] == dt.date(2019, 1, 2)
+    assert c.result().index[0] == dt.date(2019, 3, 1)
+
+    # Outside the context, functions are evaluated immediately
+    assert isinstance(start_date('SPX'), pd.Series)
+
+
+if __name__ == "__main__":
+    pytest.main(args=["test_lazy.py"])
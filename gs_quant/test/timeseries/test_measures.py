@@ -29,6 +29,7 @@ from testfixtures.mock import Mock
 import gs_quant.timeseries.measures as tm
 from gs_quant.api.gs.assets import GsTemporalXRef, GsAssetApi, GsIdType, IdList
 from gs_quant.data.core import DataContext
+from gs_quant.datetime import GsCalendar
 from gs_quant.errors import MqError
 from gs_quant.markets.securities import AssetClass, Cross, Index, Currency
 from gs_quant.session import GsSession, Environment
@@ -630,17 +631,6 @@ def test_basis():
     replace.restore()
 
 
-def test_td():
-    cases = {'3d': pd.DateOffset(days=3), '9w': pd.DateOffset(weeks=9), '2m': pd.DateOffset(months=2),
-             '10y': pd.DateOffset(years=10)}
-    for k, v in cases.items():
-        actual = tm._to_offset(k)
-        assert v == actual, f'expected {v}, got actual {actual}'
-
-    with pytest.raises(ValueError):
-        tm._to_offset('5z')
-
-
 def test_pricing_range():
     import datetime
 
@@ -655,8 +645,8 @@ def test_pricing_range():
 
     # mock
     replace = Replacer()
-    cbd = replace('gs_quant.timeseries.measures._get_custom_bd', Mock())
-    cbd.return_value = pd.tseries.offsets.BusinessDay()
+    calendar = replace('gs_quant.datetime.gscalendar.GsCalendar.get', Mock())
+    calendar.return_value = GsCalendar(())
     today = replace('gs_quant.timeseries.measures.pd.Timestamp.today', Mock())
     today.return_value = pd.Timestamp(2019, 5, 25)
     gold = datetime.date
@@ -0,0 +1,118 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import gs_quant.timeseries as ts
+from gs_quant.errors import MqValueError
+from gs_quant.timeseries import Window
+from gs_quant.timeseries.online import OnlineBeta, OnlineMaxDrawdown, OnlineMovingAverage, OnlineStd, \
+    OnlineVolatility
+
+windows = [22, Window(30, 10), Window(None, 0), Window(5, None), 1, Window(2, 0)]
+
+
+def assert_identical(actual: pd.Series, expected: pd.Series):
+    # Replay must match the batch function exactly, not merely to within a tolerance
+    assert actual.index.equals(expected.index)
+    assert np.array_equal(actual.values, expected.values.astype(float), equal_nan=True)
+
+
+def series(freq: str, seed: int) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    values = 100 + np.cumsum(rng.normal(0, 1, 400))
+    values[100:130] = 101.0
+    values[[200, 201]] = np.nan
+    return pd.Series(values, index=pd.date_range('2015-01-02', periods=400, freq=freq))
+
+
+@pytest.mark.parametrize('w', windows)
+@pytest.mark.parametrize('freq', ['B', 'W-FRI'])
+def test_replay(w, freq):
+    x = series(freq, 1)
+    b = series(freq, 2)
+    b.iloc[[10, 11]] = np.nan
+    returns = ts.returns(x)
+
+    assert_identical(OnlineMovingAverage(w).extend(returns), ts.moving_average(returns, w))
+    assert_identical(OnlineStd(w).extend(returns), ts.std(returns, w))
+    assert_identical(OnlineVolatility(w).extend(x), ts.volatility(x, w))
+    assert_identical(OnlineVolatility(w, ts.Returns.LOGARITHMIC).extend(x),
+                     ts.volatility(x, w, ts.Returns.LOGARITHMIC))
+    assert_identical(OnlineMaxDrawdown(w).extend(x), ts.max_drawdown(x, w))
+    assert_identical(OnlineBeta(w).extend(x, b), ts.beta(x, b, w))
+    assert_identical(OnlineBeta(w, prices=False).extend(returns, b), ts.beta(returns, b, w, prices=False))
+
+
+def test_volatility_irregular():
+    # Daily, then (after a gap) weekly observations: the average distance is daily for the first few only
+    days = (0, 1, 2, 3, 24, 31, 38, 45, 52, 59, 66)
+    x = series('D', 4).iloc[list(days)]
+    online = OnlineVolatility().extend(x)
+
+    # Each result is that of the batch function over the observations so far...
+    for i in range(2, len(x)):
+        assert_identical(online.iloc[i:i + 1], ts.volatility(x.iloc[:i + 1]).iloc[-1:])
+
+    # ...so differs from that over the complete series until the inferred annualization factor settles
+    batch = ts.volatility(x)
+    assert np.allclose(online.iloc[2:4] * np.sqrt(52 / 252), batch.iloc[2:4])
+    assert_identical(online.iloc[4:], batch.iloc[4:])
+
+
+def test_update():
+    x = series('B', 3)
+    vol = OnlineVolatility(Window(22, 10))
+
+    results = [vol.update(d, v) for d, v in x.items()]
+    assert results[:10] == [None] * 10
+    assert results[-1] == ts.volatility(x, Window(22, 10)).iloc[-1]
+    assert vol.count == len(x)
+    assert vol.last_date == x.index[-1]
+
+    with pytest.raises(MqValueError):
+        vol.update(x.index[-1], 100)
+    with pytest.raises(MqValueError):
+        OnlineBeta(22).extend(x, x[1:])
+    with pytest.raises(ValueError):
+        OnlineStd(Window(0, 0))
+
+
+def test_snapshot():
+    x = series('B', 4)
+    drawdown = OnlineMaxDrawdown(Window(22, 0))
+    drawdown.extend(x[:300])
+    state = drawdown.snapshot()
+
+    first = drawdown.extend(x[300:])
+    drawdown.restore(state)
+    assert drawdown.count == 300
+    assert drawdown.last_date == x.index[299]
+    assert_identical(drawdown.extend(x[300:]), first)
+
+    # Restored state is independent of the snapshot
+    drawdown.restore(state)
+    assert drawdown.update(x.index[300] + dt.timedelta(days=365), 1.0) == -1.0 + 1.0 / np.nanmax(x[280:300])
+    drawdown.restore(state)
+    assert_identical(drawdown.extend(x[300:]), first)
+
+
+if __name__ == "__main__":
+    pytest.main(args=["test_online.py"])
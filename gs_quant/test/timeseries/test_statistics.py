@@ -16,6 +16,7 @@ under the License.
 from datetime import date
 
 import pytest
+import scipy.stats
 from pandas.util.testing import assert_series_equal
 
 from gs_quant.timeseries import *
@@ -185,6 +186,12 @@ def test_mode():
     expected = pd.Series([3.0, 2.0, 2.0, 1.0, 1.0, 3.0], index=dates)
     assert_series_equal(result, expected, obj="mode window 2")
 
+    # NaNs never repeat, so are the mode only of windows without repeated values
+    x = pd.Series([1.0, np.nan, 2.0, 2.0, np.nan, np.nan], index=dates)
+    result = mode(x, Window(3, 0))
+    expected = pd.Series([1.0, np.nan, np.nan, 2.0, 2.0, np.nan], index=dates)
+    assert_series_equal(result, expected, obj="mode with NaNs")
+
 
 def test_sum():
 
@@ -297,6 +304,45 @@ def test_cov():
     assert_series_equal(result, expected, obj="var window 2", check_less_precise=True)
 
 
+@pytest.mark.parametrize('w', [Window(None, 0), 3, Window(4, 1), Window(1, 0), Window(50, 0)])
+def test_covariance_matrix(w):
+    # Long enough that the sums are recomputed, and with missing values
+    x = pd.DataFrame({'a': generate_series(1200), 'b': generate_series(1200), 'c': generate_series(1200)})
+    x.iloc[[10, 11, 80], 1] = np.nan
+    x.iloc[100:130, 2] = np.nan
+
+    result = covariance_matrix(x, w)
+    assert result.index.names == [None, None]
+    assert list(result.index[:3]) == [(x.index[w.r if isinstance(w, Window) else w], c) for c in 'abc']
+    for i in x.columns:
+        for j in x.columns:
+            expected = cov(x[i], x[j], w)
+            assert_series_equal(result.xs(j, level=1)[i], expected, check_names=False, atol=1e-10)
+
+    latest = covariance_matrix(x, w, latest=True)
+    assert np.allclose(latest.values, result.xs(x.index[-1]).values, equal_nan=True)
+
+    assert covariance_matrix(x[:3], Window(5, 2)).empty
+    assert covariance_matrix(x[:3], Window(5, 2), latest=True).empty
+
+
+@pytest.mark.parametrize('missing', [False, True])
+def test_covariance_matrix_volatility_fall(missing):
+    # The sums keep the rounding errors of the large variations, which would swamp the co-variances of the small ones
+    np.random.seed(42)
+    values = np.concatenate([np.random.normal(100, 50, (500, 3)), 7 + np.random.normal(0, 1e-4, (700, 3))])
+    x = pd.DataFrame(values, columns=['a', 'b', 'c'], index=pd.date_range('2001-01-01', periods=len(values)))
+    if missing:
+        x.iloc[np.random.choice(len(x), 50, replace=False), 1] = np.nan
+
+    result = covariance_matrix(x, Window(20, 0)).values.reshape(-1, 3, 3)
+    for i in range(19, len(x)):
+        expected = x.iloc[i - 19:i + 1].cov().values
+        deviation = np.sqrt(np.diagonal(expected))
+        np.testing.assert_allclose(result[i] / np.outer(deviation, deviation),
+                                   expected / np.outer(deviation, deviation), atol=1e-9)
+
+
 def test_zscores():
 
     assert_series_equal(zscores(pd.Series()), pd.Series())
@@ -326,6 +372,48 @@ def test_zscores():
     expected = pd.Series([0.0, -0.707107, 0.707107, -0.707107, 0.707107, 0.707107], index=dates)
     assert_series_equal(result, expected, obj="z-score window 2", check_less_precise=True)
 
+    result = zscores(x, 2)
+    assert_series_equal(result, expected[2:], obj="z-score window 2 with ramp", check_less_precise=True)
+
+    x = pd.Series([3.0, np.nan, 2.0, 3.0, 3.0, 3.0], index=dates)
+    result = zscores(x, Window(3, 0))
+    expected = pd.Series([0.0, np.nan, np.nan, np.nan, 0.577350, np.nan], index=dates)
+    assert_series_equal(result, expected, obj="z-score with NaNs and no variance", check_less_precise=True)
+
+
+@pytest.mark.parametrize('window', (Window(5, 0), Window(22, 22), Window(252, 0)))
+def test_zscores_large(window):
+    np.random.seed(42)
+    x = pd.Series(1000 + np.cumsum(np.random.normal(size=1000000)),
+                  index=pd.date_range('2000-01-01', periods=1000000, freq='min'))
+    x[np.random.choice(len(x), 100, replace=False)] = np.nan
+
+    result = zscores(x, window)
+    assert len(result) == len(x) - window.r
+
+    # Compare a sample of windows with scipy's z-score of each
+    for i in np.random.choice(len(x), 200, replace=False):
+        sample = x.values[max(i - window.w + 1, 0):i + 1]
+        expected = scipy.stats.zscore(sample, ddof=1)[-1] if i else 0.0
+        if i >= window.r:
+            np.testing.assert_allclose(result[x.index[i]], expected, rtol=1e-9, atol=1e-12)
+
+
+def test_zscores_volatility_fall():
+    # Running sums keep the rounding errors of the large variations, which would swamp those of the small ones
+    np.random.seed(42)
+    values = np.concatenate([np.random.normal(100, 5, 10), np.full(5, 100.0), 7 + np.random.normal(0, 1e-6, 30)])
+    x = pd.Series(values, index=pd.date_range('2001-01-01', periods=len(values)))
+
+    for w in (20, 40):
+        result = zscores(x, Window(w, 0))
+        expected = [scipy.stats.zscore(values[max(i - w + 1, 0):i + 1], ddof=1)[-1] if i else 0.0
+                    for i in range(len(values))]
+        np.testing.assert_allclose(result.values, expected, rtol=1e-9, atol=1e-12)
+
+        panel = zscores(pd.DataFrame({'a': x, 'b': x[::-1].values}, index=x.index), Window(w, 0))
+        np.testing.assert_allclose(panel['a'].values, expected, rtol=1e-9, atol=1e-12)
+
 
 def test_winsorize():
 
@@ -400,6 +488,16 @@ def test_percentiles():
     expected = pd.Series([100.0, 0.0, 33.333, 25.0, 100.0, 91.667], index=dates)
     assert_series_equal(result, expected, obj="percentiles without window length", check_less_precise=True)
 
+    y = pd.Series([3.5, 1.8, 2.9, 1.2], index=[date(2018, 12, 31), dates[0], dates[3], date(2019, 1, 10)])
+    result = percentiles(x, y, Window(3, 0))
+    expected = pd.Series([np.nan, 0.0, 66.667, 33.333], index=y.index)
+    assert_series_equal(result, expected, obj="percentiles of unaligned series", check_less_precise=True)
+
+    x[dates[1]] = np.nan
+    result = percentiles(x, w=Window(2, 0))
+    expected = pd.Series([50.0, np.nan, np.nan, 25.0, 75.0, 75.0], index=dates)
+    assert_series_equal(result, expected, obj="percentiles with NaNs")
+
 
 if __name__ == "__main__":
     pytest.main(args=["test_statistics.py"])
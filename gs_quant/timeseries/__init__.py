@@ -22,5 +22,8 @@ from .econometrics import *
 from .technicals import *
 from .measures import *
 from .helper import *
+from .buckets import BucketCalendar, BucketDefinition, get_bucket_calendar
+from .lazy import Expression, LazyEvaluation
+from .online import OnlineBeta, OnlineMaxDrawdown, OnlineMovingAverage, OnlineStd, OnlineVolatility
 
 __name__ = 'timeseries'
@@ -36,7 +36,7 @@ class FilterOperator(Enum):
     N_EQUALS = 'not_equals'
 
 
-@plot_function
+@plot_function(panel=True)
 def add(x: Union[pd.Series, Real], y: Union[pd.Series, Real], method: Interpolate = Interpolate.STEP) \
         -> Union[pd.Series, Real]:
     """
@@ -91,10 +91,10 @@ def add(x: Union[pd.Series, Real], y: Union[pd.Series, Real], method: Interpolat
         return x + y
 
     [x_align, y_align] = align(x, y, method)
-    return x_align.add(y_align)
+    return x_align.add(y_align, axis=0)
 
 
-@plot_function
+@plot_function(panel=True)
 def subtract(x: Union[pd.Series, Real], y: Union[pd.Series, Real], method: Interpolate = Interpolate.STEP) \
         -> Union[pd.Series, Real]:
     """
@@ -151,10 +151,10 @@ def subtract(x: Union[pd.Series, Real], y: Union[pd.Series, Real], method: Inter
         return x - y
 
     [x_align, y_align] = align(x, y, method)
-    return x_align.subtract(y_align)
+    return x_align.subtract(y_align, axis=0)
 
 
-@plot_function
+@plot_function(panel=True)
 def multiply(x: Union[pd.Series, Real], y: Union[pd.Series, Real], method: Interpolate = Interpolate.STEP) \
         -> Union[pd.Series, Real]:
     """
@@ -209,10 +209,10 @@ def multiply(x: Union[pd.Series, Real], y: Union[pd.Series, Real], method: Inter
         return x * y
 
     [x_align, y_align] = align(x, y, method)
-    return x_align.multiply(y_align)
+    return x_align.multiply(y_align, axis=0)
 
 
-@plot_function
+@plot_function(panel=True)
 def divide(x: Union[pd.Series, Real], y: Union[pd.Series, Real], method: Interpolate = Interpolate.STEP) \
         -> Union[pd.Series, Real]:
     """
@@ -267,10 +267,10 @@ def divide(x: Union[pd.Series, Real], y: Union[pd.Series, Real], method: Interpo
         return x / y
 
     [x_align, y_align] = align(x, y, method)
-    return x_align.divide(y_align)
+    return x_align.divide(y_align, axis=0)
 
 
-@plot_function
+@plot_function(panel=True)
 def floordiv(x: Union[pd.Series, Real], y: Union[pd.Series, Real], method: Interpolate = Interpolate.STEP) \
         -> Union[pd.Series, Real]:
     """
@@ -322,10 +322,10 @@ def floordiv(x: Union[pd.Series, Real], y: Union[pd.Series, Real], method: Inter
         return x // y
 
     [x_align, y_align] = align(x, y, method)
-    return x_align.floordiv(y_align)
+    return x_align.floordiv(y_align, axis=0)
 
 
-@plot_function
+@plot_function(panel=True)
 def exp(x: pd.Series) -> pd.Series:
     """
     Exponential of series
@@ -354,7 +354,7 @@ def exp(x: pd.Series) -> pd.Series:
     return np.exp(x)
 
 
-@plot_function
+@plot_function(panel=True)
 def log(x: pd.Series) -> pd.Series:
     """
     Natural logarithm of series
@@ -387,7 +387,7 @@ def log(x: pd.Series) -> pd.Series:
     return np.log(x)
 
 
-@plot_function
+@plot_function(panel=True)
 def power(x: pd.Series, y: float = 1) -> pd.Series:
     """
     Raise each element in series to power
@@ -417,7 +417,7 @@ def power(x: pd.Series, y: float = 1) -> pd.Series:
     return np.power(x, y)
 
 
-@plot_function
+@plot_function(panel=True)
 def sqrt(x: Union[Real, pd.Series]) -> Union[Real, pd.Series]:
     """
     Square root of (a) each element in a series or (b) a real number
@@ -443,7 +443,7 @@ def sqrt(x: Union[Real, pd.Series]) -> Union[Real, pd.Series]:
     :func:`pow`
 
     """
-    if isinstance(x, pd.Series):
+    if isinstance(x, (pd.Series, pd.DataFrame)):
         return np.sqrt(x)
 
     result = math.sqrt(x)
@@ -451,7 +451,7 @@ def sqrt(x: Union[Real, pd.Series]) -> Union[Real, pd.Series]:
     return round(result) if round(result) == result else result
 
 
-@plot_function
+@plot_function(panel=True)
 def abs_(x: pd.Series) -> pd.Series:
     """
     Absolute value of each element in series
@@ -483,7 +483,7 @@ def abs_(x: pd.Series) -> pd.Series:
     return abs(x)
 
 
-@plot_function
+@plot_function(panel=True)
 def floor(x: pd.Series, value: float = 0) -> pd.Series:
     """
     Floor series at minimum value
@@ -513,10 +513,10 @@ def floor(x: pd.Series, value: float = 0) -> pd.Series:
 
     """
     assert x.index.is_monotonic_increasing
-    return x.apply(lambda y: max(y, value))
+    return x.clip(lower=value)
 
 
-@plot_function
+@plot_function(panel=True)
 def ceil(x: pd.Series, value: float = 0) -> pd.Series:
     """
     Cap series at maximum value
@@ -546,7 +546,7 @@ def ceil(x: pd.Series, value: float = 0) -> pd.Series:
 
     """
     assert x.index.is_monotonic_increasing
-    return x.apply(lambda y: min(y, value))
+    return x.clip(upper=value)
 
 
 @plot_function
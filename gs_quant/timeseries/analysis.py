@@ -87,7 +87,7 @@ def last(x: pd.Series) -> pd.Series:
     return pd.Series(x[-1], x.index)
 
 
-@plot_function
+@plot_function(panel=True)
 def count(x: pd.Series) -> pd.Series:
     """
     Count observations in series
@@ -119,10 +119,10 @@ def count(x: pd.Series) -> pd.Series:
     :func:`sum`
 
     """
-    return x.rolling(x.size, 0).count()
+    return x.rolling(len(x), 0).count()
 
 
-@plot_function
+@plot_function(panel=True)
 def diff(x: pd.Series, obs: int = 1) -> pd.Series:
     """
     Diff observations with given lag
@@ -160,7 +160,7 @@ def diff(x: pd.Series, obs: int = 1) -> pd.Series:
     return ret_series
 
 
-@plot_function
+@plot_function(panel=True)
 def lag(x: pd.Series, obs: int = 1) -> pd.Series:
     """
     Lag timeseries by a specified number of observations
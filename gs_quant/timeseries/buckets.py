@@ -0,0 +1,405 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+
+import datetime as dt
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple, Type, Union
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import AbstractHolidayCalendar, Holiday, USLaborDay, USMemorialDay, USThanksgivingDay, \
+    nearest_workday
+
+from gs_quant.errors import MqValueError
+
+_DAY = 86400 * 10 ** 9
+_HOUR = 3600 * 10 ** 9
+
+# Day types index the rows of bucket definitions: Monday to Sunday, then holidays (whatever the day of the week)
+HOLIDAY = 7
+
+
+# TODO: get NERC Calendar from SecDB
+class NercCalendar(AbstractHolidayCalendar):
+    rules = [
+        Holiday('New Years Day', month=1, day=1, observance=nearest_workday),
+        USMemorialDay,
+        Holiday('July 4th', month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday('Christmas', month=12, day=25, observance=nearest_workday)
+    ]
+
+
+class BucketDefinition:
+
+    """
+    The hours of each type of day (Monday to Sunday, and holidays) in a price bucket
+    """
+
+    def __init__(self, name: str, hours: np.ndarray):
+        """
+        A price bucket
+
+        :param name: The name of the bucket
+        :param hours: Array of shape (8, 24) of whether each hour of each day type (Monday to Sunday, then holidays) is
+        in the bucket
+
+        **Examples**
+
+        Mornings (6am to 10am) of weekdays which are not holidays:
+
+        >>> from gs_quant.timeseries.buckets import BucketDefinition
+        >>> import numpy as np
+        >>>
+        >>> hours = np.zeros((8, 24), dtype=bool)
+        >>> hours[:5, 6:10] = True
+        >>> mornings = BucketDefinition('mornings', hours)
+        """
+        hours = np.array(hours, dtype=bool)
+        if hours.shape != (8, 24):
+            raise MqValueError('bucket hours must be of shape (8, 24), not {}'.format(hours.shape))
+
+        hours.flags.writeable = False
+        self.__name = name
+        self.__hours = hours
+
+    def __repr__(self):
+        return 'BucketDefinition({})'.format(self.__name)
+
+    @classmethod
+    def of(cls, name: str, hours: Iterable[int], days: Iterable[int] = range(7), holidays: bool = True) \
+            -> 'BucketDefinition':
+        """
+        A bucket of the same hours of each of a set of days
+
+        :param name: The name of the bucket
+        :param hours: The hours (0 to 23) in the bucket
+        :param days: The days of the week (0 is Monday) in the bucket
+        :param holidays: Whether the hours of holidays are in the bucket
+        :return: the bucket
+        """
+        table = np.zeros((8, 24), dtype=bool)
+        rows = list(days) + ([HOLIDAY] if holidays else [])
+        table[np.ix_(rows, list(hours))] = True
+        return cls(name, table)
+
+    @property
+    def name(self) -> str:
+        """The name of the bucket"""
+        return self.__name
+
+    @property
+    def hours(self) -> np.ndarray:
+        """Read-only array of shape (8, 24) of whether each hour of each day type is in the bucket"""
+        return self.__hours
+
+
+class BucketCalendar:
+
+    """
+    The time zone, peak hours, weekends and holidays of a power market (e.g. an ISO), from which its buckets are
+    defined. Bucket definitions are compiled once and cached, and applied to whole series (or panels of series, e.g. of
+    many nodes) at once
+    """
+
+    def __init__(self, name: str, timezone: str = 'US/Eastern', peak_start: int = 7, peak_end: int = 23,
+                 weekends: Tuple[int, ...] = (5, 6), holidays: Type[AbstractHolidayCalendar] = NercCalendar):
+        """
+        The calendar of a power market
+
+        :param name: The name of the market
+        :param timezone: The market's time zone, in which its hours and dates are defined
+        :param peak_start: The first peak hour
+        :param peak_end: The hour after the last peak hour
+        :param weekends: The days of the week (0 is Monday) which are not business days
+        :param holidays: The market's holiday calendar
+
+        **Examples**
+
+        Daily peak prices of a panel of nodes of the same ISO, indexed by UTC time:
+
+        >>> from gs_quant.timeseries.buckets import get_bucket_calendar
+        >>>
+        >>> get_bucket_calendar('MISO').bucketize(prices, 'peak')
+        """
+        self.__name = name
+        self.__timezone = timezone
+        self.__peak_start = peak_start
+        self.__peak_end = peak_end
+        self.__weekends = tuple(weekends)
+        self.__holidays = holidays
+        self.__buckets: Dict[str, BucketDefinition] = {}
+        self.__lock = threading.Lock()
+
+    def __repr__(self):
+        return 'BucketCalendar({})'.format(self.__name)
+
+    @property
+    def name(self) -> str:
+        """The name of the market"""
+        return self.__name
+
+    @property
+    def timezone(self) -> str:
+        """The market's time zone"""
+        return self.__timezone
+
+    @property
+    def peak_hours(self) -> Tuple[int, int]:
+        """The first peak hour, and the hour after the last"""
+        return self.__peak_start, self.__peak_end
+
+    @property
+    def weekends(self) -> Tuple[int, ...]:
+        """The days of the week which are not business days"""
+        return self.__weekends
+
+    def bucket(self, bucket: Union[str, BucketDefinition]) -> BucketDefinition:
+        """
+        The definition of a bucket in this market
+
+        :param bucket: One of '7x24', 'peak', 'offpeak', '7x8' and '2x16h', or a custom bucket definition
+        :return: the bucket definition
+        """
+        if isinstance(bucket, BucketDefinition):
+            return bucket
+
+        name = bucket.lower()
+        with self.__lock:
+            definition = self.__buckets.get(name)
+            if definition is None:
+                definition = BucketDefinition(name, self.__compile(name, bucket))
+                self.__buckets[name] = definition
+
+        return definition
+
+    def day_types(self, days: np.ndarray) -> np.ndarray:
+        """
+        The type of each day: its day of the week (0 is Monday), or HOLIDAY
+
+        :param days: Array of dates, as days since 1970-01-01
+        :return: Array of day types
+        """
+        days = np.asarray(days, dtype=np.int64)
+        if not len(days):
+            return days
+
+        # 1970-01-01 was a Thursday
+        types = (days + 3) % 7
+        first, last = days.min(), days.max()
+        holidays = _holidays(self.__holidays, _year(first), _year(last))
+        holidays = holidays[(holidays >= first) & (holidays <= last)]
+
+        is_holiday = np.zeros(last - first + 1, dtype=bool)
+        is_holiday[holidays - first] = True
+        types[is_holiday[days - first]] = HOLIDAY
+        return types
+
+    def mask(self, index: pd.DatetimeIndex, bucket: Union[str, BucketDefinition]) -> np.ndarray:
+        """
+        Whether each time is in a bucket
+
+        :param index: Times, which are converted to the market's time zone
+        :param bucket: One of '7x24', 'peak', 'offpeak', '7x8' and '2x16h', or a custom bucket definition
+        :return: Boolean array of whether each time is in the bucket
+        """
+        definition = self.bucket(bucket)
+        local = self.__local(index)
+        return definition.hours[self.day_types(local // _DAY), (local % _DAY) // _HOUR]
+
+    def bucketize(self, prices: Union[pd.Series, pd.DataFrame], bucket: Union[str, BucketDefinition] = '7x24',
+                  granularity: str = 'daily', start_date: Optional[dt.date] = None,
+                  end_date: Optional[dt.date] = None) -> Union[pd.Series, pd.DataFrame]:
+        """
+        Average prices of each date (or month) in a bucket
+
+        :param prices: Prices indexed by time (at a regular frequency), or DataFrame of the prices of several nodes
+        :param bucket: One of '7x24', 'peak', 'offpeak', '7x8' and '2x16h', or a custom bucket definition
+        :param granularity: daily or monthly
+        :param start_date: The first date, in the market's time zone. Defaults to that of the first price
+        :param end_date: The last date, in the market's time zone. Defaults to that of the last price
+        :return: Average prices indexed by date, or by the last date of each month
+
+        Dates (and, for monthly granularity, months) missing any price at the frequency of the data are excluded. For a
+        DataFrame, this is for each node, with missing prices either absent from the index or NaN.
+        """
+        if granularity.lower() in ('daily', 'd'):
+            monthly = False
+        elif granularity.lower() in ('monthly', 'm'):
+            monthly = True
+        else:
+            raise ValueError('Invalid granularity: ' + granularity + '. Expected Value: daily or monthly.')
+
+        definition = self.bucket(bucket)
+        panel = isinstance(prices, pd.DataFrame)
+        frame = prices if panel else prices.to_frame()
+        if not frame.index.is_monotonic_increasing:
+            frame = frame.sort_index()
+
+        local = self.__local(frame.index)
+        days = local // _DAY
+        first = _day(start_date) if start_date is not None else days[0] if len(days) else 0
+        last = _day(end_date) if end_date is not None else days[-1] if len(days) else -1
+
+        # Only prices of the dates in range count
+        lo, hi = np.searchsorted(days, (first, last + 1))
+        times, local, days = frame.index.asi8[lo:hi], local[lo:hi], days[lo:hi] - first
+        values = frame.to_numpy(dtype=float)[lo:hi]
+        count = max(last - first + 1, 0)
+
+        # The times expected at the frequency of the data, whose prices must all be present for a date to count
+        frequency = int(np.diff(frame.index.asi8).min()) if len(frame) > 1 else _HOUR
+        expected_times = self.__expected_times(first, last, frequency)
+        expected = np.bincount(self.__local(expected_times) // _DAY - first, minlength=count)[:count]
+        present = ~np.isnan(values) & _is_in(times, expected_times.asi8)[:, np.newaxis]
+        complete = _group_sums(present, days, count) == expected[:, np.newaxis]
+
+        dates = np.arange(first, last + 1).astype('M8[D]')
+        if monthly:
+            months = dates.astype('M8[M]')
+            periods = months.astype(np.int64) - (months[0].astype(np.int64) if count else 0)
+            complete = _group_sums(~complete, periods, periods[-1] + 1 if count else 0)[periods] == 0
+        else:
+            periods = np.arange(count)
+
+        included = present & complete[days] & definition.hours[self.day_types(days + first),
+                                                               (local % _DAY) // _HOUR][:, np.newaxis]
+        groups = periods[days]
+        size = periods[-1] + 1 if count else 0
+        totals = _group_sums(np.where(included, values, 0.0), groups, size)
+        counts = _group_sums(included, groups, size)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            averages = totals / counts
+
+        if monthly:
+            labels = (np.unique(months) + 1).astype('M8[D]') - 1
+        else:
+            labels = dates
+
+        # As resampling, from the first period to the last with any prices, labelled within the range of dates
+        populated = np.flatnonzero(counts.any(axis=1))
+        rows = np.arange(populated[0], populated[-1] + 1) if len(populated) else populated
+        rows = rows[labels[rows] <= np.int64(last).astype('M8[D]')]
+        index = pd.Index(labels[rows].astype(object))
+
+        if panel:
+            return pd.DataFrame(averages[rows], index=index, columns=frame.columns)
+        return pd.Series(averages[rows, 0], index=index, name=prices.name)
+
+    def __compile(self, name: str, bucket: str) -> np.ndarray:
+        peak_hours = np.zeros(24, dtype=bool)
+        peak_hours[self.__peak_start:self.__peak_end] = True
+        business = np.ones(8, dtype=bool)
+        business[list(self.__weekends) + [HOLIDAY]] = False
+        peak = business[:, np.newaxis] & peak_hours
+
+        # TODO: get frequency definition from SecDB
+        if name == '7x24':
+            return np.ones((8, 24), dtype=bool)
+        # peak: 7am to 11pm on business days
+        elif name == 'peak':
+            return peak
+        # offpeak: 11pm-7am & weekend & holiday
+        elif name == 'offpeak':
+            return ~peak
+        # 7x8: 11pm to 7am
+        elif name == '7x8':
+            return np.broadcast_to(~peak_hours, (8, 24))
+        # 2x16h: peak hours of weekends & holidays
+        elif name == '2x16h':
+            return ~business[:, np.newaxis] & peak_hours
+
+        raise ValueError('Invalid bucket: ' + bucket + '. Expected Value: peak, offpeak, 7x24, 7x8, 2x16h.')
+
+    def __local(self, index: pd.DatetimeIndex) -> np.ndarray:
+        # Nanoseconds since 1970-01-01 of the wall-clock time in the market's time zone
+        index = pd.DatetimeIndex(index)
+        if index.tz is None:
+            index = index.tz_localize('UTC')
+        return index.tz_convert(self.__timezone).tz_localize(None).asi8
+
+    def __expected_times(self, first: int, last: int, frequency: int) -> pd.DatetimeIndex:
+        if last < first:
+            return pd.DatetimeIndex([], tz=self.__timezone)
+
+        start, end = (pd.Timestamp(np.int64(d).astype('M8[D]')).tz_localize(self.__timezone) for d in (first, last + 1))
+        times = pd.date_range(start, end, freq=pd.Timedelta(frequency, 'ns'))
+        return times[times < end]
+
+
+# TODO: get timezone info from Asset
+_CALENDARS = {
+    'PJM': BucketCalendar('PJM'),
+    'MISO': BucketCalendar('MISO', 'US/Central', 6, 22),
+    'ERCOT': BucketCalendar('ERCOT', 'US/Central', 6, 22),
+    'SPP': BucketCalendar('SPP', 'US/Central', 6, 22),
+    'CAISO': BucketCalendar('CAISO', 'US/Pacific', weekends=(6,)),
+}
+_calendars_lock = threading.Lock()
+
+
+def get_bucket_calendar(iso: str) -> BucketCalendar:
+    """
+    The bucket calendar of an ISO
+
+    :param iso: The name of the ISO, e.g. PJM. ISOs without their own calendar have that of PJM
+    :return: the calendar, which is shared by all callers
+    """
+    name = iso.upper()
+    with _calendars_lock:
+        calendar = _CALENDARS.get(name)
+        if calendar is None:
+            calendar = BucketCalendar(name)
+            _CALENDARS[name] = calendar
+
+    return calendar
+
+
+@lru_cache(maxsize=64)
+def _holidays(calendar: Type[AbstractHolidayCalendar], first_year: int, last_year: int) -> np.ndarray:
+    # Holidays of whole years, as days since 1970-01-01
+    holidays = calendar().holidays(start=dt.date(first_year, 1, 1), end=dt.date(last_year, 12, 31))
+    holidays = holidays.values.astype('M8[D]').astype(np.int64)
+    holidays.flags.writeable = False
+    return holidays
+
+
+def _day(date: dt.date) -> int:
+    return int(np.datetime64(date, 'D').astype(np.int64))
+
+
+def _year(day: int) -> int:
+    return int(np.int64(day).astype('M8[D]').astype('M8[Y]').astype(np.int64)) + 1970
+
+
+def _is_in(values: np.ndarray, sorted_values: np.ndarray) -> np.ndarray:
+    # As np.isin, by binary search of sorted values
+    positions = np.minimum(np.searchsorted(sorted_values, values), len(sorted_values) - 1)
+    return sorted_values[positions] == values if len(sorted_values) else np.zeros(len(values), dtype=bool)
+
+
+def _group_sums(values: np.ndarray, groups: np.ndarray, size: int) -> np.ndarray:
+    # Sums of the rows of values in each of size groups, given the (ascending) group of each row
+    if values.dtype == bool:
+        values = values.astype(np.int64)
+
+    sums = np.zeros((size,) + values.shape[1:], dtype=values.dtype)
+    if len(groups):
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        sums[groups[starts]] = np.add.reduceat(values, starts, axis=0)
+    return sums
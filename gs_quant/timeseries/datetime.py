@@ -36,21 +36,15 @@ def __interpolate_step(x: pd.Series, dates: pd.Series = None) -> pd.Series:
     first_date = pd.Timestamp(dates.index[0]) if isinstance(x.index[0], pd.Timestamp) else dates.index[0]
 
     # locate previous valid date or take first value from series
-    prev = x.index[0] if first_date < x.index[0] else x.index[x.index.get_loc(first_date, 'pad')]
+    current = x.iloc[max(x.index.searchsorted(first_date, side='right') - 1, 0)]
 
-    current = x[prev]
+    curve = x.align(dates, 'right', axis=0)[0]            # only need values from dates
 
-    curve = x.align(dates, 'right', )[0]                  # only need values from dates
+    # each missing value takes the last value before it, or the previous valid date's value if there is none
+    return curve.ffill().fillna(current)
 
-    for knot in curve.iteritems():
-        if np.isnan(knot[1]):
-            curve[knot[0]] = current
-        else:
-            current = knot[1]
-    return curve
 
-
-@plot_function
+@plot_function(panel=True)
 def align(x: Union[pd.Series, Real], y: Union[pd.Series, Real], method: Interpolate = Interpolate.INTERSECT) -> \
         Union[List[pd.Series], List[Real]]:
     """
@@ -105,19 +99,22 @@ def align(x: Union[pd.Series, Real], y: Union[pd.Series, Real], method: Interpol
     if isinstance(y, Real):
         return [x, pd.Series(y, index=x.index)]
 
+    # a panel and a series are aligned on dates only
+    axis = 0 if isinstance(x, pd.DataFrame) != isinstance(y, pd.DataFrame) else None
+
     if method == Interpolate.INTERSECT:
-        return x.align(y, 'inner')
+        return x.align(y, 'inner', axis=axis)
     if method == Interpolate.NAN:
-        return x.align(y, 'outer')
+        return x.align(y, 'outer', axis=axis)
     if method == Interpolate.ZERO:
-        return x.align(y, 'outer', fill_value=0)
+        return x.align(y, 'outer', axis=axis, fill_value=0)
     if method == Interpolate.TIME:
-        new_x, new_y = x.align(y, 'outer')
+        new_x, new_y = x.align(y, 'outer', axis=axis)
         new_x.interpolate('time', limit_area='inside', inplace=True)
         new_y.interpolate('time', limit_area='inside', inplace=True)
         return [new_x, new_y]
     if method == Interpolate.STEP:
-        new_x, new_y = x.align(y, 'outer')
+        new_x, new_y = x.align(y, 'outer', axis=axis)
         new_x.fillna(method='ffill', inplace=True)
         new_y.fillna(method='ffill', inplace=True)
         new_x.fillna(method='bfill', inplace=True)
@@ -127,7 +124,7 @@ def align(x: Union[pd.Series, Real], y: Union[pd.Series, Real], method: Interpol
         raise MqValueError('Unknown intersection type: ' + method)
 
 
-@plot_function
+@plot_function(panel=True)
 def interpolate(x: pd.Series, dates: Union[List[date], List[time], pd.Series] = None,
                 method: Interpolate = Interpolate.INTERSECT) -> pd.Series:
     """
@@ -176,18 +173,18 @@ def interpolate(x: pd.Series, dates: Union[List[date], List[time], pd.Series] =
     if dates is None:
         dates = x
 
-    if isinstance(dates, pd.Series):
+    if isinstance(dates, (pd.Series, pd.DataFrame)):
         align_series = dates
     else:
         align_series = pd.Series(np.nan, dates)
 
     if method == Interpolate.INTERSECT:
-        return x.align(align_series, 'inner')[0]
+        return x.align(align_series, 'inner', axis=0)[0]
     if method == Interpolate.NAN:
-        return x.align(align_series, 'right')[0]
+        return x.align(align_series, 'right', axis=0)[0]
     if method == Interpolate.ZERO:
         align_series = pd.Series(0.0, dates)
-        return x.align(align_series, 'right', fill_value=0)[0]
+        return x.align(align_series, 'right', axis=0, fill_value=0)[0]
     if method == Interpolate.STEP:
         return __interpolate_step(x, align_series)
     else:
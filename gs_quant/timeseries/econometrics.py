@@ -15,7 +15,10 @@
 # should be fully documented: docstrings should describe parameters and the return value, and provide a 1-line
 # description. Type annotations should be provided for parameters.
 
+import weakref
+
 from .statistics import *
+from .statistics import _rolling_matrices
 from ..errors import *
 
 """
@@ -33,7 +36,11 @@ class AnnualizationFactor(IntEnum):
     ANNUALLY = 1
 
 
-@plot_function
+def _apply_elementwise(x: Union[pd.Series, pd.DataFrame], fn) -> Union[pd.Series, pd.DataFrame]:
+    return x.applymap(fn) if isinstance(x, pd.DataFrame) else x.apply(fn)
+
+
+@plot_function(panel=True)
 def returns(series: pd.Series, obs: int = 1, type: Returns = Returns.SIMPLE) -> pd.Series:
     """
     Calculate returns from price series
@@ -88,7 +95,7 @@ def returns(series: pd.Series, obs: int = 1, type: Returns = Returns.SIMPLE) ->
     if type == Returns.SIMPLE:
         ret_series = series / series.shift(obs) - 1
     elif type == Returns.LOGARITHMIC:
-        log_s = series.apply(math.log)
+        log_s = _apply_elementwise(series, math.log)
         ret_series = log_s - log_s.shift(obs)
     else:
         raise MqValueError('Unknown returns type (use simple / log)')
@@ -96,7 +103,7 @@ def returns(series: pd.Series, obs: int = 1, type: Returns = Returns.SIMPLE) ->
     return ret_series
 
 
-@plot_function
+@plot_function(panel=True)
 def prices(series: pd.Series, initial: int = 1, type: Returns = Returns.SIMPLE) -> pd.Series:
     """
     Calculate price levels from returns series
@@ -151,7 +158,7 @@ def prices(series: pd.Series, initial: int = 1, type: Returns = Returns.SIMPLE)
     if type == Returns.SIMPLE:
         return product(1 + series) * initial
     elif type == Returns.LOGARITHMIC:
-        return product(series.apply(math.exp)) * initial
+        return product(_apply_elementwise(series, math.exp)) * initial
     else:
         raise MqValueError('Unknown returns type (use simple / log)')
 
@@ -220,18 +227,34 @@ def change(x: pd.Series) -> pd.Series:
     return x - x[0]
 
 
+# Annualization factors by id of index, with a weak reference to the index. Indices are immutable and shared by the
+# series derived from one another, so the factor is inferred once for all of them
+_annualization_factors = {}
+
+
 def _get_annualization_factor(x):
-    prev_idx = x.index[0]
-    distances = []
+    index = x.index
+    cached = _annualization_factors.get(id(index))
+    if cached is not None and cached[0]() is index:
+        return cached[1]
+
+    distances = _day_distances(index)
+    if (distances == 0).any():
+        raise MqValueError('multiple data points on same date')
+
+    factor = _annualization_factor_for_distance(numpy.average(distances))
+    key = id(index)
+    _annualization_factors[key] = (weakref.ref(index, lambda _: _annualization_factors.pop(key, None)), factor)
+    return factor
+
+
+def _day_distances(index: pd.Index) -> numpy.ndarray:
+    # Whole days between consecutive points (as timedelta.days, i.e. rounded down)
+    times = (index if isinstance(index, pd.DatetimeIndex) else pd.DatetimeIndex(index)).asi8
+    return numpy.diff(times) // (86400 * 10 ** 9)
 
-    for idx, value in x.iloc[1:].iteritems():
-        d = (idx - prev_idx).days
-        if d == 0:
-            raise MqValueError('multiple data points on same date')
-        distances.append(d)
-        prev_idx = idx
 
-    average_distance = numpy.average(distances)
+def _annualization_factor_for_distance(average_distance: float) -> AnnualizationFactor:
     if average_distance < 2.1:
         factor = AnnualizationFactor.DAILY
     elif 6 <= average_distance < 8:
@@ -249,7 +272,7 @@ def _get_annualization_factor(x):
     return factor
 
 
-@plot_function
+@plot_function(panel=True)
 def annualize(x: pd.Series) -> pd.Series:
     """
     Annualize series based on sample observation frequency
@@ -293,7 +316,7 @@ def annualize(x: pd.Series) -> pd.Series:
     return x * math.sqrt(factor)
 
 
-@plot_function
+@plot_function(panel=True)
 def volatility(x: pd.Series, w: Union[Window, int] = Window(None, 0),
                returns_type: Returns = Returns.SIMPLE) -> pd.Series:
     """
@@ -409,7 +432,45 @@ def correlation(x: pd.Series, y: pd.Series,
     return apply_ramp(interpolate(corr, x, Interpolate.NAN), w)
 
 
-@plot_function
+def correlation_matrix(x: pd.DataFrame, w: Union[Window, int] = Window(None, 0),
+                       type_: SeriesType = SeriesType.PRICES, latest: bool = False) -> pd.DataFrame:
+    """
+    Rolling correlation matrix of the series of a panel
+
+    :param x: DataFrame: panel of aligned price series
+    :param w: Window or int: number of observations and ramp up to use. e.g. Window(22, 10) where 22 is the window size
+    and 10 the ramp up value. Window size defaults to length of series.
+    :param type_: type of the series of the panel
+    :param latest: return only the matrix for the last date
+    :return: DataFrame of the matrix for each date, indexed by date and series (as DataFrame.rolling().corr()), or of
+    the matrix for the last date if latest
+
+    **Usage**
+
+    Correlation of the returns of each pair of series, as :func:`correlation`, over the observations of both in a
+    rolling window of rows. The sums of the window are updated as each row enters and leaves it, rather than computed
+    for each pair of series, so the cost is proportional to the number of dates and the square of the number of series.
+
+    Where series have missing values, the window is of rows of the panel, whereas :func:`correlation` drops the missing
+    values of each series before applying the window.
+
+    **Examples**
+
+    Compute the latest rolling :math:`1` month (:math:`22` business day) correlation matrix of three price series:
+
+    >>> panel = pd.DataFrame({'a': generate_series(100), 'b': generate_series(100), 'c': generate_series(100)})
+    >>> correlation_matrix(panel, 22, latest=True)
+
+    **See also**
+
+    :func:`correlation` :func:`covariance_matrix`
+    """
+    w = normalize_window(x, w)
+    ret = returns(x) if type_ == SeriesType.PRICES else x
+    return _rolling_matrices(ret, w, correlation=True, latest=latest)
+
+
+@plot_function(panel=True)
 def beta(x: pd.Series, b: pd.Series, w: Union[Window, int] = Window(None, 0), prices: bool = True) -> pd.Series:
     """
     Rolling beta of price series and benchmark
@@ -463,8 +524,8 @@ def beta(x: pd.Series, b: pd.Series, w: Union[Window, int] = Window(None, 0), pr
     ret_series = returns(x) if prices else x
     ret_benchmark = returns(b) if prices else b
 
-    cov = ret_series.rolling(w.w, 0).cov(ret_benchmark.rolling(w.w, 0))
-    result = cov / ret_benchmark.rolling(w.w, 0).var()
+    cov = ret_series.rolling(w.w, 0).cov(ret_benchmark)
+    result = cov.div(ret_benchmark.rolling(w.w, 0).var(), axis=0)
 
     # do not compute initial values as they may be extreme when sample size is small
 
@@ -473,7 +534,203 @@ def beta(x: pd.Series, b: pd.Series, w: Union[Window, int] = Window(None, 0), pr
     return apply_ramp(interpolate(result, x, Interpolate.NAN), w)
 
 
-@plot_function
+def rolling_regression(y: Union[pd.Series, pd.DataFrame], X: pd.DataFrame, w: Union[Window, int] = Window(None, 0),
+                       intercept: bool = True) -> pd.DataFrame:
+    """
+    Rolling ordinary least squares regression of series on factors
+
+    :param y: time series, or DataFrame: panel of aligned series, to regress
+    :param X: DataFrame of factor series
+    :param w: Window or int: number of observations and ramp up to use. e.g. Window(22, 10) where 22 is the window size
+    and 10 the ramp up value. Window size defaults to length of series.
+    :param intercept: whether to fit an intercept
+    :return: DataFrame of the coefficient and t-statistic of each factor, and the :math:`R^2`, for each date, indexed by
+    date (and series, if y is a panel)
+
+    **Usage**
+
+    Fit the linear model of each series in a rolling window of rows:
+
+    :math:`Y_t = \\alpha + \\beta_1 X_{1,t} + ... + \\beta_k X_{k,t} + \\epsilon_t`
+
+    by least squares over the rows in which the series and all factors are present. t-statistics are of the hypothesis
+    that each coefficient is zero, from the standard errors :math:`\\sqrt{\\hat{\\sigma}^2 (X^T X)^{-1}_{ii}}` where
+    :math:`\\hat{\\sigma}^2` is the sum of squared residuals divided by :math:`n - p` for :math:`n` observations and
+    :math:`p` coefficients. :math:`R^2` is centred if fitting an intercept and uncentred otherwise. Statistics are NaN
+    where the window has no more observations than coefficients.
+
+    The normal equations of each window are updated as rows enter and leave it, rather than formed for each window,
+    and are shared by the series of a panel with the same missing values, so the cost is proportional to the number of
+    dates, factors and series.
+
+    Factors are aligned with the dates of y. To regress the returns of prices, apply :func:`returns` to each.
+
+    **Examples**
+
+    Compute the rolling :math:`1` year (:math:`252` business day) regression of returns on those of two factors:
+
+    >>> factors = pd.DataFrame({'a': returns(generate_series(1000)), 'b': returns(generate_series(1000))})
+    >>> regression = rolling_regression(returns(generate_series(1000)), factors, 252)
+    >>> regression['coefficient']
+
+    **See also**
+
+    :func:`beta` :func:`returns`
+    """
+    w = normalize_window(y, w)
+    panel = isinstance(y, pd.DataFrame)
+    index = y.index if w.w <= len(y) else y.index[:0]
+    index = index[w.r:]
+
+    names = (['intercept'] if intercept else []) + list(X.columns)
+    columns = pd.MultiIndex.from_tuples([('coefficient', n) for n in names] + [('t_stat', n) for n in names] +
+                                        [('r_squared', '')])
+
+    values = numpy.asarray(y, dtype=float).reshape(len(y), -1)
+    results = _rolling_regression(values, X.reindex(y.index).to_numpy(dtype=float), w.w, intercept,
+                                  len(y) - len(index))
+    if panel:
+        return pd.DataFrame(results.reshape(-1, len(columns)), index=pd.MultiIndex.from_product((index, y.columns)),
+                            columns=columns)
+    return pd.DataFrame(results[:, 0], index=index, columns=columns)
+
+
+# Windows in which the variance of a factor or series is less than this fraction of the largest squared (centred) value
+# summed since the sums were last recomputed may have lost their precision to cancellation, so are fitted from scratch
+_REGRESSION_CANCELLATION = 1e-6
+
+
+def _rolling_regression(y: numpy.ndarray, x: numpy.ndarray, w: int, intercept: bool, first: int,
+                        segment: int = 1024, block: int = 2 ** 20) -> numpy.ndarray:
+    # Coefficients, t-statistics and R-squared of the regression of each column of y on x over each rolling window of w
+    # rows, from the first. The sums of the normal equations of each window are those of the last, plus the terms of
+    # the row entering and less those of the row leaving
+    rows, factors = x.shape
+    p = factors + intercept
+    results = numpy.full((rows - first, y.shape[1], 2 * p + 1), numpy.nan)
+
+    # Series with the same missing values share the sums of the factors' products
+    valid = ~numpy.isnan(y) & ~numpy.isnan(x).any(axis=1)[:, numpy.newaxis]
+    patterns, groups = numpy.unique(valid, axis=1, return_inverse=True)
+    groups = groups.reshape(-1)
+
+    def centre(values: numpy.ndarray, present: numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        # With an intercept, values are centred on their mean over the rows to be summed, to limit cancellation
+        values = numpy.where(present[:, numpy.newaxis], values, 0.0)
+        reference = numpy.zeros(values.shape[1])
+        if intercept and present.any():
+            reference = values.sum(axis=0) / present.sum()
+        return numpy.where(present[:, numpy.newaxis], values - reference, 0.0), reference
+
+    def sums(z: numpy.ndarray, u: numpy.ndarray, present: numpy.ndarray) -> list:
+        # The sums over rows, each with a leading axis of length one
+        return [numpy.asarray(s)[numpy.newaxis] for s in
+                (present.sum(), z.sum(axis=0), z.T @ z, u.sum(axis=0), z.T @ u, (u * u).sum(axis=0))]
+
+    def terms(z: numpy.ndarray, u: numpy.ndarray, present: numpy.ndarray) -> list:
+        # The terms of the sums for each row, which are accumulated in place
+        return [present.astype(float), z.copy(), z[:, :, numpy.newaxis] * z[:, numpy.newaxis], u.copy(),
+                z[:, :, numpy.newaxis] * u[:, numpy.newaxis], u * u]
+
+    def statistics(window_sums: list, x_reference: numpy.ndarray, y_reference: numpy.ndarray) -> numpy.ndarray:
+        n, s_x, s_xx, s_y, s_xy, s_yy = window_sums
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            if intercept:
+                x_mean = s_x / n[:, numpy.newaxis]
+                y_mean = s_y / n[:, numpy.newaxis]
+                x_total = s_x[:, :, numpy.newaxis]
+                s_xx = s_xx - x_total * x_mean[:, numpy.newaxis]
+                s_xy = s_xy - x_total * y_mean[:, numpy.newaxis]
+                s_yy = s_yy - s_y * y_mean
+
+            fitted = n > p
+            s_xx = numpy.where(fitted[:, numpy.newaxis, numpy.newaxis], s_xx, numpy.eye(factors))
+            try:
+                inverse = numpy.linalg.inv(s_xx)
+            except numpy.linalg.LinAlgError:
+                # Some window's factors are collinear
+                inverse = numpy.linalg.pinv(s_xx, hermitian=True)
+            slopes = inverse @ s_xy
+            residual = numpy.maximum(s_yy - (slopes * s_xy).sum(axis=1), 0.0)
+            variance = residual / (n - p)[:, numpy.newaxis]
+
+            coefficients = [slopes]
+            diagonal = numpy.diagonal(inverse, axis1=1, axis2=2)
+            errors = [numpy.sqrt(variance[:, numpy.newaxis] * diagonal[:, :, numpy.newaxis])]
+            if intercept:
+                x_mean = x_mean + x_reference
+                coefficients.insert(0, (y_mean + y_reference - (slopes * x_mean[:, :, numpy.newaxis]).sum(axis=1))
+                                    [:, numpy.newaxis])
+                leverage = numpy.einsum('bi,bij,bj->b', x_mean, inverse, x_mean)
+                errors.insert(0, numpy.sqrt(variance * (1 / n + leverage)[:, numpy.newaxis])[:, numpy.newaxis])
+
+            coefficients = numpy.concatenate(coefficients, axis=1)
+            t_stats = coefficients / numpy.concatenate(errors, axis=1)
+            r_squared = 1 - residual / s_yy
+
+        result = numpy.concatenate((coefficients, t_stats, r_squared[:, numpy.newaxis]), axis=1).transpose(0, 2, 1)
+        result[~fitted] = numpy.nan
+        return result
+
+    def imprecise(window_sums: list, scale: numpy.ndarray) -> numpy.ndarray:
+        # Whether the sums of each window have lost the precision of the variance of any factor or series to
+        # cancellation
+        n, s_x, s_xx, s_y, _, s_yy = window_sums
+        deviations = numpy.concatenate((numpy.diagonal(s_xx, axis1=1, axis2=2), s_yy), axis=1)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            if intercept:
+                totals = numpy.concatenate((s_x, s_y), axis=1)
+                deviations = deviations - totals * totals / n[:, numpy.newaxis]
+            return (deviations < _REGRESSION_CANCELLATION * scale * n[:, numpy.newaxis]).any(axis=1)
+
+    for group, present in enumerate(patterns.T):
+        columns = numpy.flatnonzero(groups == group)
+        step = max(1, block // (factors * (factors + len(columns) + 1) + 2 * len(columns) + 1))
+
+        for start in range(first, rows, segment):
+            # Sums are computed exactly at the start of each segment, to bound the accumulation of rounding errors. They
+            # keep the rounding errors of the largest values they have seen, which swamp the variance of windows of much
+            # smaller variations (e.g. after a fall in volatility), so those windows are fitted from scratch
+            end = min(start + segment, rows)
+            low = max(0, start - w + 1)
+            z, x_reference = centre(x[low:end], present[low:end])
+            u, y_reference = centre(y[low:end, columns], present[low:end])
+            scale = numpy.fmax.accumulate(numpy.concatenate((z, u), axis=1) ** 2, axis=0)
+            last = sums(z[:start - low + 1], u[:start - low + 1], present[low:start + 1])
+            results[start - first, columns] = statistics(last, x_reference, y_reference)[0]
+            refit = [start] if imprecise(last, scale[start - low:start - low + 1])[0] else []
+
+            for block_start in range(start + 1, end, step):
+                block_end = min(block_start + step, end)
+                entering = terms(z[block_start - low:block_end - low], u[block_start - low:block_end - low],
+                                 present[block_start:block_end])
+
+                # Row t - w leaves as row t enters, once the window is full
+                leaving_start, leaving_end = max(block_start - w, 0), block_end - w
+                if leaving_start < leaving_end:
+                    leaving = terms(z[leaving_start - low:leaving_end - low], u[leaving_start - low:leaving_end - low],
+                                    present[leaving_start:leaving_end])
+                    offset = len(entering[0]) - len(leaving[0])
+                    for e, v in zip(entering, leaving):
+                        e[offset:] -= v
+
+                last = [numpy.cumsum(e, axis=0, out=e) + s for e, s in zip(entering, last)]
+                results[block_start - first:block_end - first, columns] = \
+                    statistics(last, x_reference, y_reference)
+                refit.extend(block_start + numpy.flatnonzero(imprecise(last, scale[block_start - low:block_end - low])))
+                last = [s[-1:] for s in last]
+
+            for row in refit:
+                window = slice(max(0, row - w + 1), row + 1)
+                z_window, x_window_reference = centre(x[window], present[window])
+                u_window, y_window_reference = centre(y[window, columns], present[window])
+                results[row - first, columns] = statistics(sums(z_window, u_window, present[window]),
+                                                           x_window_reference, y_window_reference)[0]
+
+    return results
+
+
+@plot_function(panel=True)
 def max_drawdown(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     """
     Compute the maximum peak to trough drawdown over a rolling window.
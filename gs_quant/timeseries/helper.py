@@ -14,6 +14,8 @@ specific language governing permissions and limitations
 under the License.
 """
 
+import inspect
+import itertools
 import logging
 from collections import namedtuple
 from enum import Enum, IntEnum
@@ -23,6 +25,8 @@ from typing import Optional, Union, List
 import pandas as pd
 
 from gs_quant.api.gs.data import QueryType
+from gs_quant.errors import MqValueError
+from gs_quant.timeseries.lazy import LazyEvaluation
 
 
 def _create_enum(name, members):
@@ -50,12 +54,16 @@ def _check_window(x: pd.Series, window: Window):
 
 def apply_ramp(x: pd.Series, window: Window) -> pd.Series:
     _check_window(x, window)
-    return x[window.r:] if window.w <= len(x) else pd.Series([])
+    if window.w <= len(x):
+        # Without a ramp, x (and so its index, to which metadata such as the annualization factor is keyed) is kept
+        return x[window.r:] if window.r else x
+
+    return pd.Series([]) if isinstance(x, pd.Series) else pd.DataFrame(columns=x.columns)
 
 
 def normalize_window(x: pd.Series, window: Union[Window, int, None], default_window: int = None) -> Window:
     if default_window is None:
-        default_window = x.size
+        default_window = len(x)
 
     if isinstance(window, int):
         window = Window(w=window, r=window)
@@ -73,26 +81,78 @@ def normalize_window(x: pd.Series, window: Union[Window, int, None], default_win
     return window
 
 
-def plot_function(fn):
+def plot_function(fn=None, *, panel: bool = False):
     # Indicates that fn should be exported to plottool as a pure function.
-    fn.plot_function = True
-    return fn
+    # fn also accepts panels (DataFrames of aligned series) in place of its series, returning a DataFrame with a column
+    # (or columns) for each column of the panel. Other series are applied to every column of the panel. Set panel if fn
+    # evaluates panels natively, in one pass over all columns, when its first argument is a panel.
+    # Within a LazyEvaluation, fn returns an expression, evaluated once for all identical calls
+    def decorator(fn):
+        first = next(iter(inspect.signature(fn).parameters), None)
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if LazyEvaluation.current_is_set:
+                return LazyEvaluation.current.expression(wrapper, args, kwargs)
+
+            panels = [a for a in itertools.chain(args, kwargs.values()) if isinstance(a, pd.DataFrame)]
+            if not panels:
+                return fn(*args, **kwargs)
+
+            if any(not p.columns.equals(panels[0].columns) for p in panels[1:]):
+                raise MqValueError('panels must have the same columns')
+
+            if panel and isinstance(args[0] if args else kwargs.get(first), pd.DataFrame):
+                return fn(*args, **kwargs)
+
+            return _apply_by_column(fn, args, kwargs, panels[0].columns)
+
+        wrapper.plot_function = True
+        wrapper.panel = panel
+        return wrapper
+
+    return decorator(fn) if fn else decorator
+
+
+def _apply_by_column(fn, args: tuple, kwargs: dict, columns: pd.Index) \
+        -> Union[pd.DataFrame, pd.Series, List[pd.DataFrame]]:
+    def column(value, i: int):
+        return value.iloc[:, i].rename(None) if isinstance(value, pd.DataFrame) else value
+
+    results = [fn(*(column(a, i) for a in args), **{k: column(v, i) for k, v in kwargs.items()})
+               for i in range(len(columns))]
+
+    # Results are aligned on the union of their indices in one pass
+    if results and all(isinstance(r, (pd.Series, pd.DataFrame)) for r in results):
+        return pd.concat(results, axis=1, keys=columns)
+    if results and all(isinstance(r, (list, tuple)) for r in results):
+        return [pd.concat(r, axis=1, keys=columns) for r in zip(*results)]
+
+    return pd.Series(results, index=columns)
 
 
 def plot_measure(asset_class: Optional[tuple] = None, asset_type: Optional[tuple] = None,
                  dependencies: Optional[List[QueryType]] = []):
     # Indicates that fn should be exported to plottool as a member function / pseudo-measure.
     # Set category to None for no restrictions, else provide a tuple of allowed values.
+    # Within a LazyEvaluation, fn returns an expression, evaluated once for all identical calls in the same DataContext
     def decorator(fn):
         assert asset_class is None or isinstance(asset_class, tuple)
         assert asset_type is None or isinstance(asset_type, tuple)
 
-        fn.plot_measure = True
-        fn.asset_class = asset_class
-        fn.asset_type = asset_type
-        fn.dependencies = dependencies
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if LazyEvaluation.current_is_set:
+                return LazyEvaluation.current.expression(wrapper, args, kwargs, data_dependent=True)
+
+            return fn(*args, **kwargs)
+
+        wrapper.plot_measure = True
+        wrapper.asset_class = asset_class
+        wrapper.asset_type = asset_type
+        wrapper.dependencies = dependencies
 
-        return fn
+        return wrapper
 
     return decorator
 
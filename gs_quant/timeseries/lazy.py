@@ -0,0 +1,294 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+
+import hashlib
+import itertools
+import operator
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+from gs_quant.context_base import ContextBase
+from gs_quant.data.core import DataContext
+from gs_quant.session import GsSession
+
+
+class Expression:
+
+    """
+    A lazily evaluated call of a timeseries function, returned by the function when called within a LazyEvaluation.
+    Expressions may be passed to other timeseries functions and combined with arithmetic operators
+    """
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: dict, contexts: tuple, evaluation: 'LazyEvaluation'):
+        self.__fn = fn
+        self.__args = args
+        self.__kwargs = kwargs
+        self.__contexts = contexts
+        self.__evaluation = evaluation
+        self.__done = False
+        self.__result = None
+        self.__exception = None
+
+    def __repr__(self):
+        return '{}({})'.format(getattr(self.__fn, '__name__', self.__fn), ', '.join(itertools.chain(
+            (repr(a) if isinstance(a, Expression) else type(a).__name__ for a in self.__args),
+            ('{}={}'.format(k, repr(v) if isinstance(v, Expression) else type(v).__name__)
+             for k, v in self.__kwargs.items()))))
+
+    @property
+    def dependencies(self) -> Tuple['Expression', ...]:
+        """The expressions whose results are arguments of this one"""
+        return tuple(a for a in itertools.chain(self.__args, self.__kwargs.values()) if isinstance(a, Expression))
+
+    @property
+    def done(self) -> bool:
+        """Whether the expression has been evaluated"""
+        return self.__done
+
+    def result(self) -> Any:
+        """
+        The result of the expression, evaluating it (and those of its dependencies not yet evaluated) if required
+
+        :return: the result of the timeseries function
+        """
+        if not self.__done:
+            self.__evaluation.evaluate(self)
+
+        if self.__exception is not None:
+            raise self.__exception
+
+        return self.__result
+
+    def _evaluate(self):
+        try:
+            args = tuple(a.result() if isinstance(a, Expression) else a for a in self.__args)
+            kwargs = {k: v.result() if isinstance(v, Expression) else v for k, v in self.__kwargs.items()}
+
+            with ExitStack() as stack:
+                for context in self.__contexts:
+                    stack.enter_context(context)
+
+                self.__result = self.__fn(*args, **kwargs)
+        except Exception as e:
+            self.__exception = e
+        finally:
+            self.__done = True
+
+    def __operator(self, op: Callable, *args) -> 'Expression':
+        return self.__evaluation.expression(op, (self,) + args, {})
+
+    def __reversed_operator(self, op: Callable, other) -> 'Expression':
+        return self.__evaluation.expression(op, (other, self), {})
+
+    def __add__(self, other):
+        return self.__operator(operator.add, other)
+
+    def __radd__(self, other):
+        return self.__reversed_operator(operator.add, other)
+
+    def __sub__(self, other):
+        return self.__operator(operator.sub, other)
+
+    def __rsub__(self, other):
+        return self.__reversed_operator(operator.sub, other)
+
+    def __mul__(self, other):
+        return self.__operator(operator.mul, other)
+
+    def __rmul__(self, other):
+        return self.__reversed_operator(operator.mul, other)
+
+    def __truediv__(self, other):
+        return self.__operator(operator.truediv, other)
+
+    def __rtruediv__(self, other):
+        return self.__reversed_operator(operator.truediv, other)
+
+    def __pow__(self, other):
+        return self.__operator(operator.pow, other)
+
+    def __neg__(self):
+        return self.__operator(operator.neg)
+
+    def __abs__(self):
+        return self.__operator(operator.abs)
+
+    def __getitem__(self, item):
+        return self.__operator(operator.getitem, item)
+
+
+class LazyEvaluation(ContextBase):
+
+    """
+    Within this context, timeseries functions (and measures) return an Expression rather than their result. Identical
+    calls, i.e. of the same function with the same arguments, return the same expression, which is evaluated only once.
+    Expressions are evaluated on exiting the context, with independent expressions evaluated in parallel
+    """
+
+    def __init__(self, max_workers: int = 8):
+        """
+        Lazy, de-duplicated evaluation of timeseries functions
+
+        :param max_workers: The maximum number of expressions to evaluate in parallel
+
+        **Examples**
+
+        Compute the volatility of returns once, for both expressions:
+
+        >>> from gs_quant.timeseries import *
+        >>>
+        >>> x = generate_series(1000)
+        >>> with LazyEvaluation():
+        >>>     vol = volatility(returns(x), 22)
+        >>>     score = zscores(volatility(returns(x), 22)) - mean(vol)
+        >>>
+        >>> score.result()
+        """
+        super().__init__()
+        self.__max_workers = max_workers
+        self.__expressions: Dict[tuple, Expression] = {}
+        self.__fingerprints: Dict[int, Tuple[Any, tuple]] = {}
+        self.__lock = threading.RLock()
+
+    @property
+    def max_workers(self) -> int:
+        """The maximum number of expressions to evaluate in parallel"""
+        return self.__max_workers
+
+    @property
+    def expressions(self) -> Tuple[Expression, ...]:
+        """All distinct expressions created in this context"""
+        return tuple(self.__expressions.values())
+
+    def _on_exit(self, exc_type, exc_val, exc_tb):
+        if exc_val is None:
+            self.evaluate()
+
+    def expression(self, fn: Callable, args: tuple, kwargs: dict, data_dependent: bool = False) -> Expression:
+        """
+        The expression for a call of fn, which is shared by all identical calls
+
+        :param fn: The function
+        :param args: The function's positional arguments, which may include expressions
+        :param kwargs: The function's keyword arguments, which may include expressions
+        :param data_dependent: Whether fn queries data, so depends on the current DataContext and GsSession
+        :return: the expression
+        """
+        contexts = ()
+        key = (fn, self.__fingerprint(args), self.__fingerprint(tuple(sorted(kwargs.items()))))
+
+        if data_dependent:
+            data_context = DataContext.current
+            session = GsSession.current if GsSession.current_is_set else None
+            contexts = (data_context,) + ((session,) if session else ())
+            key += (data_context.start_date, data_context.end_date, id(session))
+
+        with self.__lock:
+            expression = self.__expressions.get(key)
+            if expression is None:
+                expression = Expression(fn, args, kwargs, contexts, self)
+                self.__expressions[key] = expression
+
+        return expression
+
+    def evaluate(self, *expressions: Expression):
+        """
+        Evaluate expressions, and their dependencies, which have not yet been evaluated
+
+        :param expressions: The expressions to evaluate. Defaults to all those created in this context
+        """
+        with self.__lock:
+            pending = self.__pending(expressions or self.expressions)
+            if not pending:
+                return
+
+            waiting = {e: {d for d in e.dependencies if not d.done} for e in pending}
+            dependents = {e: [] for e in pending}
+            for expression, dependencies in waiting.items():
+                for dependency in dependencies:
+                    dependents[dependency].append(expression)
+
+            # Evaluation is always on worker threads, where timeseries functions are not lazy
+            with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+                futures = {executor.submit(e._evaluate): e for e, d in waiting.items() if not d}
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        expression = futures.pop(future)
+                        for dependent in dependents[expression]:
+                            waiting[dependent].discard(expression)
+                            if not waiting[dependent]:
+                                futures[executor.submit(dependent._evaluate)] = dependent
+
+    @staticmethod
+    def __pending(expressions: Iterable[Expression]) -> List[Expression]:
+        pending = []
+        seen = set()
+        stack = list(expressions)
+
+        while stack:
+            expression = stack.pop()
+            if expression in seen or expression.done:
+                continue
+
+            seen.add(expression)
+            pending.append(expression)
+            stack.extend(expression.dependencies)
+
+        return pending
+
+    def __fingerprint(self, value) -> Any:
+        if isinstance(value, Expression):
+            return value
+        if isinstance(value, (tuple, list)):
+            return (type(value).__name__,) + tuple(self.__fingerprint(v) for v in value)
+        if isinstance(value, (pd.Series, pd.DataFrame, pd.Index, dict)) or not _is_hashable(value):
+            return self.__content_fingerprint(value)
+
+        return type(value).__name__, value
+
+    def __content_fingerprint(self, value) -> tuple:
+        # Fingerprints of data are computed once per object, which is kept so that its id is not re-used
+        cached = self.__fingerprints.get(id(value))
+        if cached is not None and cached[0] is value:
+            return cached[1]
+
+        if isinstance(value, (pd.Series, pd.DataFrame, pd.Index)):
+            digest = hashlib.sha256(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+            if isinstance(value, pd.DataFrame):
+                labels, dtypes = tuple(value.columns), tuple(str(d) for d in value.dtypes)
+            else:
+                labels, dtypes = (value.name,), (str(value.dtype),)
+            fingerprint = (type(value).__name__, len(value), labels, dtypes, digest.hexdigest())
+        elif isinstance(value, dict):
+            fingerprint = ('dict',) + tuple((self.__fingerprint(k), self.__fingerprint(v)) for k, v in value.items())
+        else:
+            fingerprint = ('id', id(value))
+
+        self.__fingerprints[id(value)] = (value, fingerprint)
+        return fingerprint
+
+
+def _is_hashable(value) -> bool:
+    try:
+        hash(value)
+        return True
+    except TypeError:
+        return False
@@ -22,23 +22,22 @@ from numbers import Real
 from dateutil import tz
 
 import cachetools.func
-import numpy as np
 import pandas as pd
 from pandas import Series
-from pandas.tseries.holiday import Holiday, AbstractHolidayCalendar, USMemorialDay, USLaborDay, USThanksgivingDay, \
-    nearest_workday
 
 from gs_quant.api.gs.assets import GsIdType
 from gs_quant.api.gs.data import GsDataApi
 from gs_quant.api.gs.data import QueryType
 from gs_quant.data.core import DataContext
 from gs_quant.data.fields import Fields
-from gs_quant.datetime.gscalendar import GsCalendar
+from gs_quant.datetime.date import business_day_offset_array, prev_business_date_array
 from gs_quant.datetime.point import relative_days_add
+from gs_quant.datetime.tenor import Tenor, add_tenors, parse_tenor
 from gs_quant.errors import MqTypeError, MqValueError
 from gs_quant.markets.securities import *
 from gs_quant.markets.securities import Asset, AssetIdentifier, SecurityMaster
 from gs_quant.target.common import AssetClass, FieldFilterMap, AssetType, Currency
+from gs_quant.timeseries.buckets import NercCalendar, get_bucket_calendar  # noqa: F401
 from gs_quant.timeseries.helper import log_return, plot_measure
 
 GENERIC_DATE = Union[datetime.date, str]
@@ -48,18 +47,6 @@ _logger = logging.getLogger(__name__)
 MeasureDependency: namedtuple = namedtuple("MeasureDependency", ["id_provider", "query_type"])
 
 
-# TODO: get NERC Calendar from SecDB
-class NercCalendar(AbstractHolidayCalendar):
-    rules = [
-        Holiday('New Years Day', month=1, day=1, observance=nearest_workday),
-        USMemorialDay,
-        Holiday('July 4th', month=7, day=4, observance=nearest_workday),
-        USLaborDay,
-        USThanksgivingDay,
-        Holiday('Christmas', month=12, day=25, observance=nearest_workday)
-    ]
-
-
 def _to_fx_strikes(strikes):
     out = []
     for strike in strikes:
@@ -233,12 +220,6 @@ def convert_asset_for_rates_data_set(from_asset: Asset, c_type: RatesConversionT
         raise from_asset.get_marquee_id()
 
 
-def _get_custom_bd(exchange):
-    from pandas.tseries.offsets import CustomBusinessDay
-    calendar = GsCalendar.get(exchange).business_day_calendar()
-    return CustomBusinessDay(calendar=calendar)
-
-
 @log_return(_logger, 'trying pricing dates')
 def _range_from_pricing_date(exchange, pricing_date: Optional[GENERIC_DATE] = None):
     if isinstance(pricing_date, datetime.date):
@@ -246,40 +227,20 @@ def _range_from_pricing_date(exchange, pricing_date: Optional[GENERIC_DATE] = No
 
     today = pd.Timestamp.today().normalize()
     if pricing_date is None:
-        t1 = today - _get_custom_bd(exchange)
+        t1 = pd.Timestamp(prev_business_date_array(today, calendars=exchange))
         return t1, t1
 
     assert isinstance(pricing_date, str)
     matcher = re.fullmatch('(\\d+)b', pricing_date)
     if matcher:
-        start = end = today - _get_custom_bd(exchange) * int(matcher.group(1))
+        start = end = pd.Timestamp(business_day_offset_array(today, -int(matcher.group(1)), roll='forward',
+                                                             calendars=exchange))
     else:
         end = today - datetime.timedelta(days=relative_days_add(pricing_date, True))
-        start = end - _get_custom_bd(exchange)
+        start = pd.Timestamp(prev_business_date_array(end, calendars=exchange))
     return start, end
 
 
-def _to_offset(tenor: str) -> pd.DateOffset:
-    import re
-    matcher = re.fullmatch('(\\d+)([dwmy])', tenor)
-    if not matcher:
-        raise ValueError('invalid tenor ' + tenor)
-
-    ab = matcher.group(2)
-    if ab == 'd':
-        name = 'days'
-    elif ab == 'w':
-        name = 'weeks'
-    elif ab == 'm':
-        name = 'months'
-    else:
-        assert ab == 'y'
-        name = 'years'
-
-    kwarg = {name: int(matcher.group(1))}
-    return pd.DateOffset(**kwarg)
-
-
 def _market_data_timed(q):
     start = time.perf_counter()
     df = GsDataApi.get_market_data(q)
@@ -1054,8 +1015,7 @@ def vol_term(asset: Asset, strike_reference: SkewReference, relative_strike: Rea
     latest = df.index.max()
     _logger.info('selected pricing date %s', latest)
     df = df.loc[latest]
-    cbd = _get_custom_bd(asset.exchange)
-    df = df.assign(expirationDate=df.index + df['tenor'].map(_to_offset) + cbd - cbd)
+    df = df.assign(expirationDate=add_tenors(df.index, df['tenor'], 'preceding', asset.exchange))
     df = df.set_index('expirationDate')
     df.sort_index(inplace=True)
     df = df.loc[DataContext.current.start_date: DataContext.current.end_date]
@@ -1136,8 +1096,7 @@ def fwd_term(asset: Asset, pricing_date: Optional[GENERIC_DATE] = None, *, sourc
     latest = df.index.max()
     _logger.info('selected pricing date %s', latest)
     df = df.loc[latest]
-    cbd = _get_custom_bd(asset.exchange)
-    df.loc[:, 'expirationDate'] = df.index + df['tenor'].map(_to_offset) + cbd - cbd
+    df.loc[:, 'expirationDate'] = add_tenors(df.index, df['tenor'], 'preceding', asset.exchange)
     df = df.set_index('expirationDate')
     df.sort_index(inplace=True)
     df = df.loc[DataContext.current.start_date: DataContext.current.end_date]
@@ -1159,10 +1118,12 @@ def _var_swap_tenors(asset: Asset):
 
 
 def _tenor_to_month(relative_date: str) -> int:
-    matcher = re.fullmatch('([1-9]\\d*)([my])', relative_date)
-    if matcher:
-        mag = int(matcher.group(1))
-        return mag if matcher.group(2) == 'm' else mag * 12
+    try:
+        tenor = parse_tenor(relative_date)
+    except ValueError:
+        tenor = None
+    if tenor is not None and tenor.months > 0 and tenor == Tenor(months=tenor.months):
+        return tenor.months
     raise MqValueError('invalid input: relative date must be in months or years')
 
 
@@ -1213,8 +1174,8 @@ def var_term(asset: Asset, pricing_date: Optional[str] = None, forward_start_dat
     latest = df.index.max()
     _logger.info('selected pricing date %s', latest)
     df = df.loc[latest]
-    cbd = _get_custom_bd(asset.exchange)
-    df.loc[:, Fields.EXPIRATION_DATE.value] = df.index + df[Fields.TENOR.value].map(_to_offset) + cbd - cbd
+    df.loc[:, Fields.EXPIRATION_DATE.value] = add_tenors(df.index, df[Fields.TENOR.value], 'preceding',
+                                                         asset.exchange)
     df = df.set_index(Fields.EXPIRATION_DATE.value)
     df.sort_index(inplace=True)
     df = df.loc[DataContext.current.start_date: DataContext.current.end_date]
@@ -1294,33 +1255,16 @@ def bucketize_price(asset: Asset, price_method: str, bucket: str = '7x24',
     if real_time:
         raise ValueError('Bucketize function returns aggregated daily data')
 
-    # create granularity indicator
-    if granularity.lower() in ['daily', 'd']:
-        granularity = 'D'
-    elif granularity.lower() in ['monthly', 'm']:
-        granularity = 'M'
-    else:
+    if granularity.lower() not in ('daily', 'd', 'monthly', 'm'):
         raise ValueError('Invalid granularity: ' + granularity + '. Expected Value: daily or monthly.')
 
     bbid = Asset.get_identifier(asset, AssetIdentifier.BLOOMBERG_ID)
-
-    # TODO: get timezone info from Asset
-    # default frequency definition
-    timezone = 'US/Eastern'
-    peak_start = 7
-    peak_end = 23
-    weekends = [5, 6]
-
-    if bbid.split(" ")[0] in ['MISO', 'ERCOT', 'SPP']:
-        timezone = 'US/Central'
-        peak_start = 6
-        peak_end = 22
-    if bbid.split(" ")[0] == 'CAISO':
-        timezone = 'US/Pacific'
-        weekends = [6]
+    calendar = get_bucket_calendar(bbid.split(" ")[0])
+    # Raises for an unknown bucket before any data is queried
+    calendar.bucket(bucket)
 
     to_zone = tz.gettz('UTC')
-    from_zone = tz.gettz(timezone)
+    from_zone = tz.gettz(calendar.timezone)
 
     # Start date and end date are considered to be in ISO's local timezone
     start_date, end_date = DataContext.current.start_date, DataContext.current.end_date
@@ -1339,52 +1283,5 @@ def bucketize_price(asset: Asset, price_method: str, bucket: str = '7x24',
         df = _market_data_timed(q)
         _logger.debug('q %s', q)
 
-    df = df.tz_convert(timezone)
-
-    df['month'] = df.index.to_period('M')
-    df['date'] = df.index.date
-    df['day'] = df.index.dayofweek
-    df['hour'] = df.index.hour
-    holidays = NercCalendar().holidays(start=start_date, end=end_date).date
-
-    # freq is the frequency at which the ISO publishes data for e.g. 15 min, 1hr
-    freq = int(min(np.diff(df.index) / np.timedelta64(1, 's')))
-    # checking missing data points
-    ref_hour_range = pd.date_range(str(start_date), str(end_date + datetime.timedelta(days=1)),
-                                   freq=str(freq) + "S", tz=timezone, closed='left')
-    missing_hours = ref_hour_range[~ref_hour_range.isin(df.index)]
-    missing_dates = np.unique(missing_hours.date)
-    missing_months = np.unique(np.array(missing_dates, dtype='M8[D]').astype('M8[M]'))
-
-    # drop dates and months which have missing data
-    df = df.loc[(~df['date'].isin(missing_dates))]
-    if granularity == 'M':
-        df = df.loc[(~df['month'].isin(missing_months))]
-
-    # TODO: get frequency definition from SecDB
-    if bucket.lower() == '7x24':
-        pass
-    # offpeak: 11pm-7am & weekend & holiday
-    elif bucket.lower() == 'offpeak':
-        df = df.loc[df['date'].isin(holidays) |
-                    df['day'].isin(weekends) |
-                    (~df['date'].isin(holidays) & ~df['day'].isin(weekends) &
-                        ((df['hour'] < peak_start) | (df['hour'] > peak_end - 1)))]
-    # peak: 7am to 11pm on weekdays
-    elif bucket.lower() == 'peak':
-        df = df.loc[(~df['date'].isin(holidays)) & (~df['day'].isin(weekends)) & (df['hour'] > peak_start - 1) &
-                    (df['hour'] < peak_end)]
-    # 7x8: 11pm to 7am
-    elif bucket.lower() == '7x8':
-        df = df.loc[(df['hour'] < peak_start) | (df['hour'] > peak_end - 1)]
-    # 2x16h: weekends & holidays
-    elif bucket.lower() == '2x16h':
-        df = df.loc[((df['date'].isin(holidays)) | df['day'].isin(weekends)) & ((df['hour'] > peak_start - 1) &
-                                                                                (df['hour'] < peak_end))]
-    else:
-        raise ValueError('Invalid bucket: ' + bucket + '. Expected Value: peak, offpeak, 7x24, 7x8, 2x16h.')
-
-    df = df['price'].resample(granularity).mean()
-    df.index = df.index.date
-    df = df.loc[start_date: end_date]
-    return df
+    # dates (and months) with missing data points are dropped
+    return calendar.bucketize(df['price'], bucket, granularity, start_date, end_date)
@@ -0,0 +1,565 @@
+"""
+Copyright 2019 Goldman Sachs.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+
+import copy
+import datetime as dt
+import math
+from abc import ABCMeta, abstractmethod
+from collections import deque
+from typing import Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from gs_quant.errors import MqValueError
+from gs_quant.timeseries.econometrics import _annualization_factor_for_distance
+from gs_quant.timeseries.helper import Returns, Window
+
+"""
+Online counterparts of timeseries functions, which are updated with one observation at a time. Each update replicates
+the floating point operations of the batch function (and the pandas rolling aggregations it uses), so replaying a
+series through an online function gives exactly the same result as the batch function
+"""
+
+
+def _normalize_window(w: Union[Window, int, None]) -> Window:
+    # As normalize_window, except that the window size defaults to all observations, rather than the series length
+    if isinstance(w, int):
+        w = Window(w=w, r=w)
+    elif w is None:
+        w = Window(w=None, r=0)
+    elif w.w and w.r is None:
+        w = Window(w=w.w, r=w.w)
+
+    if w.w is not None and w.w <= 0:
+        raise ValueError('Window value must be greater than zero.')
+    if w.r < 0:
+        raise ValueError('Ramp value must be less than the length of the series and greater than zero.')
+
+    return w
+
+
+def _divide(a: float, b: float) -> float:
+    # Division by zero gives inf or nan, as for series
+    try:
+        return a / b
+    except ZeroDivisionError:
+        with np.errstate(all='ignore'):
+            return float(np.float64(a) / np.float64(b))
+
+
+class _RollingMean:
+
+    # pandas' roll_mean: Kahan summation, with separate compensation for additions and removals
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.nobs = 0
+        self.neg_ct = 0
+        self.sum = 0.0
+        self.add_compensation = 0.0
+        self.remove_compensation = 0.0
+        self.consecutive = 0
+        self.prev = math.nan
+
+    def add(self, val: float):
+        if val == val:
+            self.nobs += 1
+            y = val - self.add_compensation
+            t = self.sum + y
+            self.add_compensation = t - self.sum - y
+            self.sum = t
+            if math.copysign(1.0, val) < 0:
+                self.neg_ct += 1
+
+            self.consecutive = self.consecutive + 1 if val == self.prev else 1
+            self.prev = val
+
+    def remove(self, val: float):
+        if val == val:
+            self.nobs -= 1
+            y = -val - self.remove_compensation
+            t = self.sum + y
+            self.remove_compensation = t - self.sum - y
+            self.sum = t
+            if math.copysign(1.0, val) < 0:
+                self.neg_ct -= 1
+
+    @property
+    def value(self) -> float:
+        if self.nobs == 0:
+            return math.nan
+
+        result = self.sum / self.nobs
+        if self.consecutive >= self.nobs:
+            return self.prev
+        if (self.neg_ct == 0 and result < 0) or (self.neg_ct == self.nobs and result > 0):
+            return 0.0
+
+        return result
+
+
+class _RollingVariance:
+
+    # pandas' roll_var: Welford's method, with Kahan summation of the mean
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.nobs = 0
+        self.mean = 0.0
+        self.ssqdm = 0.0
+        self.add_compensation = 0.0
+        self.remove_compensation = 0.0
+        self.consecutive = 0
+        self.prev = math.nan
+
+    def add(self, val: float):
+        if val != val:
+            return
+
+        self.nobs += 1
+        self.consecutive = self.consecutive + 1 if val == self.prev else 1
+        self.prev = val
+
+        prev_mean = self.mean - self.add_compensation
+        y = val - self.add_compensation
+        t = y - self.mean
+        self.add_compensation = t + self.mean - y
+        self.mean = self.mean + t / self.nobs
+        self.ssqdm = self.ssqdm + (val - prev_mean) * (val - self.mean)
+
+    def remove(self, val: float):
+        if val == val:
+            self.nobs -= 1
+            if self.nobs:
+                prev_mean = self.mean - self.remove_compensation
+                y = val - self.remove_compensation
+                t = y - self.mean
+                self.remove_compensation = t + self.mean - y
+                self.mean = self.mean - t / self.nobs
+                self.ssqdm = self.ssqdm - (val - prev_mean) * (val - self.mean)
+            else:
+                self.mean = 0.0
+                self.ssqdm = 0.0
+
+    @property
+    def value(self) -> float:
+        if self.nobs <= 1:
+            return math.nan
+        if self.consecutive >= self.nobs:
+            return 0.0
+
+        return self.ssqdm / (self.nobs - 1)
+
+    @property
+    def std(self) -> float:
+        variance = self.value
+        return 0.0 if variance < 0 else math.sqrt(variance)
+
+
+class _RollingExtreme:
+
+    # pandas' roll_max / roll_min: a monotonic deque of (observation number, value)
+
+    def __init__(self, size: Optional[int], is_max: bool):
+        self.__size = size
+        self.__is_max = is_max
+        self.__queue = deque()
+        self.__count = 0
+
+    def update(self, val: float) -> float:
+        count = self.__count
+        self.__count += 1
+        queue = self.__queue
+
+        # Missing values are never the extreme, but are kept until discarded by a later observation
+        if self.__is_max:
+            ai = val if val == val else -math.inf
+            while queue and (ai >= queue[-1][1] or queue[-1][1] != queue[-1][1]):
+                queue.pop()
+        else:
+            ai = val if val == val else math.inf
+            while queue and (ai <= queue[-1][1] or queue[-1][1] != queue[-1][1]):
+                queue.pop()
+
+        queue.append((count, val))
+
+        if self.__size is not None:
+            while queue[0][0] <= count - self.__size:
+                queue.popleft()
+
+        return queue[0][1]
+
+
+class OnlineFunction(metaclass=ABCMeta):
+
+    """
+    A timeseries function evaluated one observation at a time, with constant (or amortized constant) time updates.
+    The result of each update is that of the batch function, applied to the observations so far, at the latest
+    observation; the batch function applied to the complete series is identical to the results of replaying it (but
+    see OnlineVolatility for irregularly spaced observations)
+    """
+
+    def __init__(self, w: Union[Window, int, None] = Window(None, 0)):
+        self.__window = _normalize_window(w)
+        self.__count = 0
+        self.__last_date = None
+
+    @property
+    def window(self) -> Window:
+        """The window size (None for all observations) and ramp up"""
+        return self.__window
+
+    @property
+    def count(self) -> int:
+        """The number of observations"""
+        return self.__count
+
+    @property
+    def last_date(self) -> Optional[Union[dt.date, dt.datetime]]:
+        """The date (or time) of the latest observation"""
+        return self.__last_date
+
+    def update(self, date: Union[dt.date, dt.datetime], *values: float) -> Optional[float]:
+        """
+        Add an observation
+
+        :param date: The date (or time) of the observation, which must be after that of the previous observation
+        :param values: The observed values
+        :return: The result at this observation, or None within the ramp up
+        """
+        if self.__last_date is not None and not date > self.__last_date:
+            raise MqValueError('observations must be in increasing date order')
+
+        result = self._update(date, *(float(v) for v in values))
+        self.__count += 1
+        self.__last_date = date
+
+        return result if self.__count > self.__window.r else None
+
+    def extend(self, *series: pd.Series) -> pd.Series:
+        """
+        Add the observations of series, e.g. to initialise from history
+
+        :param series: The series of observations, each with the same index
+        :return: The results at each observation after the ramp up
+        """
+        index = series[0].index
+        if any(not s.index.equals(index) for s in series[1:]):
+            raise MqValueError('series must have the same index')
+
+        results = [self.update(d, *v) for d, *v in zip(index, *(s.values for s in series))]
+        ramp = sum(r is None for r in results)
+        return pd.Series(results[ramp:], index=index[ramp:], dtype=float)
+
+    def snapshot(self) -> Any:
+        """
+        The state of the function, from which it may be restored
+
+        :return: An (opaque) copy of the state
+        """
+        return copy.deepcopy(self.__dict__)
+
+    def restore(self, state: Any):
+        """
+        Restore the state of the function
+
+        :param state: A state returned by snapshot()
+        """
+        self.__dict__.update(copy.deepcopy(state))
+
+    @abstractmethod
+    def _update(self, date: Union[dt.date, dt.datetime], *values: float) -> float:
+        ...
+
+
+class _RollingWindow:
+
+    # The observations in the window, which are removed (oldest first) as new observations are added
+
+    def __init__(self, size: Optional[int]):
+        self.__size = size
+        self.__values = deque()
+
+    def add(self, value) -> tuple:
+        """The observations removed from the window, as value is added"""
+        if self.__size is None:
+            return ()
+        if self.__size == 1:
+            # pandas restarts its aggregations, rather than removing the observation, for windows of one observation
+            return None,
+
+        self.__values.append(value)
+        return (self.__values.popleft(),) if len(self.__values) > self.__size else ()
+
+
+class OnlineMovingAverage(OnlineFunction):
+
+    """
+    Moving average over a window, updated one observation at a time
+
+    **Examples**
+
+    >>> ma = OnlineMovingAverage(Window(22, 10))
+    >>> ma.extend(history)
+    >>> ma.update(dt.date(2020, 1, 2), 3050.2)
+
+    **See also**
+
+    :func:`moving_average`
+    """
+
+    def __init__(self, w: Union[Window, int, None] = Window(None, 0)):
+        """
+        Moving average over a window, updated one observation at a time
+
+        :param w: Window or int: number of observations and ramp up to use. e.g. Window(22, 10) where 22 is the window
+        size and 10 the ramp up value. Window size defaults to all observations
+        """
+        super().__init__(w)
+        self.__observations = _RollingWindow(self.window.w)
+        self.__mean = _RollingMean()
+
+    def _update(self, date, value):
+        for removed in self.__observations.add(value):
+            if removed is None:
+                self.__mean.reset()
+            else:
+                self.__mean.remove(removed)
+
+        self.__mean.add(value)
+        return self.__mean.value
+
+
+class OnlineStd(OnlineFunction):
+
+    """
+    Standard deviation over a window, updated one observation at a time
+
+    **Examples**
+
+    >>> sd = OnlineStd(22)
+    >>> sd.extend(history)
+    >>> sd.update(dt.date(2020, 1, 2), 3050.2)
+
+    **See also**
+
+    :func:`std`
+    """
+
+    def __init__(self, w: Union[Window, int, None] = Window(None, 0)):
+        """
+        Standard deviation over a window, updated one observation at a time
+
+        :param w: Window or int: number of observations and ramp up to use. e.g. Window(22, 10) where 22 is the window
+        size and 10 the ramp up value. Window size defaults to all observations
+        """
+        super().__init__(w)
+        self.__observations = _RollingWindow(self.window.w)
+        self.__variance = _RollingVariance()
+
+    def _update(self, date, value):
+        for removed in self.__observations.add(value):
+            if removed is None:
+                self.__variance.reset()
+            else:
+                self.__variance.remove(removed)
+
+        self.__variance.add(value)
+        return self.__variance.std
+
+
+class _Returns:
+
+    # Returns of consecutive observations, as returns()
+
+    def __init__(self, returns_type: Returns = Returns.SIMPLE):
+        if returns_type not in (Returns.SIMPLE, Returns.LOGARITHMIC):
+            raise MqValueError('Unknown returns type (use simple / log)')
+
+        self.__logarithmic = returns_type == Returns.LOGARITHMIC
+        self.__prev = None
+
+    def update(self, value: float) -> float:
+        if self.__logarithmic:
+            value = math.log(value)
+
+        prev, self.__prev = self.__prev, value
+        if prev is None:
+            return math.nan
+
+        return value - prev if self.__logarithmic else _divide(value, prev) - 1
+
+
+class OnlineVolatility(OnlineFunction):
+
+    """
+    Realized volatility of a price series, updated one observation at a time
+
+    The annualization factor is inferred from the average distance between the dates of the observations so far, as
+    the batch function infers it from those of the series it is applied to. Where the spacing of observations changes,
+    e.g. from daily to weekly, the factor of earlier results may differ from that which the batch function infers from
+    the complete series, and updates raise MqValueError while the average distance so far matches no frequency
+
+    **Examples**
+
+    >>> vol = OnlineVolatility(22)
+    >>> vol.extend(history)
+    >>> vol.update(dt.date(2020, 1, 2), 3050.2)
+
+    **See also**
+
+    :func:`volatility`
+    """
+
+    def __init__(self, w: Union[Window, int, None] = Window(None, 0), returns_type: Returns = Returns.SIMPLE):
+        """
+        Realized volatility of a price series, updated one observation at a time
+
+        :param w: Window or int: number of observations and ramp up to use. e.g. Window(22, 10) where 22 is the window
+        size and 10 the ramp up value. Window size defaults to all observations
+        :param returns_type: returns type
+        """
+        super().__init__(w)
+        self.__returns = _Returns(returns_type)
+        self.__observations = _RollingWindow(self.window.w)
+        self.__variance = _RollingVariance()
+        self.__total_distance = 0
+
+    def _update(self, date, price):
+        if self.last_date is not None:
+            distance = (date - self.last_date).days
+            if distance == 0:
+                raise MqValueError('multiple data points on same date')
+            self.__total_distance += distance
+
+        ret = self.__returns.update(price)
+        for removed in self.__observations.add(ret):
+            if removed is None:
+                self.__variance.reset()
+            else:
+                self.__variance.remove(removed)
+
+        self.__variance.add(ret)
+        std = self.__variance.std
+        if std != std:
+            # The annualization factor may not be inferable from the first few dates, but is irrelevant
+            return math.nan
+
+        factor = _annualization_factor_for_distance(self.__total_distance / self.count)
+        return std * math.sqrt(factor) * 100
+
+
+class OnlineMaxDrawdown(OnlineFunction):
+
+    """
+    Maximum peak to trough drawdown over a window, updated one observation at a time
+
+    **Examples**
+
+    >>> drawdown = OnlineMaxDrawdown(Window(252, 0))
+    >>> drawdown.extend(history)
+    >>> drawdown.update(dt.date(2020, 1, 2), 3050.2)
+
+    **See also**
+
+    :func:`max_drawdown`
+    """
+
+    def __init__(self, w: Union[Window, int, None] = Window(None, 0)):
+        """
+        Maximum peak to trough drawdown over a window, updated one observation at a time
+
+        :param w: Window or int: number of observations and ramp up to use. e.g. Window(22, 10) where 22 is the window
+        size and 10 the ramp up value. Window size defaults to all observations
+        """
+        super().__init__(w)
+        self.__peak = _RollingExtreme(self.window.w, is_max=True)
+        self.__drawdown = _RollingExtreme(self.window.w, is_max=False)
+
+    def _update(self, date, value):
+        return self.__drawdown.update(_divide(value, self.__peak.update(value)) - 1)
+
+
+class OnlineBeta(OnlineFunction):
+
+    """
+    Beta of a price series and benchmark over a window, updated one observation of each at a time
+
+    **Examples**
+
+    >>> b = OnlineBeta(22)
+    >>> b.extend(history, benchmark_history)
+    >>> b.update(dt.date(2020, 1, 2), 3050.2, 280.1)
+
+    **See also**
+
+    :func:`beta`
+    """
+
+    def __init__(self, w: Union[Window, int, None] = Window(None, 0), prices: bool = True):
+        """
+        Beta of a price series and benchmark over a window, updated one observation of each at a time
+
+        :param w: Window or int: number of observations and ramp up to use. e.g. Window(22, 10) where 22 is the window
+        size and 10 the ramp up value. Window size defaults to all observations
+        :param prices: True if the observations are prices, False if they are returns
+        """
+        super().__init__(w)
+        self.__returns = (_Returns(), _Returns()) if prices else None
+        self.__observations = _RollingWindow(self.window.w)
+        self.__mean_product = _RollingMean()
+        self.__mean = _RollingMean()
+        self.__mean_benchmark = _RollingMean()
+        self.__variance_benchmark = _RollingVariance()
+        self.__count_both = 0
+
+    def _update(self, date, value, benchmark):
+        if self.__returns:
+            value, benchmark = self.__returns[0].update(value), self.__returns[1].update(benchmark)
+
+        # As for the batch function, the covariance is of the observations of both
+        both = 0 if math.isnan(value + benchmark) else 1
+        value, joint_benchmark = value + 0 * benchmark, benchmark + 0 * value
+        for removed in self.__observations.add((value, joint_benchmark, benchmark, both)):
+            if removed is None:
+                for aggregation in (self.__mean_product, self.__mean, self.__mean_benchmark, self.__variance_benchmark):
+                    aggregation.reset()
+                self.__count_both = 0
+            else:
+                self.__mean_product.remove(removed[0] * removed[1])
+                self.__mean.remove(removed[0])
+                self.__mean_benchmark.remove(removed[1])
+                self.__variance_benchmark.remove(removed[2])
+                self.__count_both -= removed[3]
+
+        self.__mean_product.add(value * joint_benchmark)
+        self.__mean.add(value)
+        self.__mean_benchmark.add(joint_benchmark)
+        self.__variance_benchmark.add(benchmark)
+        self.__count_both += both
+
+        if self.count < 3:
+            # As the batch function, initial values (which may be extreme when the sample is small) are not computed
+            return math.nan
+
+        count = float(self.__count_both)
+        cov = (self.__mean_product.value - self.__mean.value * self.__mean_benchmark.value) * _divide(count, count - 1)
+        return _divide(cov, self.__variance_benchmark.value)
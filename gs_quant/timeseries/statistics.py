@@ -16,10 +16,10 @@
 # a 1-line description. Type annotations should be provided for parameters.
 
 import datetime
+from typing import Tuple
 
 import numpy
 import scipy.stats.mstats as stats
-from scipy.stats import percentileofscore
 
 from .algebra import *
 
@@ -30,7 +30,133 @@ Generally not finance-specific routines.
 """
 
 
-@plot_function
+class _OrderStatistics:
+
+    """
+    Counts of the values in a rolling window by their rank amongst the distinct values of a series, held in a segment
+    tree so that the number of values below a rank and the smallest most frequent value are found in O(log n)
+    """
+
+    def __init__(self, num_ranks: int):
+        self.__size = 1 << max(num_ranks - 1, 0).bit_length()
+        self.__counts = [0] * (2 * self.__size)
+        self.__maxima = [0] * (2 * self.__size)
+
+    def add(self, rank: int, count: int = 1):
+        counts, maxima = self.__counts, self.__maxima
+        i = rank + self.__size
+        counts[i] += count
+        maxima[i] = counts[i]
+        i >>= 1
+
+        while i:
+            counts[i] += count
+            left, right = maxima[2 * i], maxima[2 * i + 1]
+            maxima[i] = left if left >= right else right
+            i >>= 1
+
+    def remove(self, rank: int):
+        self.add(rank, -1)
+
+    def count_below(self, rank: int) -> int:
+        counts = self.__counts
+        total = 0
+        lo, hi = self.__size, rank + self.__size
+
+        while lo < hi:
+            if lo & 1:
+                total += counts[lo]
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                total += counts[hi]
+            lo >>= 1
+            hi >>= 1
+
+        return total
+
+    def mode(self) -> Tuple[int, int]:
+        # The leftmost (i.e. smallest) of the most frequent ranks, and its count
+        maxima = self.__maxima
+        count = maxima[1]
+        i = 1
+
+        while i < self.__size:
+            i = 2 * i if maxima[2 * i] == count else 2 * i + 1
+
+        return i - self.__size, count
+
+
+def _ranks(values: numpy.ndarray) -> Tuple[numpy.ndarray, list, list]:
+    # The distinct (non-NaN) values, and each value's rank amongst them and whether it is valid (i.e. not NaN)
+    valid = ~numpy.isnan(values)
+    distinct = numpy.unique(values[valid])
+    return distinct, numpy.searchsorted(distinct, values).tolist(), valid.tolist()
+
+
+def _rolling_mode(values: numpy.ndarray, w: int) -> numpy.ndarray:
+    distinct, ranks, valid = _ranks(values)
+    order_stats = _OrderStatistics(len(distinct))
+    result = numpy.full(len(values), numpy.nan)
+    nans = 0
+
+    for i in range(len(values)):
+        if valid[i]:
+            order_stats.add(ranks[i])
+        else:
+            nans += 1
+
+        if i >= w:
+            if valid[i - w]:
+                order_stats.remove(ranks[i - w])
+            else:
+                nans -= 1
+
+        # As scipy.stats.mstats.mode: NaNs never repeat, so are the mode only of windows with no repeated values
+        rank, count = order_stats.mode()
+        if count > 1 or (count == 1 and not nans):
+            result[i] = distinct[rank]
+
+    return result
+
+
+def _rolling_percentiles(values: numpy.ndarray, ends: numpy.ndarray, scores: numpy.ndarray, w: int) -> numpy.ndarray:
+    # Percentile ranks of scores[i] amongst values[max(ends[i] - w, 0):ends[i]]
+    distinct, ranks, valid = _ranks(values)
+    order_stats = _OrderStatistics(len(distinct))
+    below = numpy.searchsorted(distinct, scores, side='left').tolist()
+    at_or_below = numpy.searchsorted(distinct, scores, side='right').tolist()
+    result = numpy.full(len(scores), numpy.nan)
+    start = end = nans = 0
+
+    # Windows are visited in order of their end, so both bounds only ever advance
+    for i in numpy.argsort(ends, kind='mergesort').tolist():
+        window_end = int(ends[i])
+        window_start = max(window_end - w, 0)
+
+        while end < window_end:
+            if valid[end]:
+                order_stats.add(ranks[end])
+            else:
+                nans += 1
+            end += 1
+
+        while start < window_start:
+            if valid[start]:
+                order_stats.remove(ranks[start])
+            else:
+                nans -= 1
+            start += 1
+
+        # As scipy.stats.percentileofscore (kind='mean'), NaN for an empty window or if there are any NaNs
+        n = window_end - window_start
+        if n and not nans and not numpy.isnan(scores[i]):
+            result[i] = (order_stats.count_below(below[i]) + order_stats.count_below(at_or_below[i])) * (50.0 / n)
+
+    return result
+
+
+@plot_function(panel=True)
 def min_(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     """
     Minimum value of series over given window
@@ -66,7 +192,7 @@ def min_(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     return apply_ramp(x.rolling(w.w, 0).min(), w)
 
 
-@plot_function
+@plot_function(panel=True)
 def max_(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     """
     Maximum value of series over given window
@@ -102,7 +228,7 @@ def max_(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     return apply_ramp(x.rolling(w.w, 0).max(), w)
 
 
-@plot_function
+@plot_function(panel=True)
 def range_(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     """
     Range of series over given window
@@ -142,7 +268,7 @@ def range_(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     return apply_ramp(max - min, w)
 
 
-@plot_function
+@plot_function(panel=True)
 def mean(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     """
     Arithmetic mean of series over given window
@@ -179,7 +305,7 @@ def mean(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     return apply_ramp(x.rolling(w.w, 0).mean(), w)
 
 
-@plot_function
+@plot_function(panel=True)
 def median(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     """
     Median value of series over given window
@@ -249,10 +375,10 @@ def mode(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     """
     w = normalize_window(x, w)
     assert x.index.is_monotonic_increasing, "series index is monotonic increasing"
-    return apply_ramp(x.rolling(w.w, 0).apply(lambda y: stats.mode(y).mode, raw=True), w)
+    return apply_ramp(pd.Series(_rolling_mode(x.to_numpy(dtype=float), w.w), index=x.index, name=x.name), w)
 
 
-@plot_function
+@plot_function(panel=True)
 def sum_(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     """
     Rolling sum of series over given window
@@ -288,7 +414,7 @@ def sum_(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     return apply_ramp(x.rolling(w.w, 0).sum(), w)
 
 
-@plot_function
+@plot_function(panel=True)
 def product(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     """
     Rolling product of series over given window
@@ -323,7 +449,7 @@ def product(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     return apply_ramp(x.rolling(w.w, 0).agg(pd.Series.prod), w)
 
 
-@plot_function
+@plot_function(panel=True)
 def std(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     """
     Rolling standard deviation of series over given window
@@ -364,7 +490,7 @@ def std(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     return apply_ramp(x.rolling(w.w, 0).std(), w)
 
 
-@plot_function
+@plot_function(panel=True)
 def var(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     """
     Rolling variance of series over given window
@@ -405,7 +531,7 @@ def var(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     return apply_ramp(x.rolling(w.w, 0).var(), w)
 
 
-@plot_function
+@plot_function(panel=True)
 def cov(x: pd.Series, y: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     """
     Rolling co-variance of series over given window
@@ -448,14 +574,254 @@ def cov(x: pd.Series, y: pd.Series, w: Union[Window, int] = Window(None, 0)) ->
     return apply_ramp(x.rolling(w.w, 0).cov(y), w)
 
 
-def _zscore(x):
-    if x.size == 1:
-        return 0
+def covariance_matrix(x: pd.DataFrame, w: Union[Window, int] = Window(None, 0), latest: bool = False) \
+        -> pd.DataFrame:
+    """
+    Rolling co-variance matrix of the series of a panel over given window
+
+    :param x: DataFrame: panel of aligned timeseries
+    :param w: Window or int: number of observations and ramp up to use. e.g. Window(22, 10) where 22 is the window size
+    and 10 the ramp up value. Window size defaults to length of series.
+    :param latest: return only the matrix for the last date
+    :return: DataFrame of the matrix for each date, indexed by date and series (as DataFrame.rolling().cov()), or of
+    the matrix for the last date if latest
+
+    **Usage**
+
+    Co-variance of each pair of series, as :func:`cov`, over the observations of both in a rolling window of rows. The
+    sums of the window are updated as each row enters and leaves it, rather than computed for each pair of series, so
+    the cost is proportional to the number of dates and the square of the number of series.
+
+    **Examples**
 
-    return stats.zscore(x, ddof=1)[-1]
+    Compute the latest rolling :math:`22` day co-variance matrix of three series:
 
+    >>> panel = pd.DataFrame({'a': generate_series(100), 'b': generate_series(100), 'c': generate_series(100)})
+    >>> covariance_matrix(panel, 22, latest=True)
 
-@plot_function
+    The matrices for all dates, as an array of dates x series x series:
+
+    >>> covariance_matrix(panel, 22).values.reshape(-1, 3, 3)
+
+    **See also**
+
+    :func:`cov` :func:`correlation_matrix`
+    """
+    w = normalize_window(x, w)
+    return _rolling_matrices(x, w, correlation=False, latest=latest)
+
+
+def _rolling_matrices(x: pd.DataFrame, w: Window, correlation: bool, latest: bool) -> pd.DataFrame:
+    index = x.index if w.w <= len(x) else x.index[:0]
+    index = index[w.r:]
+    if latest:
+        if len(index) == 0:
+            return pd.DataFrame(columns=x.columns)
+        return pd.DataFrame(_comoment_matrices(x.to_numpy(dtype=float), w.w, correlation, latest)[-1],
+                            index=x.columns, columns=x.columns)
+
+    matrices = _comoment_matrices(x.to_numpy(dtype=float), w.w, correlation, latest)[len(x) - len(index):]
+    return pd.DataFrame(matrices.reshape(-1, x.shape[1]), index=pd.MultiIndex.from_product((index, x.columns)),
+                        columns=x.columns)
+
+
+# Windows in which the variance of a series is less than this fraction of the largest squared (centred) value summed
+# since the sums were last recomputed may have lost their precision to cancellation, so have their matrices recomputed
+_COMOMENT_CANCELLATION = 1e-6
+
+
+def _comoment_matrices(values: numpy.ndarray, w: int, correlation: bool, latest: bool, segment: int = 1024,
+                       block: int = 2 ** 18) -> numpy.ndarray:
+    # Co-variance (or correlation) matrices of the columns of values over each rolling window of w rows (or only the
+    # last). Pairs of columns are over the rows in which both are present (as pandas), from sums of the products of
+    # centred values, of indicators of their presence, and of both
+    rows, columns = values.shape
+    valid = ~numpy.isnan(values)
+
+    # Where each row is either complete or missing (e.g. the first of returns), all pairs have the same observations
+    complete = (valid.all(axis=1) | ~valid.any(axis=1)).all()
+
+    def centre(start: int, end: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        # Values are centred on their mean over the rows to be summed, to limit cancellation in the sums
+        present = valid[start:end]
+        values_ = numpy.where(present, values[start:end], 0.0)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            reference = numpy.nan_to_num(values_.sum(axis=0) / present.sum(axis=0))
+        return numpy.where(present, values_ - reference, 0.0), present.astype(float)
+
+    def window_sums(z: numpy.ndarray, v: numpy.ndarray) -> list:
+        # The sums over rows, each with a leading axis of length one
+        if complete:
+            sums = [z.T @ z, z.sum(axis=0), None, v[:, :1].sum()]
+        else:
+            sums = [z.T @ z, z.T @ v, (z * z).T @ v, v.T @ v]
+        return [None if s is None else numpy.asarray(s)[numpy.newaxis] for s in sums]
+
+    def row_terms(z: numpy.ndarray, v: numpy.ndarray) -> list:
+        # The terms of each row in the sums
+        products = z[:, :, numpy.newaxis] * z[:, numpy.newaxis, :]
+        if complete:
+            return [products, z.copy(), None, v[:, :1].sum(axis=1)]
+        v = v[:, numpy.newaxis, :]
+        return [products, z[:, :, numpy.newaxis] * v, (z * z)[:, :, numpy.newaxis] * v,
+                v.transpose(0, 2, 1) * v]
+
+    def matrices(sums: list, out: numpy.ndarray) -> numpy.ndarray:
+        products, totals, squares, count = sums
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            if complete:
+                numpy.multiply(totals[:, :, numpy.newaxis], (totals / count[:, numpy.newaxis])[:, numpy.newaxis, :],
+                               out=out)
+                numpy.subtract(products, out, out=out)
+                out /= (count - 1)[:, numpy.newaxis, numpy.newaxis]
+                if correlation:
+                    deviation = numpy.sqrt(numpy.diagonal(out, axis1=1, axis2=2))
+                    out /= deviation[:, :, numpy.newaxis]
+                    out /= deviation[:, numpy.newaxis, :]
+                out[count <= 1] = numpy.nan
+            else:
+                out[:] = (products - totals * totals.transpose(0, 2, 1) / count) / (count - 1)
+                if correlation:
+                    variance = (squares - totals * totals / count) / (count - 1)
+                    out /= numpy.sqrt(variance * variance.transpose(0, 2, 1))
+                out[count <= 1] = numpy.nan
+
+        return out
+
+    def imprecise(sums: list, scale: numpy.ndarray) -> numpy.ndarray:
+        # Whether the sums of each row's window have lost the precision of the variance of any series to cancellation
+        products, totals, _, count = sums
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            if complete:
+                count = count[:, numpy.newaxis]
+            else:
+                totals = numpy.diagonal(totals, axis1=1, axis2=2)
+                count = numpy.diagonal(count, axis1=1, axis2=2)
+            deviations = numpy.diagonal(products, axis1=1, axis2=2) - totals * totals / count
+            return (deviations < _COMOMENT_CANCELLATION * scale * count).any(axis=1)
+
+    if latest:
+        if not rows:
+            return numpy.empty((0, columns, columns))
+        return matrices(window_sums(*centre(max(rows - w, 0), rows)), numpy.empty((1, columns, columns)))
+
+    # Sums are updated (a block of rows at a time) as rows enter and leave the window, and recomputed for each segment
+    # of rows, with a new centre, so that the rounding errors of updates do not accumulate. The sums keep the rounding
+    # errors of the largest values they have seen, which swamp the variance of windows of much smaller variations (e.g.
+    # after a fall in volatility), so those windows are summed again, centred on their own means
+    result = numpy.empty((rows, columns, columns))
+    step = max(1, block // (columns * columns * (2 if complete else 8)))
+    for begin in range(0, rows, segment):
+        end = min(begin + segment, rows)
+        first = max(begin + 1 - w, 0)
+        z, v = centre(first, end)
+        scale = numpy.fmax.accumulate(z * z, axis=0)
+        sums = window_sums(z[:begin + 1 - first], v[:begin + 1 - first])
+        matrices(sums, result[begin:begin + 1])
+        recompute = [begin] if imprecise(sums, scale[begin - first:begin + 1 - first])[0] else []
+
+        for start in range(begin + 1, end, step):
+            stop = min(start + step, end)
+            terms = row_terms(z[start - first:stop - first], v[start - first:stop - first])
+
+            # Rows leave the window only once it is full
+            leaving = max(start, w)
+            if leaving < stop:
+                removed = row_terms(z[leaving - w - first:stop - w - first], v[leaving - w - first:stop - w - first])
+                for term, removed_term in zip(terms, removed):
+                    if term is not None:
+                        term[leaving - start:] -= removed_term
+
+            for s, t in zip(sums, terms):
+                if t is not None:
+                    numpy.cumsum(t, axis=0, out=t)
+                    t += s[-1:]
+            sums = terms
+            matrices(sums, result[start:stop])
+            recompute.extend(start + numpy.flatnonzero(imprecise(sums, scale[start - first:stop - first])))
+
+        for row in recompute:
+            matrices(window_sums(*centre(max(row + 1 - w, 0), row + 1)), result[row:row + 1])
+
+    return result
+
+
+# Windows of at most this many values have their z-scores computed directly, rather than from running sums
+_EXACT_ZSCORE_WINDOW = 16
+# Windows whose running variance is less than this fraction of the largest squared (centred) value seen so far may have
+# lost their precision to cancellation, so have their z-scores computed directly
+_ZSCORE_CANCELLATION = 1e-6
+
+
+def _window_zscores(values: numpy.ndarray, w: int, rows: int = 2 ** 16) -> numpy.ndarray:
+    # z-scores computed directly from the values of each window (of each column), a block of windows at a time
+    result = numpy.empty(values.shape)
+    for i in range(min(w - 1, len(values))):
+        window = values[:i + 1]
+        result[i] = (values[i] - window.mean(axis=0)) / window.std(axis=0, ddof=1) if i else 0.0
+
+    for start in range(0, max(len(values) - w + 1, 0), rows):
+        count = min(rows, len(values) - w + 1 - start)
+        windows = numpy.lib.stride_tricks.as_strided(values[start:], (count, w) + values.shape[1:],
+                                                     (values.strides[0],) + values.strides, writeable=False)
+        zscores = (windows[:, -1] - windows.mean(axis=1)) / windows.std(axis=1, ddof=1)
+        result[start + w - 1:start + w - 1 + count] = zscores
+
+    return result
+
+
+def _rolling_zscores(x: Union[pd.Series, pd.DataFrame], w: int, block: int = 4096) \
+        -> Union[pd.Series, pd.DataFrame]:
+    values = x.to_numpy(dtype=float)
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        if w <= _EXACT_ZSCORE_WINDOW:
+            # The variance of a few values is small relative to the rounding errors of a running sum
+            result = _window_zscores(values, w)
+        else:
+            result = numpy.empty(values.shape)
+            block = max(block, w)
+
+            # Rolling means and variances are maintained incrementally (Welford-style) as the window moves. Rounding
+            # errors accumulate with each step, so each block of results is computed afresh from the preceding window,
+            # after centring on the block's mean
+            for start in range(0, len(values), block):
+                offset = min(start, w - 1)
+                chunk = values[start - offset:start + block]
+                nans = numpy.isnan(chunk)
+                reference = numpy.nanmean(numpy.where(nans.all(axis=0), 0.0, chunk), axis=0)
+
+                centred = chunk - reference
+                rolling = pd.DataFrame(centred).rolling(w, 0)
+                variance = rolling.var().to_numpy().reshape(chunk.shape)
+                zscores = (centred - rolling.mean().to_numpy().reshape(chunk.shape)) / numpy.sqrt(variance)
+
+                # Running sums keep the rounding errors of the largest values they have seen, which swamp the variance
+                # of windows of much smaller variations (e.g. after a fall in volatility)
+                scale = numpy.fmax.accumulate(centred ** 2, axis=0)
+                for i, *column in zip(*numpy.nonzero(variance < _ZSCORE_CANCELLATION * scale)):
+                    window = chunk[max(i - w + 1, 0):i + 1, column[0]] if column else chunk[max(i - w + 1, 0):i + 1]
+                    zscores[(i, *column)] = (window[-1] - window.mean()) / window.std(ddof=1) if len(window) > 1 \
+                        else 0.0
+
+                zscores[pd.DataFrame(nans.astype(float)).rolling(w, 0).sum().to_numpy().reshape(chunk.shape) > 0] = \
+                    numpy.nan
+                result[start:start + block] = zscores[offset:]
+
+            result[:1] = 0.0
+
+    # As scipy.stats.zscore of each window: NaN if it has any NaNs or no variance, but zero for a single value
+    result[numpy.isinf(result)] = numpy.nan
+    if w == 1:
+        result[:] = 0.0
+
+    if isinstance(x, pd.DataFrame):
+        return pd.DataFrame(result, index=x.index, columns=x.columns)
+
+    return pd.Series(result, index=x.index, name=x.name)
+
+
+@plot_function(panel=True)
 def zscores(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     """
     Rolling z-scores over a given window
@@ -492,7 +858,12 @@ def zscores(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     if x.size < 1:
         return x
 
-    if not w.w:
+    if isinstance(w, int):
+        w = normalize_window(x, w)
+    elif not w.w:
+        if isinstance(x, pd.DataFrame):
+            return x.apply(zscores)
+
         if x.size == 1:
             return pd.Series([0.0], index=x.index)
 
@@ -500,7 +871,7 @@ def zscores(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
         zscore_series = pd.Series(stats.zscore(clean_series, ddof=1), clean_series.index)
         return interpolate(zscore_series, x, Interpolate.NAN)
 
-    return apply_ramp(x.rolling(w.w, 0).apply(_zscore, raw=False), w)
+    return apply_ramp(_rolling_zscores(x, w.w), w)
 
 
 @plot_function
@@ -648,9 +1019,6 @@ def percentiles(x: pd.Series, y: pd.Series = None, w: Union[Window, int] = Windo
     if y is None:
         y = x.copy()
 
-    res = pd.Series()
-    for idx, val in y.iteritems():
-        sample = x[:idx][-w.w:]
-        res.loc[idx] = percentileofscore(sample, val, kind='mean')
-
+    ends = x.index.searchsorted(y.index, side='right')
+    res = pd.Series(_rolling_percentiles(x.to_numpy(dtype=float), ends, y.to_numpy(dtype=float), w.w), index=y.index)
     return apply_ramp(res, w)
@@ -24,7 +24,7 @@ statistical properties of trading activity, such as price movement and volume ch
 """
 
 
-@plot_function
+@plot_function(panel=True)
 def moving_average(x: pd.Series, w: Union[Window, int] = Window(None, 0)) -> pd.Series:
     """
     Moving average over specified window
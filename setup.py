@@ -67,11 +67,12 @@ setuptools.setup(
         "typing;python_version<'3.7'"
     ],
     extras_require={
+        "async": ["aiohttp"],
         "internal": ["gs_quant_internal>=0.4.1", "requests_kerberos"],
         "notebook": ["jupyter", "matplotlib~=2.1.0", "pprint"],
-        "test": ["pytest", "pytest-cov", "pytest-mock", "testfixtures"],
-        "develop": ["wheel", "sphinx", "sphinx_rtd_theme", "sphinx_autodoc_typehints", "pytest", "pytest-cov",
-                    "pytest-mock", "testfixtures"]
+        "test": ["aiohttp", "pytest", "pytest-cov", "pytest-mock", "testfixtures"],
+        "develop": ["wheel", "sphinx", "sphinx_rtd_theme", "sphinx_autodoc_typehints", "aiohttp", "pytest",
+                    "pytest-cov", "pytest-mock", "testfixtures"]
     },
     classifiers=[
         "Programming Language :: Python :: 3",